@@ -0,0 +1,76 @@
+"""
+Measure embedding throughput and latency against a simulated provider.
+
+The provider sleeps for a fixed overhead plus a per-text cost and rejects
+requests above its size limit, so the report compares one request per
+call (the old behaviour, which fails for large inputs) with batched,
+concurrent requests, without network access.
+
+Usage:
+    python benchmarks/benchmark_embedding_batching.py --texts 500 --concurrency 4
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lib.embedding_client import EmbeddingBatcher
+
+
+def _provider(request_overhead: float, per_text: float, limit: int, dimension: int):
+    """Build a fake provider embedding one request."""
+    def embed_batch(texts):
+        if len(texts) > limit:
+            raise ValueError(f"batch size {len(texts)} exceeds limit {limit}")
+        time.sleep(request_overhead + per_text * len(texts))
+        return [[float(len(text))] * dimension for text in texts]
+    return embed_batch
+
+
+def measure(texts: int, concurrency: int, batch_size: int, request_overhead: float, per_text: float) -> dict:
+    """Embed the same texts sequentially in provider-sized requests and with the batcher."""
+    inputs = [f"chunk {i} " + "word " * 150 for i in range(texts)]
+    embed_batch = _provider(request_overhead, per_text, batch_size, 1024)
+    report = {"texts": texts, "provider_batch_limit": batch_size}
+
+    start = time.perf_counter()
+    try:
+        embed_batch(inputs)
+        report["single_request"] = {"seconds": round(time.perf_counter() - start, 3)}
+    except ValueError as e:
+        report["single_request"] = {"error": str(e)}
+
+    for label, workers in (("sequential_batches", 1), ("concurrent_batches", concurrency)):
+        batcher = EmbeddingBatcher(embed_batch, max_batch_size=batch_size, max_batch_chars=10 ** 9,
+                                   max_input_chars=8192, concurrency=workers)
+        start = time.perf_counter()
+        vectors = batcher.embed(inputs)
+        elapsed = time.perf_counter() - start
+        batcher.close()
+        report[label] = dict(batcher.get_stats(), concurrency=workers, seconds=round(elapsed, 3),
+                             vectors=len(vectors))
+    return report
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=500, help="Texts to embed")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight")
+    parser.add_argument("--batch-size", type=int, default=10, help="Provider limit of texts per request")
+    parser.add_argument("--request-overhead", type=float, default=0.05, help="Seconds per request")
+    parser.add_argument("--per-text", type=float, default=0.002, help="Seconds per text")
+    args = parser.parse_args()
+
+    print(json.dumps(
+        measure(args.texts, args.concurrency, args.batch_size, args.request_overhead, args.per_text),
+        indent=2
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare batch indexing with one worker per stage against the configured workers.
+
+The parser, embedding and extraction calls are replaced by fakes that sleep
+for a fixed API latency, so the report shows how much the staged pipeline
+overlaps the calls; with one worker per stage each API stage runs serially.
+
+Usage:
+    python benchmarks/benchmark_indexing_pipeline.py --documents 8 --chunks 32 --extract-latency 0.05
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.document_chunk import DocumentChunk
+from src.models.vector_embedding import VectorEmbedding
+from src.services.indexing_service import IndexingService
+
+
+def _service(chunks: int, embed_latency: float, extract_latency: float, workers: dict) -> IndexingService:
+    """Build an indexing service whose API calls sleep instead of calling out."""
+    service = IndexingService()
+    service.pdf_parser = MagicMock()
+    service.pdf_parser.parse_pdf.side_effect = lambda path: (time.sleep(0.01), path)[1]
+    service.pdf_parser.get_pdf_metadata.return_value = {}
+    service.document_chunker = MagicMock()
+    service.document_chunker.chunk_document.side_effect = lambda document_id, text, metadata=None: [
+        DocumentChunk(document_id, f"{text} {i}", i) for i in range(chunks)
+    ]
+    service.embedding_generator = MagicMock()
+    service.embedding_generator.generate_embeddings.side_effect = lambda ids, texts: (
+        time.sleep(embed_latency), [VectorEmbedding(chunk_id, [0.0, 1.0], "fake") for chunk_id in ids]
+    )[1]
+    service.kg_extractor = MagicMock()
+    service.kg_extractor.extract_entities_and_relationships.side_effect = lambda chunk_id, text: (
+        time.sleep(extract_latency), ([], [])
+    )[1]
+    service.vector_search = MagicMock()
+    service.vector_search.store.backend = "memory"
+    service.stage_workers = dict(service.stage_workers, **workers)
+    service.progress_interval = 0
+    return service
+
+
+def measure(documents: int, chunks: int, embed_latency: float, extract_latency: float) -> dict:
+    """Index the same synthetic batch with serial and configured stage workers."""
+    report = {"documents": documents, "chunks_per_document": chunks}
+    configured = IndexingService().stage_workers
+    serial = {stage: 1 for stage in configured}
+    for label, workers in (("serial_stages", serial), ("configured_stages", configured)):
+        service = _service(chunks, embed_latency, extract_latency, workers)
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            service.checkpoint_dir = checkpoint_dir
+            start = time.perf_counter()
+            indexed = service.index_documents_batch("benchmark", [f"doc-{i}.pdf" for i in range(documents)])
+            elapsed = time.perf_counter() - start
+        report[label] = {
+            "workers": workers,
+            "indexed": len(indexed),
+            "seconds": round(elapsed, 3),
+            "chunks_per_second": round(documents * chunks / elapsed, 1),
+            "stages": service.last_report["stages"],
+        }
+    return report
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=8, help="Documents in the batch")
+    parser.add_argument("--chunks", type=int, default=32, help="Chunks per document")
+    parser.add_argument("--embed-latency", type=float, default=0.05, help="Seconds per embedding request")
+    parser.add_argument("--extract-latency", type=float, default=0.02, help="Seconds per extraction request")
+    args = parser.parse_args()
+
+    print(json.dumps(
+        measure(args.documents, args.chunks, args.embed_latency, args.extract_latency),
+        indent=2
+    ))
+
+
+if __name__ == "__main__":
+    main()
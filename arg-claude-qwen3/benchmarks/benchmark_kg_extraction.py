@@ -0,0 +1,97 @@
+"""
+Count knowledge graph extraction LLM calls per document, per chunk and batched.
+
+The extractor runs against the deterministic FakeLLMClient, so the report
+needs no API key or network and is reproducible.
+
+Usage:
+    python benchmarks/benchmark_kg_extraction.py --documents 20 --chunks 40 --chunks-per-request 8
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lib.fake_llm_client import FakeLLMClient
+from src.services.kg_extractor import KnowledgeGraphExtractor
+
+_NAMES = ["Huawei", "Ren Zhengfei", "Shenzhen", "Apple", "Steve Jobs", "Cupertino", "Alibaba", "Jack Ma"]
+
+
+def _documents(documents: int, chunks: int, chunk_chars: int, repeat: float, rng: random.Random) -> list:
+    """Build documents of synthetic chunks, a fraction of which repeat earlier text."""
+    seen = []
+    corpus = []
+    for d in range(documents):
+        document = []
+        for c in range(chunks):
+            if seen and rng.random() < repeat:
+                text = rng.choice(seen)
+            else:
+                words = [rng.choice(_NAMES) if rng.random() < 0.1 else "text" for _ in range(chunk_chars // 6)]
+                text = " ".join(words) + f" {d}-{c}"
+                seen.append(text)
+            document.append((f"doc{d}-chunk{c}", text))
+        corpus.append(document)
+    return corpus
+
+
+def measure(documents: int, chunks: int, chunk_chars: int, chunks_per_request: int, repeat: float) -> dict:
+    """Extract the same corpus per chunk and batched, counting LLM calls."""
+    corpus = _documents(documents, chunks, chunk_chars, repeat, random.Random(0))
+    report = {"documents": documents, "chunks_per_document": chunks, "repeated_fraction": repeat}
+
+    llm = FakeLLMClient()
+    extractor = KnowledgeGraphExtractor(llm_client=llm, cache_size=0)
+    start = time.perf_counter()
+    for document in corpus:
+        for chunk_id, text in document:
+            extractor.extract_entities_and_relationships(chunk_id, text)
+    report["per_chunk"] = {
+        "llm_calls": llm.calls,
+        "calls_per_document": llm.calls / documents,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+    llm = FakeLLMClient()
+    extractor = KnowledgeGraphExtractor(llm_client=llm, chunks_per_request=chunks_per_request,
+                                        max_request_chars=chunks_per_request * (chunk_chars + 100))
+    start = time.perf_counter()
+    entities = 0
+    for document in corpus:
+        entities += len(extractor.extract_batch(document).entities)
+    report["batched"] = {
+        "chunks_per_request": chunks_per_request,
+        "llm_calls": llm.calls,
+        "calls_per_document": llm.calls / documents,
+        "entities": entities,
+        "seconds": round(time.perf_counter() - start, 3),
+        **extractor.get_stats(),
+    }
+    report["call_reduction"] = round(report["per_chunk"]["llm_calls"] / max(llm.calls, 1), 1)
+    return report
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20, help="Number of documents")
+    parser.add_argument("--chunks", type=int, default=40, help="Chunks per document")
+    parser.add_argument("--chunk-chars", type=int, default=1000, help="Characters per chunk")
+    parser.add_argument("--chunks-per-request", type=int, default=8, help="Chunks packed into one request")
+    parser.add_argument("--repeat", type=float, default=0.1, help="Fraction of chunks repeating earlier text")
+    args = parser.parse_args()
+
+    print(json.dumps(
+        measure(args.documents, args.chunks, args.chunk_chars, args.chunks_per_request, args.repeat),
+        indent=2
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure the per-call overhead of metrics instrumentation.
+
+Usage:
+    python benchmarks/benchmark_metrics_overhead.py --calls 200000
+"""
+import argparse
+import json
+import logging
+import sys
+import timeit
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lib.monitoring import MetricsCollector, MetricsRegistry, log_function_call
+import src.lib.monitoring as monitoring
+
+
+def _per_call_ns(statement, calls: int) -> float:
+    """Best-of-three nanoseconds per call of statement."""
+    timer = timeit.Timer(statement)
+    return round(min(timer.repeat(repeat=3, number=calls)) / calls * 1e9, 1)
+
+
+def measure(calls: int) -> dict:
+    """Time each instrumentation primitive and return nanoseconds per call."""
+    logger = logging.getLogger("benchmark")
+    logger.disabled = True
+    registry = MetricsRegistry()
+    collector = MetricsCollector(logger, registry)
+    monitoring._metrics_collector = collector
+
+    counter = registry.counter("calls_total", "Calls").labels()
+    histogram = registry.histogram("call_seconds", "Call latency").labels()
+    labeled = registry.histogram("op_seconds", "Operation latency", ["operation"])
+
+    def bare():
+        return None
+
+    decorated = log_function_call(logger)(bare)
+    # psutil samples that log_function_call used to take around every call
+    system_sample = collector.get_system_metrics
+
+    baseline = _per_call_ns(bare, calls)
+    results = {
+        "function_call": baseline,
+        "counter_inc": _per_call_ns(counter.inc, calls),
+        "histogram_observe": _per_call_ns(lambda: histogram.observe(0.012), calls),
+        "labeled_histogram_observe": _per_call_ns(lambda: labeled.labels("search").observe(0.012), calls),
+        "collector_timer": _per_call_ns(lambda: collector.timer("search", 0.012), calls),
+        "log_function_call": _per_call_ns(decorated, calls),
+        "system_metrics_sample": _per_call_ns(system_sample, max(1, calls // 100)),
+    }
+    results["log_function_call_overhead"] = round(results["log_function_call"] - baseline, 1)
+    return results
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    print(json.dumps({"calls": args.calls, "ns_per_call": measure(args.calls)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
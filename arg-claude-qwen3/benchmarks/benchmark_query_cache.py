@@ -0,0 +1,91 @@
+"""
+Measure hybrid search latency with and without the query result cache.
+
+The search steps are replaced by a fixed sleep standing in for expansion,
+embedding, vector and graph search and reranking, and a stream of queries
+drawn from a small FAQ-style set (with varied case and punctuation) is run
+through RetrievalService.hybrid_search, without a cache, with the memory tier alone, and with a fresh memory tier
+in front of a disk tier another process already filled.
+
+Usage:
+    python benchmarks/benchmark_query_cache.py --queries 2000 --distinct 50
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lib.query_cache import QueryResultCache
+from src.services.retrieval_service import RetrievalService
+
+
+def _queries(count: int, distinct: int, seed: int = 7) -> list:
+    """Draw queries from a fixed set, varying their spelling."""
+    rng = random.Random(seed)
+    base = [f"What does section {i} of the handbook say about leave" for i in range(distinct)]
+    variants = [str.lower, str.upper, lambda q: q + "?", lambda q: "  " + q + " ."]
+    return [rng.choice(variants)(rng.choice(base)) for _ in range(count)]
+
+
+def measure(queries: int, distinct: int, search_seconds: float) -> dict:
+    """Run the same query stream without a cache, with memory only, and from the disk tier."""
+    stream = _queries(queries, distinct)
+    service = RetrievalService()
+
+    def search(*args, **kwargs):
+        time.sleep(search_seconds)
+        return [(f"chunk_{i}", 1.0 - i / 10) for i in range(5)]
+
+    service._search = search
+    report = {"queries": queries, "distinct": distinct, "search_seconds": search_seconds}
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "query_cache.sqlite3")
+        # Fill the disk tier as another process would
+        service.query_cache = QueryResultCache(max_entries=10000, ttl=3600, db_path=db_path)
+        for query in stream:
+            service.hybrid_search(query, "bench", top_k=5)
+        service.query_cache.close()
+
+        caches = {
+            "uncached": QueryResultCache(max_entries=0, ttl=3600),
+            "memory": QueryResultCache(max_entries=10000, ttl=3600),
+            "memory_and_disk": QueryResultCache(max_entries=10000, ttl=3600, db_path=db_path),
+        }
+        for label, cache in caches.items():
+            service.query_cache = cache
+            latencies = []
+            for query in stream:
+                start = time.perf_counter()
+                service.hybrid_search(query, "bench", top_k=5)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            report[label] = dict(
+                cache.get_stats(),
+                total_seconds=round(sum(latencies), 3),
+                median_us=round(latencies[len(latencies) // 2] * 1e6, 1),
+            )
+            cache.close()
+    return report
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=2000, help="Queries to run")
+    parser.add_argument("--distinct", type=int, default=50, help="Distinct questions among them")
+    parser.add_argument("--search-seconds", type=float, default=0.005, help="Seconds per uncached search")
+    args = parser.parse_args()
+
+    print(json.dumps(measure(args.queries, args.distinct, args.search_seconds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
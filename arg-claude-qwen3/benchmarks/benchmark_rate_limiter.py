@@ -0,0 +1,93 @@
+"""
+Measure CPU burned by threads waiting on a contended sliding window rate limiter.
+
+Every thread repeatedly requests a slot for a random key and waits until it is
+allowed. The "polling" mode reproduces the previous behaviour (check, sleep
+10ms, check again) for comparison with the reservation-based waiters.
+
+Usage:
+    python benchmarks/benchmark_rate_limiter.py --threads 2000 --keys 1000
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lib.rate_limiter import SlidingWindowRateLimiter
+
+
+def _poll_until_allowed(limiter: SlidingWindowRateLimiter, key: str) -> None:
+    """Wait by polling, as the limiter did before it computed exact waits."""
+    while not limiter.is_allowed(key):
+        time.sleep(0.01)
+
+
+def measure(mode: str, threads: int, keys: int, requests: int, max_requests: int, window: float) -> dict:
+    """Run the contention scenario and return CPU and wall-clock statistics."""
+    limiter = SlidingWindowRateLimiter(max_requests, window)
+    start_barrier = threading.Barrier(threads + 1)
+    rng = random.Random(0)
+    key_plan = [[f"client-{rng.randrange(keys)}" for _ in range(requests)] for _ in range(threads)]
+
+    def worker(plan):
+        start_barrier.wait()
+        for key in plan:
+            if mode == "polling":
+                _poll_until_allowed(limiter, key)
+            else:
+                limiter.wait_until_allowed(key)
+
+    pool = [threading.Thread(target=worker, args=(plan,), daemon=True) for plan in key_plan]
+    for thread in pool:
+        thread.start()
+
+    start_barrier.wait()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for thread in pool:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "mode": mode,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_utilization": round(cpu / wall, 3) if wall else None,
+        "requests": threads * requests,
+        "tracked_keys": len(limiter),
+    }
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=2000, help="Number of waiting threads")
+    parser.add_argument("--keys", type=int, default=1000, help="Number of distinct keys")
+    parser.add_argument("--requests", type=int, default=4, help="Requests per thread")
+    parser.add_argument("--max-requests", type=int, default=5, help="Requests allowed per key and window")
+    parser.add_argument("--window", type=float, default=0.5, help="Window size in seconds")
+    parser.add_argument("--modes", nargs="+", default=["reserved", "polling"], choices=["reserved", "polling"])
+    args = parser.parse_args()
+
+    results = [
+        measure(mode, args.threads, args.keys, args.requests, args.max_requests, args.window)
+        for mode in args.modes
+    ]
+    print(json.dumps({
+        "threads": args.threads,
+        "keys": args.keys,
+        "max_requests": args.max_requests,
+        "window": args.window,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
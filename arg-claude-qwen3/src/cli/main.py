@@ -39,7 +39,38 @@ def main():
 
     # Parse arguments first to handle help without requiring environment variables
     args = parser.parse_args()
+    if args.command is None:
+        parser.print_help()
+        return
+
+    metrics_collector = _start_metrics()
+    try:
+        _run_command(args)
+    finally:
+        _stop_metrics(metrics_collector)
+
+
+def _start_metrics():
+    """Start sampling system metrics for the duration of a command."""
+    from src.lib.logger import get_logger
+    from src.lib.monitoring import get_metrics_collector
+
+    metrics_collector = get_metrics_collector(get_logger("src.lib.monitoring"))
+    metrics_collector.start_sampler()
+    return metrics_collector
 
+
+def _stop_metrics(metrics_collector) -> None:
+    """Stop the sampler and write the Prometheus exposition if METRICS_EXPORT_PATH is set."""
+    metrics_collector.stop_sampler()
+    try:
+        metrics_collector.export_prometheus()
+    except OSError as e:
+        print(f"Warning: could not write metrics: {e}", file=sys.stderr)
+
+
+def _run_command(args) -> None:
+    """Run the parsed CLI command."""
     # Only import the implementation functions when actually needed
     if args.command == 'indexing':
         from src.cli.indexing import index_document
@@ -82,9 +113,6 @@ def main():
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
 
-    else:
-        parser.print_help()
-
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
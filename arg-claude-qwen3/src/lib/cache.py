@@ -0,0 +1,97 @@
+"""
+In-process caches for the RAG backend system.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """A thread-safe LRU cache whose entries expire after a time to live.
+
+    The least recently used entry is evicted once max_entries is reached;
+    expired entries are dropped when they are read.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a TTLCache.
+
+        Args:
+            max_entries: Most entries kept (0 disables the cache)
+            ttl: Seconds an entry stays valid
+            clock: Time source, replaceable in tests
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value.
+
+        Args:
+            key: Entry key
+            default: Value returned for missing or expired entries
+
+        Returns:
+            The cached value, or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Entry key
+            value: Value to cache
+            ttl: Time to live of this entry (defaults to the cache's)
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, self.clock() + (self.ttl if ttl is None else ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage.
+
+        Returns:
+            Dictionary with entry count, hits, misses and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+            }
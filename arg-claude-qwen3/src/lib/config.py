@@ -32,6 +32,65 @@ class Config:
         self.max_chunk_size = int(os.getenv("MAX_CHUNK_SIZE", "1000"))
         self.max_concurrent_requests = int(os.getenv("MAX_CONCURRENT_REQUESTS", "10"))
 
+        # Embedding request configuration
+        self.embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "10"))
+        self.embedding_max_batch_chars = int(os.getenv("EMBEDDING_MAX_BATCH_CHARS", "60000"))
+        self.embedding_max_input_chars = int(os.getenv("EMBEDDING_MAX_INPUT_CHARS", "8192"))
+        self.embedding_concurrency = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+        self.embedding_timeout = float(os.getenv("EMBEDDING_TIMEOUT", "30"))
+
+        # Reranking configuration
+        self.rerank_min_candidates = int(os.getenv("RERANK_MIN_CANDIDATES", "3"))
+        self.rerank_max_tokens = int(os.getenv("RERANK_MAX_TOKENS", "512"))
+        self.rerank_batch_size = int(os.getenv("RERANK_BATCH_SIZE", "20"))
+        self.rerank_concurrency = int(os.getenv("RERANK_CONCURRENCY", "4"))
+        self.rerank_timeout = float(os.getenv("RERANK_TIMEOUT", "15"))
+        self.rerank_cache_size = int(os.getenv("RERANK_CACHE_SIZE", "10000"))
+        self.rerank_cache_ttl = float(os.getenv("RERANK_CACHE_TTL", "600"))
+
+        # Query result cache configuration
+        self.query_cache_size = int(os.getenv("QUERY_CACHE_SIZE", "1000"))
+        self.query_cache_ttl = float(os.getenv("QUERY_CACHE_TTL", "3600"))
+        self.query_cache_db_path = os.getenv("QUERY_CACHE_DB_PATH", "")
+
+        # Vector search configuration
+        self.vector_backend = os.getenv("VECTOR_BACKEND", "auto")
+        self.vector_exact_scan_limit = int(os.getenv("VECTOR_EXACT_SCAN_LIMIT", "5000"))
+        self.vector_recall_sample_rate = float(os.getenv("VECTOR_RECALL_SAMPLE_RATE", "0.0"))
+
+        # Indexing pipeline configuration
+        self.index_parse_workers = int(os.getenv("INDEX_PARSE_WORKERS", "2"))
+        self.index_embed_workers = int(os.getenv("INDEX_EMBED_WORKERS", "2"))
+        self.index_extract_workers = int(os.getenv("INDEX_EXTRACT_WORKERS", "4"))
+        self.index_write_workers = int(os.getenv("INDEX_WRITE_WORKERS", "1"))
+        self.index_queue_size = int(os.getenv("INDEX_QUEUE_SIZE", "8"))
+        self.index_chunk_batch_size = int(os.getenv("INDEX_CHUNK_BATCH_SIZE", "16"))
+        self.index_checkpoint_dir = os.getenv("INDEX_CHECKPOINT_DIR", ".index_checkpoints")
+        self.index_progress_interval = float(os.getenv("INDEX_PROGRESS_INTERVAL", "30"))
+
+        # Knowledge graph extraction configuration
+        self.kg_extraction_mode = os.getenv("KG_EXTRACTION_MODE", "batched")
+        self.kg_chunks_per_request = int(os.getenv("KG_CHUNKS_PER_REQUEST", "8"))
+        self.kg_max_request_chars = int(os.getenv("KG_MAX_REQUEST_CHARS", "12000"))
+        self.kg_cache_size = int(os.getenv("KG_CACHE_SIZE", "10000"))
+
+        # Graph search configuration
+        self.graph_max_depth = int(os.getenv("GRAPH_MAX_DEPTH", "2"))
+        self.graph_max_fan_out = int(os.getenv("GRAPH_MAX_FAN_OUT", "50"))
+
+        # Conversation configuration
+        self.conversation_db_path = os.getenv("CONVERSATION_DB_PATH", ".conversations.sqlite3")
+        self.conversation_window_turns = int(os.getenv("CONVERSATION_WINDOW_TURNS", "5"))
+        self.conversation_summary_batch = int(os.getenv("CONVERSATION_SUMMARY_BATCH", "10"))
+        self.conversation_summary_max_chars = int(os.getenv("CONVERSATION_SUMMARY_MAX_CHARS", "2000"))
+        self.conversation_turn_max_chars = int(os.getenv("CONVERSATION_TURN_MAX_CHARS", "2000"))
+        self.conversation_cached_sessions = int(os.getenv("CONVERSATION_CACHED_SESSIONS", "1000"))
+
+        # Metrics configuration
+        self.metrics_max_series = int(os.getenv("METRICS_MAX_SERIES", "100"))
+        self.metrics_sample_interval = float(os.getenv("METRICS_SAMPLE_INTERVAL", "15"))
+        self.metrics_export_path = os.getenv("METRICS_EXPORT_PATH", "")
+
     @property
     def is_production(self) -> bool:
         """Check if running in production environment."""
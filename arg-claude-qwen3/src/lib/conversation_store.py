@@ -0,0 +1,226 @@
+"""
+SQLite storage for chat conversation turns and summaries.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversation_turns (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    session_id TEXT NOT NULL,
+    query_id TEXT NOT NULL,
+    question TEXT,
+    response TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversation_turns_session ON conversation_turns (session_id, seq);
+CREATE TABLE IF NOT EXISTS conversation_summaries (
+    session_id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    summarized_through INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+_TURN_COLUMNS = "seq, id, session_id, query_id, question, response, created_at"
+
+
+class SQLiteConversationStore:
+    """Append-only conversation turns in SQLite.
+
+    Turns are only ever inserted (or deleted with their whole session), and
+    every lookup goes through the (session_id, seq) index, so reading the
+    latest turns of a session costs the same however long it is. Each
+    session also has at most one summary row, recording the last turn it
+    covers.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store; the database is opened on first use.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            logger.info(f"Opened conversation store {self.path}")
+        return self._connection
+
+    def append_turn(self, turn: Dict[str, Any]) -> int:
+        """
+        Store a turn.
+
+        Args:
+            turn: Dictionary with id, session_id, query_id, question, response and created_at
+
+        Returns:
+            Sequence number of the turn
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                cursor = connection.execute(
+                    "INSERT INTO conversation_turns (id, session_id, query_id, question, response, created_at) "
+                    "VALUES (:id, :session_id, :query_id, :question, :response, :created_at)",
+                    turn
+                )
+            return cursor.lastrowid
+
+    def recent_turns(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the latest turns of a session.
+
+        Args:
+            session_id: Identifier for the chat session
+            limit: Most turns returned
+
+        Returns:
+            Turn dictionaries, oldest first
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {_TURN_COLUMNS} FROM conversation_turns WHERE session_id = ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (session_id, limit)
+            ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def turns_after(self, session_id: str, after_seq: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the turns of a session following a sequence number.
+
+        Args:
+            session_id: Identifier for the chat session
+            after_seq: Only turns with a larger sequence number are returned
+            limit: Most turns returned
+
+        Returns:
+            Turn dictionaries, oldest first
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {_TURN_COLUMNS} FROM conversation_turns WHERE session_id = ? AND seq > ? "
+                "ORDER BY seq LIMIT ?",
+                (session_id, after_seq, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_turns(self, session_id: str, after_seq: int = 0) -> int:
+        """
+        Count the turns of a session following a sequence number.
+
+        Args:
+            session_id: Identifier for the chat session
+            after_seq: Only turns with a larger sequence number are counted
+
+        Returns:
+            Number of turns
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT count(*) FROM conversation_turns WHERE session_id = ? AND seq > ?",
+                (session_id, after_seq)
+            ).fetchone()
+        return row[0]
+
+    def session_stats(self, session_id: str) -> Dict[str, Any]:
+        """
+        Count the turns of a session.
+
+        Args:
+            session_id: Identifier for the chat session
+
+        Returns:
+            Dictionary with the turn count and first and last timestamps
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT count(*) AS turns, min(created_at) AS first_at, max(created_at) AS last_at "
+                "FROM conversation_turns WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+        return dict(row)
+
+    def get_summary(self, session_id: str) -> Tuple[str, int]:
+        """
+        Get the summary of a session's older turns.
+
+        Args:
+            session_id: Identifier for the chat session
+
+        Returns:
+            (summary, sequence number of the last summarized turn); ("", 0) if there is none
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT summary, summarized_through FROM conversation_summaries WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+        return (row["summary"], row["summarized_through"]) if row else ("", 0)
+
+    def set_summary(self, session_id: str, summary: str, summarized_through: int, updated_at: str) -> None:
+        """
+        Replace the summary of a session.
+
+        Args:
+            session_id: Identifier for the chat session
+            summary: Summary text
+            summarized_through: Sequence number of the last turn it covers
+            updated_at: ISO timestamp of the update
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT INTO conversation_summaries (session_id, summary, summarized_through, updated_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(session_id) DO UPDATE SET "
+                    "summary = excluded.summary, summarized_through = excluded.summarized_through, "
+                    "updated_at = excluded.updated_at",
+                    (session_id, summary, summarized_through, updated_at)
+                )
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Delete every turn and the summary of a session.
+
+        Args:
+            session_id: Identifier for the chat session
+
+        Returns:
+            Number of turns deleted
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                deleted = connection.execute(
+                    "DELETE FROM conversation_turns WHERE session_id = ?", (session_id,)
+                ).rowcount
+                connection.execute("DELETE FROM conversation_summaries WHERE session_id = ?", (session_id,))
+        return deleted
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -2,16 +2,200 @@
 Qwen API client for generating text embeddings.
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from typing import List, Optional
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Dict, List, Optional, Sequence
 import logging
 from src.lib.config import get_config
+from src.lib.monitoring import DEFAULT_LATENCY_BUCKETS, Histogram
 
 logger = logging.getLogger(__name__)
 
 
+class EmbeddingBatcher:
+    """Runs embedding requests within provider limits, concurrently.
+
+    Inputs are split into requests of at most max_batch_size texts and
+    max_batch_chars characters (texts longer than max_input_chars are
+    truncated), and the requests run on a fixed pool of threads. When a
+    request fails, its texts are retried one by one, so one bad input does
+    not sink its neighbours; vectors are always returned in input order.
+    """
+
+    def __init__(self, embed_batch: Callable[[List[str]], List[List[float]]],
+                 max_batch_size: Optional[int] = None, max_batch_chars: Optional[int] = None,
+                 max_input_chars: Optional[int] = None, concurrency: Optional[int] = None):
+        """
+        Initialize an EmbeddingBatcher.
+
+        Args:
+            embed_batch: Function embedding one request's texts, in order
+            max_batch_size: Most texts per request (defaults to EMBEDDING_BATCH_SIZE)
+            max_batch_chars: Most characters per request (defaults to EMBEDDING_MAX_BATCH_CHARS)
+            max_input_chars: Characters kept of each text (defaults to EMBEDDING_MAX_INPUT_CHARS)
+            concurrency: Requests in flight at once (defaults to EMBEDDING_CONCURRENCY)
+        """
+        config = get_config()
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size or config.embedding_batch_size
+        self.max_batch_chars = max_batch_chars or config.embedding_max_batch_chars
+        self.max_input_chars = max_input_chars or config.embedding_max_input_chars
+        self.concurrency = concurrency or config.embedding_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.latency = Histogram(DEFAULT_LATENCY_BUCKETS)
+        self.texts = 0
+        self.requests = 0
+        self.failed_requests = 0
+        self.retried_texts = 0
+        self.truncated_texts = 0
+        self.embed_seconds = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The request thread pool, created on first use."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.concurrency, thread_name_prefix="embedding"
+                    )
+        return self._executor
+
+    def plan(self, texts: Sequence[str]) -> List[List[int]]:
+        """
+        Split texts into requests.
+
+        Args:
+            texts: Texts to embed (already truncated)
+
+        Returns:
+            Lists of text indexes, one list per request
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        chars = 0
+        for index, text in enumerate(texts):
+            if current and (len(current) >= self.max_batch_size or chars + len(text) > self.max_batch_chars):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(index)
+            chars += len(text)
+        if current:
+            batches.append(current)
+        return batches
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in input order
+
+        Raises:
+            Exception: The error of the first text that failed on its own
+        """
+        if not texts:
+            return []
+        start = time.perf_counter()
+        inputs = []
+        truncated = 0
+        for text in texts:
+            if len(text) > self.max_input_chars:
+                text = text[:self.max_input_chars]
+                truncated += 1
+            inputs.append(text)
+        if truncated:
+            logger.warning(f"Truncated {truncated} texts to {self.max_input_chars} characters for embedding")
+
+        batches = self.plan(inputs)
+        if len(batches) == 1:
+            results = [self._run([inputs[i] for i in batches[0]])]
+        else:
+            futures = [self.executor.submit(self._run, [inputs[i] for i in batch]) for batch in batches]
+            results = [future.result() for future in futures]
+
+        vectors: List[Optional[List[float]]] = [None] * len(inputs)
+        for batch, batch_vectors in zip(batches, results):
+            for index, vector in zip(batch, batch_vectors):
+                vectors[index] = vector
+
+        with self._lock:
+            self.texts += len(inputs)
+            self.truncated_texts += truncated
+            self.embed_seconds += time.perf_counter() - start
+        return vectors
+
+    def _run(self, texts: List[str]) -> List[List[float]]:
+        """Embed one request's texts, retrying them one by one if it fails."""
+        try:
+            return self._request(texts)
+        except Exception as e:
+            if len(texts) == 1:
+                raise
+            logger.warning(f"Embedding request of {len(texts)} texts failed, retrying individually: {e}")
+            with self._lock:
+                self.retried_texts += len(texts)
+            return [self._request([text])[0] for text in texts]
+
+    def _request(self, texts: List[str]) -> List[List[float]]:
+        start = time.perf_counter()
+        try:
+            vectors = self.embed_batch(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+            return vectors
+        except Exception:
+            with self._lock:
+                self.failed_requests += 1
+            raise
+        finally:
+            self.latency.observe(time.perf_counter() - start)
+            with self._lock:
+                self.requests += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get request counts, throughput and latency.
+
+        Returns:
+            Dictionary with text and request counts, retries, texts per second
+            and request latency percentiles
+        """
+        percentiles = self.latency.percentiles()
+        with self._lock:
+            return {
+                "texts": self.texts,
+                "requests": self.requests,
+                "failed_requests": self.failed_requests,
+                "retried_texts": self.retried_texts,
+                "truncated_texts": self.truncated_texts,
+                "texts_per_second": self.texts / self.embed_seconds if self.embed_seconds else None,
+                "latency_p50": percentiles["p50"],
+                "latency_p95": percentiles["p95"],
+                "latency_p99": percentiles["p99"],
+            }
+
+    def close(self) -> None:
+        """Shut down the request threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
 class EmbeddingClient:
-    """Client for Qwen text embedding API."""
+    """Client for Qwen text embedding API.
+
+    Requests go through one pooled keep-alive session with a timeout, and
+    are batched and run concurrently by an EmbeddingBatcher.
+    """
 
     def __init__(self):
         """Initialize embedding client with API configuration."""
@@ -19,26 +203,24 @@ class EmbeddingClient:
         self.api_base = config.qwen_api_base
         self.api_key = config.qwen_api_key
         self.model = "text-embedding-v4"
+        self.timeout = config.embedding_timeout
 
         if not self.api_key:
             raise ValueError("QWEN_API_KEY environment variable is required")
 
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """
-        Generate embeddings for a list of texts.
-
-        Args:
-            texts: List of text strings to embed
-
-        Returns:
-            List of embedding vectors
-        """
-        url = f"{self.api_base}/embeddings"
-
-        headers = {
+        self.batcher = EmbeddingBatcher(self._post_embeddings)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.batcher.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
-        }
+        })
+
+    def _post_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed one request's texts."""
+        url = f"{self.api_base}/embeddings"
 
         payload = {
             "model": self.model,
@@ -46,14 +228,12 @@ class EmbeddingClient:
         }
 
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = self.session.post(url, json=payload, timeout=self.timeout)
             response.raise_for_status()
 
             data = response.json()
-            embeddings = [item["embedding"] for item in data["data"]]
-
-            logger.info(f"Generated embeddings for {len(texts)} texts")
-            return embeddings
+            items = sorted(data["data"], key=lambda item: item.get("index", 0))
+            return [item["embedding"] for item in items]
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to generate embeddings: {e}")
@@ -62,6 +242,20 @@ class EmbeddingClient:
             logger.error(f"Unexpected response format: {e}")
             raise
 
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for a list of texts.
+
+        Args:
+            texts: List of text strings to embed
+
+        Returns:
+            List of embedding vectors
+        """
+        embeddings = self.batcher.embed(texts)
+        logger.info(f"Generated embeddings for {len(texts)} texts")
+        return embeddings
+
     def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
@@ -75,6 +269,15 @@ class EmbeddingClient:
         embeddings = self.generate_embeddings([text])
         return embeddings[0]
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get embedding throughput and latency.
+
+        Returns:
+            Dictionary of EmbeddingBatcher statistics
+        """
+        return self.batcher.get_stats()
+
 
 # Global embedding client instance
 embedding_client = EmbeddingClient()
@@ -87,4 +290,4 @@ def get_embedding_client() -> EmbeddingClient:
     Returns:
         EmbeddingClient instance
     """
-    return embedding_client
\ No newline at end of file
+    return embedding_client
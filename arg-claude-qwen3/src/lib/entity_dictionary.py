@@ -0,0 +1,149 @@
+"""
+Entity dictionary for linking query text to knowledge graph entities.
+"""
+
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Characters stripped from both ends of an entity name before matching
+_EDGE_PUNCTUATION = " \t\n\"'`.,;:!?()[]{}<>“”‘’「」『』《》（）【】，。；：！？、"
+
+
+def normalize_entity_name(name: str) -> str:
+    """
+    Normalize an entity name for indexing and lookup.
+
+    Applies NFKC normalization and case folding, collapses whitespace and
+    strips surrounding punctuation, so "  Huawei Technologies." and
+    "HUAWEI technologies" share a key.
+
+    Args:
+        name: Entity name or text fragment
+
+    Returns:
+        Normalized name (empty if nothing remains)
+    """
+    text = unicodedata.normalize("NFKC", name).casefold()
+    return _WHITESPACE.sub(" ", text).strip(_EDGE_PUNCTUATION)
+
+
+def _is_word_char(char: str) -> bool:
+    """Whether a character belongs to a space-delimited word (not CJK)."""
+    return char.isalnum() and ord(char) < 0x2E80
+
+
+class EntityDictionary:
+    """Aho-Corasick automaton over normalized entity names.
+
+    Finds every dictionary entity in a text in one pass, in time linear in
+    the text length plus the number of matches, independent of how many
+    entities the dictionary holds. Matches inside a longer word are ignored
+    for space-delimited scripts ("art" does not match "start"); scripts
+    without spaces, such as Chinese, match anywhere.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Build the dictionary.
+
+        Args:
+            names: Entity names (normalized before insertion)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, str]]] = [[]]
+        self._size = 0
+        for name in names:
+            self._insert(normalize_entity_name(name))
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _insert(self, key: str) -> None:
+        if not key:
+            return
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        if not any(existing == key for _, existing in self._outputs[state]):
+            self._outputs[state].append((len(key), key))
+            self._size += 1
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find every dictionary entity occurring in a text.
+
+        Args:
+            text: Text to scan; it is normalized like the dictionary names
+
+        Returns:
+            List of (start, end, name_key) over the normalized text, possibly overlapping
+        """
+        text = normalize_entity_name(text)
+        matches = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, key in self._outputs[state]:
+                start, end = i - length + 1, i + 1
+                if _is_word_char(text[start]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(text[i]) and end < len(text) and _is_word_char(text[end]):
+                    continue
+                matches.append((start, end, key))
+        return matches
+
+    def link(self, text: str, limit: int = 10) -> List[str]:
+        """
+        Link a text to dictionary entities.
+
+        Overlapping matches are resolved leftmost-longest, so "New York
+        Times" yields one entity rather than "new york" and "times".
+
+        Args:
+            text: Query or passage text
+            limit: Maximum number of entities to return
+
+        Returns:
+            Normalized entity names in order of appearance, without duplicates
+        """
+        selected = []
+        seen = set()
+        position = 0
+        for start, end, key in sorted(self.find_all(text), key=lambda m: (m[0], -(m[1] - m[0]))):
+            if start < position:
+                continue
+            position = end
+            if key not in seen:
+                seen.add(key)
+                selected.append(key)
+                if len(selected) >= limit:
+                    break
+        return selected
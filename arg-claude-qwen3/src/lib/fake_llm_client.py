@@ -0,0 +1,75 @@
+"""
+Deterministic offline stand-in for the Qwen LLM client.
+"""
+
+import json
+import re
+import threading
+from typing import Dict, List
+
+_CHUNK_BLOCK = re.compile(r'<chunk id="([^"]+)">\n(.*?)\n</chunk>', re.DOTALL)
+_CAPITALIZED_PHRASE = re.compile(r"\b[A-Z][\w&.-]*(?:\s+[A-Z][\w&.-]*)*")
+
+
+class FakeLLMClient:
+    """LLM client answering knowledge graph extraction prompts without a network.
+
+    Batched extraction prompts get every capitalized phrase of a chunk as an
+    entity, with a "related_to" relationship between consecutive entities;
+    any other prompt gets an empty JSON array. Answers depend only on the
+    prompt, and every call is counted, so the client can be used to test
+    extraction offline and to measure how many calls a document costs.
+    """
+
+    model = "fake"
+
+    def __init__(self):
+        """Initialize the FakeLLMClient."""
+        self.calls = 0
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+
+    def generate_completion(self, prompt: str, **kwargs) -> str:
+        """
+        Answer a prompt deterministically.
+
+        Args:
+            prompt: Input prompt
+            **kwargs: Ignored API parameters
+
+        Returns:
+            JSON text
+        """
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+
+        blocks = _CHUNK_BLOCK.findall(prompt)
+        if not blocks:
+            return "[]"
+        return json.dumps({"chunks": [self._extract(label, text) for label, text in blocks]})
+
+    def generate_chat_completion(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """
+        Answer the last message of a conversation deterministically.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            **kwargs: Ignored API parameters
+
+        Returns:
+            JSON text
+        """
+        return self.generate_completion(messages[-1]["content"] if messages else "", **kwargs)
+
+    @staticmethod
+    def _extract(label: str, text: str) -> dict:
+        names = list(dict.fromkeys(match.strip(" .") for match in _CAPITALIZED_PHRASE.findall(text)))
+        return {
+            "chunk": label,
+            "entities": [{"name": name, "type": "other", "description": ""} for name in names],
+            "relationships": [
+                {"source": source, "target": target, "type": "related_to", "description": ""}
+                for source, target in zip(names, names[1:])
+            ],
+        }
@@ -1,41 +1,544 @@
 """
 Monitoring and metrics collection for the RAG backend system.
+
+Metrics live in a MetricsRegistry of preallocated families (counters, gauges
+and fixed-bucket histograms). Each family caps the number of label
+combinations it tracks, so per-session or per-document labels cannot grow
+memory without bound. Counters and histograms are incremented in per-thread
+cells, so the hot path takes no lock; readers sum the cells. System metrics
+are sampled by a background thread instead of on every call, and the whole
+registry can be exported in the Prometheus text format.
 """
 
 import logging
+import math
+import os
+import threading
 import time
 import functools
-from typing import Any, Callable, Optional
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from contextlib import contextmanager
 import psutil
-import os
+from src.lib.config import config
+
+# Upper bounds (seconds) of the default latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Upper bounds of histogram buckets for sizes and counts
+DEFAULT_SIZE_BUCKETS = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 100000, 1000000, 10000000
+)
+
+# Label value used for every label combination beyond a family's cap
+OVERFLOW_LABEL = "__overflow__"
+
+_get_ident = threading.get_ident
+
+
+class Counter:
+    """Monotonically increasing value, incremented without locking."""
+
+    __slots__ = ("_cells", "_lock")
+
+    def __init__(self):
+        self._cells: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1.0) -> None:
+        """Add value to the counter."""
+        cell = self._cells.get(_get_ident())
+        if cell is None:
+            cell = self._new_cell()
+        # Only the owning thread writes to its cell
+        cell[0] += value
+
+    def _new_cell(self) -> List[float]:
+        with self._lock:
+            cell = self._cells.setdefault(_get_ident(), [0.0])
+        return cell
+
+    @property
+    def value(self) -> float:
+        """Current total over all threads."""
+        return sum(cell[0] for cell in list(self._cells.values()))
+
+
+class Gauge:
+    """Value that is set to the latest observation."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the gauge to value."""
+        self.value = value
+
+
+class Histogram:
+    """Distribution of observations over fixed buckets, incremented without locking.
+
+    Percentiles are estimated by linear interpolation inside the bucket that
+    contains the requested rank, so their accuracy depends on the bucket bounds.
+    """
+
+    __slots__ = ("bounds", "_cells", "_lock")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self._cells: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        cell = self._cells.get(_get_ident())
+        if cell is None:
+            cell = self._new_cell()
+        # Layout: one count per bound, one for +Inf, then the running sum
+        cell[bisect_left(self.bounds, value)] += 1
+        cell[-1] += value
+
+    def _new_cell(self) -> List[float]:
+        with self._lock:
+            cell = self._cells.setdefault(_get_ident(), [0] * (len(self.bounds) + 1) + [0.0])
+        return cell
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """Get per-bucket counts (the last one is +Inf) and the sum of observations."""
+        counts = [0] * (len(self.bounds) + 1)
+        total = 0.0
+        for cell in list(self._cells.values()):
+            for i in range(len(counts)):
+                counts[i] += cell[i]
+            total += cell[-1]
+        return counts, total
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return sum(self.snapshot()[0])
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile of the observations.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None if nothing has been observed
+        """
+        counts, _ = self.snapshot()
+        return _bucket_quantile(self.bounds, counts, q)
+
+    def percentiles(self) -> Dict[str, Optional[float]]:
+        """Get the estimated p50, p95 and p99."""
+        counts, _ = self.snapshot()
+        return {
+            "p50": _bucket_quantile(self.bounds, counts, 0.50),
+            "p95": _bucket_quantile(self.bounds, counts, 0.95),
+            "p99": _bucket_quantile(self.bounds, counts, 0.99),
+        }
+
+
+def _bucket_quantile(bounds: Sequence[float], counts: Sequence[int], q: float) -> Optional[float]:
+    """Interpolate a quantile from cumulative bucket counts."""
+    total = sum(counts)
+    if total == 0:
+        return None
+    rank = q * total
+    cumulative = 0
+    for i, count in enumerate(counts):
+        if count and cumulative + count >= rank:
+            if i == len(bounds):
+                # Observations above the largest bound cannot be located further
+                return bounds[-1] if bounds else None
+            lower = bounds[i - 1] if i > 0 else min(0.0, bounds[0])
+            return lower + (bounds[i] - lower) * (rank - cumulative) / count
+        cumulative += count
+    return bounds[-1] if bounds else None
+
+
+class MetricFamily:
+    """A named metric with a fixed set of label names.
+
+    Children (one per label combination) are created on first use and kept
+    for the life of the process, so callers should hold on to them. Once
+    max_series children exist, further combinations share a single overflow
+    child whose label values are all OVERFLOW_LABEL.
+    """
+
+    def __init__(self, name: str, documentation: str, kind: str,
+                 labelnames: Sequence[str] = (), max_series: Optional[int] = None,
+                 buckets: Optional[Sequence[float]] = None):
+        """
+        Initialize a metric family.
+
+        Args:
+            name: Metric name, as exported
+            documentation: Help text
+            kind: One of "counter", "gauge" or "histogram"
+            labelnames: Names of the labels
+            max_series: Maximum number of label combinations (defaults to METRICS_MAX_SERIES)
+            buckets: Histogram bucket upper bounds (defaults to DEFAULT_LATENCY_BUCKETS)
+        """
+        if kind not in ("counter", "gauge", "histogram"):
+            raise ValueError(f"Unknown metric kind: {kind}")
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series or config.metrics_max_series
+        self.buckets = tuple(sorted(buckets or DEFAULT_LATENCY_BUCKETS))
+        self.overflowed = 0
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        self._unlabeled = None if self.labelnames else self._create()
+
+    def _create(self):
+        if self.kind == "counter":
+            return Counter()
+        if self.kind == "gauge":
+            return Gauge()
+        return Histogram(self.buckets)
+
+    def labels(self, *values: Any):
+        """
+        Get the child for a label combination.
+
+        Args:
+            values: One value per label name, in order
+
+        Returns:
+            Counter, Gauge or Histogram for the combination
+        """
+        if self._unlabeled is not None and not values:
+            return self._unlabeled
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is not None:
+            return child
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                if len(self._children) >= self.max_series:
+                    self.overflowed += 1
+                    key = (OVERFLOW_LABEL,) * len(self.labelnames)
+                    child = self._children.get(key)
+                if child is None:
+                    child = self._create()
+                    self._children[key] = child
+        return child
+
+    def _only(self):
+        if self._unlabeled is None:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use labels()")
+        return self._unlabeled
+
+    def inc(self, value: float = 1.0) -> None:
+        """Increment an unlabeled counter."""
+        self._only().inc(value)
+
+    def set(self, value: float) -> None:
+        """Set an unlabeled gauge."""
+        self._only().set(value)
+
+    def observe(self, value: float) -> None:
+        """Record an observation in an unlabeled histogram."""
+        self._only().observe(value)
+
+    def series(self) -> List[Tuple[Dict[str, str], Any]]:
+        """Get (labels, child) pairs for every tracked label combination."""
+        if self._unlabeled is not None:
+            return [({}, self._unlabeled)]
+        return [
+            (dict(zip(self.labelnames, key)), child)
+            for key, child in list(self._children.items())
+        ]
+
+
+class MetricsRegistry:
+    """Registry of metric families with Prometheus text export."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, documentation: str, kind: str, labelnames: Sequence[str],
+                  max_series: Optional[int], buckets: Optional[Sequence[float]]) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = MetricFamily(name, documentation, kind, labelnames, max_series, buckets)
+                self._families[name] = family
+            elif family.kind != kind or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a different {family.kind}")
+            return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                max_series: Optional[int] = None) -> MetricFamily:
+        """Get or create a counter family."""
+        return self._register(name, documentation, "counter", labelnames, max_series, None)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              max_series: Optional[int] = None) -> MetricFamily:
+        """Get or create a gauge family."""
+        return self._register(name, documentation, "gauge", labelnames, max_series, None)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  max_series: Optional[int] = None,
+                  buckets: Optional[Sequence[float]] = None) -> MetricFamily:
+        """Get or create a histogram family."""
+        return self._register(name, documentation, "histogram", labelnames, max_series, buckets)
+
+    def get(self, name: str) -> Optional[MetricFamily]:
+        """Get a registered family by name."""
+        return self._families.get(name)
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text, ending with a newline
+        """
+        lines: List[str] = []
+        for family in sorted(self._families.values(), key=lambda f: f.name):
+            lines.append(f"# HELP {family.name} {_escape_help(family.documentation)}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for labels, child in family.series():
+                if family.kind == "histogram":
+                    counts, total = child.snapshot()
+                    cumulative = 0
+                    for bound, count in zip(family.buckets + (math.inf,), counts):
+                        cumulative += count
+                        bucket_labels = dict(labels, le=_format_value(bound))
+                        lines.append(f"{family.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                    lines.append(f"{family.name}_sum{_format_labels(labels)} {_format_value(total)}")
+                    lines.append(f"{family.name}_count{_format_labels(labels)} {cumulative}")
+                else:
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(child.value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Atomically write the Prometheus exposition to a file.
+
+        The file can be picked up by the node exporter's textfile collector.
+
+        Args:
+            path: Destination file path
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(temporary, path)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+class SystemMetricsSampler:
+    """Background thread that samples process and system metrics into gauges."""
+
+    def __init__(self, registry: MetricsRegistry, interval: Optional[float] = None):
+        """
+        Initialize the sampler.
+
+        Args:
+            registry: Registry to record gauges in
+            interval: Seconds between samples (defaults to METRICS_SAMPLE_INTERVAL)
+        """
+        self.interval = interval or config.metrics_sample_interval
+        self.process = psutil.Process(os.getpid())
+        self.latest: Dict[str, float] = {}
+        self._gauges = {
+            "cpu_percent": registry.gauge("system_cpu_percent", "System-wide CPU utilization in percent"),
+            "process_cpu_percent": registry.gauge("process_cpu_percent", "Process CPU utilization in percent"),
+            "memory_percent": registry.gauge("process_memory_percent", "Process resident memory in percent of total"),
+            "memory_rss": registry.gauge("process_resident_memory_bytes", "Process resident memory in bytes"),
+            "num_threads": registry.gauge("process_threads", "Number of process threads"),
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> Dict[str, float]:
+        """Take one sample, update the gauges and return it."""
+        with self.process.oneshot():
+            values = {
+                "cpu_percent": psutil.cpu_percent(),
+                "process_cpu_percent": self.process.cpu_percent(),
+                "memory_percent": self.process.memory_percent(),
+                "memory_rss": self.process.memory_info().rss,
+                "num_threads": self.process.num_threads(),
+            }
+        for name, value in values.items():
+            self._gauges[name].set(value)
+        self.latest = values
+        return values
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampling thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.sample()
+            except psutil.Error:
+                pass
+            if self._stop.wait(self.interval):
+                return
 
 
 class MetricsCollector:
     """Collects and logs performance metrics."""
 
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, registry: Optional[MetricsRegistry] = None,
+                 max_metrics: Optional[int] = None):
+        """
+        Initialize the metrics collector.
+
+        Args:
+            logger: Logger for metric messages
+            registry: Registry to record metrics in (a new one if omitted)
+            max_metrics: Maximum number of named counters and gauges kept in
+                the metrics dict (defaults to METRICS_MAX_SERIES)
+        """
         self.logger = logger
+        self.registry = registry or MetricsRegistry()
         self.metrics = {}
+        self.max_metrics = max_metrics or config.metrics_max_series
+        self.dropped_metrics = 0
+        self.sampler: Optional[SystemMetricsSampler] = None
+
+        # Preallocated families used by the logging helpers below
+        self.events = self.registry.counter("rag_events_total", "Named events", ["event"])
+        self.durations = self.registry.histogram(
+            "rag_operation_duration_seconds", "Duration of timed operations", ["operation"]
+        )
+        self.search_results = self.registry.histogram(
+            "rag_search_results", "Results returned per search query", buckets=DEFAULT_SIZE_BUCKETS
+        )
+        self.document_size = self.registry.histogram(
+            "rag_document_size_bytes", "Size of processed documents", ["operation"],
+            buckets=DEFAULT_SIZE_BUCKETS
+        )
+        self.chat_message_length = self.registry.histogram(
+            "rag_chat_message_chars", "Length of chat messages", buckets=DEFAULT_SIZE_BUCKETS
+        )
+        self.chat_response_length = self.registry.histogram(
+            "rag_chat_response_chars", "Length of chat responses", buckets=DEFAULT_SIZE_BUCKETS
+        )
+
+    def _has_room(self, name: str) -> bool:
+        """Check whether name may be stored in the bounded metrics dict."""
+        if name in self.metrics or len(self.metrics) < self.max_metrics:
+            return True
+        self.dropped_metrics += 1
+        if self.dropped_metrics == 1:
+            self.logger.warning(f"Metric limit of {self.max_metrics} reached; dropping new metric names")
+        return False
 
     def increment_counter(self, name: str, value: int = 1) -> None:
         """Increment a counter metric."""
-        if name not in self.metrics:
-            self.metrics[name] = 0
-        self.metrics[name] += value
-        self.logger.debug(f"Counter {name}: {self.metrics[name]}")
+        self.events.labels(name).inc(value)
+        if self._has_room(name):
+            self.metrics[name] = self.metrics.get(name, 0) + value
+            self.logger.debug(f"Counter {name}: {self.metrics[name]}")
 
     def gauge(self, name: str, value: float) -> None:
         """Set a gauge metric."""
-        self.metrics[name] = value
-        self.logger.debug(f"Gauge {name}: {value}")
+        if self._has_room(name):
+            self.metrics[name] = value
+            self.logger.debug(f"Gauge {name}: {value}")
 
     def timer(self, name: str, duration: float) -> None:
         """Record a timer metric."""
+        self.durations.labels(name).observe(duration)
         self.logger.info(f"Timer {name}: {duration:.4f}s")
 
+    def percentiles(self, name: str) -> Dict[str, Optional[float]]:
+        """
+        Get p50/p95/p99 of a timer.
+
+        Args:
+            name: Timer name
+
+        Returns:
+            Dictionary with p50, p95 and p99 in seconds (None if never recorded)
+        """
+        return self.durations.labels(name).percentiles()
+
+    def start_sampler(self, interval: Optional[float] = None) -> SystemMetricsSampler:
+        """
+        Start sampling system metrics in the background.
+
+        Args:
+            interval: Seconds between samples (defaults to METRICS_SAMPLE_INTERVAL)
+
+        Returns:
+            The running sampler
+        """
+        if self.sampler is None:
+            self.sampler = SystemMetricsSampler(self.registry, interval)
+        self.sampler.start()
+        return self.sampler
+
+    def stop_sampler(self) -> None:
+        """Stop the background sampler if it is running."""
+        if self.sampler is not None:
+            self.sampler.stop()
+
     def get_system_metrics(self) -> dict:
-        """Get system-level metrics."""
+        """Get system-level metrics, from the background sampler when it is running."""
+        if self.sampler is not None and self.sampler.running and self.sampler.latest:
+            return dict(self.sampler.latest)
         process = psutil.Process(os.getpid())
         return {
             "cpu_percent": psutil.cpu_percent(),
@@ -44,6 +547,26 @@ class MetricsCollector:
             "num_threads": process.num_threads()
         }
 
+    def render_prometheus(self) -> str:
+        """Render the collector's registry in the Prometheus text format."""
+        return self.registry.render_prometheus()
+
+    def export_prometheus(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Write the registry's Prometheus exposition to a file.
+
+        Args:
+            path: Destination file (defaults to METRICS_EXPORT_PATH)
+
+        Returns:
+            The path written, or None if no path is configured
+        """
+        path = path or config.metrics_export_path
+        if not path:
+            return None
+        self.registry.write_textfile(path)
+        return path
+
 
 # Global metrics collector instance
 _metrics_collector: Optional[MetricsCollector] = None
@@ -75,35 +598,29 @@ def log_function_call(logger: logging.Logger):
         logger: Logger to use for logging
     """
     def decorator(func: Callable) -> Callable:
+        func_name = f"{func.__module__}.{func.__name__}"
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            func_name = f"{func.__module__}.{func.__name__}"
             logger.info(f"Calling function: {func_name}")
 
             # Get metrics collector
             metrics_collector = get_metrics_collector(logger)
 
-            # Record start time and system metrics
-            start_time = time.time()
-            start_metrics = metrics_collector.get_system_metrics()
+            # Record start time
+            start_time = time.perf_counter()
 
             try:
                 # Call the function
                 result = func(*args, **kwargs)
 
                 # Calculate duration
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 metrics_collector.timer(f"{func_name}.duration", duration)
 
                 # Log success
                 logger.info(f"Function {func_name} completed successfully in {duration:.4f}s")
 
-                # Record end system metrics
-                end_metrics = metrics_collector.get_system_metrics()
-                logger.debug(f"System metrics for {func_name}: "
-                           f"CPU: {start_metrics['cpu_percent']:.1f}% -> {end_metrics['cpu_percent']:.1f}%, "
-                           f"Memory: {start_metrics['memory_percent']:.1f}% -> {end_metrics['memory_percent']:.1f}%")
-
                 # Increment success counter
                 metrics_collector.increment_counter(f"{func_name}.success")
 
@@ -111,7 +628,7 @@ def log_function_call(logger: logging.Logger):
 
             except Exception as e:
                 # Calculate duration even for failed calls
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 metrics_collector.timer(f"{func_name}.duration", duration)
 
                 # Log error
@@ -142,14 +659,14 @@ def log_execution_block(logger: logging.Logger, block_name: str):
     metrics_collector = get_metrics_collector(logger)
 
     # Record start time
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     try:
         # Yield control to the code block
         yield
 
         # Calculate duration
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         metrics_collector.timer(f"{block_name}.duration", duration)
 
         # Log success
@@ -160,7 +677,7 @@ def log_execution_block(logger: logging.Logger, block_name: str):
 
     except Exception as e:
         # Calculate duration even for failed blocks
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         metrics_collector.timer(f"{block_name}.duration", duration)
 
         # Log error
@@ -189,7 +706,7 @@ def log_document_processing(logger: logging.Logger, document_id: str,
     # Log the operation
     if size is not None:
         logger.info(f"Processing document {document_id}: {operation} ({size} bytes)")
-        metrics_collector.gauge(f"document.{document_id}.size", size)
+        metrics_collector.document_size.labels(operation).observe(size)
     else:
         logger.info(f"Processing document {document_id}: {operation}")
 
@@ -214,7 +731,7 @@ def log_search_query(logger: logging.Logger, query: str, results_count: int):
 
     # Increment search counter and record results
     metrics_collector.increment_counter("search.query")
-    metrics_collector.gauge("search.results_count", results_count)
+    metrics_collector.search_results.observe(results_count)
 
 
 def log_chat_interaction(logger: logging.Logger, session_id: str,
@@ -234,7 +751,7 @@ def log_chat_interaction(logger: logging.Logger, session_id: str,
     logger.info(f"Chat interaction in session {session_id}: "
                f"message ({message_length} chars) -> response ({response_length} chars)")
 
-    # Record metrics
+    # Record metrics; lengths are aggregated across sessions to keep cardinality bounded
     metrics_collector.increment_counter("chat.interaction")
-    metrics_collector.gauge(f"chat.session.{session_id}.message_length", message_length)
-    metrics_collector.gauge(f"chat.session.{session_id}.response_length", response_length)
\ No newline at end of file
+    metrics_collector.chat_message_length.observe(message_length)
+    metrics_collector.chat_response_length.observe(response_length)
@@ -0,0 +1,279 @@
+"""
+Staged processing pipeline and checkpoint storage for the RAG backend system.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class StageStats:
+    """Progress and throughput counters of one pipeline stage."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.units = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.first_start: Optional[float] = None
+        self.last_finish: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, start: float, finish: float, units: int, failed: bool) -> None:
+        """Record one processed item."""
+        with self._lock:
+            self.items += 1
+            self.units += units
+            self.errors += failed
+            self.busy_seconds += finish - start
+            if self.first_start is None or start < self.first_start:
+                self.first_start = start
+            if self.last_finish is None or finish > self.last_finish:
+                self.last_finish = finish
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the stage.
+
+        Returns:
+            Dictionary with item, unit and error counts, the active time,
+            throughput in units per second and worker utilization
+        """
+        with self._lock:
+            active = (self.last_finish - self.first_start) if self.first_start is not None else 0.0
+            return {
+                "stage": self.name,
+                "workers": self.workers,
+                "items": self.items,
+                "units": self.units,
+                "errors": self.errors,
+                "active_seconds": active,
+                "throughput": self.units / active if active > 0 else None,
+                "utilization": self.busy_seconds / (active * self.workers) if active > 0 else None,
+            }
+
+
+class Stage:
+    """A pipeline step run by its own pool of worker threads.
+
+    The function receives one item and returns the items to pass to the next
+    stage, so a stage can drop, transform or split its input.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Iterable[Any]], workers: int = 1,
+                 units: Optional[Callable[[Any], int]] = None):
+        """
+        Initialize a Stage.
+
+        Args:
+            name: Stage name used in reports
+            func: Function returning the output items for an input item
+            workers: Number of worker threads
+            units: Function giving the amount of work in an item, for
+                throughput (defaults to one unit per item)
+        """
+        if workers < 1:
+            raise ValueError(f"Stage {name} needs at least one worker")
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.units = units or (lambda item: 1)
+
+
+class StagedPipeline:
+    """Runs items through stages connected by bounded queues.
+
+    Every stage works concurrently with the others, so a slow stage (such
+    as API calls) is kept busy while earlier stages prepare more work, and
+    the bounded queues keep fast stages from running ahead and holding
+    everything in memory. An item whose stage function raises is passed to
+    on_error and dropped; the other items carry on.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 8,
+                 on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+                 progress_interval: Optional[float] = None):
+        """
+        Initialize a StagedPipeline.
+
+        Args:
+            stages: Stages in processing order
+            queue_size: Capacity of the queue in front of each stage
+            on_error: Called with (stage name, item, exception) when a stage fails
+            progress_interval: Seconds between progress log lines (None disables them)
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.progress_interval = progress_interval
+        self.stats = [StageStats(stage.name, stage.workers) for stage in stages]
+        self.elapsed = 0.0
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """
+        Process items through every stage.
+
+        Args:
+            items: Input items of the first stage
+
+        Returns:
+            Output items of the last stage, in completion order
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: List[Any] = []
+        remaining = [stage.workers for stage in self.stages]
+        remaining_lock = threading.Lock()
+        threads = []
+
+        def work(index: int) -> None:
+            stage, stats = self.stages[index], self.stats[index]
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                start = time.perf_counter()
+                failed = False
+                try:
+                    outputs = list(stage.func(item))
+                except Exception as e:
+                    failed, outputs = True, []
+                    logger.error(f"Pipeline stage {stage.name} failed: {e}")
+                    if self.on_error is not None:
+                        self.on_error(stage.name, item, e)
+                stats.record(start, time.perf_counter(), stage.units(item), failed)
+                for output in outputs:
+                    if outbox is None:
+                        results.append(output)
+                    else:
+                        outbox.put(output)
+            with remaining_lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0
+            # The last worker to finish closes the next stage's input
+            if last and outbox is not None:
+                for _ in range(self.stages[index + 1].workers):
+                    outbox.put(_DONE)
+
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(target=work, args=(index,), daemon=True,
+                                          name=f"pipeline-{stage.name}-{n}")
+                thread.start()
+                threads.append(thread)
+
+        started = time.perf_counter()
+        for item in items:
+            queues[0].put(item)
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(self.progress_interval)
+                if thread.is_alive() and self.progress_interval:
+                    self.log_progress()
+        self.elapsed = time.perf_counter() - started
+        return results
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get per-stage progress and throughput.
+
+        Returns:
+            Dictionary with the elapsed time and a summary of each stage
+        """
+        return {
+            "elapsed_seconds": self.elapsed,
+            "stages": [stats.to_dict() for stats in self.stats],
+        }
+
+    def log_progress(self) -> None:
+        """Log the progress of every stage."""
+        for summary in self.report()["stages"]:
+            throughput = summary["throughput"]
+            utilization = summary["utilization"]
+            logger.info(
+                f"Stage {summary['stage']}: {summary['items']} items, {summary['units']} units, "
+                f"{summary['errors']} errors"
+                + (f", {throughput:.1f} units/s" if throughput is not None else "")
+                + (f", {utilization:.0%} busy" if utilization is not None else "")
+            )
+
+
+class CheckpointStore:
+    """A small JSON map persisted after every update.
+
+    Writes go to a temporary file that replaces the checkpoint, so an
+    interrupted process leaves either the previous or the new state.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a CheckpointStore, loading existing entries.
+
+        Args:
+            path: Path of the checkpoint file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+                logger.info(f"Resuming from checkpoint {self.path} with {len(self._entries)} entries")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a checkpoint entry.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            A copy of the entry, or None if there is none
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry) if entry is not None else None
+
+    def update(self, key: str, **values: Any) -> None:
+        """
+        Update an entry and persist the checkpoint.
+
+        Args:
+            key: Entry key
+            **values: Fields to set on the entry
+        """
+        with self._lock:
+            self._entries.setdefault(key, {}).update(values)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_name(self.path.name + ".tmp")
+            temporary.write_text(json.dumps(self._entries), encoding="utf-8")
+            os.replace(temporary, self.path)
+
+    def remove(self) -> None:
+        """Delete the checkpoint file."""
+        with self._lock:
+            self._entries = {}
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,282 @@
+"""
+Two-tier cache of hybrid search results.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from src.lib.cache import TTLCache
+from src.lib.config import get_config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_results (
+    key TEXT PRIMARY KEY,
+    collection_name TEXT NOT NULL,
+    results TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS query_results_collection ON query_results (collection_name);
+CREATE TABLE IF NOT EXISTS corpus_versions (
+    collection_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different spellings share cache entries.
+
+    Unicode compatibility forms are folded, case is folded, whitespace runs
+    are collapsed and trailing sentence punctuation is dropped.
+
+    Args:
+        query: Query text
+
+    Returns:
+        Normalized query text
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    return _WHITESPACE.sub(" ", text).strip().rstrip("?!.").rstrip()
+
+
+class QueryResultCache:
+    """Caches final hybrid search results per query, options and corpus version.
+
+    Lookups go to an in-process LRU first and then, when db_path is set, to
+    a SQLite file shared across restarts and processes. Keys include the
+    collection's corpus version, which indexing bumps whenever it writes
+    chunks, so results computed before a write are never served after it.
+    With the SQLite tier the versions live in the same file, so an indexing
+    run in another process invalidates this one's entries as well; without
+    it, cross-process staleness is bounded by the time to live.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, db_path: Optional[str] = None):
+        """
+        Initialize a QueryResultCache.
+
+        Args:
+            max_entries: Most results kept in memory (0 disables the cache)
+            ttl: Seconds a result stays valid
+            db_path: SQLite file of the on-disk tier (optional)
+        """
+        self.enabled = max_entries > 0
+        self.ttl = ttl
+        self.db_path = db_path or None
+        self.memory = TTLCache(max_entries, ttl)
+        self._versions: Dict[str, int] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls) -> "QueryResultCache":
+        """
+        Create a cache from QUERY_CACHE_* settings.
+
+        Returns:
+            QueryResultCache instance
+        """
+        config = get_config()
+        return cls(config.query_cache_size, config.query_cache_ttl, config.query_cache_db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            logger.info(f"Opened query result cache {self.db_path}")
+        return self._connection
+
+    def corpus_version(self, collection_name: str) -> int:
+        """
+        Get the corpus version of a collection.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            Version number, 0 until the collection is first written
+        """
+        if not self.db_path:
+            with self._lock:
+                return self._versions.get(collection_name, 0)
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT version FROM corpus_versions WHERE collection_name = ?", (collection_name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def bump_version(self, collection_name: str) -> int:
+        """
+        Invalidate a collection's cached results.
+
+        Args:
+            collection_name: Name of the collection whose content changed
+
+        Returns:
+            The new version number
+        """
+        with self._lock:
+            if not self.db_path:
+                version = self._versions.get(collection_name, 0) + 1
+                self._versions[collection_name] = version
+                return version
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT INTO corpus_versions (collection_name, version) VALUES (?, 1) "
+                    "ON CONFLICT(collection_name) DO UPDATE SET version = version + 1",
+                    (collection_name,)
+                )
+                # Entries of older versions can never be looked up again
+                connection.execute("DELETE FROM query_results WHERE collection_name = ?", (collection_name,))
+                return connection.execute(
+                    "SELECT version FROM corpus_versions WHERE collection_name = ?", (collection_name,)
+                ).fetchone()[0]
+
+    def make_key(self, query: str, collection_name: str, options: Dict[str, Any]) -> str:
+        """
+        Build the cache key of a search.
+
+        Args:
+            query: Query text
+            collection_name: Name of the collection searched
+            options: Search options that change the results
+
+        Returns:
+            Hex digest of the normalized query, collection, options and corpus version
+        """
+        material = json.dumps(
+            [normalize_query(query), collection_name, options, self.corpus_version(collection_name)],
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Tuple[str, float]]]:
+        """
+        Get cached results.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            List of (chunk_id, score) tuples, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        results = self.memory.get(key)
+        if results is not None:
+            return results
+
+        if self.db_path:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT results, expires_at FROM query_results WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+            if row:
+                results = [(chunk_id, score) for chunk_id, score in json.loads(row[0])]
+                # Promote with the time the entry has left
+                self.memory.put(key, results, ttl=row[1] - time.time())
+                with self._lock:
+                    self.disk_hits += 1
+                return results
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, collection_name: str, results: List[Tuple[str, float]]) -> None:
+        """
+        Store results.
+
+        Args:
+            key: Key from make_key
+            collection_name: Name of the collection searched
+            results: List of (chunk_id, score) tuples
+        """
+        if not self.enabled:
+            return
+        results = list(results)
+        self.memory.put(key, results)
+        if self.db_path:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO query_results (key, collection_name, results, expires_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, collection_name, json.dumps(results), time.time() + self.ttl)
+                    )
+
+    def clear(self) -> None:
+        """Remove every cached result; corpus versions are kept."""
+        self.memory.clear()
+        if self.db_path:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute("DELETE FROM query_results")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit ratios per tier.
+
+        Returns:
+            Dictionary with lookup, hit and miss counts, the overall hit
+            ratio, and the memory and disk tiers' shares of lookups
+        """
+        memory = self.memory.get_stats()
+        with self._lock:
+            hits = memory["hits"] + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "lookups": lookups,
+                "hits": hits,
+                "misses": self.misses,
+                "hit_ratio": hits / lookups if lookups else None,
+                "memory_hits": memory["hits"],
+                "memory_hit_ratio": memory["hits"] / lookups if lookups else None,
+                "disk_hits": self.disk_hits,
+                "disk_hit_ratio": self.disk_hits / lookups if lookups else None,
+                "memory_entries": memory["entries"],
+            }
+
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# Global query result cache instance
+query_cache = QueryResultCache.from_config()
+
+
+def get_query_cache() -> QueryResultCache:
+    """
+    Get the global query result cache instance.
+
+    Returns:
+        QueryResultCache instance
+    """
+    return query_cache
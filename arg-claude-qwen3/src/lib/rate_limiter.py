@@ -1,13 +1,29 @@
 """
 Rate limiting utilities for the RAG backend system.
+
+Limiters never poll. A caller that has to wait reserves its slot while
+holding the limiter's lock, computes the exact delay until that slot and
+sleeps once (time.sleep for threads, asyncio.sleep for coroutines).
+Reservations are handed out in arrival order, so waiters do not wake up
+together and race for the same capacity.
 """
 
-import time
+import asyncio
+import functools
+import inspect
+import math
 import threading
-from typing import Dict, Optional
-from collections import defaultdict
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional
 from src.lib.exceptions import RAGBaseException
 
+# Number of independently locked key shards per sliding window limiter
+DEFAULT_SHARDS = 16
+
+# Idle keys examined for eviction per sliding window request
+EVICTIONS_PER_CALL = 2
+
 
 class RateLimitExceededError(RAGBaseException):
     """Raised when rate limit is exceeded."""
@@ -22,32 +38,82 @@ class TokenBucketRateLimiter:
 
     This rate limiter uses the token bucket algorithm to control the rate of requests.
     Tokens are added to the bucket at a fixed rate, and each request consumes one token.
-    If there are no tokens available, the request is rejected.
+    If there are no tokens available, the request is rejected, or a waiter reserves
+    the tokens ahead of time (the balance goes negative) and sleeps until they have
+    been refilled.
     """
 
-    def __init__(self, capacity: int, refill_rate: float):
+    def __init__(self, capacity: int, refill_rate: float,
+                 clock: Callable[[], float] = time.time):
         """
         Initialize the token bucket rate limiter.
 
         Args:
             capacity: Maximum number of tokens in the bucket
             refill_rate: Number of tokens added per second
+            clock: Time source in seconds
         """
         self.capacity = capacity
         self.refill_rate = refill_rate
+        self.clock = clock
         self.tokens = capacity
-        self.last_refill = time.time()
+        self.last_refill = clock()
         self.lock = threading.Lock()
 
     def _refill_tokens(self) -> None:
         """Refill tokens based on elapsed time."""
-        now = time.time()
+        now = self.clock()
         elapsed = now - self.last_refill
         if elapsed > 0:
             new_tokens = elapsed * self.refill_rate
             self.tokens = min(self.capacity, self.tokens + new_tokens)
             self.last_refill = now
 
+    def _reserve(self, tokens: int, max_wait: float) -> Optional[float]:
+        """
+        Take tokens now if they will be available within max_wait seconds.
+
+        Returns:
+            Seconds until the reserved tokens are covered, or None if that is
+            longer than max_wait (nothing is taken)
+        """
+        with self.lock:
+            self._refill_tokens()
+            deficit = tokens - self.tokens
+            if deficit <= 0:
+                delay = 0.0
+            elif self.refill_rate > 0:
+                delay = deficit / self.refill_rate
+            else:
+                delay = math.inf
+            if delay > max_wait:
+                return None
+            self.tokens -= tokens
+            return delay
+
+    def _release(self, tokens: int) -> None:
+        """Return tokens reserved by a waiter that gave up."""
+        with self.lock:
+            self._refill_tokens()
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
+    def time_until_available(self, tokens: int = 1) -> float:
+        """
+        Get the number of seconds until tokens could be consumed.
+
+        Args:
+            tokens: Number of tokens to consume
+
+        Returns:
+            Seconds to wait (0.0 if the tokens are available now)
+        """
+        with self.lock:
+            self._refill_tokens()
+            deficit = tokens - self.tokens
+            if deficit <= 0:
+                return 0.0
+            return deficit / self.refill_rate if self.refill_rate > 0 else math.inf
+
     def consume(self, tokens: int = 1) -> bool:
         """
         Consume tokens from the bucket.
@@ -58,17 +124,15 @@ class TokenBucketRateLimiter:
         Returns:
             True if tokens were consumed, False if rate limit would be exceeded
         """
-        with self.lock:
-            self._refill_tokens()
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return True
-            return False
+        return self._reserve(tokens, 0.0) is not None
 
     def wait_and_consume(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
         """
         Wait for tokens to become available and then consume them.
 
+        Returns immediately with False if the tokens cannot be refilled within
+        the timeout; otherwise sleeps exactly until they are.
+
         Args:
             tokens: Number of tokens to consume
             timeout: Maximum time to wait in seconds (None for no timeout)
@@ -76,16 +140,46 @@ class TokenBucketRateLimiter:
         Returns:
             True if tokens were consumed, False if timeout was reached
         """
-        start_time = time.time()
-        while True:
-            if self.consume(tokens):
-                return True
+        delay = self._reserve(tokens, math.inf if timeout is None else timeout)
+        if delay is None:
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
 
-            if timeout is not None and (time.time() - start_time) >= timeout:
-                return False
+    async def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Asynchronously wait for tokens to become available and consume them.
 
-            # Sleep briefly to avoid busy waiting
-            time.sleep(0.01)
+        Cancelling the waiting coroutine returns its reserved tokens.
+
+        Args:
+            tokens: Number of tokens to consume
+            timeout: Maximum time to wait in seconds (None for no timeout)
+
+        Returns:
+            True if tokens were consumed, False if timeout was reached
+        """
+        delay = self._reserve(tokens, math.inf if timeout is None else timeout)
+        if delay is None:
+            return False
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._release(tokens)
+                raise
+        return True
+
+
+class _WindowShard:
+    """Keys of a sliding window limiter that share one lock."""
+
+    __slots__ = ("lock", "windows")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.windows: "OrderedDict[str, Deque[float]]" = OrderedDict()
 
 
 class SlidingWindowRateLimiter:
@@ -94,20 +188,107 @@ class SlidingWindowRateLimiter:
 
     This rate limiter tracks requests within a time window and limits the total
     number of requests in that window.
+
+    Each key keeps a ring buffer of its last max_requests timestamps. A request
+    is allowed when the buffer is not full or its oldest entry has left the
+    window, so every check is O(1) and memory per key is bounded. Keys are
+    spread over independently locked shards, and keys whose timestamps have
+    all expired are evicted as the limiter is used.
     """
 
-    def __init__(self, max_requests: int, window_size: float):
+    def __init__(self, max_requests: int, window_size: float,
+                 shards: int = DEFAULT_SHARDS, clock: Callable[[], float] = time.time):
         """
         Initialize the sliding window rate limiter.
 
         Args:
             max_requests: Maximum number of requests allowed in the window
             window_size: Size of the time window in seconds
+            shards: Number of independently locked key shards
+            clock: Time source in seconds
         """
+        if max_requests < 1:
+            raise ValueError("max_requests must be at least 1")
         self.max_requests = max_requests
         self.window_size = window_size
-        self.requests: Dict[str, list] = defaultdict(list)
-        self.lock = threading.Lock()
+        self.clock = clock
+        self._shards: List[_WindowShard] = [_WindowShard() for _ in range(max(1, shards))]
+
+    def __len__(self) -> int:
+        """Number of keys currently tracked."""
+        return sum(len(shard.windows) for shard in self._shards)
+
+    def _shard(self, key: str) -> _WindowShard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _reserve(self, key: str, max_wait: float) -> Optional[float]:
+        """
+        Record a request for key at the earliest slot within max_wait seconds.
+
+        Returns:
+            The reserved timestamp, or None if no slot is free within max_wait
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            now = self.clock()
+            window = shard.windows.get(key)
+            if window is None:
+                window = deque(maxlen=self.max_requests)
+                shard.windows[key] = window
+            else:
+                shard.windows.move_to_end(key)
+
+            slot = now
+            if window:
+                # Later than any pending reservation, so waiters are served in order
+                slot = max(slot, window[-1])
+                if len(window) == self.max_requests:
+                    slot = max(slot, window[0] + self.window_size)
+
+            if slot - now > max_wait:
+                result = None
+            else:
+                window.append(slot)
+                result = slot
+
+            self._evict_idle(shard, now, key)
+            return result
+
+    def _release(self, key: str, slot: float) -> None:
+        """Forget a reservation whose waiter gave up."""
+        shard = self._shard(key)
+        with shard.lock:
+            window = shard.windows.get(key)
+            if window is not None and slot in window:
+                window.remove(slot)
+
+    def _evict_idle(self, shard: _WindowShard, now: float, current_key: str) -> None:
+        """Drop least recently used keys whose requests have all left the window."""
+        for _ in range(EVICTIONS_PER_CALL):
+            key, window = next(iter(shard.windows.items()))
+            if key == current_key or (window and now - window[-1] < self.window_size):
+                return
+            del shard.windows[key]
+
+    def purge_idle(self) -> int:
+        """
+        Drop every key whose requests have all left the window.
+
+        Returns:
+            Number of keys removed
+        """
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                now = self.clock()
+                idle = [
+                    key for key, window in shard.windows.items()
+                    if not window or now - window[-1] >= self.window_size
+                ]
+                for key in idle:
+                    del shard.windows[key]
+                removed += len(idle)
+        return removed
 
     def is_allowed(self, key: str) -> bool:
         """
@@ -119,24 +300,82 @@ class SlidingWindowRateLimiter:
         Returns:
             True if request is allowed, False if rate limit would be exceeded
         """
-        with self.lock:
-            now = time.time()
-            # Remove old requests outside the window
-            self.requests[key] = [
-                timestamp for timestamp in self.requests[key]
-                if now - timestamp < self.window_size
-            ]
-
-            # Check if we're under the limit
-            if len(self.requests[key]) < self.max_requests:
-                self.requests[key].append(now)
-                return True
+        return self._reserve(key, 0.0) is not None
+
+    def time_until_allowed(self, key: str) -> float:
+        """
+        Get the number of seconds until a request for key would be allowed.
+
+        Args:
+            key: Identifier for the client/resource being rate limited
+
+        Returns:
+            Seconds to wait (0.0 if a request is allowed now)
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            now = self.clock()
+            window = shard.windows.get(key)
+            if not window:
+                return 0.0
+            slot = window[-1]
+            if len(window) == self.max_requests:
+                slot = max(slot, window[0] + self.window_size)
+            return max(0.0, slot - now)
+
+    def wait_until_allowed(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a request for key is allowed and record it.
+
+        Args:
+            key: Identifier for the client/resource being rate limited
+            timeout: Maximum time to wait in seconds (None for no timeout)
 
+        Returns:
+            True if the request was allowed, False if timeout was reached
+        """
+        slot = self._reserve(key, math.inf if timeout is None else timeout)
+        if slot is None:
             return False
+        delay = slot - self.clock()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    async def acquire(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Asynchronously wait until a request for key is allowed and record it.
+
+        Cancelling the waiting coroutine gives its slot back.
+
+        Args:
+            key: Identifier for the client/resource being rate limited
+            timeout: Maximum time to wait in seconds (None for no timeout)
+
+        Returns:
+            True if the request was allowed, False if timeout was reached
+        """
+        slot = self._reserve(key, math.inf if timeout is None else timeout)
+        if slot is None:
+            return False
+        delay = slot - self.clock()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._release(key, slot)
+                raise
+        return True
 
 
 class RateLimiterManager:
-    """Manages multiple rate limiters for different resources."""
+    """
+    Manages multiple rate limiters for different resources.
+
+    The registries are replaced rather than mutated when a limiter is added,
+    so checks look limiters up without taking the manager's lock and only
+    contend on the limiter (or key shard) they use.
+    """
 
     def __init__(self):
         """Initialize the rate limiter manager."""
@@ -154,7 +393,9 @@ class RateLimiterManager:
             refill_rate: Number of tokens added per second
         """
         with self.lock:
-            self.limiters[name] = TokenBucketRateLimiter(capacity, refill_rate)
+            limiters = dict(self.limiters)
+            limiters[name] = TokenBucketRateLimiter(capacity, refill_rate)
+            self.limiters = limiters
 
     def add_sliding_window_limiter(self, name: str, max_requests: int, window_size: float) -> None:
         """
@@ -166,15 +407,19 @@ class RateLimiterManager:
             window_size: Size of the time window in seconds
         """
         with self.lock:
-            self.window_limiters[name] = SlidingWindowRateLimiter(max_requests, window_size)
+            window_limiters = dict(self.window_limiters)
+            window_limiters[name] = SlidingWindowRateLimiter(max_requests, window_size)
+            self.window_limiters = window_limiters
 
-    def check_token_bucket_limit(self, limiter_name: str, tokens: int = 1) -> bool:
+    def check_token_bucket_limit(self, limiter_name: str, tokens: int = 1,
+                                 max_wait: float = 0.0) -> bool:
         """
         Check if a request is allowed by a token bucket limiter.
 
         Args:
             limiter_name: Name of the rate limiter
             tokens: Number of tokens to consume
+            max_wait: Seconds to wait for tokens before giving up
 
         Returns:
             True if request is allowed, False if rate limit would be exceeded
@@ -182,24 +427,25 @@ class RateLimiterManager:
         Raises:
             RateLimitExceededError: If rate limit is exceeded
         """
-        with self.lock:
-            if limiter_name not in self.limiters:
-                # No limiter configured, allow the request
-                return True
+        limiter = self.limiters.get(limiter_name)
+        if limiter is None:
+            # No limiter configured, allow the request
+            return True
 
-            limiter = self.limiters[limiter_name]
-            if not limiter.consume(tokens):
-                raise RateLimitExceededError(f"Rate limit exceeded for {limiter_name}")
+        if not limiter.wait_and_consume(tokens, timeout=max_wait):
+            raise RateLimitExceededError(f"Rate limit exceeded for {limiter_name}")
 
-            return True
+        return True
 
-    def check_sliding_window_limit(self, limiter_name: str, key: str) -> bool:
+    def check_sliding_window_limit(self, limiter_name: str, key: str,
+                                   max_wait: float = 0.0) -> bool:
         """
         Check if a request is allowed by a sliding window limiter.
 
         Args:
             limiter_name: Name of the rate limiter
             key: Identifier for the client/resource being rate limited
+            max_wait: Seconds to wait for a free slot before giving up
 
         Returns:
             True if request is allowed, False if rate limit would be exceeded
@@ -207,17 +453,50 @@ class RateLimiterManager:
         Raises:
             RateLimitExceededError: If rate limit is exceeded
         """
-        with self.lock:
-            if limiter_name not in self.window_limiters:
-                # No limiter configured, allow the request
-                return True
+        limiter = self.window_limiters.get(limiter_name)
+        if limiter is None:
+            # No limiter configured, allow the request
+            return True
+
+        if not limiter.wait_until_allowed(key, timeout=max_wait):
+            raise RateLimitExceededError(f"Rate limit exceeded for {limiter_name}")
+
+        return True
+
+    async def acquire_token_bucket(self, limiter_name: str, tokens: int = 1,
+                                   max_wait: float = 0.0) -> bool:
+        """
+        Asynchronous variant of check_token_bucket_limit.
+
+        Raises:
+            RateLimitExceededError: If rate limit is exceeded
+        """
+        limiter = self.limiters.get(limiter_name)
+        if limiter is None:
+            return True
+
+        if not await limiter.acquire(tokens, timeout=max_wait):
+            raise RateLimitExceededError(f"Rate limit exceeded for {limiter_name}")
 
-            limiter = self.window_limiters[limiter_name]
-            if not limiter.is_allowed(key):
-                raise RateLimitExceededError(f"Rate limit exceeded for {limiter_name}")
+        return True
+
+    async def acquire_sliding_window(self, limiter_name: str, key: str,
+                                     max_wait: float = 0.0) -> bool:
+        """
+        Asynchronous variant of check_sliding_window_limit.
 
+        Raises:
+            RateLimitExceededError: If rate limit is exceeded
+        """
+        limiter = self.window_limiters.get(limiter_name)
+        if limiter is None:
             return True
 
+        if not await limiter.acquire(key, timeout=max_wait):
+            raise RateLimitExceededError(f"Rate limit exceeded for {limiter_name}")
+
+        return True
+
 
 # Global rate limiter manager instance
 _rate_limiter_manager: Optional[RateLimiterManager] = None
@@ -236,44 +515,71 @@ def get_rate_limiter_manager() -> RateLimiterManager:
     return _rate_limiter_manager
 
 
-def rate_limit_by_token_bucket(limiter_name: str, tokens: int = 1):
+def rate_limit_by_token_bucket(limiter_name: str, tokens: int = 1, max_wait: float = 0.0):
     """
     Decorator to apply token bucket rate limiting to a function.
 
+    Coroutine functions wait with asyncio instead of blocking the event loop.
+
     Args:
         limiter_name: Name of the rate limiter to use
         tokens: Number of tokens to consume per call
+        max_wait: Seconds a call may wait for tokens before raising
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                rate_limiter_manager = get_rate_limiter_manager()
+                await rate_limiter_manager.acquire_token_bucket(limiter_name, tokens, max_wait)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             rate_limiter_manager = get_rate_limiter_manager()
-            rate_limiter_manager.check_token_bucket_limit(limiter_name, tokens)
+            rate_limiter_manager.check_token_bucket_limit(limiter_name, tokens, max_wait)
             return func(*args, **kwargs)
         return wrapper
     return decorator
 
 
-def rate_limit_by_sliding_window(limiter_name: str, key_func=None):
+def rate_limit_by_sliding_window(limiter_name: str, key_func=None, max_wait: float = 0.0):
     """
     Decorator to apply sliding window rate limiting to a function.
 
+    Coroutine functions wait with asyncio instead of blocking the event loop.
+
     Args:
         limiter_name: Name of the rate limiter to use
         key_func: Function to generate the key from function arguments
                  If None, uses the first argument as the key
+        max_wait: Seconds a call may wait for a free slot before raising
     """
+    def make_key(args, kwargs):
+        if key_func:
+            return key_func(*args, **kwargs)
+        if args:
+            return str(args[0])
+        return "default"
+
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                rate_limiter_manager = get_rate_limiter_manager()
+                await rate_limiter_manager.acquire_sliding_window(
+                    limiter_name, make_key(args, kwargs), max_wait
+                )
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # Generate key
-            if key_func:
-                key = key_func(*args, **kwargs)
-            elif args:
-                key = str(args[0])
-            else:
-                key = "default"
-
             rate_limiter_manager = get_rate_limiter_manager()
-            rate_limiter_manager.check_sliding_window_limit(limiter_name, key)
+            rate_limiter_manager.check_sliding_window_limit(
+                limiter_name, make_key(args, kwargs), max_wait
+            )
             return func(*args, **kwargs)
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
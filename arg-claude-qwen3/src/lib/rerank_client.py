@@ -2,8 +2,11 @@
 DashScope API client for reranking search results.
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Optional
 import logging
 from src.lib.config import get_config
 
@@ -11,7 +14,11 @@ logger = logging.getLogger(__name__)
 
 
 class RerankClient:
-    """Client for DashScope reranking API."""
+    """Client for DashScope reranking API.
+
+    Requests share a pooled keep-alive session and time out after
+    RERANK_TIMEOUT seconds.
+    """
 
     def __init__(self):
         """Initialize rerank client with API configuration."""
@@ -19,10 +26,19 @@ class RerankClient:
         self.api_base = config.qwen_api_base
         self.api_key = config.qwen_api_key
         self.model = "dashscope-rerank"
+        self.timeout = config.rerank_timeout
+        self.concurrency = config.rerank_concurrency
 
         if not self.api_key:
             raise ValueError("QWEN_API_KEY environment variable is required")
 
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
     def rerank(self, query: str, documents: List[str]) -> List[Dict[str, Any]]:
         """
         Rerank documents based on their relevance to a query.
@@ -48,7 +64,7 @@ class RerankClient:
         }
 
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
             response.raise_for_status()
 
             data = response.json()
@@ -64,6 +80,38 @@ class RerankClient:
             logger.error(f"Unexpected response format: {e}")
             raise
 
+    def rerank_scores(self, query: str, documents: List[str], batch_size: int) -> List[float]:
+        """
+        Score documents against a query in requests of at most batch_size documents.
+
+        The requests run concurrently; relevance scores are absolute, so
+        scores from different requests can be compared.
+
+        Args:
+            query: Search query
+            documents: Document texts to score
+            batch_size: Most documents per request
+
+        Returns:
+            Relevance score of each document, in input order
+        """
+        batches = [(start, documents[start:start + batch_size]) for start in range(0, len(documents), batch_size)]
+        if len(batches) > 1:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="rerank")
+            responses = list(self._executor.map(lambda batch: self.rerank(query, batch[1]), batches))
+        else:
+            responses = [self.rerank(query, batch) for _, batch in batches]
+
+        scores = [0.0] * len(documents)
+        for (start, batch), results in zip(batches, responses):
+            if len(results) != len(batch):
+                raise ValueError(f"Expected {len(batch)} rerank results, got {len(results)}")
+            for item in results:
+                scores[start + item["index"]] = item["relevance_score"]
+        return scores
+
 
 # Global rerank client instance
 rerank_client = RerankClient()
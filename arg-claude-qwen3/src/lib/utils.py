@@ -3,6 +3,7 @@ Utility functions for the RAG backend system.
 """
 
 import os
+import re
 import hashlib
 from typing import List, Optional
 from pathlib import Path
@@ -188,4 +189,33 @@ def split_text_into_chunks(text: str, chunk_size: int = 1000, overlap: int = 100
                 chunks.append(remaining)
             break
 
-    return chunks
\ No newline at end of file
+    return chunks
+
+
+# One estimated token: a CJK character, a run of at most four word
+# characters, or a punctuation mark
+_TOKEN_ESTIMATE = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]|[^\W\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]{1,4}|[^\w\s]")
+
+
+def truncate_to_token_budget(text: str, max_tokens: int) -> str:
+    """
+    Cut text to roughly a number of model tokens.
+
+    Tokens are estimated without a tokenizer: each CJK character counts
+    as one, as does every four characters of a word or each punctuation mark.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+
+    Returns:
+        The longest prefix of text within the budget
+    """
+    if max_tokens <= 0:
+        return ""
+    if len(text) <= max_tokens:
+        return text
+    for count, match in enumerate(_TOKEN_ESTIMATE.finditer(text), 1):
+        if count == max_tokens:
+            return text[:match.end()]
+    return text
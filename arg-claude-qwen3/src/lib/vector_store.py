@@ -0,0 +1,502 @@
+"""
+Vector storage for chunk embeddings.
+
+GraphVectorStore keeps embeddings on Chunk nodes in Neo4j or Memgraph and
+queries the database's native vector index. InMemoryVectorStore keeps them
+in a numpy matrix for the life of the process; it is only used when asked
+for explicitly, e.g. in tests, since nothing it holds is persisted.
+Both expose exact_search(), a brute-force scan used as the recall baseline.
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from src.lib.database import DatabaseConnection
+from src.lib.exceptions import SearchError
+
+logger = logging.getLogger(__name__)
+
+# Name of the vector index on Chunk.embedding
+VECTOR_INDEX_NAME = "chunk_embedding"
+
+# Chunks written per UNWIND statement
+VECTOR_WRITE_BATCH_SIZE = 500
+
+# Maximum number of vectors a Memgraph vector index is sized for
+MEMGRAPH_INDEX_CAPACITY = 1_000_000
+
+# Candidates requested from the index per wanted result, before filtering
+ANN_OVERSAMPLE = 4
+
+# Largest candidate list requested from the index when widening a filtered search
+ANN_MAX_CANDIDATES = 10_000
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _top_k(ids: Sequence[str], scores: np.ndarray, top_k: int) -> List[Tuple[str, float]]:
+    """Pick the top_k highest scores, best first."""
+    if top_k <= 0 or len(scores) == 0:
+        return []
+    if len(scores) > top_k:
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [(ids[i], float(scores[i])) for i in order]
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    """Convert a vector to a unit-length float32 array."""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm else array
+
+
+def _cosine_scores(query: Sequence[float], vectors: np.ndarray) -> np.ndarray:
+    """Cosine similarity of a query against each row of vectors."""
+    norms = np.linalg.norm(vectors, axis=1)
+    norms[norms == 0] = 1.0
+    return (vectors @ _normalize(query)) / norms
+
+
+class InMemoryVectorStore:
+    """Chunk embeddings held in a numpy matrix and searched by a full scan."""
+
+    backend = "memory"
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._documents: List[Optional[str]] = []
+        self._texts: List[Optional[str]] = []
+        # Collection of each row, as codes so filtering is a vectorized comparison
+        self._collection_codes: Dict[str, int] = {}
+        self._row_collections = np.zeros(16, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def ensure_index(self, dimension: int) -> None:
+        """No index is needed for a matrix scan."""
+
+    def add(self, collection_name: str, rows: Iterable[Dict]) -> int:
+        """
+        Add or replace chunk embeddings.
+
+        Args:
+            collection_name: Collection the chunks belong to
+            rows: Dictionaries with id, document_id, content (optional) and embedding
+
+        Returns:
+            Number of embeddings stored
+        """
+        stored = 0
+        with self._lock:
+            for row in rows:
+                vector = _normalize(row["embedding"])
+                if self._matrix is None:
+                    self._matrix = np.zeros((16, len(vector)), dtype=np.float32)
+                elif len(vector) != self._matrix.shape[1]:
+                    raise ValueError(
+                        f"Embedding dimension {len(vector)} does not match {self._matrix.shape[1]}"
+                    )
+
+                index = self._rows.get(row["id"])
+                if index is None:
+                    if self._size == len(self._matrix):
+                        # Grow geometrically so appends are amortized O(1)
+                        self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+                        self._row_collections = np.concatenate(
+                            [self._row_collections, np.zeros_like(self._row_collections)]
+                        )
+                    index = self._size
+                    self._size += 1
+                    self._rows[row["id"]] = index
+                    self._ids.append(row["id"])
+                    self._documents.append(row.get("document_id"))
+                    self._texts.append(row.get("content"))
+                else:
+                    self._documents[index] = row.get("document_id")
+                    self._texts[index] = row.get("content")
+                code = self._collection_codes.setdefault(collection_name, len(self._collection_codes))
+                self._row_collections[index] = code
+                self._matrix[index] = vector
+                stored += 1
+        return stored
+
+    def search(self, vector: Sequence[float], top_k: int, collection_name: str,
+               document_ids: Optional[Sequence[str]] = None) -> List[Tuple[str, float]]:
+        """Find the chunks most similar to vector; the scan is exact."""
+        return self.exact_search(vector, top_k, collection_name, document_ids)
+
+    def exact_search(self, vector: Sequence[float], top_k: int, collection_name: str,
+                     document_ids: Optional[Sequence[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Score every stored chunk matching the filter.
+
+        Args:
+            vector: Query embedding
+            top_k: Number of results to return
+            collection_name: Only search chunks of this collection
+            document_ids: Only search chunks of these documents (optional)
+
+        Returns:
+            List of (chunk_id, cosine similarity) tuples, best first
+        """
+        with self._lock:
+            if not self._size:
+                return []
+            code = self._collection_codes.get(collection_name)
+            if code is None:
+                return []
+            mask = self._row_collections[:self._size] == code
+            if document_ids is not None:
+                wanted = set(document_ids)
+                mask &= np.fromiter((d in wanted for d in self._documents), dtype=bool, count=self._size)
+            rows = np.flatnonzero(mask)
+            if not len(rows):
+                return []
+            scores = self._matrix[rows] @ _normalize(vector)
+            ids = [self._ids[i] for i in rows]
+        return _top_k(ids, scores, top_k)
+
+    def get_texts(self, chunk_ids: Sequence[str]) -> Dict[str, str]:
+        """
+        Look up the content of chunks.
+
+        Args:
+            chunk_ids: IDs of the chunks
+
+        Returns:
+            Dictionary of chunk ID to content, for the chunks that have content
+        """
+        with self._lock:
+            texts = {}
+            for chunk_id in chunk_ids:
+                index = self._rows.get(chunk_id)
+                if index is not None and self._texts[index] is not None:
+                    texts[chunk_id] = self._texts[index]
+            return texts
+
+    def delete(self, chunk_ids: Sequence[str]) -> int:
+        """
+        Remove chunk embeddings.
+
+        The last row is moved into each freed row, so the matrix stays dense.
+
+        Args:
+            chunk_ids: IDs of the chunks to remove
+
+        Returns:
+            Number of embeddings removed
+        """
+        removed = 0
+        with self._lock:
+            for chunk_id in chunk_ids:
+                index = self._rows.pop(chunk_id, None)
+                if index is None:
+                    continue
+                last = self._size - 1
+                if index != last:
+                    moved = self._ids[last]
+                    self._rows[moved] = index
+                    self._ids[index] = moved
+                    self._documents[index] = self._documents[last]
+                    self._texts[index] = self._texts[last]
+                    self._row_collections[index] = self._row_collections[last]
+                    self._matrix[index] = self._matrix[last]
+                self._ids.pop()
+                self._documents.pop()
+                self._texts.pop()
+                self._size = last
+                removed += 1
+        return removed
+
+
+class GraphVectorStore:
+    """Chunk embeddings stored on Chunk nodes and searched with a native vector index.
+
+    The index is created with Neo4j 5 syntax, or Memgraph syntax if that
+    fails. Searches restricted to a few documents are pre-filtered: the
+    matching chunks are scored exactly instead of asking the index, whose
+    global nearest neighbours may all belong to other documents. Broader
+    searches over-fetch from the index and widen until enough candidates
+    pass the collection filter.
+    """
+
+    backend = "graph"
+
+    def __init__(self, db: DatabaseConnection, index_name: str = VECTOR_INDEX_NAME,
+                 exact_scan_limit: int = 5000):
+        """
+        Initialize the store.
+
+        Args:
+            db: Database connection
+            index_name: Name of the vector index
+            exact_scan_limit: Largest filtered chunk set scored exactly instead of via the index
+        """
+        if not _IDENTIFIER.match(index_name):
+            raise ValueError(f"Invalid index name: {index_name}")
+        self.db = db
+        self.index_name = index_name
+        self.exact_scan_limit = exact_scan_limit
+        self.dialect: Optional[str] = None
+        self._indexed_dimension: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def ensure_index(self, dimension: int) -> None:
+        """
+        Create the vector index for the given embedding dimension if missing.
+
+        Args:
+            dimension: Embedding dimension
+        """
+        with self._lock:
+            if self._indexed_dimension == dimension:
+                return
+            statements = [
+                ("neo4j",
+                 f"CREATE VECTOR INDEX {self.index_name} IF NOT EXISTS "
+                 f"FOR (c:Chunk) ON (c.embedding) OPTIONS {{indexConfig: {{"
+                 f"`vector.dimensions`: {int(dimension)}, `vector.similarity_function`: 'cosine'}}}}"),
+                ("memgraph",
+                 f"CREATE VECTOR INDEX {self.index_name} ON :Chunk(embedding) WITH CONFIG {{"
+                 f"\"dimension\": {int(dimension)}, \"capacity\": {MEMGRAPH_INDEX_CAPACITY}, \"metric\": \"cos\"}}"),
+            ]
+            driver = self.db.connect()
+            errors = []
+            for dialect, statement in statements:
+                try:
+                    with driver.session() as session:
+                        session.run(statement).consume()
+                    self.dialect = dialect
+                    break
+                except Exception as e:
+                    if "already exists" in str(e).lower():
+                        self.dialect = dialect
+                        break
+                    errors.append(f"{dialect}: {e}")
+            if self.dialect is None:
+                logger.warning(f"Could not create vector index, falling back to exact scans: {errors}")
+            else:
+                logger.info(f"Vector index {self.index_name} ready ({self.dialect}, dimension {dimension})")
+
+            # Property index so MERGE on Chunk.id does not scan every chunk
+            id_index = {
+                "neo4j": "CREATE INDEX chunk_id IF NOT EXISTS FOR (c:Chunk) ON (c.id)",
+                "memgraph": "CREATE INDEX ON :Chunk(id)",
+            }.get(self.dialect)
+            if id_index:
+                try:
+                    with driver.session() as session:
+                        session.run(id_index).consume()
+                except Exception as e:
+                    logger.debug(f"Chunk id index not created: {e}")
+            self._indexed_dimension = dimension
+
+    def add(self, collection_name: str, rows: Iterable[Dict]) -> int:
+        """
+        Write chunk nodes with their embeddings in batched UNWIND statements.
+
+        Args:
+            collection_name: Collection the chunks belong to
+            rows: Dictionaries with id, document_id, content, position and embedding
+
+        Returns:
+            Number of chunks written
+        """
+        query = """
+        UNWIND $rows AS row
+        MERGE (c:Chunk {id: row.id})
+        SET c.document_id = row.document_id,
+            c.collection_name = $collection_name,
+            c.content = row.content,
+            c.position = row.position,
+            c.embedding = row.embedding
+        """
+        rows = list(rows)
+        driver = self.db.connect()
+        with driver.session() as session:
+            for start in range(0, len(rows), VECTOR_WRITE_BATCH_SIZE):
+                batch = rows[start:start + VECTOR_WRITE_BATCH_SIZE]
+                session.execute_write(
+                    lambda tx, batch=batch: tx.run(
+                        query, rows=batch, collection_name=collection_name
+                    ).consume()
+                )
+        return len(rows)
+
+    def search(self, vector: Sequence[float], top_k: int, collection_name: str,
+               document_ids: Optional[Sequence[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Find the chunks most similar to vector.
+
+        Args:
+            vector: Query embedding
+            top_k: Number of results to return
+            collection_name: Only return chunks of this collection
+            document_ids: Only return chunks of these documents (optional)
+
+        Returns:
+            List of (chunk_id, cosine similarity) tuples, best first
+        """
+        if self._indexed_dimension is None:
+            self.ensure_index(len(vector))
+        if self.dialect is None:
+            return self.exact_search(vector, top_k, collection_name, document_ids)
+        if document_ids is not None and self._count(collection_name, document_ids) <= self.exact_scan_limit:
+            return self.exact_search(vector, top_k, collection_name, document_ids)
+
+        if self.dialect == "neo4j":
+            # queryNodes scores cosine as (1 + cos) / 2
+            call = "CALL db.index.vector.queryNodes($index_name, $k, $vector) YIELD node, score " \
+                   "WITH node, 2 * score - 1 AS score"
+        else:
+            call = "CALL vector_search.search($index_name, $k, $vector) YIELD node, similarity " \
+                   "WITH node, similarity AS score"
+        query = f"""
+        {call}
+        WHERE node.collection_name = $collection_name
+          AND ($document_ids IS NULL OR node.document_id IN $document_ids)
+        RETURN node.id AS chunk_id, score
+        ORDER BY score DESC
+        LIMIT $top_k
+        """
+        k = max(top_k * ANN_OVERSAMPLE, top_k)
+        driver = self.db.connect()
+        while True:
+            with driver.session() as session:
+                records = session.execute_read(lambda tx: list(tx.run(
+                    query, index_name=self.index_name, k=k, vector=list(vector),
+                    collection_name=collection_name, document_ids=document_ids, top_k=top_k
+                )))
+            if len(records) >= top_k or k >= ANN_MAX_CANDIDATES:
+                return [(record["chunk_id"], float(record["score"])) for record in records]
+            k = min(k * ANN_OVERSAMPLE, ANN_MAX_CANDIDATES)
+
+    def exact_search(self, vector: Sequence[float], top_k: int, collection_name: str,
+                     document_ids: Optional[Sequence[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Score every chunk matching the filter, without the index.
+
+        Args:
+            vector: Query embedding
+            top_k: Number of results to return
+            collection_name: Only search chunks of this collection
+            document_ids: Only search chunks of these documents (optional)
+
+        Returns:
+            List of (chunk_id, cosine similarity) tuples, best first
+        """
+        query = """
+        MATCH (c:Chunk)
+        WHERE c.collection_name = $collection_name
+          AND c.embedding IS NOT NULL
+          AND ($document_ids IS NULL OR c.document_id IN $document_ids)
+        RETURN c.id AS chunk_id, c.embedding AS embedding
+        """
+        driver = self.db.connect()
+        with driver.session() as session:
+            records = session.execute_read(lambda tx: list(tx.run(
+                query, collection_name=collection_name, document_ids=document_ids
+            )))
+        if not records:
+            return []
+        ids = [record["chunk_id"] for record in records]
+        vectors = np.asarray([record["embedding"] for record in records], dtype=np.float32)
+        return _top_k(ids, _cosine_scores(vector, vectors), top_k)
+
+    def get_texts(self, chunk_ids: Sequence[str]) -> Dict[str, str]:
+        """
+        Look up the content of chunks in one query.
+
+        Args:
+            chunk_ids: IDs of the chunks
+
+        Returns:
+            Dictionary of chunk ID to content, for the chunks that have content
+        """
+        query = """
+        UNWIND $chunk_ids AS chunk_id
+        MATCH (c:Chunk {id: chunk_id})
+        WHERE c.content IS NOT NULL
+        RETURN c.id AS chunk_id, c.content AS content
+        """
+        driver = self.db.connect()
+        with driver.session() as session:
+            records = session.execute_read(lambda tx: list(tx.run(query, chunk_ids=list(chunk_ids))))
+        return {record["chunk_id"]: record["content"] for record in records}
+
+    def delete(self, chunk_ids: Sequence[str]) -> int:
+        """
+        Remove Chunk nodes, with their embeddings and relationships.
+
+        Args:
+            chunk_ids: IDs of the chunks to remove
+
+        Returns:
+            Number of chunks removed
+        """
+        query = """
+        UNWIND $chunk_ids AS chunk_id
+        MATCH (c:Chunk {id: chunk_id})
+        DETACH DELETE c
+        RETURN count(*) AS removed
+        """
+        driver = self.db.connect()
+        with driver.session() as session:
+            record = session.execute_write(lambda tx: tx.run(query, chunk_ids=list(chunk_ids)).single())
+        return record["removed"] if record else 0
+
+    def _count(self, collection_name: str, document_ids: Sequence[str]) -> int:
+        """Count the chunks matching a document filter."""
+        query = """
+        MATCH (c:Chunk)
+        WHERE c.collection_name = $collection_name AND c.document_id IN $document_ids
+        RETURN count(c) AS total
+        """
+        driver = self.db.connect()
+        with driver.session() as session:
+            record = session.execute_read(lambda tx: tx.run(
+                query, collection_name=collection_name, document_ids=list(document_ids)
+            ).single())
+        return record["total"] if record else 0
+
+
+def create_vector_store(backend: str, db: DatabaseConnection, exact_scan_limit: int = 5000):
+    """
+    Create the vector store for a configured backend.
+
+    Args:
+        backend: "graph", "memory", or "auto" (graph, checking first that the database answers)
+        db: Database connection
+        exact_scan_limit: Largest filtered chunk set scored exactly by the graph store
+
+    Returns:
+        GraphVectorStore or InMemoryVectorStore
+
+    Raises:
+        SearchError: If the backend name is unknown, or the backend is "auto"
+            and the database is unreachable
+    """
+    if backend == "memory":
+        return InMemoryVectorStore()
+    if backend == "graph":
+        return GraphVectorStore(db, exact_scan_limit=exact_scan_limit)
+    if backend == "auto":
+        if db.test_connection():
+            return GraphVectorStore(db, exact_scan_limit=exact_scan_limit)
+        # Falling back to memory would lose every embedding at exit
+        raise SearchError(
+            "Database unavailable for the vector store; set VECTOR_BACKEND=memory "
+            "to use an in-process store that is not persisted"
+        )
+    raise SearchError(f"Unknown vector backend: {backend}")
@@ -16,7 +16,8 @@ class ConversationContext:
         query_id: str,
         response: str,
         id: Optional[str] = None,
-        created_at: Optional[datetime] = None
+        created_at: Optional[datetime] = None,
+        question: Optional[str] = None
     ):
         """
         Initialize a ConversationContext.
@@ -27,11 +28,13 @@ class ConversationContext:
             response: The generated response to the query
             id: Unique identifier for the conversation (generated if not provided)
             created_at: Timestamp when the conversation entry was created
+            question: Text of the query, if known
         """
         self.id = id or str(uuid.uuid4())
         self.session_id = session_id
         self.query_id = query_id
         self.response = response
+        self.question = question
         self.created_at = created_at or datetime.now()
 
     def to_dict(self) -> dict:
@@ -46,6 +49,7 @@ class ConversationContext:
             "session_id": self.session_id,
             "query_id": self.query_id,
             "response": self.response,
+            "question": self.question,
             "created_at": self.created_at.isoformat()
         }
 
@@ -65,7 +69,8 @@ class ConversationContext:
             session_id=data["session_id"],
             query_id=data["query_id"],
             response=data["response"],
-            created_at=datetime.fromisoformat(data["created_at"])
+            created_at=datetime.fromisoformat(data["created_at"]),
+            question=data.get("question")
         )
 
     def __str__(self) -> str:
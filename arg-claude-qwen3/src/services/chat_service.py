@@ -57,10 +57,8 @@ class ChatService:
 
             logger.info(f"Starting chat session {session_id} with question: {question}")
 
-            # Step 1: Retrieve conversation history
-            conversation_history = self.conversation_manager.format_conversation_context(
-                session_id, max_turns=5
-            )
+            # Step 1: Retrieve conversation history (recent turns plus a summary of older ones)
+            conversation_history = self.conversation_manager.format_conversation_context(session_id)
 
             # Step 2: Perform hybrid search
             retrieval_results = self.retrieval_service.hybrid_search(
@@ -74,12 +72,16 @@ class ChatService:
             )
 
             # Step 3: Format retrieved content for answer generation
+            chunk_texts = self.retrieval_service.vector_search.get_chunk_texts(
+                [result.chunk_id for result in retrieval_results]
+            )
             retrieved_content = []
             for result in retrieval_results:
-                # In a real implementation, we'd retrieve the actual chunk content
-                # For now, we'll create placeholder content
+                if result.chunk_id not in chunk_texts:
+                    logger.warning(f"No stored content for chunk {result.chunk_id}, leaving it out")
+                    continue
                 content_item = {
-                    "content": f"Content of chunk {result.chunk_id}",
+                    "content": chunk_texts[result.chunk_id],
                     "source": f"Document containing chunk {result.chunk_id}",
                     "relevance_score": result.relevance_score
                 }
@@ -97,7 +99,8 @@ class ChatService:
             conversation_entry = self.conversation_manager.add_conversation_entry(
                 session_id=session_id,
                 query_id=query_obj.id,
-                response=answer_result["answer"]
+                response=answer_result["answer"],
+                question=question
             )
 
             # Step 6: Prepare response
@@ -134,6 +137,7 @@ class ChatService:
                 formatted_entry = {
                     "id": entry.id,
                     "query_id": entry.query_id,
+                    "question": entry.question,
                     "response": entry.response,
                     "created_at": entry.created_at.isoformat()
                 }
@@ -2,23 +2,116 @@
 Conversation context management service for the RAG backend system.
 """
 
-from typing import List, Optional
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from src.models.conversation_context import ConversationContext
-from src.lib.database import get_db_connection
+from src.lib.config import get_config
+from src.lib.conversation_store import SQLiteConversationStore
 from src.lib.exceptions import ChatError
 import logging
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_PROMPT = """Update the running summary of a conversation between a user and an assistant about their documents.
+Keep the facts, names, numbers and open questions later turns may refer to; drop pleasantries.
+Answer with the updated summary only, in at most {max_chars} characters.
+
+Current summary:
+{summary}
+
+New turns:
+{turns}"""
+
+
+class _SessionWindow:
+    """The in-memory part of a session: its latest turns and its summary."""
+
+    def __init__(self, turns: List[Dict[str, Any]], summary: str, summarized_through: int,
+                 unsummarized: int, max_turns: int):
+        self.turns = deque(turns, maxlen=max_turns)
+        self.summary = summary
+        self.summarized_through = summarized_through
+        # Stored turns after summarized_through, including those in the window
+        self.unsummarized = unsummarized
+        self.summarizing = False
+
 
 class ConversationManager:
-    """Service for managing conversation context and history."""
+    """Service for managing conversation context and history.
+
+    Every turn is appended to a SQLiteConversationStore, so history survives
+    restarts. Prompts carry a rolling summary plus the turns it does not
+    cover yet: once summary_batch turns older than the latest window_turns
+    have piled up, they are folded into the summary with one LLM call, off
+    the request path by default. A prompt thus holds at most
+    window_turns + summary_batch - 1 turns however long the session runs.
+    The turns and summaries of recently used sessions are kept in memory,
+    so most turns cost one insert.
+    """
 
-    def __init__(self):
-        """Initialize the ConversationManager."""
-        self.db = get_db_connection()
+    def __init__(self, store: Optional[SQLiteConversationStore] = None, llm_client=None,
+                 window_turns: Optional[int] = None, summary_batch: Optional[int] = None,
+                 summarize_in_background: bool = True):
+        """
+        Initialize the ConversationManager.
 
-    def add_conversation_entry(self, session_id: str, query_id: str, response: str) -> ConversationContext:
+        Args:
+            store: Turn storage (defaults to SQLite at CONVERSATION_DB_PATH)
+            llm_client: Client writing summaries (defaults to the global LLM client)
+            window_turns: Latest turns kept verbatim (defaults to CONVERSATION_WINDOW_TURNS)
+            summary_batch: Turns folded into the summary at once (defaults to CONVERSATION_SUMMARY_BATCH)
+            summarize_in_background: Whether summaries are written on a background thread
+        """
+        config = get_config()
+        self.store = store or SQLiteConversationStore(config.conversation_db_path)
+        self._llm_client = llm_client
+        self.window_turns = max(1, window_turns or config.conversation_window_turns)
+        self.summary_batch = max(1, summary_batch or config.conversation_summary_batch)
+        self.summary_max_chars = config.conversation_summary_max_chars
+        self.turn_max_chars = config.conversation_turn_max_chars
+        self.cached_sessions = config.conversation_cached_sessions
+        self.summarize_in_background = summarize_in_background
+        self._sessions: "OrderedDict[str, _SessionWindow]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def llm_client(self):
+        """The client writing summaries, created on first use."""
+        if self._llm_client is None:
+            from src.lib.llm_client import get_llm_client
+            self._llm_client = get_llm_client()
+        return self._llm_client
+
+    def _get_window(self, session_id: str) -> _SessionWindow:
+        """Get a session's window, loading it from the store on a miss."""
+        with self._lock:
+            window = self._sessions.get(session_id)
+            if window is not None:
+                self._sessions.move_to_end(session_id)
+                return window
+
+        summary, summarized_through = self.store.get_summary(session_id)
+        max_turns = self.window_turns + self.summary_batch
+        loaded = _SessionWindow(
+            self.store.recent_turns(session_id, max_turns),
+            summary, summarized_through,
+            self.store.count_turns(session_id, after_seq=summarized_through),
+            max_turns
+        )
+
+        with self._lock:
+            window = self._sessions.setdefault(session_id, loaded)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.cached_sessions:
+                self._sessions.popitem(last=False)
+            return window
+
+    def add_conversation_entry(self, session_id: str, query_id: str, response: str,
+                               question: Optional[str] = None) -> ConversationContext:
         """
         Add a new entry to the conversation history.
 
@@ -26,6 +119,7 @@ class ConversationManager:
             session_id: Identifier for the chat session
             query_id: Reference to the Query
             response: The generated response to the query
+            question: Text of the query
 
         Returns:
             ConversationContext object
@@ -34,10 +128,27 @@ class ConversationManager:
             conversation_entry = ConversationContext(
                 session_id=session_id,
                 query_id=query_id,
-                response=response
+                response=response,
+                question=question
             )
 
-            # In a real implementation, this would save to the database
+            window = self._get_window(session_id)
+            turn = conversation_entry.to_dict()
+            turn["seq"] = self.store.append_turn(turn)
+            with self._lock:
+                window.turns.append(turn)
+                window.unsummarized += 1
+                due = (window.unsummarized - self.window_turns >= self.summary_batch
+                       and not window.summarizing)
+                if due:
+                    window.summarizing = True
+
+            if due:
+                if self.summarize_in_background:
+                    self._summary_executor().submit(self._update_summary, session_id, window)
+                else:
+                    self._update_summary(session_id, window)
+
             logger.info(f"Added conversation entry for session {session_id}")
             return conversation_entry
 
@@ -45,6 +156,62 @@ class ConversationManager:
             logger.error(f"Failed to add conversation entry for session {session_id}: {e}")
             raise ChatError(f"Failed to add conversation entry: {str(e)}")
 
+    def _summary_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="conversation-summary")
+            return self._executor
+
+    def _update_summary(self, session_id: str, window: _SessionWindow) -> None:
+        """Fold the turns that left a session's window into its summary."""
+        try:
+            with self._lock:
+                count = window.unsummarized - self.window_turns
+                summary, summarized_through = window.summary, window.summarized_through
+            turns = self.store.turns_after(session_id, summarized_through, count)
+            if not turns:
+                return
+
+            new_summary = self._summarize(summary, turns)
+            last_seq = turns[-1]["seq"]
+            self.store.set_summary(session_id, new_summary, last_seq, datetime.now().isoformat())
+            with self._lock:
+                window.summary = new_summary
+                window.summarized_through = last_seq
+                window.unsummarized -= len(turns)
+            logger.info(f"Summarized {len(turns)} turns of session {session_id}")
+        except Exception as e:
+            logger.error(f"Failed to update summary for session {session_id}: {e}")
+        finally:
+            with self._lock:
+                window.summarizing = False
+
+    def _summarize(self, summary: str, turns: List[Dict[str, Any]]) -> str:
+        """Write a summary covering an older summary and some turns."""
+        lines = []
+        for turn in turns:
+            lines.append(f"User: {self._clip(turn['question'] or '')}")
+            lines.append(f"Assistant: {self._clip(turn['response'])}")
+        try:
+            updated = self.llm_client.generate_completion(
+                SUMMARY_PROMPT.format(
+                    max_chars=self.summary_max_chars, summary=summary or "(none)", turns="\n".join(lines)
+                ),
+                temperature=0.2,
+                max_tokens=max(64, self.summary_max_chars // 3)
+            ).strip()
+        except Exception as e:
+            # Keep the prompt bounded even without the LLM: append the turns and keep the end
+            logger.warning(f"Summary generation failed, falling back to excerpts: {e}")
+            updated = "\n".join(filter(None, [summary] + lines))
+            return updated[-self.summary_max_chars:]
+        return updated[:self.summary_max_chars]
+
+    def _clip(self, text: str) -> str:
+        if len(text) <= self.turn_max_chars:
+            return text
+        return text[:self.turn_max_chars] + "..."
+
     def get_conversation_history(self, session_id: str, limit: int = 10) -> List[ConversationContext]:
         """
         Get the conversation history for a session.
@@ -54,43 +221,52 @@ class ConversationManager:
             limit: Maximum number of entries to return
 
         Returns:
-            List of ConversationContext objects
+            List of ConversationContext objects, oldest first
         """
         try:
-            # In a real implementation, this would query the database
+            turns = self.store.recent_turns(session_id, limit)
             logger.info(f"Retrieved conversation history for session {session_id}")
-            return []  # Placeholder - would return actual history in real implementation
+            return [ConversationContext.from_dict(turn) for turn in turns]
 
         except Exception as e:
             logger.error(f"Failed to retrieve conversation history for session {session_id}: {e}")
             raise ChatError(f"Failed to retrieve conversation history: {str(e)}")
 
-    def format_conversation_context(self, session_id: str, max_turns: int = 5) -> List[dict]:
+    def format_conversation_context(self, session_id: str, max_turns: Optional[int] = None) -> List[dict]:
         """
         Format conversation history for use in prompts.
 
         Args:
             session_id: Identifier for the chat session
-            max_turns: Maximum number of conversation turns to include
+            max_turns: Maximum number of conversation turns to include (defaults to every
+                turn the summary does not cover)
 
         Returns:
-            List of message dictionaries in the format {"role": "user/assistant", "content": "..."}
+            List of message dictionaries in the format {"role": "system/user/assistant", "content": "..."};
+            a system message carries the summary of turns older than the window
         """
         try:
-            history = self.get_conversation_history(session_id, max_turns)
+            window = self._get_window(session_id)
+            with self._lock:
+                summary = window.summary
+                turns = [turn for turn in window.turns if turn["seq"] > window.summarized_through]
+            if max_turns is not None:
+                turns = turns[-max_turns:] if max_turns > 0 else []
 
-            # Format as message history for LLM
             messages = []
-            for entry in history:
-                # In a real implementation, we'd need to retrieve the original query text
-                # For now, we'll just format what we have
+            if summary:
+                messages.append({
+                    "role": "system",
+                    "content": f"Summary of the earlier conversation: {summary}"
+                })
+            for turn in turns:
                 messages.append({
                     "role": "user",
-                    "content": f"Previous query (ID: {entry.query_id})"
+                    "content": self._clip(turn["question"] or f"Previous query (ID: {turn['query_id']})")
                 })
                 messages.append({
                     "role": "assistant",
-                    "content": entry.response
+                    "content": self._clip(turn["response"])
                 })
 
             logger.info(f"Formatted conversation context with {len(messages)} messages")
@@ -108,8 +284,10 @@ class ConversationManager:
             session_id: Identifier for the chat session
         """
         try:
-            # In a real implementation, this would delete from the database
-            logger.info(f"Cleared conversation history for session {session_id}")
+            deleted = self.store.delete_session(session_id)
+            with self._lock:
+                self._sessions.pop(session_id, None)
+            logger.info(f"Cleared {deleted} conversation entries for session {session_id}")
 
         except Exception as e:
             logger.error(f"Failed to clear conversation history for session {session_id}: {e}")
@@ -126,17 +304,19 @@ class ConversationManager:
             Dictionary with session summary information
         """
         try:
-            history = self.get_conversation_history(session_id)
+            stats = self.store.session_stats(session_id)
+            summary, _ = self.store.get_summary(session_id)
 
-            summary = {
+            session_summary = {
                 "session_id": session_id,
-                "total_turns": len(history),
-                "first_message": history[0].created_at if history else None,
-                "last_message": history[-1].created_at if history else None
+                "total_turns": stats["turns"],
+                "first_message": stats["first_at"],
+                "last_message": stats["last_at"],
+                "summary": summary or None
             }
 
             logger.info(f"Generated session summary for {session_id}")
-            return summary
+            return session_summary
 
         except Exception as e:
             logger.error(f"Failed to generate session summary for session {session_id}: {e}")
@@ -146,6 +326,14 @@ class ConversationManager:
                 "error": str(e)
             }
 
+    def close(self) -> None:
+        """Wait for pending summaries and close the store."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.store.close()
+
 
 # Global conversation manager instance
 conversation_manager = ConversationManager()
@@ -158,4 +346,4 @@ def get_conversation_manager() -> ConversationManager:
     Returns:
         ConversationManager instance
     """
-    return conversation_manager
\ No newline at end of file
+    return conversation_manager
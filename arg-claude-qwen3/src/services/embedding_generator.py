@@ -2,25 +2,48 @@
 Embedding generation service for the RAG backend system.
 """
 
-from typing import List
+from typing import Any, Dict, List
 from dashscope import TextEmbedding
+from src.lib.embedding_client import EmbeddingBatcher
 from src.lib.exceptions import EmbeddingGenerationError
 from src.models.vector_embedding import VectorEmbedding
 from src.lib.config import get_config
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
 
 
 class EmbeddingGenerator:
-    """Service for generating vector embeddings for document chunks."""
+    """Service for generating vector embeddings for document chunks.
+
+    Chunks are embedded by an EmbeddingBatcher: split into requests within
+    the API's input limits, sent concurrently over DashScope's pooled
+    session with EMBEDDING_TIMEOUT, and retried one by one when a request
+    fails.
+    """
 
     def __init__(self):
         """Initialize the EmbeddingGenerator with DashScope embeddings."""
         config = get_config()
         self.api_key = config.qwen_api_key
         self.model = TextEmbedding.Models.text_embedding_v4
+        self.timeout = config.embedding_timeout
+        self.batcher = EmbeddingBatcher(self._call_batch)
+
+    def _call_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one request's texts with DashScope."""
+        response = TextEmbedding.call(
+            model=self.model,
+            input=texts,
+            api_key=self.api_key,
+            request_timeout=self.timeout
+        )
+
+        if response.status_code != 200:
+            raise Exception(f"DashScope API error: {response.message}")
+
+        items = sorted(response.output['embeddings'], key=lambda item: item.get('text_index', 0))
+        return [item['embedding'] for item in items]
 
     def generate_embeddings(self, chunk_ids: List[str], texts: List[str],
                           model_name: str = "text-embedding-v4") -> List[VectorEmbedding]:
@@ -45,19 +68,7 @@ class EmbeddingGenerator:
             return []
 
         try:
-            # Generate embeddings using DashScope embeddings
-            print("texts", texts)
-            response = TextEmbedding.call(
-                model=self.model,
-                input=texts,
-                api_key=self.api_key
-            )
-
-            if response.status_code != 200:
-                raise Exception(f"DashScope API error: {response.message}")
-
-            # Extract embeddings from response
-            embeddings = [item['embedding'] for item in response.output['embeddings']]
+            embeddings = self.batcher.embed(texts)
 
             # Create VectorEmbedding objects
             vector_embeddings = []
@@ -73,8 +84,6 @@ class EmbeddingGenerator:
             return vector_embeddings
 
         except Exception as e:
-            # print stack
-            traceback.print_stack()
             logger.error(f"Failed to generate embeddings: {e}")
             raise EmbeddingGenerationError(f"Failed to generate embeddings: {str(e)}")
 
@@ -98,8 +107,9 @@ class EmbeddingGenerator:
             # Generate embedding using DashScope embeddings
             response = TextEmbedding.call(
                 model=self.model,
-                input=text,
-                api_key=self.api_key
+                input=text[:self.batcher.max_input_chars],
+                api_key=self.api_key,
+                request_timeout=self.timeout
             )
 
             if response.status_code != 200:
@@ -123,6 +133,16 @@ class EmbeddingGenerator:
             raise EmbeddingGenerationError(f"Failed to generate embedding: {str(e)}")
 
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get embedding throughput and latency.
+
+        Returns:
+            Dictionary of EmbeddingBatcher statistics
+        """
+        return self.batcher.get_stats()
+
+
 # Global embedding generator instance
 _embedding_generator: EmbeddingGenerator = None
 
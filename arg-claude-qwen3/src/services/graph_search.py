@@ -2,20 +2,238 @@
 Graph search service for the RAG backend system.
 """
 
-from typing import List, Tuple
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.lib.config import get_config
 from src.lib.database import get_db_connection
+from src.lib.entity_dictionary import EntityDictionary, normalize_entity_name
 from src.lib.exceptions import SearchError
+from src.models.knowledge_graph_node import KnowledgeGraphNode
+from src.models.knowledge_graph_relationship import KnowledgeGraphRelationship
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Largest traversal depth a query may ask for; the Cypher pattern is built from it
+MAX_TRAVERSAL_DEPTH = 4
+
+# Score multiplier applied per hop between a query entity and a mentioning entity
+HOP_DECAY = 0.5
+
+# Rows written per UNWIND statement when storing the knowledge graph
+GRAPH_WRITE_BATCH_SIZE = 500
+
 
 class GraphSearchService:
-    """Service for performing graph-based search using knowledge graph relationships."""
+    """Service for performing graph-based search using knowledge graph relationships.
+
+    The knowledge graph is stored as Entity nodes keyed by collection and
+    normalized name, RELATED relationships between entities, and
+    MENTIONED_IN relationships to the Chunk nodes an entity was extracted
+    from. Searches resolve query entities through the (collection_name,
+    name_key) index and expand from them in a single query. Expansion is
+    bounded in depth, and entities with more than max_fan_out relationships
+    are reached but not expanded further, so hubs cannot blow up the cost.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None, max_fan_out: Optional[int] = None):
+        """
+        Initialize the GraphSearchService.
 
-    def __init__(self):
-        """Initialize the GraphSearchService."""
+        Args:
+            max_depth: Default traversal depth (defaults to GRAPH_MAX_DEPTH)
+            max_fan_out: Relationships above which an entity is not expanded
+                (defaults to GRAPH_MAX_FAN_OUT)
+        """
+        config = get_config()
         self.db = get_db_connection()
+        self.max_depth = max_depth or config.graph_max_depth
+        self.max_fan_out = max_fan_out or config.graph_max_fan_out
+        self._dictionaries: Dict[str, EntityDictionary] = {}
+        self._schema_ready = False
+        self._lock = threading.Lock()
+
+    def ensure_schema(self) -> None:
+        """Create the entity name index if it does not exist."""
+        if self._schema_ready:
+            return
+        with self._lock:
+            if self._schema_ready:
+                return
+            statements = [
+                # Neo4j 5
+                "CREATE INDEX entity_name_key IF NOT EXISTS FOR (e:Entity) ON (e.collection_name, e.name_key)",
+                # Memgraph
+                "CREATE INDEX ON :Entity(name_key)",
+            ]
+            driver = self.db.connect()
+            for statement in statements:
+                try:
+                    with driver.session() as session:
+                        session.run(statement).consume()
+                    break
+                except Exception as e:
+                    logger.debug(f"Entity index statement not applied: {e}")
+            self._schema_ready = True
+
+    def add_knowledge_graph(self, collection_name: str, entities: Sequence[KnowledgeGraphNode],
+                            relationships: Sequence[KnowledgeGraphRelationship]) -> Dict[str, int]:
+        """
+        Store extracted entities and relationships.
+
+        Entities with the same normalized name in a collection are merged into
+        one node, linked to every chunk that mentions them.
+
+        Args:
+            collection_name: Name of the collection the entities were extracted from
+            entities: Extracted entities (their chunk_id is the mentioning chunk)
+            relationships: Relationships between the extracted entities
+
+        Returns:
+            Dictionary with the numbers of entity mentions and relationships written
+
+        Raises:
+            SearchError: If writing fails
+        """
+        keys_by_node = {}
+        mentions = []
+        for entity in entities:
+            name_key = normalize_entity_name(entity.name)
+            if not name_key:
+                continue
+            keys_by_node[entity.id] = (name_key, entity.chunk_id)
+            mentions.append({
+                "name_key": name_key,
+                "name": entity.name,
+                "type": entity.entity_type,
+                "description": entity.description,
+                "chunk_id": entity.chunk_id,
+            })
+
+        edges = []
+        for relationship in relationships:
+            source = keys_by_node.get(relationship.source_node_id)
+            target = keys_by_node.get(relationship.target_node_id)
+            if source is None or target is None or source[0] == target[0]:
+                continue
+            edges.append({
+                "source": source[0],
+                "target": target[0],
+                "type": relationship.relationship_type,
+                "description": relationship.description,
+                "chunk_id": source[1],
+            })
+
+        if not mentions:
+            return {"mentions": 0, "relationships": 0}
+
+        try:
+            self.ensure_schema()
+            driver = self.db.connect()
+            with driver.session() as session:
+                for start in range(0, len(mentions), GRAPH_WRITE_BATCH_SIZE):
+                    session.execute_write(
+                        _write_mentions, collection_name, mentions[start:start + GRAPH_WRITE_BATCH_SIZE]
+                    )
+                for start in range(0, len(edges), GRAPH_WRITE_BATCH_SIZE):
+                    session.execute_write(
+                        _write_relationships, collection_name, edges[start:start + GRAPH_WRITE_BATCH_SIZE]
+                    )
+                touched = sorted({row["name_key"] for row in mentions})
+                session.execute_write(_update_degrees, collection_name, touched)
+        except Exception as e:
+            logger.error(f"Failed to store knowledge graph for collection {collection_name}: {e}")
+            raise SearchError(f"Failed to store knowledge graph: {str(e)}")
+
+        with self._lock:
+            # Rebuilt from the database on next use
+            self._dictionaries.pop(collection_name, None)
+
+        logger.info(f"Stored {len(mentions)} entity mentions and {len(edges)} relationships "
+                    f"in collection {collection_name}")
+        return {"mentions": len(mentions), "relationships": len(edges)}
+
+    def remove_chunks(self, collection_name: str, chunk_ids: Sequence[str]) -> None:
+        """
+        Remove the knowledge graph extracted from chunks.
+
+        The chunks are dropped from the chunk_ids of relationships, which are
+        deleted once no chunk is left. Their MENTIONED_IN relationships are
+        deleted, and then entities no chunk mentions any more. Entities and
+        relationships also found in other chunks are kept.
+
+        Args:
+            collection_name: Name of the collection the chunks belong to
+            chunk_ids: IDs of the chunks
+
+        Raises:
+            SearchError: If removing fails
+        """
+        if not chunk_ids:
+            return
+        try:
+            driver = self.db.connect()
+            with driver.session() as session:
+                session.execute_write(_remove_chunk_graph, collection_name, list(chunk_ids))
+        except Exception as e:
+            logger.error(f"Failed to remove knowledge graph of chunks in collection {collection_name}: {e}")
+            raise SearchError(f"Failed to remove knowledge graph: {str(e)}")
+
+        with self._lock:
+            # Rebuilt from the database on next use
+            self._dictionaries.pop(collection_name, None)
+        logger.info(f"Removed knowledge graph of {len(chunk_ids)} chunks in collection {collection_name}")
+
+    def get_entity_dictionary(self, collection_name: str) -> EntityDictionary:
+        """
+        Get the entity dictionary of a collection, loading it on first use.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            EntityDictionary of the collection's entity names
+
+        Raises:
+            SearchError: If loading the entity names fails
+        """
+        dictionary = self._dictionaries.get(collection_name)
+        if dictionary is not None:
+            return dictionary
+
+        query = """
+        MATCH (e:Entity {collection_name: $collection_name})
+        RETURN e.name_key AS name_key
+        """
+        try:
+            driver = self.db.connect()
+            with driver.session() as session:
+                names = session.execute_read(
+                    lambda tx: [record["name_key"] for record in tx.run(query, collection_name=collection_name)]
+                )
+        except Exception as e:
+            logger.error(f"Failed to load entity dictionary for collection {collection_name}: {e}")
+            raise SearchError(f"Failed to load entity dictionary: {str(e)}")
+
+        dictionary = EntityDictionary(names)
+        with self._lock:
+            self._dictionaries[collection_name] = dictionary
+        logger.info(f"Loaded entity dictionary with {len(dictionary)} entities for collection {collection_name}")
+        return dictionary
+
+    def link_entities(self, text: str, collection_name: str, limit: int = 10) -> List[str]:
+        """
+        Find the collection's entities mentioned in a text.
+
+        Args:
+            text: Query text
+            collection_name: Name of the collection
+            limit: Maximum number of entities
+
+        Returns:
+            Normalized entity names in order of appearance
+        """
+        return self.get_entity_dictionary(collection_name).link(text, limit)
 
     def search_by_entities(self, query_entities: List[str], collection_name: str,
                           top_k: int = 5) -> List[Tuple[str, float]]:
@@ -33,28 +251,10 @@ class GraphSearchService:
         Raises:
             SearchError: If graph search fails
         """
-        try:
-            # In a real implementation, this would query the knowledge graph
-            # For now, we'll simulate the search with a placeholder implementation
-            logger.info(f"Performing graph search for entities: {query_entities}")
-
-            # Placeholder results - in real implementation would query database
-            # This is where you would use something like:
-            # MATCH (n:Entity)-[:APPEARS_IN]->(c:Chunk)-[:PART_OF]->(:Document)-[:IN_COLLECTION]->(:Collection {name: $collection_name})
-            # WHERE n.name IN $query_entities
-            # RETURN c.id, count(n) AS entity_count
-            # ORDER BY entity_count DESC
-            # LIMIT $top_k
-
-            # Return empty results for now - would be populated in real implementation
-            results = []
-
-            logger.info(f"Graph search returned {len(results)} results")
-            return results
-
-        except Exception as e:
-            logger.error(f"Graph search failed for entities {query_entities}: {e}")
-            raise SearchError(f"Graph search failed: {str(e)}")
+        logger.info(f"Performing graph search for entities: {query_entities}")
+        results = self.traverse_knowledge_graph(query_entities, self.max_depth, collection_name, top_k)
+        logger.info(f"Graph search returned {len(results)} results")
+        return results
 
     def search_by_relationships(self, source_entity: str, target_entity: str,
                               relationship_type: str, collection_name: str,
@@ -62,23 +262,48 @@ class GraphSearchService:
         """
         Search for document chunks based on specific relationships between entities.
 
+        Chunks the relationship was extracted from score 1.0; other chunks
+        mentioning either entity score 0.5.
+
         Args:
             source_entity: Source entity name
             target_entity: Target entity name
-            relationship_type: Type of relationship to search for
+            relationship_type: Type of relationship to search for (None for any type)
             collection_name: Name of the document collection to search
             top_k: Number of results to return
 
         Returns:
             List of tuples (chunk_id, relevance_score)
+
+        Raises:
+            SearchError: If relationship search fails
+        """
+        query = """
+        MATCH (s:Entity {collection_name: $collection_name, name_key: $source})
+              -[r:RELATED]-(t:Entity {collection_name: $collection_name, name_key: $target})
+        WHERE $type IS NULL OR r.type = $type
+        WITH s, t, collect(r.chunk_ids) AS chunk_lists
+        UNWIND [s, t] AS e
+        MATCH (e)-[:MENTIONED_IN]->(c:Chunk)
+        WITH c.id AS chunk_id, chunk_lists
+        RETURN DISTINCT chunk_id, any(ids IN chunk_lists WHERE chunk_id IN ids) AS direct
+        LIMIT $limit
         """
         try:
-            # In a real implementation, this would query the knowledge graph for relationships
             logger.info(f"Performing relationship search: {source_entity} -> {relationship_type} -> {target_entity}")
+            driver = self.db.connect()
+            with driver.session() as session:
+                records = session.execute_read(lambda tx: list(tx.run(
+                    query, collection_name=collection_name,
+                    source=normalize_entity_name(source_entity),
+                    target=normalize_entity_name(target_entity),
+                    type=relationship_type, limit=max(top_k * 10, 100)
+                )))
 
-            # Placeholder results
-            results = []
-
+            results = sorted(
+                ((record["chunk_id"], 1.0 if record["direct"] else 0.5) for record in records),
+                key=lambda item: (-item[1], item[0])
+            )[:top_k]
             logger.info(f"Relationship search returned {len(results)} results")
             return results
 
@@ -87,25 +312,54 @@ class GraphSearchService:
             raise SearchError(f"Relationship search failed: {str(e)}")
 
     def traverse_knowledge_graph(self, start_entities: List[str], max_depth: int = 2,
-                               collection_name: str = None) -> List[Tuple[str, float]]:
+                               collection_name: str = None, top_k: int = 10) -> List[Tuple[str, float]]:
         """
         Traverse the knowledge graph starting from given entities.
 
+        A chunk's score averages, over the start entities, the best path
+        score to an entity mentioned in the chunk; a path of n hops scores
+        HOP_DECAY ** n, so chunks mentioning every start entity score 1.0.
+
         Args:
             start_entities: List of entity names to start traversal from
             max_depth: Maximum depth of traversal
-            collection_name: Optional collection name to limit results
+            collection_name: Collection to search (required: entities are scoped by collection)
+            top_k: Number of results to return
 
         Returns:
             List of tuples (chunk_id, relevance_score)
+
+        Raises:
+            SearchError: If graph traversal fails
         """
+        name_keys = list(dict.fromkeys(
+            key for key in (normalize_entity_name(name) for name in start_entities) if key
+        ))
+        if not name_keys or collection_name is None:
+            return []
+
+        depth = max(0, min(int(max_depth), MAX_TRAVERSAL_DEPTH))
         try:
-            # In a real implementation, this would perform graph traversal
-            logger.info(f"Traversing knowledge graph from entities: {start_entities}")
+            logger.info(f"Traversing knowledge graph from entities: {name_keys}")
+            driver = self.db.connect()
+            with driver.session() as session:
+                records = session.execute_read(lambda tx: list(tx.run(
+                    _traversal_query(depth), collection_name=collection_name, name_keys=name_keys,
+                    max_fan_out=self.max_fan_out,
+                    max_rows=max(top_k, 1) * self.max_fan_out * len(name_keys)
+                )))
 
-            # Placeholder results
-            results = []
+            best: Dict[str, Dict[str, float]] = {}
+            for record in records:
+                path_score = HOP_DECAY ** record["hops"]
+                per_seed = best.setdefault(record["chunk_id"], {})
+                if path_score > per_seed.get(record["seed"], 0.0):
+                    per_seed[record["seed"]] = path_score
 
+            results = sorted(
+                ((chunk_id, sum(scores.values()) / len(name_keys)) for chunk_id, scores in best.items()),
+                key=lambda item: (-item[1], item[0])
+            )[:top_k]
             logger.info(f"Graph traversal returned {len(results)} results")
             return results
 
@@ -114,6 +368,109 @@ class GraphSearchService:
             raise SearchError(f"Graph traversal failed: {str(e)}")
 
 
+def _traversal_query(depth: int) -> str:
+    """Build the traversal query for a depth (variable-length bounds must be literals).
+
+    Rows are reduced to the shortest path per chunk and seed and ordered by
+    hops before the row limit, so the limit drops the most distant chunks.
+    """
+    if depth == 0:
+        expansion = "WITH seed, [{entity: seed, hops: 0}] AS reached"
+    else:
+        expansion = f"""
+        OPTIONAL MATCH p = (seed)-[:RELATED*1..{depth}]-(neighbor:Entity)
+        WHERE coalesce(seed.degree, 0) <= $max_fan_out
+          AND all(n IN nodes(p)[1..-1] WHERE coalesce(n.degree, 0) <= $max_fan_out)
+        WITH seed, neighbor, min(length(p)) AS hops
+        WITH seed, [{{entity: seed, hops: 0}}] + collect({{entity: neighbor, hops: hops}}) AS reached"""
+    return f"""
+    UNWIND $name_keys AS name_key
+    MATCH (seed:Entity {{collection_name: $collection_name, name_key: name_key}})
+    {expansion}
+    UNWIND reached AS step
+    WITH seed, step.entity AS entity, step.hops AS hops
+    WHERE entity IS NOT NULL
+    MATCH (entity)-[:MENTIONED_IN]->(chunk:Chunk)
+    WITH chunk.id AS chunk_id, seed.name_key AS seed, min(hops) AS hops
+    RETURN chunk_id, seed, hops
+    ORDER BY hops, chunk_id
+    LIMIT $max_rows
+    """
+
+
+def _write_mentions(tx, collection_name: str, rows: List[dict]) -> None:
+    """Merge entities by normalized name and link them to their chunks."""
+    query = """
+    UNWIND $rows AS row
+    MERGE (e:Entity {collection_name: $collection_name, name_key: row.name_key})
+    ON CREATE SET e.name = row.name, e.type = row.type, e.description = row.description, e.degree = 0
+    MERGE (c:Chunk {id: row.chunk_id})
+    MERGE (e)-[:MENTIONED_IN]->(c)
+    """
+    tx.run(query, rows=rows, collection_name=collection_name).consume()
+
+
+def _write_relationships(tx, collection_name: str, rows: List[dict]) -> None:
+    """Merge relationships between entities, remembering the chunks they came from."""
+    query = """
+    UNWIND $rows AS row
+    MATCH (s:Entity {collection_name: $collection_name, name_key: row.source})
+    MATCH (t:Entity {collection_name: $collection_name, name_key: row.target})
+    MERGE (s)-[r:RELATED {type: row.type}]->(t)
+    ON CREATE SET r.description = row.description, r.chunk_ids = [row.chunk_id]
+    ON MATCH SET r.chunk_ids = CASE WHEN row.chunk_id IN r.chunk_ids
+                                    THEN r.chunk_ids ELSE r.chunk_ids + row.chunk_id END
+    """
+    tx.run(query, rows=rows, collection_name=collection_name).consume()
+
+
+def _remove_chunk_graph(tx, collection_name: str, chunk_ids: List[str]) -> None:
+    """Detach chunks from the knowledge graph and delete what only they supported."""
+    relationships = """
+    MATCH (s:Entity {collection_name: $collection_name})-[r:RELATED]->(t:Entity)
+    WHERE any(chunk_id IN r.chunk_ids WHERE chunk_id IN $chunk_ids)
+    SET r.chunk_ids = [chunk_id IN r.chunk_ids WHERE NOT chunk_id IN $chunk_ids]
+    RETURN s.name_key AS source, t.name_key AS target
+    """
+    unsupported = """
+    MATCH (:Entity {collection_name: $collection_name})-[r:RELATED]->(:Entity)
+    WHERE size(r.chunk_ids) = 0
+    DELETE r
+    """
+    mentions = """
+    UNWIND $chunk_ids AS chunk_id
+    MATCH (e:Entity {collection_name: $collection_name})-[m:MENTIONED_IN]->(:Chunk {id: chunk_id})
+    DELETE m
+    RETURN DISTINCT e.name_key AS name_key
+    """
+    orphans = """
+    UNWIND $name_keys AS name_key
+    MATCH (e:Entity {collection_name: $collection_name, name_key: name_key})
+    WHERE NOT (e)-[:MENTIONED_IN]->()
+    DETACH DELETE e
+    """
+    touched = set()
+    for record in tx.run(relationships, collection_name=collection_name, chunk_ids=chunk_ids):
+        touched.update((record["source"], record["target"]))
+    tx.run(unsupported, collection_name=collection_name).consume()
+    mentioned = [record["name_key"] for record in
+                 tx.run(mentions, collection_name=collection_name, chunk_ids=chunk_ids)]
+    tx.run(orphans, collection_name=collection_name, name_keys=mentioned).consume()
+    _update_degrees(tx, collection_name, sorted(touched.union(mentioned)))
+
+
+def _update_degrees(tx, collection_name: str, name_keys: List[str]) -> None:
+    """Recompute the relationship count used to cap traversal fan-out."""
+    query = """
+    UNWIND $name_keys AS name_key
+    MATCH (e:Entity {collection_name: $collection_name, name_key: name_key})
+    OPTIONAL MATCH (e)-[r:RELATED]-()
+    WITH e, count(r) AS degree
+    SET e.degree = degree
+    """
+    tx.run(query, name_keys=name_keys, collection_name=collection_name).consume()
+
+
 # Global graph search service instance
 graph_search_service = GraphSearchService()
 
@@ -125,4 +482,4 @@ def get_graph_search_service() -> GraphSearchService:
     Returns:
         GraphSearchService instance
     """
-    return graph_search_service
\ No newline at end of file
+    return graph_search_service
@@ -2,34 +2,106 @@
 Document indexing orchestration service for the RAG backend system.
 """
 
-from typing import List, Tuple
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
 from src.services.pdf_parser import get_pdf_parser
 from src.services.document_chunker import get_document_chunker
 from src.services.embedding_generator import get_embedding_generator
 from src.services.kg_extractor import get_kg_extractor
+from src.services.vector_search import get_vector_search_service
+from src.services.graph_search import get_graph_search_service
 from src.models.document_collection import DocumentCollection
 from src.models.document import Document
 from src.models.document_chunk import DocumentChunk
 from src.models.vector_embedding import VectorEmbedding
 from src.models.knowledge_graph_node import KnowledgeGraphNode
 from src.models.knowledge_graph_relationship import KnowledgeGraphRelationship
+from src.lib.config import get_config
 from src.lib.database import get_db_connection
 from src.lib.exceptions import DocumentNotFoundError, CollectionNotFoundError, FileProcessingError
+from src.lib.pipeline import CheckpointStore, Stage, StagedPipeline
+from src.lib.query_cache import get_query_cache
+from src.lib.utils import generate_file_hash
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class _DocumentJob:
+    """State of one document moving through the indexing pipeline."""
+
+    def __init__(self, collection: DocumentCollection, file_path: str,
+                 document_id: Optional[str] = None, resumed: bool = False):
+        self.collection = collection
+        self.file_path = file_path
+        self.document_id = document_id
+        self.resumed = resumed
+        self.checkpoint_key: Optional[str] = None
+        self.document: Optional[Document] = None
+        self.text = ""
+        self.metadata: Dict = {}
+        self.pending_batches = 0
+        self.ready_batches: List["_ChunkBatch"] = []
+        self.chunk_count = 0
+        self.entity_count = 0
+        self.relationship_count = 0
+        self.extraction_calls = 0
+        self.error: Optional[Exception] = None
+        self.done = False
+
+
+class _ChunkBatch:
+    """A group of a document's chunks, embedded and extracted together."""
+
+    def __init__(self, job: _DocumentJob, chunks: List[DocumentChunk]):
+        self.job = job
+        self.chunks = chunks
+        self.embeddings: List[VectorEmbedding] = []
+        self.entities: List[KnowledgeGraphNode] = []
+        self.relationships: List[KnowledgeGraphRelationship] = []
+        self.llm_calls = 0
+
+
 class IndexingService:
-    """Orchestration service for document indexing."""
+    """Orchestration service for document indexing.
+
+    Documents go through a pipeline of parse, chunk, embed, extract and
+    write stages, each with its own worker threads and a bounded queue in
+    front of it. Chunks travel in batches, so embedding and knowledge graph
+    extraction of one document overlap with parsing of the next and with
+    writes of the previous one. A document is written once all of its
+    batches are ready, so a failure never leaves part of it searchable.
+    Batch indexing records finished documents
+    in a checkpoint file, and rerunning an interrupted batch skips them.
+    """
 
     def __init__(self):
         """Initialize the IndexingService."""
+        config = get_config()
         self.pdf_parser = get_pdf_parser()
         self.document_chunker = get_document_chunker()
         self.embedding_generator = get_embedding_generator()
         self.kg_extractor = get_kg_extractor()
+        self.vector_search = get_vector_search_service()
+        self.graph_search = get_graph_search_service()
         self.db = get_db_connection()
+        self.query_cache = get_query_cache()
+        self.stage_workers = {
+            "parse": config.index_parse_workers,
+            "chunk": 1,
+            "embed": config.index_embed_workers,
+            "extract": config.index_extract_workers,
+            "write": config.index_write_workers,
+        }
+        self.queue_size = config.index_queue_size
+        self.chunk_batch_size = config.index_chunk_batch_size
+        self.checkpoint_dir = config.index_checkpoint_dir
+        self.progress_interval = config.index_progress_interval
+        self.kg_extraction_mode = config.kg_extraction_mode
+        self.last_report: Optional[Dict] = None
+        self._job_lock = threading.Lock()
 
     def index_document(self, collection_name: str, file_path: str) -> str:
         """
@@ -46,61 +118,234 @@ class IndexingService:
             FileProcessingError: If document processing fails
             CollectionNotFoundError: If collection doesn't exist
         """
+        logger.info(f"Starting indexing process for {file_path} into collection {collection_name}")
         try:
-            logger.info(f"Starting indexing process for {file_path} into collection {collection_name}")
-
-            # Step 1: Parse PDF document
-            text_content = self.pdf_parser.parse_pdf(file_path)
-            metadata = self.pdf_parser.get_pdf_metadata(file_path)
+            job = self._run_pipeline(collection_name, [file_path])[0]
+        except Exception as e:
+            logger.error(f"Failed to index document {file_path}: {e}")
+            raise FileProcessingError(file_path, f"Failed to index document: {str(e)}")
 
-            # Step 2: Create or get collection
-            collection = self._get_or_create_collection(collection_name)
+        if not job.done:
+            raise FileProcessingError(file_path, f"Failed to index document: {str(job.error)}")
+        return job.document_id
 
-            # Step 3: Create document record
-            document = Document(
-                collection_id=collection.id,
-                file_path=file_path,
-                title=metadata.get("title") if metadata else None
-            )
+    def _run_pipeline(self, collection_name: str, file_paths: List[str],
+                      checkpoint: Optional[CheckpointStore] = None) -> List[_DocumentJob]:
+        """
+        Run documents through the indexing pipeline.
 
-            # Save document to database (simplified - in real implementation would use DB)
-            logger.info(f"Created document record: {document.id}")
+        Args:
+            collection_name: Name of the document collection
+            file_paths: Paths to the PDF files
+            checkpoint: Checkpoint of the batch (optional); finished documents
+                are skipped and started ones keep their document ID
 
-            # Step 4: Split document into chunks
+        Returns:
+            One job per file path, in input order
+        """
+        collection = self._get_or_create_collection(collection_name)
+        jobs = []
+        for file_path in file_paths:
+            key = _checkpoint_key(file_path) if checkpoint else None
+            entry = checkpoint.get(key) if checkpoint else None
+            if entry and entry.get("status") == "done":
+                job = _DocumentJob(collection, file_path, entry["document_id"])
+                job.done = True
+                logger.info(f"Skipping {file_path}, already indexed as {job.document_id}")
+            else:
+                job = _DocumentJob(collection, file_path,
+                                   entry.get("document_id") if entry else None, resumed=bool(entry))
+            job.checkpoint_key = key
+            jobs.append(job)
+
+        # The knowledge graph and document records link to Chunk nodes, so they
+        # are only stored when chunks live in the graph database
+        use_graph = self.vector_search.store.backend == "graph"
+        if not use_graph:
+            logger.warning("Graph database unavailable, documents and knowledge graphs will not be stored")
+
+        def parse(job: _DocumentJob):
+            job.text = self.pdf_parser.parse_pdf(job.file_path)
+            job.metadata = self.pdf_parser.get_pdf_metadata(job.file_path) or {}
+            job.document = Document(
+                collection_id=job.collection.id,
+                file_path=job.file_path,
+                title=job.metadata.get("title"),
+                id=job.document_id
+            )
+            job.document_id = job.document.id
+            if checkpoint:
+                checkpoint.update(job.checkpoint_key, document_id=job.document_id, status="started")
+            logger.info(f"Created document record: {job.document_id}")
+            return [job]
+
+        def chunk(job: _DocumentJob):
+            if use_graph and job.resumed:
+                # Runs before any batch of the document is emitted, so it can
+                # only remove chunks left by the interrupted run
+                self._delete_document_chunks(job.collection.name, job.document_id)
+                job.resumed = False
             chunks = self.document_chunker.chunk_document(
-                document_id=document.id,
-                text=text_content,
-                metadata=metadata
+                document_id=job.document_id,
+                text=job.text,
+                metadata=job.metadata
             )
-
-            # Step 5: Generate embeddings and extract knowledge graph for each chunk
-            chunk_ids = [chunk.id for chunk in chunks]
-            chunk_texts = [chunk.content for chunk in chunks]
-
-            # Generate embeddings
-            embeddings = self.embedding_generator.generate_embeddings(chunk_ids, chunk_texts)
-
-            # Extract knowledge graph entities and relationships
-            all_entities = []
-            all_relationships = []
-
-            for chunk in chunks:
+            job.text = ""
+            job.chunk_count = len(chunks)
+            batches = [
+                _ChunkBatch(job, chunks[start:start + self.chunk_batch_size])
+                for start in range(0, len(chunks), self.chunk_batch_size)
+            ] or [_ChunkBatch(job, [])]
+            job.pending_batches = len(batches)
+            return batches
+
+        def embed(batch: _ChunkBatch):
+            if batch.job.error is not None or not batch.chunks:
+                return [batch]
+            batch.embeddings = self.embedding_generator.generate_embeddings(
+                [c.id for c in batch.chunks], [c.content for c in batch.chunks]
+            )
+            return [batch]
+
+        def extract(batch: _ChunkBatch):
+            if batch.job.error is not None:
+                return [batch]
+            if self.kg_extraction_mode == "batched":
+                extraction = self.kg_extractor.extract_batch([(c.id, c.content) for c in batch.chunks])
+                batch.entities.extend(extraction.entities)
+                batch.relationships.extend(extraction.relationships)
+                batch.llm_calls = extraction.llm_calls
+                return [batch]
+            for c in batch.chunks:
                 entities, relationships = self.kg_extractor.extract_entities_and_relationships(
-                    chunk.id, chunk.content
+                    c.id, c.content
                 )
-                all_entities.extend(entities)
-                all_relationships.extend(relationships)
-
-            # Step 6: Store all data (simplified - in real implementation would use DB)
-            logger.info(f"Processed {len(chunks)} chunks, {len(embeddings)} embeddings, "
-                       f"{len(all_entities)} entities, and {len(all_relationships)} relationships")
-
-            logger.info(f"Successfully indexed document {document.id} into collection {collection_name}")
-            return document.id
+                batch.entities.extend(entities)
+                batch.relationships.extend(relationships)
+            batch.llm_calls = 2 * len(batch.chunks)
+            return [batch]
+
+        def write(batch: _ChunkBatch):
+            job = batch.job
+            if job.error is not None:
+                return []
+            with self._job_lock:
+                job.ready_batches.append(batch)
+                job.pending_batches -= 1
+                finished = job.pending_batches == 0
+            if not finished or job.error is not None:
+                return []
+
+            batches, job.ready_batches = job.ready_batches, []
+            try:
+                for ready in batches:
+                    self.vector_search.add_embeddings(job.collection.name, ready.chunks, ready.embeddings)
+                    if use_graph and ready.entities:
+                        self.graph_search.add_knowledge_graph(
+                            job.collection.name, ready.entities, ready.relationships
+                        )
+                    job.entity_count += len(ready.entities)
+                    job.relationship_count += len(ready.relationships)
+                    job.extraction_calls += ready.llm_calls
+                if use_graph:
+                    self._write_documents([job])
+            except Exception:
+                self._discard_chunks(
+                    job, [c.id for ready in batches for c in ready.chunks], use_graph
+                )
+                raise
+            finally:
+                # Searches cached before this write would miss the new chunks
+                self.query_cache.bump_version(job.collection.name)
+
+            if checkpoint:
+                checkpoint.update(job.checkpoint_key, status="done")
+            job.done = True
+            logger.info(f"Processed {job.chunk_count} chunks, {job.entity_count} entities, "
+                        f"and {job.relationship_count} relationships with {job.extraction_calls} "
+                        f"extraction calls")
+            logger.info(f"Successfully indexed document {job.document_id} into collection {collection_name}")
+            return [job]
+
+        def on_error(stage_name: str, item, error: Exception) -> None:
+            job = item.job if isinstance(item, _ChunkBatch) else item
+            if job.error is None:
+                job.error = error
+                logger.error(f"Failed to index document {job.file_path} in {stage_name} stage: {error}")
+
+        def chunk_units(batch: _ChunkBatch) -> int:
+            return len(batch.chunks)
+
+        pipeline = StagedPipeline(
+            [
+                Stage("parse", parse, self.stage_workers["parse"]),
+                Stage("chunk", chunk, self.stage_workers["chunk"]),
+                Stage("embed", embed, self.stage_workers["embed"], units=chunk_units),
+                Stage("extract", extract, self.stage_workers["extract"], units=chunk_units),
+                Stage("write", write, self.stage_workers["write"], units=chunk_units),
+            ],
+            queue_size=self.queue_size,
+            on_error=on_error,
+            progress_interval=self.progress_interval or None,
+        )
+        pipeline.run(job for job in jobs if not job.done)
+
+        self.last_report = pipeline.report()
+        self.last_report["documents"] = [{
+            "file_path": job.file_path,
+            "document_id": job.document_id,
+            "indexed": job.done,
+            "chunks": job.chunk_count,
+            "extraction_calls": job.extraction_calls,
+        } for job in jobs]
+        pipeline.log_progress()
+        return jobs
+
+    def _write_documents(self, jobs: List[_DocumentJob]) -> None:
+        """Store document records and link them to their collection."""
+        query = """
+        UNWIND $documents AS doc
+        MERGE (col:Collection {id: doc.collection_id})
+        ON CREATE SET col.name = doc.collection_name
+        MERGE (d:Document {id: doc.id})
+        SET d.file_path = doc.file_path, d.title = doc.title, d.collection_name = doc.collection_name,
+            d.chunk_count = doc.chunk_count, d.created_at = doc.created_at
+        MERGE (d)-[:IN_COLLECTION]->(col)
+        """
+        documents = [{
+            "id": job.document_id,
+            "collection_id": job.collection.id,
+            "collection_name": job.collection.name,
+            "file_path": job.file_path,
+            "title": job.document.title,
+            "chunk_count": job.chunk_count,
+            "created_at": job.document.created_at.isoformat(),
+        } for job in jobs]
+        driver = self.db.connect()
+        with driver.session() as session:
+            session.execute_write(lambda tx: tx.run(query, documents=documents).consume())
+
+    def _delete_document_chunks(self, collection_name: str, document_id: str) -> None:
+        """Remove chunks, and their knowledge graph, left by an interrupted run before a document is rewritten."""
+        query = "MATCH (c:Chunk {document_id: $document_id}) RETURN c.id AS chunk_id"
+        driver = self.db.connect()
+        with driver.session() as session:
+            chunk_ids = session.execute_read(
+                lambda tx: [record["chunk_id"] for record in tx.run(query, document_id=document_id)]
+            )
+        self.graph_search.remove_chunks(collection_name, chunk_ids)
+        self.vector_search.delete_embeddings(chunk_ids)
+        logger.info(f"Removed {len(chunk_ids)} chunks of interrupted document {document_id}")
 
+    def _discard_chunks(self, job: _DocumentJob, chunk_ids: List[str], use_graph: bool) -> None:
+        """Remove the embeddings and knowledge graph a failed write of a document left behind."""
+        try:
+            # The knowledge graph is found through the Chunk nodes, so it goes first
+            if use_graph:
+                self.graph_search.remove_chunks(job.collection.name, chunk_ids)
+            self.vector_search.delete_embeddings(chunk_ids)
         except Exception as e:
-            logger.error(f"Failed to index document {file_path}: {e}")
-            raise FileProcessingError(file_path, f"Failed to index document: {str(e)}")
+            logger.error(f"Failed to remove chunks of failed document {job.document_id}: {e}")
 
     def _get_or_create_collection(self, collection_name: str) -> DocumentCollection:
         """
@@ -118,31 +363,55 @@ class IndexingService:
         logger.info(f"Created collection: {collection.id}")
         return collection
 
-    def index_documents_batch(self, collection_name: str, file_paths: List[str]) -> List[str]:
+    def index_documents_batch(self, collection_name: str, file_paths: List[str],
+                              resume: bool = True) -> List[str]:
         """
         Index multiple documents in batch.
 
+        Documents are processed concurrently by the indexing pipeline, and
+        progress is checkpointed under INDEX_CHECKPOINT_DIR: rerunning an
+        interrupted batch skips the documents it already indexed. The
+        checkpoint is removed once every document succeeded.
+
         Args:
             collection_name: Name of the document collection
             file_paths: List of paths to PDF files
+            resume: Whether to resume from an existing checkpoint of this batch
 
         Returns:
             List of indexed document IDs
         """
-        document_ids = []
-        for file_path in file_paths:
-            try:
-                document_id = self.index_document(collection_name, file_path)
-                document_ids.append(document_id)
-            except Exception as e:
-                logger.error(f"Failed to index document {file_path}: {e}")
-                # Continue with other documents
-                continue
-
+        checkpoint = None
+        if self.checkpoint_dir:
+            checkpoint = CheckpointStore(os.path.join(
+                self.checkpoint_dir, _batch_checkpoint_name(collection_name, file_paths)
+            ))
+            if not resume:
+                checkpoint.remove()
+
+        jobs = self._run_pipeline(collection_name, file_paths, checkpoint)
+        document_ids = [job.document_id for job in jobs if job.done]
+
+        if checkpoint and len(document_ids) == len(file_paths):
+            checkpoint.remove()
         logger.info(f"Batch indexing completed. Indexed {len(document_ids)} out of {len(file_paths)} documents")
         return document_ids
 
 
+def _checkpoint_key(file_path: str) -> str:
+    """Key a file by path and content, so edited files are indexed again."""
+    try:
+        return f"{os.path.abspath(file_path)}:{generate_file_hash(file_path)}"
+    except Exception:
+        return os.path.abspath(file_path)
+
+
+def _batch_checkpoint_name(collection_name: str, file_paths: List[str]) -> str:
+    """Name the checkpoint file of a batch after its collection and files."""
+    digest = hashlib.sha256("\n".join([collection_name] + sorted(file_paths)).encode("utf-8"))
+    return f"{digest.hexdigest()[:16]}.json"
+
+
 # Global indexing service instance
 indexing_service = IndexingService()
 
@@ -2,7 +2,11 @@
 Knowledge graph extraction service for the RAG backend system.
 """
 
-from typing import List, Tuple
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.lib.config import get_config
 from src.lib.rerank_client import get_rerank_client
 from src.lib.llm_client import get_llm_client
 from src.lib.exceptions import LLMGenerationError
@@ -13,14 +17,109 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+ENTITY_TYPES = ("person", "organization", "location", "concept", "other")
+
+# Bumped whenever the batched prompt changes, so cached results are not reused
+EXTRACTION_PROMPT_VERSION = 1
+
+# Schema of a batched extraction response, quoted in the prompt and checked
+# by _validate_extraction
+EXTRACTION_SCHEMA = {
+    "type": "object",
+    "required": ["chunks"],
+    "properties": {
+        "chunks": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["chunk", "entities", "relationships"],
+                "properties": {
+                    "chunk": {"type": "string"},
+                    "entities": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["name", "type"],
+                            "properties": {
+                                "name": {"type": "string"},
+                                "type": {"enum": list(ENTITY_TYPES)},
+                                "description": {"type": "string"},
+                            },
+                        },
+                    },
+                    "relationships": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["source", "target", "type"],
+                            "properties": {
+                                "source": {"type": "string"},
+                                "target": {"type": "string"},
+                                "type": {"type": "string"},
+                                "description": {"type": "string"},
+                            },
+                        },
+                    },
+                },
+            },
+        }
+    },
+}
+
+
+class ExtractionBatch:
+    """Result of extracting a group of chunks."""
+
+    def __init__(self):
+        self.results: Dict[str, Tuple[List[KnowledgeGraphNode], List[KnowledgeGraphRelationship]]] = {}
+        self.llm_calls = 0
+        self.cache_hits = 0
+
+    @property
+    def entities(self) -> List[KnowledgeGraphNode]:
+        """All extracted entities."""
+        return [entity for entities, _ in self.results.values() for entity in entities]
+
+    @property
+    def relationships(self) -> List[KnowledgeGraphRelationship]:
+        """All extracted relationships."""
+        return [relationship for _, relationships in self.results.values() for relationship in relationships]
+
 
 class KnowledgeGraphExtractor:
-    """Service for extracting entities and relationships from document chunks."""
+    """Service for extracting entities and relationships from document chunks.
 
-    def __init__(self):
-        """Initialize the KnowledgeGraphExtractor."""
+    extract_entities_and_relationships asks the LLM for the entities and
+    then the relationships of one chunk. extract_batch packs several chunks
+    into one JSON-mode request returning both, attributed to each chunk,
+    validates the response against EXTRACTION_SCHEMA, and caches results by
+    chunk text hash, so repeated chunks cost no calls.
+    """
+
+    def __init__(self, llm_client=None, chunks_per_request: Optional[int] = None,
+                 max_request_chars: Optional[int] = None, cache_size: Optional[int] = None):
+        """
+        Initialize the KnowledgeGraphExtractor.
+
+        Args:
+            llm_client: LLM client (defaults to the global client)
+            chunks_per_request: Most chunks packed into one batched request
+                (defaults to KG_CHUNKS_PER_REQUEST)
+            max_request_chars: Most chunk characters packed into one batched
+                request (defaults to KG_MAX_REQUEST_CHARS)
+            cache_size: Chunk results kept in the cache (defaults to KG_CACHE_SIZE)
+        """
+        config = get_config()
         self.rerank_client = get_rerank_client()
-        self.llm_client = get_llm_client()
+        self.llm_client = llm_client or get_llm_client()
+        self.chunks_per_request = chunks_per_request or config.kg_chunks_per_request
+        self.max_request_chars = max_request_chars or config.kg_max_request_chars
+        self.cache_size = config.kg_cache_size if cache_size is None else cache_size
+        self._cache: "OrderedDict[str, Dict[str, list]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.chunks_extracted = 0
+        self.cache_hits = 0
 
     def extract_entities_and_relationships(self, chunk_id: str, text: str) -> Tuple[List[KnowledgeGraphNode], List[KnowledgeGraphRelationship]]:
         """
@@ -122,6 +221,141 @@ class KnowledgeGraphExtractor:
             # Return empty lists on failure
             return [], []
 
+    def extract_batch(self, chunks: Sequence[Tuple[str, str]]) -> ExtractionBatch:
+        """
+        Extract entities and relationships from several chunks at once.
+
+        Chunks are packed into requests of at most chunks_per_request chunks
+        and max_request_chars characters. A request whose response is not
+        valid is split in half and retried; a chunk that still fails on its
+        own gets empty results, as in extract_entities_and_relationships.
+
+        Args:
+            chunks: (chunk_id, text) pairs
+
+        Returns:
+            ExtractionBatch with per-chunk results and the number of LLM calls made
+        """
+        batch = ExtractionBatch()
+        pending: Dict[str, List[str]] = OrderedDict()
+        texts: Dict[str, str] = {}
+        for chunk_id, text in chunks:
+            key = self._cache_key(text)
+            cached = self._cache_get(key)
+            if cached is not None:
+                batch.results[chunk_id] = _build_graph(chunk_id, cached)
+                batch.cache_hits += 1
+            else:
+                # Chunks with the same text share one extraction
+                pending.setdefault(key, []).append(chunk_id)
+                texts[key] = text
+
+        group: List[str] = []
+        size = 0
+        for key in pending:
+            length = len(texts[key])
+            if group and (len(group) >= self.chunks_per_request or size + length > self.max_request_chars):
+                self._extract_group(group, texts, pending, batch)
+                group, size = [], 0
+            group.append(key)
+            size += length
+        if group:
+            self._extract_group(group, texts, pending, batch)
+
+        with self._lock:
+            self.llm_calls += batch.llm_calls
+            self.cache_hits += batch.cache_hits
+            self.chunks_extracted += len(batch.results)
+        logger.info(f"Extracted knowledge graph from {len(batch.results)} chunks with "
+                    f"{batch.llm_calls} LLM calls and {batch.cache_hits} cache hits")
+        return batch
+
+    def _extract_group(self, keys: List[str], texts: Dict[str, str],
+                       pending: Dict[str, List[str]], batch: ExtractionBatch) -> None:
+        """Extract one request's worth of chunks, splitting it on invalid responses."""
+        labels = {f"C{i + 1}": key for i, key in enumerate(keys)}
+        batch.llm_calls += 1
+        try:
+            response = self.llm_client.generate_completion(
+                self._batch_prompt({label: texts[key] for label, key in labels.items()}),
+                temperature=0.0,
+                max_tokens=min(1000 * len(keys), 8000),
+                response_format={"type": "json_object"}
+            )
+            extracted = _validate_extraction(json.loads(response), set(labels))
+        except Exception as e:
+            extracted = {}
+            logger.warning(f"Batched extraction of {len(keys)} chunks failed: {e}")
+
+        missing = [key for label, key in labels.items() if label not in extracted]
+        for label, data in extracted.items():
+            key = labels[label]
+            self._cache_put(key, data)
+            for chunk_id in pending[key]:
+                batch.results[chunk_id] = _build_graph(chunk_id, data)
+
+        if missing and len(keys) > 1:
+            middle = (len(missing) + 1) // 2
+            for part in (missing[:middle], missing[middle:]):
+                if part:
+                    self._extract_group(part, texts, pending, batch)
+        elif missing:
+            for chunk_id in pending[missing[0]]:
+                logger.warning(f"Failed to extract knowledge graph from chunk {chunk_id}, using empty lists")
+                batch.results[chunk_id] = ([], [])
+
+    def _batch_prompt(self, texts: Dict[str, str]) -> str:
+        """Build the prompt of a batched extraction request."""
+        blocks = "\n".join(
+            f'<chunk id="{label}">\n{text.replace("</chunk>", "</ chunk>")}\n</chunk>'
+            for label, text in texts.items()
+        )
+        return f"""Extract named entities and the relationships between them from each chunk below.
+Treat every chunk on its own: entities and relationships must come from that chunk's text, and a
+relationship's source and target must be names of entities of the same chunk.
+Return one JSON object matching this JSON schema, with one item per chunk id:
+{json.dumps(EXTRACTION_SCHEMA)}
+
+{blocks}
+"""
+
+    def _cache_key(self, text: str) -> str:
+        """Key a chunk by its text, the model and the prompt version."""
+        model = getattr(self.llm_client, "model", "")
+        return hashlib.sha256(f"{model}:{EXTRACTION_PROMPT_VERSION}:{text}".encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, list]]:
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+            return data
+
+    def _cache_put(self, key: str, data: Dict[str, list]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = data
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batched extraction counters.
+
+        Returns:
+            Dictionary with LLM calls, chunks extracted, cache hits and calls per chunk
+        """
+        with self._lock:
+            return {
+                "llm_calls": self.llm_calls,
+                "chunks_extracted": self.chunks_extracted,
+                "cache_hits": self.cache_hits,
+                "cache_entries": len(self._cache),
+                "calls_per_chunk": self.llm_calls / self.chunks_extracted if self.chunks_extracted else None,
+            }
+
     def extract_entities(self, chunk_id: str, text: str) -> List[KnowledgeGraphNode]:
         """
         Extract entities from a text chunk.
@@ -152,6 +386,88 @@ class KnowledgeGraphExtractor:
         return relationships
 
 
+def _validate_extraction(data: Any, labels: set) -> Dict[str, Dict[str, list]]:
+    """
+    Check a batched extraction response against EXTRACTION_SCHEMA.
+
+    Malformed items inside a valid chunk are dropped, unknown entity types
+    become "other", and relationships must connect entities of their chunk.
+
+    Args:
+        data: Decoded JSON response
+        labels: Chunk ids sent in the request
+
+    Returns:
+        Cleaned {"entities": [...], "relationships": [...]} per chunk id
+
+    Raises:
+        ValueError: If the response does not have the expected structure
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("chunks"), list):
+        raise ValueError("response must be an object with a 'chunks' array")
+
+    extracted = {}
+    for item in data["chunks"]:
+        if not isinstance(item, dict) or item.get("chunk") not in labels:
+            continue
+        if not isinstance(item.get("entities"), list) or not isinstance(item.get("relationships"), list):
+            continue
+
+        entities = {}
+        for entity in item["entities"]:
+            if not isinstance(entity, dict) or not isinstance(entity.get("name"), str) or not entity["name"].strip():
+                continue
+            entity_type = entity.get("type")
+            entities.setdefault(entity["name"].strip().lower(), {
+                "name": entity["name"].strip(),
+                "type": entity_type if entity_type in ENTITY_TYPES else "other",
+                "description": entity.get("description") if isinstance(entity.get("description"), str) else "",
+            })
+
+        relationships = []
+        for relationship in item["relationships"]:
+            if not isinstance(relationship, dict):
+                continue
+            source, target, relationship_type = (
+                relationship.get("source"), relationship.get("target"), relationship.get("type")
+            )
+            if not all(isinstance(value, str) for value in (source, target, relationship_type)):
+                continue
+            if source.strip().lower() not in entities or target.strip().lower() not in entities:
+                continue
+            relationships.append({
+                "source": source.strip().lower(),
+                "target": target.strip().lower(),
+                "type": relationship_type,
+                "description": relationship.get("description") if isinstance(relationship.get("description"), str) else "",
+            })
+
+        extracted[item["chunk"]] = {"entities": list(entities.values()), "relationships": relationships}
+    return extracted
+
+
+def _build_graph(chunk_id: str, data: Dict[str, list]) -> Tuple[List[KnowledgeGraphNode], List[KnowledgeGraphRelationship]]:
+    """Create the nodes and relationships of a chunk from validated extraction data."""
+    nodes = {}
+    for entity in data["entities"]:
+        nodes[entity["name"].lower()] = KnowledgeGraphNode(
+            chunk_id=chunk_id,
+            entity_type=entity["type"],
+            name=entity["name"],
+            description=entity["description"]
+        )
+    relationships = [
+        KnowledgeGraphRelationship(
+            source_node_id=nodes[relationship["source"]].id,
+            target_node_id=nodes[relationship["target"]].id,
+            relationship_type=relationship["type"],
+            description=relationship["description"]
+        )
+        for relationship in data["relationships"]
+    ]
+    return list(nodes.values()), relationships
+
+
 # Global knowledge graph extractor instance
 kg_extractor = KnowledgeGraphExtractor()
 
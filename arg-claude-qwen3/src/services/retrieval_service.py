@@ -2,11 +2,18 @@
 Hybrid retrieval service for the RAG backend system.
 """
 
-from typing import List, Tuple
+import hashlib
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from src.services.query_expander import get_query_expander
 from src.services.vector_search import get_vector_search_service
 from src.services.graph_search import get_graph_search_service
+from src.lib.cache import TTLCache
+from src.lib.config import get_config
+from src.lib.monitoring import DEFAULT_LATENCY_BUCKETS, Histogram
+from src.lib.query_cache import get_query_cache
 from src.lib.rerank_client import get_rerank_client
+from src.lib.utils import truncate_to_token_budget
 from src.models.query import Query
 from src.models.retrieval_result import RetrievalResult
 from src.lib.exceptions import SearchError
@@ -16,14 +23,34 @@ logger = logging.getLogger(__name__)
 
 
 class RetrievalService:
-    """Service for performing hybrid retrieval combining vector and graph search."""
+    """Service for performing hybrid retrieval combining vector and graph search.
+
+    Reranking scores the candidates' stored chunk texts, fetched in one
+    lookup and cut to RERANK_MAX_TOKENS, in requests of RERANK_BATCH_SIZE.
+    Scores are cached per (query, chunk) for RERANK_CACHE_TTL seconds, and
+    candidate sets smaller than RERANK_MIN_CANDIDATES are not reranked.
+
+    Final results are cached in a QueryResultCache keyed by the normalized
+    query, the search options and the collection's corpus version, so a
+    repeated question skips expansion, search and reranking entirely.
+    Results of a search that fell back because a step failed are not
+    cached, so the next identical query tries the full search again.
+    """
 
     def __init__(self):
         """Initialize the RetrievalService."""
+        config = get_config()
         self.query_expander = get_query_expander()
         self.vector_search = get_vector_search_service()
         self.graph_search = get_graph_search_service()
         self.rerank_client = get_rerank_client()
+        self.rerank_min_candidates = config.rerank_min_candidates
+        self.rerank_max_tokens = config.rerank_max_tokens
+        self.rerank_batch_size = config.rerank_batch_size
+        self.rerank_cache = TTLCache(config.rerank_cache_size, config.rerank_cache_ttl)
+        self.rerank_latency = Histogram(DEFAULT_LATENCY_BUCKETS)
+        self.rerank_skipped = 0
+        self.query_cache = get_query_cache()
 
     def hybrid_search(self, query_text: str, collection_name: str, top_k: int = 5,
                      enable_query_expansion: bool = True, enable_reranking: bool = True,
@@ -47,46 +74,27 @@ class RetrievalService:
             SearchError: If search fails
         """
         try:
-            # Step 1: Expand query if enabled
-            if enable_query_expansion:
-                expanded_query = self.query_expander.expand_query(query_text)
-                logger.info(f"Expanded query: {query_text} -> {expanded_query}")
-                search_query = expanded_query
+            cache_key = self.query_cache.make_key(query_text, collection_name, {
+                "top_k": top_k,
+                "query_expansion": enable_query_expansion,
+                "reranking": enable_reranking,
+                "vector_search": enable_vector_search,
+                "graph_search": enable_graph_search,
+            })
+            final_results = self.query_cache.get(cache_key)
+            if final_results is not None:
+                logger.info(f"Served query '{query_text}' from the result cache")
             else:
-                search_query = query_text
-
-            # Step 2: Perform vector search if enabled
-            vector_results = []
-            if enable_vector_search:
-                vector_results = self.vector_search.search_by_vector(
-                    search_query, collection_name, top_k * 2  # Get more results for reranking
+                final_results, degraded = self._search(
+                    query_text, collection_name, top_k, enable_query_expansion,
+                    enable_reranking, enable_vector_search, enable_graph_search
                 )
-                logger.info(f"Vector search returned {len(vector_results)} results")
-
-            # Step 3: Perform graph search if enabled
-            graph_results = []
-            if enable_graph_search:
-                # Extract entities from query for graph search
-                entities = self._extract_entities_from_query(search_query)
-                if entities:
-                    graph_results = self.graph_search.search_by_entities(
-                        entities, collection_name, top_k * 2
-                    )
-                    logger.info(f"Graph search returned {len(graph_results)} results")
-
-            # Step 4: Combine results
-            combined_results = self._combine_results(vector_results, graph_results, top_k * 2)
-
-            # Step 5: Re-rank results if enabled
-            if enable_reranking and combined_results:
-                reranked_results = self._rerank_results(search_query, combined_results, top_k)
-                logger.info(f"Re-ranked results from {len(combined_results)} to {len(reranked_results)}")
-                final_results = reranked_results
-            else:
-                # Just take top_k results
-                final_results = combined_results[:top_k]
+                if degraded:
+                    logger.info(f"Not caching results of query '{query_text}', degraded steps: {degraded}")
+                else:
+                    self.query_cache.put(cache_key, collection_name, final_results)
 
-            # Step 6: Convert to RetrievalResult objects
+            # Convert to RetrievalResult objects
             query_obj = Query(content=query_text)
             retrieval_results = []
             for i, (chunk_id, score) in enumerate(final_results):
@@ -105,21 +113,81 @@ class RetrievalService:
             logger.error(f"Hybrid search failed for query '{query_text}': {e}")
             raise SearchError(f"Hybrid search failed: {str(e)}")
 
-    def _extract_entities_from_query(self, query: str) -> List[str]:
+    def _search(self, query_text: str, collection_name: str, top_k: int, enable_query_expansion: bool,
+                enable_reranking: bool, enable_vector_search: bool,
+                enable_graph_search: bool) -> Tuple[List[Tuple[str, float]], List[str]]:
         """
-        Extract potential entities from a query.
+        Run the search steps of hybrid_search.
+
+        Returns:
+            Tuple of (chunk_id, score) tuples, best first, and the names of
+            steps that failed and fell back to a degraded result
+        """
+        degraded: List[str] = []
+        # Step 1: Expand query if enabled
+        if enable_query_expansion:
+            expanded_query = self.query_expander.expand_query(query_text)
+            logger.info(f"Expanded query: {query_text} -> {expanded_query}")
+            search_query = expanded_query
+        else:
+            search_query = query_text
+
+        # Step 2: Perform vector search if enabled
+        vector_results = []
+        if enable_vector_search:
+            vector_results = self.vector_search.search_by_vector(
+                search_query, collection_name, top_k * 2  # Get more results for reranking
+            )
+            logger.info(f"Vector search returned {len(vector_results)} results")
+
+        # Step 3: Perform graph search if enabled
+        graph_results = []
+        if enable_graph_search:
+            # Extract entities from query for graph search
+            entities = self._extract_entities_from_query(search_query, collection_name, degraded)
+            if entities:
+                graph_results = self.graph_search.search_by_entities(
+                    entities, collection_name, top_k * 2
+                )
+                logger.info(f"Graph search returned {len(graph_results)} results")
+
+        # Step 4: Combine results
+        combined_results = self._combine_results(vector_results, graph_results, top_k * 2)
+
+        # Step 5: Re-rank results if enabled
+        if enable_reranking and combined_results:
+            reranked_results = self._rerank_results(search_query, combined_results, top_k, degraded)
+            logger.info(f"Re-ranked results from {len(combined_results)} to {len(reranked_results)}")
+            final_results = reranked_results
+        else:
+            # Just take top_k results
+            final_results = combined_results[:top_k]
+
+        return final_results, degraded
+
+    def _extract_entities_from_query(self, query: str, collection_name: str,
+                                     degraded: Optional[List[str]] = None) -> List[str]:
+        """
+        Extract the collection's known entities from a query.
+
+        Entities are found with the collection's entity dictionary, so names
+        are matched regardless of case or script.
 
         Args:
             query: Query text
+            collection_name: Name of the collection whose entities to link
+            degraded: List that "entity_linking" is appended to if linking fails (optional)
 
         Returns:
-            List of potential entity names
+            List of normalized entity names (empty if the graph is unavailable)
         """
-        # Simple entity extraction - in real implementation would use NER
-        # For now, just split by common delimiters and filter
-        import re
-        words = re.findall(r'\b[A-Z][a-z]*\b', query)
-        return words[:10]  # Limit to first 10 potential entities
+        try:
+            return self.graph_search.link_entities(query, collection_name, limit=10)
+        except SearchError as e:
+            logger.warning(f"Entity linking unavailable for collection {collection_name}: {e}")
+            if degraded is not None:
+                degraded.append("entity_linking")
+            return []
 
     def _combine_results(self, vector_results: List[Tuple[str, float]],
                         graph_results: List[Tuple[str, float]], max_results: int) -> List[Tuple[str, float]]:
@@ -150,44 +218,95 @@ class RetrievalService:
         sorted_results = sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
         return sorted_results[:max_results]
 
-    def _rerank_results(self, query: str, results: List[Tuple[str, float]], top_k: int) -> List[Tuple[str, float]]:
+    def _rerank_results(self, query: str, results: List[Tuple[str, float]], top_k: int,
+                        degraded: Optional[List[str]] = None) -> List[Tuple[str, float]]:
         """
         Re-rank results using the reranking service.
 
+        Candidates whose text cannot be found keep their order after the
+        reranked ones.
+
         Args:
             query: Original query
             results: List of (chunk_id, score) tuples
             top_k: Number of results to return
+            degraded: List that "reranking" is appended to if reranking fails (optional)
 
         Returns:
             Re-ranked results
         """
         if not results:
             return []
+        if len(results) < self.rerank_min_candidates:
+            self.rerank_skipped += 1
+            logger.info(f"Skipped reranking of {len(results)} candidates")
+            return results[:top_k]
 
+        start = time.perf_counter()
         try:
-            # Get document contents for reranking (simplified - would query DB in real implementation)
-            documents = [f"Document content for chunk {chunk_id}" for chunk_id, _ in results]
-
-            # Perform reranking
-            reranked = self.rerank_client.rerank(query, documents)
-
-            # Map back to chunk_ids and sort
-            reranked_results = []
-            for item in reranked:
-                index = item["index"]
-                chunk_id = results[index][0]
-                score = item["relevance_score"]
-                reranked_results.append((chunk_id, score))
-
-            # Sort by reranked scores and limit
-            reranked_results.sort(key=lambda x: x[1], reverse=True)
+            query_key = hashlib.sha256(f"{self.rerank_client.model}\n{query}".encode("utf-8")).hexdigest()
+            scores: Dict[str, float] = {}
+            for chunk_id, _ in results:
+                score = self.rerank_cache.get((query_key, chunk_id))
+                if score is not None:
+                    scores[chunk_id] = score
+
+            missing = [chunk_id for chunk_id, _ in results if chunk_id not in scores]
+            texts = self.vector_search.get_chunk_texts(missing) if missing else {}
+            to_score = [chunk_id for chunk_id in missing if texts.get(chunk_id)]
+            if to_score:
+                documents = [truncate_to_token_budget(texts[chunk_id], self.rerank_max_tokens)
+                             for chunk_id in to_score]
+                for chunk_id, score in zip(
+                    to_score, self.rerank_client.rerank_scores(query, documents, self.rerank_batch_size)
+                ):
+                    scores[chunk_id] = score
+                    self.rerank_cache.put((query_key, chunk_id), score)
+
+            reranked_results = sorted(
+                ((chunk_id, scores[chunk_id]) for chunk_id, _ in results if chunk_id in scores),
+                key=lambda x: x[1], reverse=True
+            )
+            reranked_results += [(chunk_id, score) for chunk_id, score in results if chunk_id not in scores]
+            elapsed = time.perf_counter() - start
+            self.rerank_latency.observe(elapsed)
+            logger.info(f"Reranked {len(results)} candidates ({len(results) - len(missing)} cached, "
+                        f"{len(to_score)} scored) in {elapsed * 1000:.1f} ms")
             return reranked_results[:top_k]
 
         except Exception as e:
             logger.warning(f"Reranking failed, returning original results: {e}")
+            if degraded is not None:
+                degraded.append("reranking")
             return results[:top_k]
 
+    def get_rerank_stats(self) -> Dict[str, Any]:
+        """
+        Get the latency cost and cache use of reranking.
+
+        Returns:
+            Dictionary with reranked and skipped query counts, latency
+            percentiles and score cache statistics
+        """
+        percentiles = self.rerank_latency.percentiles()
+        return {
+            "reranked_queries": self.rerank_latency.count,
+            "skipped_queries": self.rerank_skipped,
+            "latency_p50": percentiles["p50"],
+            "latency_p95": percentiles["p95"],
+            "latency_p99": percentiles["p99"],
+            "cache": self.rerank_cache.get_stats(),
+        }
+
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get the hit ratios of the query result cache.
+
+        Returns:
+            Dictionary of QueryResultCache statistics
+        """
+        return self.query_cache.get_stats()
+
 
 # Global retrieval service instance
 retrieval_service = RetrievalService()
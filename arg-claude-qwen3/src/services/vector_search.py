@@ -2,10 +2,17 @@
 Vector search service for the RAG backend system.
 """
 
-from typing import List, Tuple
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.lib.config import get_config
 from src.lib.database import get_db_connection
 from src.lib.embedding_client import get_embedding_client
-from src.models.retrieval_result import RetrievalResult
+from src.lib.monitoring import DEFAULT_LATENCY_BUCKETS, Histogram
+from src.lib.vector_store import create_vector_store
+from src.models.document_chunk import DocumentChunk
+from src.models.vector_embedding import VectorEmbedding
 from src.lib.exceptions import SearchError
 import logging
 
@@ -13,12 +20,136 @@ logger = logging.getLogger(__name__)
 
 
 class VectorSearchService:
-    """Service for performing vector similarity search."""
+    """Service for performing vector similarity search.
 
-    def __init__(self):
-        """Initialize the VectorSearchService."""
+    Embeddings are stored in a vector store chosen by VECTOR_BACKEND: the
+    graph database's native vector index, an in-process matrix scan, or
+    "auto" (the database, failing if it is unreachable). Query latency is recorded in a
+    histogram, and a sample of queries (VECTOR_RECALL_SAMPLE_RATE) is also
+    answered by brute force to track the index's recall.
+    """
+
+    def __init__(self, store=None, embedding_client=None,
+                 recall_sample_rate: Optional[float] = None):
+        """
+        Initialize the VectorSearchService.
+
+        Args:
+            store: Vector store (created from VECTOR_BACKEND on first use if omitted)
+            embedding_client: Client used to embed queries (defaults to the global client)
+            recall_sample_rate: Fraction of queries checked against brute force
+                (defaults to VECTOR_RECALL_SAMPLE_RATE)
+        """
+        config = get_config()
         self.db = get_db_connection()
-        self.embedding_client = get_embedding_client()
+        self.embedding_client = embedding_client or get_embedding_client()
+        self.backend = config.vector_backend
+        self.exact_scan_limit = config.vector_exact_scan_limit
+        self.recall_sample_rate = (
+            config.vector_recall_sample_rate if recall_sample_rate is None else recall_sample_rate
+        )
+        self._store = store
+        self._lock = threading.Lock()
+        self.latency = Histogram(DEFAULT_LATENCY_BUCKETS)
+        self.exact_latency = Histogram(DEFAULT_LATENCY_BUCKETS)
+        self.recall_samples = 0
+        self.recall_total = 0.0
+
+    @property
+    def store(self):
+        """The vector store, created on first use."""
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = create_vector_store(self.backend, self.db, self.exact_scan_limit)
+                    logger.info(f"Using {self._store.backend} vector store")
+        return self._store
+
+    def add_embeddings(self, collection_name: str, chunks: Sequence[DocumentChunk],
+                       embeddings: Sequence[VectorEmbedding]) -> int:
+        """
+        Store chunk embeddings so they can be searched.
+
+        Args:
+            collection_name: Name of the collection the chunks belong to
+            chunks: Chunks that were embedded
+            embeddings: Embeddings of the chunks, matched by chunk_id
+
+        Returns:
+            Number of embeddings stored
+
+        Raises:
+            SearchError: If storing fails
+        """
+        chunks_by_id = {chunk.id: chunk for chunk in chunks}
+        rows = []
+        for embedding in embeddings:
+            chunk = chunks_by_id.get(embedding.chunk_id)
+            if chunk is None:
+                logger.warning(f"Skipping embedding for unknown chunk {embedding.chunk_id}")
+                continue
+            rows.append({
+                "id": chunk.id,
+                "document_id": chunk.document_id,
+                "content": chunk.content,
+                "position": chunk.position,
+                "embedding": list(embedding.vector),
+            })
+        if not rows:
+            return 0
+
+        try:
+            self.store.ensure_index(len(rows[0]["embedding"]))
+            stored = self.store.add(collection_name, rows)
+            logger.info(f"Stored {stored} embeddings in collection {collection_name}")
+            return stored
+        except Exception as e:
+            logger.error(f"Failed to store embeddings for collection {collection_name}: {e}")
+            raise SearchError(f"Failed to store embeddings: {str(e)}")
+
+    def get_chunk_texts(self, chunk_ids: Sequence[str]) -> Dict[str, str]:
+        """
+        Fetch the content of chunks in one batched lookup.
+
+        Args:
+            chunk_ids: IDs of the chunks
+
+        Returns:
+            Dictionary of chunk ID to content; chunks without stored content are omitted
+
+        Raises:
+            SearchError: If the lookup fails
+        """
+        if not chunk_ids:
+            return {}
+        try:
+            return self.store.get_texts(list(dict.fromkeys(chunk_ids)))
+        except Exception as e:
+            logger.error(f"Failed to fetch chunk texts: {e}")
+            raise SearchError(f"Failed to fetch chunk texts: {str(e)}")
+
+    def delete_embeddings(self, chunk_ids: Sequence[str]) -> int:
+        """
+        Remove the stored embeddings of chunks, e.g. of a document that failed to index.
+
+        Args:
+            chunk_ids: IDs of the chunks
+
+        Returns:
+            Number of embeddings removed
+
+        Raises:
+            SearchError: If removing fails
+        """
+        if not chunk_ids:
+            return 0
+        try:
+            removed = self.store.delete(list(dict.fromkeys(chunk_ids)))
+            logger.info(f"Removed {removed} chunk embeddings")
+            return removed
+        except Exception as e:
+            logger.error(f"Failed to remove chunk embeddings: {e}")
+            raise SearchError(f"Failed to remove embeddings: {str(e)}")
 
     def search_by_vector(self, query: str, collection_name: str, top_k: int = 5) -> List[Tuple[str, float]]:
         """
@@ -36,27 +167,14 @@ class VectorSearchService:
             SearchError: If vector search fails
         """
         try:
-            # Generate embedding for the query
-            query_embedding = self.embedding_client.generate_embedding(query)
-
-            # In a real implementation, this would query the database for similar vectors
-            # For now, we'll simulate the search with a placeholder implementation
             logger.info(f"Performing vector search for query: {query}")
-
-            # Placeholder results - in real implementation would query database
-            # This is where you would use something like:
-            # MATCH (c:Chunk)-[:HAS_EMBEDDING]->(e:Embedding)
-            # WHERE c.collection_name = $collection_name
-            # RETURN c.id, gds.similarity.cosine(e.vector, $query_vector) AS similarity
-            # ORDER BY similarity DESC
-            # LIMIT $top_k
-
-            # Return empty results for now - would be populated in real implementation
-            results = []
-
+            query_embedding = self.embedding_client.generate_embedding(query)
+            results = self.search_by_embedding(query_embedding, collection_name, top_k)
             logger.info(f"Vector search returned {len(results)} results")
             return results
 
+        except SearchError:
+            raise
         except Exception as e:
             logger.error(f"Vector search failed for query '{query}': {e}")
             raise SearchError(f"Vector search failed: {str(e)}")
@@ -69,30 +187,146 @@ class VectorSearchService:
         Args:
             query: Search query text
             collection_name: Name of the document collection to search
-            filter_conditions: Additional filter conditions
+            filter_conditions: Additional filter conditions; supports
+                "document_id" (a single ID) and "document_ids" (a list of IDs)
             top_k: Number of results to return
 
         Returns:
             List of tuples (chunk_id, similarity_score)
-        """
-        try:
-            # Generate embedding for the query
-            query_embedding = self.embedding_client.generate_embedding(query)
 
-            # In a real implementation, this would query the database with filters
-            # For now, we'll simulate the search
-            logger.info(f"Performing vector search with filters for query: {query}")
+        Raises:
+            SearchError: If vector search fails or a filter is not supported
+        """
+        unsupported = set(filter_conditions) - {"document_id", "document_ids"}
+        if unsupported:
+            raise SearchError(f"Unsupported vector search filters: {sorted(unsupported)}")
 
-            # Placeholder results
-            results = []
+        document_ids = list(filter_conditions.get("document_ids") or [])
+        if filter_conditions.get("document_id"):
+            document_ids.append(filter_conditions["document_id"])
 
+        try:
+            logger.info(f"Performing vector search with filters for query: {query}")
+            query_embedding = self.embedding_client.generate_embedding(query)
+            results = self.search_by_embedding(
+                query_embedding, collection_name, top_k,
+                document_ids=document_ids if document_ids else None
+            )
             logger.info(f"Vector search with filters returned {len(results)} results")
             return results
 
+        except SearchError:
+            raise
         except Exception as e:
             logger.error(f"Vector search with filters failed for query '{query}': {e}")
             raise SearchError(f"Vector search with filters failed: {str(e)}")
 
+    def search_by_embedding(self, query_embedding: Sequence[float], collection_name: str,
+                            top_k: int = 5,
+                            document_ids: Optional[Sequence[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Find the chunks closest to an embedding.
+
+        Args:
+            query_embedding: Query vector
+            collection_name: Name of the document collection to search
+            top_k: Number of results to return
+            document_ids: Only return chunks of these documents (optional)
+
+        Returns:
+            List of tuples (chunk_id, similarity_score), best first
+
+        Raises:
+            SearchError: If the vector store query fails
+        """
+        try:
+            start = time.perf_counter()
+            results = self.store.search(query_embedding, top_k, collection_name, document_ids)
+            self.latency.observe(time.perf_counter() - start)
+
+            if self.recall_sample_rate and random.random() < self.recall_sample_rate:
+                self._record_recall(results, query_embedding, collection_name, top_k, document_ids)
+            return results
+
+        except Exception as e:
+            logger.error(f"Vector store query failed for collection {collection_name}: {e}")
+            raise SearchError(f"Vector search failed: {str(e)}")
+
+    def _record_recall(self, results: List[Tuple[str, float]], query_embedding: Sequence[float],
+                       collection_name: str, top_k: int,
+                       document_ids: Optional[Sequence[str]]) -> float:
+        """Compare results with a brute-force search and record their recall."""
+        start = time.perf_counter()
+        exact = self.store.exact_search(query_embedding, top_k, collection_name, document_ids)
+        self.exact_latency.observe(time.perf_counter() - start)
+
+        expected = {chunk_id for chunk_id, _ in exact}
+        recall = len(expected & {chunk_id for chunk_id, _ in results}) / len(expected) if expected else 1.0
+        with self._lock:
+            self.recall_samples += 1
+            self.recall_total += recall
+        return recall
+
+    def evaluate_recall(self, query_embeddings: Sequence[Sequence[float]], collection_name: str,
+                        top_k: int = 5) -> Dict[str, Optional[float]]:
+        """
+        Measure recall@k and latency of the store against brute force.
+
+        Args:
+            query_embeddings: Query vectors to evaluate
+            collection_name: Name of the document collection to search
+            top_k: Number of results per query
+
+        Returns:
+            Dictionary with mean recall and p50/p95 latencies of both searches
+        """
+        indexed = Histogram(DEFAULT_LATENCY_BUCKETS)
+        exact = Histogram(DEFAULT_LATENCY_BUCKETS)
+        recalls = []
+        for vector in query_embeddings:
+            start = time.perf_counter()
+            results = self.store.search(vector, top_k, collection_name)
+            indexed.observe(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            expected = {chunk_id for chunk_id, _ in self.store.exact_search(vector, top_k, collection_name)}
+            exact.observe(time.perf_counter() - start)
+
+            found = {chunk_id for chunk_id, _ in results}
+            recalls.append(len(expected & found) / len(expected) if expected else 1.0)
+
+        indexed_percentiles = indexed.percentiles()
+        exact_percentiles = exact.percentiles()
+        return {
+            "queries": len(recalls),
+            "recall": sum(recalls) / len(recalls) if recalls else None,
+            "latency_p50": indexed_percentiles["p50"],
+            "latency_p95": indexed_percentiles["p95"],
+            "exact_latency_p50": exact_percentiles["p50"],
+            "exact_latency_p95": exact_percentiles["p95"],
+        }
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        """
+        Get query latency and sampled recall.
+
+        Returns:
+            Dictionary with the backend, query count, latency percentiles and mean recall
+        """
+        percentiles = self.latency.percentiles()
+        with self._lock:
+            samples = self.recall_samples
+            mean_recall = self.recall_total / samples if samples else None
+        return {
+            "backend": self._store.backend if self._store is not None else None,
+            "queries": self.latency.count,
+            "latency_p50": percentiles["p50"],
+            "latency_p95": percentiles["p95"],
+            "latency_p99": percentiles["p99"],
+            "recall_samples": samples,
+            "mean_recall": mean_recall,
+        }
+
 
 # Global vector search service instance
 vector_search_service = VectorSearchService()
@@ -105,4 +339,4 @@ def get_vector_search_service() -> VectorSearchService:
     Returns:
         VectorSearchService instance
     """
-    return vector_search_service
\ No newline at end of file
+    return vector_search_service
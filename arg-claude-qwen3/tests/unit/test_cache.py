@@ -0,0 +1,60 @@
+"""
+Unit tests for the in-process caches.
+"""
+
+import pytest
+from src.lib.cache import TTLCache
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Test expiry, eviction and statistics."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.clock = FakeClock()
+        self.cache = TTLCache(max_entries=2, ttl=10, clock=self.clock)
+
+    def test_entries_expire(self):
+        """Entries are returned until their time to live passes."""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2, ttl=30)
+        self.clock.now = 9.9
+        assert self.cache.get("a") == 1
+        self.clock.now = 10
+        assert self.cache.get("a") is None
+        assert self.cache.get("b") == 2
+        assert len(self.cache) == 1
+
+    def test_least_recently_used_is_evicted(self):
+        """Reading an entry protects it from eviction."""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a")
+        self.cache.put("c", 3)
+        assert self.cache.get("b", "missing") == "missing"
+        assert self.cache.get("a") == 1
+
+    def test_stats(self):
+        """Hits and misses are counted."""
+        self.cache.put("a", 1)
+        self.cache.get("a")
+        self.cache.get("z")
+        stats = self.cache.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_ratio"] == pytest.approx(0.5)
+
+    def test_disabled_cache(self):
+        """A cache without entries stores nothing."""
+        cache = TTLCache(max_entries=0, ttl=10)
+        cache.put("a", 1)
+        assert cache.get("a") is None
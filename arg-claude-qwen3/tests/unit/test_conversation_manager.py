@@ -0,0 +1,103 @@
+"""
+Unit tests for the conversation manager.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from src.lib.conversation_store import SQLiteConversationStore
+from src.services.conversation_manager import ConversationManager
+
+
+class TestConversationManager:
+    """Test persisted turns, the recent-turn window and rolling summaries."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.store = SQLiteConversationStore(":memory:")
+        self.llm = MagicMock()
+        self.llm.generate_completion.side_effect = lambda prompt, **kwargs: f"summary {prompt.count('User:')}"
+        self.manager = self._manager()
+        self.turns = 0
+
+    def _manager(self):
+        return ConversationManager(
+            store=self.store, llm_client=self.llm, window_turns=2, summary_batch=3,
+            summarize_in_background=False
+        )
+
+    def _add_turns(self, count, session_id="s1"):
+        for i in range(self.turns, self.turns + count):
+            self.manager.add_conversation_entry(session_id, f"q{i}", f"answer {i}", question=f"question {i}")
+        self.turns += count
+
+    def test_turns_are_formatted_with_their_questions(self):
+        """Context messages carry the stored question and answer texts."""
+        self._add_turns(2)
+
+        messages = self.manager.format_conversation_context("s1")
+
+        assert messages == [
+            {"role": "user", "content": "question 0"},
+            {"role": "assistant", "content": "answer 0"},
+            {"role": "user", "content": "question 1"},
+            {"role": "assistant", "content": "answer 1"},
+        ]
+        assert self.manager.format_conversation_context("other") == []
+
+    def test_older_turns_are_folded_into_summary(self):
+        """Turns behind the window are summarized in batches, keeping prompts bounded."""
+        self._add_turns(4)
+        assert self.llm.generate_completion.call_count == 0
+
+        self._add_turns(1)
+        assert self.llm.generate_completion.call_count == 1
+        messages = self.manager.format_conversation_context("s1")
+        assert messages[0] == {"role": "system", "content": "Summary of the earlier conversation: summary 3"}
+        assert [m["content"] for m in messages[1::2]] == ["question 3", "question 4"]
+
+        self._add_turns(100)
+        assert self.llm.generate_completion.call_count == 34
+        assert len(self.manager.format_conversation_context("s1")) <= 1 + 2 * (2 + 3 - 1)
+
+    def test_summary_falls_back_to_excerpts(self):
+        """A failing summary call still advances the summary."""
+        self.llm.generate_completion.side_effect = Exception("LLM unavailable")
+        self._add_turns(5)
+
+        messages = self.manager.format_conversation_context("s1")
+
+        assert "User: question 2" in messages[0]["content"]
+        assert len(messages) == 5
+
+    def test_history_survives_restart(self):
+        """A new manager on the same store sees the history and summary."""
+        self._add_turns(7)
+        expected = self.manager.format_conversation_context("s1")
+
+        self.manager = self._manager()
+
+        assert self.manager.format_conversation_context("s1") == expected
+        history = self.manager.get_conversation_history("s1", limit=3)
+        assert [entry.question for entry in history] == ["question 4", "question 5", "question 6"]
+        summary = self.manager.get_session_summary("s1")
+        assert summary["total_turns"] == 7
+        assert summary["summary"] == "summary 3"
+
+    def test_clear_conversation_history(self):
+        """Clearing removes stored turns, the summary and the cached window."""
+        self._add_turns(6)
+
+        self.manager.clear_conversation_history("s1")
+
+        assert self.manager.format_conversation_context("s1") == []
+        assert self.manager.get_session_summary("s1")["total_turns"] == 0
+
+    def test_max_turns_limits_context(self):
+        """Callers can ask for fewer turns than the window holds."""
+        self._add_turns(3)
+        messages = self.manager.format_conversation_context("s1", max_turns=1)
+        assert [m["content"] for m in messages] == ["question 2", "answer 2"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -3,7 +3,10 @@ Unit tests for the embedding generator service.
 """
 
 import pytest
+import threading
+import time
 from unittest.mock import patch, MagicMock
+from src.lib.embedding_client import EmbeddingBatcher
 from src.services.embedding_generator import EmbeddingGenerator
 from src.lib.exceptions import EmbeddingGenerationError
 from src.models.vector_embedding import VectorEmbedding
@@ -108,6 +111,110 @@ class TestEmbeddingGenerator:
             with pytest.raises(EmbeddingGenerationError):
                 self.generator.generate_embedding(chunk_id, text)
 
+    def test_generate_embeddings_splits_requests(self):
+        """Inputs above the request size are sent as several ordered requests."""
+        def call(model, input, api_key, request_timeout):
+            response = MagicMock()
+            response.status_code = 200
+            response.output = {'embeddings': [
+                {'text_index': i, 'embedding': [float(text.split()[-1])]} for i, text in enumerate(input)
+            ][::-1]}
+            return response
+
+        texts = [f"Text {i}" for i in range(25)]
+        with patch('src.services.embedding_generator.TextEmbedding.call', side_effect=call) as mock_call:
+            embeddings = self.generator.generate_embeddings([f"chunk_{i}" for i in range(25)], texts)
+
+        assert mock_call.call_count == 3
+        assert [embedding.vector[0] for embedding in embeddings] == [float(i) for i in range(25)]
+        assert self.generator.get_stats()["texts"] == 25
+
+
+class TestEmbeddingBatcher:
+    """Test request planning, concurrency and retries."""
+
+    def test_plan_respects_count_and_characters(self):
+        """Requests are cut at the size or character limit, whichever comes first."""
+        batcher = EmbeddingBatcher(MagicMock(), max_batch_size=3, max_batch_chars=10,
+                                   max_input_chars=100, concurrency=2)
+        assert batcher.plan(["a", "b", "c", "d"]) == [[0, 1, 2], [3]]
+        assert batcher.plan(["aaaaaa", "bbbbbb", "c"]) == [[0], [1, 2]]
+        assert batcher.plan(["x" * 50]) == [[0]]
+
+    def test_concurrent_requests_keep_order(self):
+        """Requests run in parallel and vectors come back in input order."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def embed_batch(texts):
+            with lock:
+                active.append(texts)
+                peak.append(len(active))
+            time.sleep(0.02 * (len(texts) % 3))
+            with lock:
+                active.remove(texts)
+            return [[float(text)] for text in texts]
+
+        batcher = EmbeddingBatcher(embed_batch, max_batch_size=2, max_batch_chars=1000,
+                                   max_input_chars=100, concurrency=4)
+        vectors = batcher.embed([str(i) for i in range(11)])
+
+        assert vectors == [[float(i)] for i in range(11)]
+        assert max(peak) > 1
+        stats = batcher.get_stats()
+        assert stats["requests"] == 6
+        assert stats["texts_per_second"] > 0
+        assert stats["latency_p50"] is not None
+        batcher.close()
+
+    def test_failed_request_is_retried_per_text(self):
+        """A failing request is retried one text at a time."""
+        calls = []
+
+        def embed_batch(texts):
+            calls.append(list(texts))
+            if len(texts) > 1 and "b" in texts:
+                raise RuntimeError("request too large")
+            return [[ord(text)] for text in texts]
+
+        batcher = EmbeddingBatcher(embed_batch, max_batch_size=2, max_batch_chars=1000,
+                                   max_input_chars=100, concurrency=1)
+
+        assert batcher.embed(["a", "b", "c"]) == [[97], [98], [99]]
+        assert calls == [["a", "b"], ["a"], ["b"], ["c"]]
+        stats = batcher.get_stats()
+        assert stats["failed_requests"] == 1
+        assert stats["retried_texts"] == 2
+
+    def test_failing_text_raises(self):
+        """A text that fails on its own fails the call."""
+        def embed_batch(texts):
+            if "bad" in texts:
+                raise RuntimeError("invalid input")
+            return [[0.0] for _ in texts]
+
+        batcher = EmbeddingBatcher(embed_batch, max_batch_size=4, max_batch_chars=1000,
+                                   max_input_chars=100, concurrency=1)
+        with pytest.raises(RuntimeError):
+            batcher.embed(["good", "bad"])
+
+    def test_wrong_vector_count_is_a_failure(self):
+        """A response with too few vectors is treated as a failed request."""
+        batcher = EmbeddingBatcher(lambda texts: [[0.0]], max_batch_size=4, max_batch_chars=1000,
+                                   max_input_chars=100, concurrency=1)
+        assert batcher.embed(["a", "b"]) == [[0.0], [0.0]]
+        assert batcher.get_stats()["retried_texts"] == 2
+
+    def test_long_texts_are_truncated(self):
+        """Texts longer than the input limit are cut before sending."""
+        sent = []
+        batcher = EmbeddingBatcher(lambda texts: sent.extend(texts) or [[0.0] for _ in texts],
+                                   max_batch_size=4, max_batch_chars=1000, max_input_chars=5, concurrency=1)
+        batcher.embed(["abcdefgh", "xy"])
+        assert sent == ["abcde", "xy"]
+        assert batcher.get_stats()["truncated_texts"] == 1
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Unit tests for entity linking and the graph search service.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from src.lib.entity_dictionary import EntityDictionary, normalize_entity_name
+from src.lib.exceptions import SearchError
+from src.models.knowledge_graph_node import KnowledgeGraphNode
+from src.models.knowledge_graph_relationship import KnowledgeGraphRelationship
+from src.services.graph_search import GraphSearchService
+
+
+class FakeTransaction:
+    """Transaction returning canned records and remembering its queries."""
+
+    def __init__(self, records):
+        self.records = records
+        self.runs = []
+
+    def run(self, query, **params):
+        self.runs.append((query, params))
+        result = MagicMock()
+        result.__iter__.return_value = iter(self.records)
+        return result
+
+
+def fake_db(records=()):
+    """Build a database connection whose sessions run work on a FakeTransaction."""
+    tx = FakeTransaction(list(records))
+    session = MagicMock()
+    session.__enter__.return_value = session
+    session.execute_read.side_effect = lambda work, *args: work(tx, *args)
+    session.execute_write.side_effect = lambda work, *args: work(tx, *args)
+    db = MagicMock()
+    db.connect.return_value.session.return_value = session
+    return db, tx
+
+
+class TestEntityDictionary:
+    """Test normalization and dictionary matching."""
+
+    def test_normalize_entity_name(self):
+        """Case, width, whitespace and surrounding punctuation are ignored."""
+        assert normalize_entity_name("  Huawei   Technologies. ") == "huawei technologies"
+        assert normalize_entity_name("ＨＵＡＷＥＩ") == "huawei"
+        assert normalize_entity_name("《基本法》") == "基本法"
+        assert normalize_entity_name("...") == ""
+
+    def test_link_respects_word_boundaries(self):
+        """Entities only match whole words in space-delimited text."""
+        dictionary = EntityDictionary(["Art", "Huawei"])
+        assert dictionary.link("How do I start a company like Huawei?") == ["huawei"]
+        assert dictionary.link("Modern art, and Huawei's phones") == ["art", "huawei"]
+
+    def test_link_matches_inside_cjk_text(self):
+        """Scripts without spaces match anywhere in the text."""
+        dictionary = EntityDictionary(["华为", "基本法"])
+        assert dictionary.link("华为公司的基本法是什么") == ["华为", "基本法"]
+
+    def test_link_prefers_leftmost_longest(self):
+        """Overlapping names resolve to the longest match and duplicates are dropped."""
+        dictionary = EntityDictionary(["New York", "New York Times", "Times", "York"])
+        assert dictionary.link("The New York Times and the new york times") == ["new york times"]
+        assert dictionary.link("York, then Times") == ["york", "times"]
+        assert len(dictionary) == 4
+
+    def test_link_limit(self):
+        """At most limit entities are returned."""
+        dictionary = EntityDictionary(["a1", "b2", "c3"])
+        assert dictionary.link("a1 b2 c3", limit=2) == ["a1", "b2"]
+
+
+class TestGraphSearchService:
+    """Test graph traversal scoring and knowledge graph storage."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.service = GraphSearchService(max_depth=2, max_fan_out=50)
+
+    def test_traversal_scores_by_hops_per_seed(self):
+        """Each seed contributes its best path score and scores average over seeds."""
+        self.service.db, tx = fake_db([
+            {"chunk_id": "c1", "seed": "huawei", "hops": 0},
+            {"chunk_id": "c1", "seed": "huawei", "hops": 2},
+            {"chunk_id": "c1", "seed": "ren zhengfei", "hops": 0},
+            {"chunk_id": "c2", "seed": "huawei", "hops": 1},
+            {"chunk_id": "c3", "seed": "ren zhengfei", "hops": 2},
+        ])
+
+        results = self.service.traverse_knowledge_graph(
+            ["Huawei", "Ren Zhengfei", "huawei"], max_depth=2, collection_name="c", top_k=10
+        )
+
+        assert results == [("c1", 1.0), ("c2", 0.25), ("c3", 0.125)]
+        query, params = tx.runs[0]
+        assert "[:RELATED*1..2]" in query
+        assert params["name_keys"] == ["huawei", "ren zhengfei"]
+        assert params["max_fan_out"] == 50
+        # The row limit keeps the closest chunks
+        assert query.index("ORDER BY hops") < query.index("LIMIT $max_rows")
+
+    def test_traversal_depth_is_clamped(self):
+        """Depth zero only uses the seeds and large depths are capped."""
+        self.service.db, tx = fake_db()
+        self.service.traverse_knowledge_graph(["x"], max_depth=0, collection_name="c")
+        self.service.traverse_knowledge_graph(["x"], max_depth=99, collection_name="c")
+        assert "RELATED*" not in tx.runs[0][0]
+        assert "[:RELATED*1..4]" in tx.runs[1][0]
+
+    def test_traversal_without_entities_skips_database(self):
+        """No query is run when there is nothing to start from."""
+        self.service.db, tx = fake_db()
+        assert self.service.search_by_entities(["..."], "c") == []
+        assert tx.runs == []
+
+    def test_traversal_failure_raises_search_error(self):
+        """Database errors are reported as SearchError."""
+        self.service.db = MagicMock()
+        self.service.db.connect.side_effect = RuntimeError("down")
+        with pytest.raises(SearchError):
+            self.service.search_by_entities(["Huawei"], "c")
+
+    def test_relationship_search_ranks_direct_chunks_first(self):
+        """Chunks a relationship came from outrank chunks mentioning one endpoint."""
+        self.service.db, tx = fake_db([
+            {"chunk_id": "c2", "direct": False},
+            {"chunk_id": "c1", "direct": True},
+        ])
+        results = self.service.search_by_relationships("Huawei", "Ren Zhengfei", "founded_by", "c")
+        assert results == [("c1", 1.0), ("c2", 0.5)]
+        assert tx.runs[0][1]["source"] == "huawei"
+
+    def test_add_knowledge_graph_merges_by_name(self):
+        """Entities are keyed by normalized name and relationships carry their chunk."""
+        self.service.db, tx = fake_db()
+        self.service._schema_ready = True
+        source = KnowledgeGraphNode("chunk_1", "organization", "Huawei", "Company")
+        duplicate = KnowledgeGraphNode("chunk_2", "organization", "HUAWEI ", "Company")
+        target = KnowledgeGraphNode("chunk_1", "person", "Ren Zhengfei", "Founder")
+        relationship = KnowledgeGraphRelationship(source.id, target.id, "founded_by", "Founder")
+        dangling = KnowledgeGraphRelationship(source.id, "unknown", "related_to", "")
+
+        counts = self.service.add_knowledge_graph(
+            "c", [source, duplicate, target], [relationship, dangling]
+        )
+
+        assert counts == {"mentions": 3, "relationships": 1}
+        mentions, edges, degrees = (params for _, params in tx.runs)
+        assert [row["name_key"] for row in mentions["rows"]] == ["huawei", "huawei", "ren zhengfei"]
+        assert edges["rows"][0]["chunk_id"] == "chunk_1"
+        assert degrees["name_keys"] == ["huawei", "ren zhengfei"]
+
+    def test_entity_dictionary_is_cached_until_graph_changes(self):
+        """The dictionary is loaded once and reloaded after new entities are stored."""
+        self.service.db, tx = fake_db([{"name_key": "huawei"}])
+        self.service._schema_ready = True
+
+        assert self.service.link_entities("What does Huawei make?", "c") == ["huawei"]
+        assert self.service.link_entities("Huawei", "c") == ["huawei"]
+        assert len(tx.runs) == 1
+
+        self.service.add_knowledge_graph(
+            "c", [KnowledgeGraphNode("chunk_1", "organization", "Huawei", "")], []
+        )
+        self.service.link_entities("Huawei", "c")
+        assert len(tx.runs) == 4
+
+    def test_remove_chunks_drops_their_graph(self):
+        """Removing chunks prunes their edges and entities and reloads the dictionary."""
+        self.service.db, tx = fake_db([{"name_key": "huawei", "source": "huawei", "target": "huawei"}])
+        self.service._schema_ready = True
+        self.service.link_entities("Huawei", "c")
+
+        self.service.remove_chunks("c", ["chunk_1", "chunk_2"])
+
+        assert tx.runs[1][1]["chunk_ids"] == tx.runs[3][1]["chunk_ids"] == ["chunk_1", "chunk_2"]
+        assert any("DETACH DELETE e" in query for query, _ in tx.runs)
+        runs = len(tx.runs)
+        self.service.link_entities("Huawei", "c")
+        assert len(tx.runs) == runs + 1
+
+    def test_remove_no_chunks_skips_database(self):
+        """Nothing is run when there are no chunks to remove."""
+        self.service.db, tx = fake_db()
+        self.service.remove_chunks("c", [])
+        assert tx.runs == []
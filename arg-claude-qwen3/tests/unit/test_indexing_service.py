@@ -7,6 +7,8 @@ import tempfile
 import os
 from unittest.mock import patch, MagicMock
 from src.services.indexing_service import IndexingService
+from src.services.kg_extractor import KnowledgeGraphExtractor
+from src.lib.fake_llm_client import FakeLLMClient
 from src.models.document_collection import DocumentCollection
 from src.models.document import Document
 from src.models.document_chunk import DocumentChunk
@@ -35,7 +37,9 @@ class TestIndexingService:
                            pdf_parser=MagicMock(),
                            document_chunker=MagicMock(),
                            embedding_generator=MagicMock(),
-                           kg_extractor=MagicMock()):
+                           kg_extractor=MagicMock(),
+                           vector_search=MagicMock()):
+            self.indexing_service.vector_search.store.backend = "memory"
 
             # Mock PDF parser
             self.indexing_service.pdf_parser.parse_pdf.return_value = "Test content"
@@ -107,6 +111,33 @@ class TestIndexingService:
         assert isinstance(collection, DocumentCollection)
         assert collection.name == collection_name
 
+    def mock_pipeline_dependencies(self, failing_path=None):
+        """Replace the pipeline's collaborators with mocks, failing one file if given."""
+        def parse_pdf(file_path):
+            if file_path == failing_path:
+                raise Exception("Failed to parse document")
+            return f"Content of {file_path}"
+
+        def chunk_document(document_id, text, metadata=None):
+            return [DocumentChunk(document_id, text, 0), DocumentChunk(document_id, text, 1)]
+
+        def generate_embeddings(chunk_ids, texts):
+            return [VectorEmbedding(chunk_id, [0.1, 0.2, 0.3], "text-embedding-v4") for chunk_id in chunk_ids]
+
+        mocks = {
+            "pdf_parser": MagicMock(),
+            "document_chunker": MagicMock(),
+            "embedding_generator": MagicMock(),
+            "kg_extractor": KnowledgeGraphExtractor(llm_client=FakeLLMClient(), cache_size=0),
+            "vector_search": MagicMock(),
+        }
+        mocks["pdf_parser"].parse_pdf.side_effect = parse_pdf
+        mocks["pdf_parser"].get_pdf_metadata.return_value = {}
+        mocks["document_chunker"].chunk_document.side_effect = chunk_document
+        mocks["embedding_generator"].generate_embeddings.side_effect = generate_embeddings
+        mocks["vector_search"].store.backend = "memory"
+        return patch.multiple(self.indexing_service, **mocks)
+
     def test_index_documents_batch_success(self):
         """Test successful batch document indexing."""
         collection_name = "test_collection"
@@ -118,15 +149,21 @@ class TestIndexingService:
                 f.write(f"Test PDF content {i}")
                 files.append(f.name)
 
-        # Mock the index_document method
-        with patch.object(self.indexing_service, 'index_document') as mock_index:
-            mock_index.return_value = "doc_123"
+        with tempfile.TemporaryDirectory() as checkpoint_dir, self.mock_pipeline_dependencies():
+            self.indexing_service.checkpoint_dir = checkpoint_dir
 
             document_ids = self.indexing_service.index_documents_batch(collection_name, files)
 
             # Verify the results
             assert len(document_ids) == 3
             assert all(isinstance(doc_id, str) for doc_id in document_ids)
+            assert os.listdir(checkpoint_dir) == []
+
+            stages = {stage["stage"]: stage for stage in self.indexing_service.last_report["stages"]}
+            assert stages["parse"]["items"] == 3
+            assert stages["embed"]["units"] == 6
+            assert stages["write"]["errors"] == 0
+            assert [doc["extraction_calls"] for doc in self.indexing_service.last_report["documents"]] == [1, 1, 1]
 
         # Clean up
         for file_path in files:
@@ -143,23 +180,147 @@ class TestIndexingService:
                 f.write(f"Test PDF content {i}")
                 files.append(f.name)
 
-        # Mock the index_document method to fail for the second file
-        def mock_index_document(collection_name, file_path):
-            if file_path == files[1]:
-                raise Exception("Failed to index document")
-            return "doc_123"
+        # Fail the second file
+        with tempfile.TemporaryDirectory() as checkpoint_dir, \
+                self.mock_pipeline_dependencies(failing_path=files[1]):
+            self.indexing_service.checkpoint_dir = checkpoint_dir
 
-        with patch.object(self.indexing_service, 'index_document', side_effect=mock_index_document):
             document_ids = self.indexing_service.index_documents_batch(collection_name, files)
 
             # Should have indexed 2 out of 3 documents
             assert len(document_ids) == 2
             assert all(isinstance(doc_id, str) for doc_id in document_ids)
+            assert len(os.listdir(checkpoint_dir)) == 1
 
         # Clean up
         for file_path in files:
             os.unlink(file_path)
 
+    def test_index_documents_batch_resumes_from_checkpoint(self):
+        """Documents finished before an interruption are not processed again."""
+        collection_name = "test_collection"
+        files = []
+        for i in range(3):
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.pdf', delete=False) as f:
+                f.write(f"Test PDF content {i}")
+                files.append(f.name)
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            self.indexing_service.checkpoint_dir = checkpoint_dir
+
+            with self.mock_pipeline_dependencies(failing_path=files[2]):
+                first_ids = self.indexing_service.index_documents_batch(collection_name, files)
+
+            with self.mock_pipeline_dependencies():
+                second_ids = self.indexing_service.index_documents_batch(collection_name, files)
+                parsed = [call.args[0] for call in self.indexing_service.pdf_parser.parse_pdf.call_args_list]
+
+            assert parsed == [files[2]]
+            assert second_ids[:2] == first_ids
+            assert len(second_ids) == 3
+            assert os.listdir(checkpoint_dir) == []
+
+        for file_path in files:
+            os.unlink(file_path)
+
+    def test_failed_batch_leaves_no_chunks(self):
+        """A document whose later batch fails writes none of its chunks."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.pdf', delete=False) as f:
+            f.write("Test PDF content")
+            file_path = f.name
+
+        with self.mock_pipeline_dependencies():
+            self.indexing_service.chunk_batch_size = 1
+            self.indexing_service.query_cache = MagicMock()
+
+            def generate_embeddings(chunk_ids, texts):
+                if self.indexing_service.embedding_generator.generate_embeddings.call_count == 2:
+                    raise Exception("Embedding API failed")
+                return [VectorEmbedding(chunk_id, [0.1, 0.2, 0.3], "text-embedding-v4") for chunk_id in chunk_ids]
+
+            self.indexing_service.embedding_generator.generate_embeddings.side_effect = generate_embeddings
+
+            with pytest.raises(FileProcessingError):
+                self.indexing_service.index_document("test_collection", file_path)
+
+            self.indexing_service.vector_search.add_embeddings.assert_not_called()
+            self.indexing_service.query_cache.bump_version.assert_not_called()
+
+        os.unlink(file_path)
+
+    def test_failed_write_removes_written_chunks(self):
+        """Chunks, embeddings and graph already written are removed when a later write fails."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.pdf', delete=False) as f:
+            f.write("Test PDF content")
+            file_path = f.name
+
+        events = []
+        with self.mock_pipeline_dependencies():
+            self.indexing_service.chunk_batch_size = 1
+            self.indexing_service.vector_search.store.backend = "graph"
+            self.indexing_service.graph_search = MagicMock()
+            self.indexing_service.graph_search.remove_chunks.side_effect = (
+                lambda collection_name, chunk_ids: events.append(("graph", list(chunk_ids)))
+            )
+            self.indexing_service.vector_search.delete_embeddings.side_effect = (
+                lambda chunk_ids: events.append(("embeddings", list(chunk_ids)))
+            )
+            self.indexing_service.vector_search.add_embeddings.side_effect = [1, Exception("write failed")]
+
+            with pytest.raises(FileProcessingError):
+                self.indexing_service.index_document("test_collection", file_path)
+
+        assert [kind for kind, _ in events] == ["graph", "embeddings"]
+        assert events[0][1] == events[1][1]
+        assert len(events[0][1]) == 2
+        os.unlink(file_path)
+
+    def test_failed_write_removes_memory_embeddings(self):
+        """Embeddings of a failed document are removed from the in-process store too."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.pdf', delete=False) as f:
+            f.write("Test PDF content")
+            file_path = f.name
+
+        with self.mock_pipeline_dependencies():
+            self.indexing_service.chunk_batch_size = 1
+            self.indexing_service.graph_search = MagicMock()
+            self.indexing_service.vector_search.add_embeddings.side_effect = [1, Exception("write failed")]
+
+            with pytest.raises(FileProcessingError):
+                self.indexing_service.index_document("test_collection", file_path)
+
+            self.indexing_service.vector_search.delete_embeddings.assert_called_once()
+            self.indexing_service.graph_search.remove_chunks.assert_not_called()
+
+        os.unlink(file_path)
+
+    def test_resumed_document_is_cleared_before_any_write(self):
+        """Chunks of an interrupted run are removed before the first batch is written."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.pdf', delete=False) as f:
+            f.write("Test PDF content")
+            file_path = f.name
+
+        events = []
+        with tempfile.TemporaryDirectory() as checkpoint_dir, self.mock_pipeline_dependencies(), \
+                patch.object(self.indexing_service, "_delete_document_chunks",
+                             side_effect=lambda collection_name, document_id: events.append("delete")), \
+                patch.object(self.indexing_service, "_write_documents"):
+            self.indexing_service.checkpoint_dir = checkpoint_dir
+            self.indexing_service.chunk_batch_size = 1
+            self.indexing_service.stage_workers["write"] = 4
+            self.indexing_service.vector_search.store.backend = "graph"
+            self.indexing_service.graph_search = MagicMock()
+            self.indexing_service.vector_search.add_embeddings.side_effect = (
+                lambda *args: events.append("write")
+            )
+
+            with patch("src.services.indexing_service.CheckpointStore") as store:
+                store.return_value.get.return_value = {"document_id": "doc-1", "status": "started"}
+                self.indexing_service.index_documents_batch("test_collection", [file_path])
+
+        assert events == ["delete", "write", "write"]
+        os.unlink(file_path)
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
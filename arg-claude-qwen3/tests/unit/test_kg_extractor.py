@@ -2,9 +2,11 @@
 Unit tests for the knowledge graph extractor service.
 """
 
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 from src.services.kg_extractor import KnowledgeGraphExtractor
+from src.lib.fake_llm_client import FakeLLMClient
 from src.models.knowledge_graph_node import KnowledgeGraphNode
 from src.models.knowledge_graph_relationship import KnowledgeGraphRelationship
 
@@ -148,5 +150,93 @@ class TestKnowledgeGraphExtractor:
             assert relationships == mock_relationships
 
 
+class TestBatchedExtraction:
+    """Test packed extraction requests, validation and caching."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.llm = FakeLLMClient()
+        self.extractor = KnowledgeGraphExtractor(
+            llm_client=self.llm, chunks_per_request=4, max_request_chars=10000, cache_size=100
+        )
+
+    def test_chunks_share_requests_with_attribution(self):
+        """Several chunks go in one request and results keep their chunk."""
+        chunks = [(f"chunk_{i}", f"Alice Smith met Bob Jones in Paris {i}.") for i in range(10)]
+        chunks[3] = ("chunk_3", "Steve Jobs founded Apple in Cupertino.")
+
+        batch = self.extractor.extract_batch(chunks)
+
+        assert batch.llm_calls == 3
+        assert self.llm.calls == 3
+        entities, relationships = batch.results["chunk_3"]
+        assert [entity.name for entity in entities] == ["Steve Jobs", "Apple", "Cupertino"]
+        assert all(entity.chunk_id == "chunk_3" for entity in entities)
+        assert relationships[0].source_node_id == entities[0].id
+        assert relationships[0].target_node_id == entities[1].id
+        assert len(batch.entities) == 30
+
+    def test_request_size_limit(self):
+        """Requests are also bounded by their characters."""
+        self.extractor.max_request_chars = 100
+        batch = self.extractor.extract_batch([(f"c{i}", "Word " * 15 + str(i)) for i in range(4)])
+        assert batch.llm_calls == 4
+
+    def test_cache_by_chunk_text(self):
+        """Repeated texts are extracted once, in a batch or across batches."""
+        first = self.extractor.extract_batch([("a", "Alice met Bob."), ("b", "Alice met Bob.")])
+        second = self.extractor.extract_batch([("c", "Alice met Bob.")])
+
+        assert first.llm_calls == 1
+        assert second.llm_calls == 0 and second.cache_hits == 1
+        assert first.results["a"][0][0].id != first.results["b"][0][0].id
+        assert second.results["c"][0][0].chunk_id == "c"
+        assert self.extractor.get_stats()["calls_per_chunk"] == pytest.approx(1 / 3)
+
+    def test_invalid_response_is_split_and_retried(self):
+        """A request with an invalid answer is split until chunks succeed or fail alone."""
+        def answer(prompt, **kwargs):
+            if "Broken" in prompt:
+                return "not json"
+            return FakeLLMClient().generate_completion(prompt)
+
+        with patch.object(self.llm, 'generate_completion', side_effect=answer) as mock_llm:
+            batch = self.extractor.extract_batch([("a", "Alice"), ("b", "Broken"), ("c", "Carol"), ("d", "Dave")])
+
+        # One packed call, two halves, then the failing half split in two
+        assert mock_llm.call_count == 5
+        assert batch.results["b"] == ([], [])
+        assert [entity.name for entity in batch.results["c"][0]] == ["Carol"]
+        assert self.extractor.get_stats()["cache_entries"] == 3
+
+    def test_schema_validation_drops_bad_items(self):
+        """Malformed entities and dangling relationships are dropped."""
+        response = json.dumps({"chunks": [{
+            "chunk": "C1",
+            "entities": [
+                {"name": "Apple", "type": "organization"},
+                {"name": "Steve Jobs", "type": "founder"},
+                {"type": "person"},
+                "Cupertino",
+            ],
+            "relationships": [
+                {"source": "steve jobs", "target": "Apple", "type": "founded"},
+                {"source": "Apple", "target": "Cupertino", "type": "located_in"},
+                {"source": "Apple", "target": "Steve Jobs"},
+            ],
+        }, {"chunk": "C9", "entities": [], "relationships": []}]})
+
+        with patch.object(self.llm, 'generate_completion', return_value=response):
+            batch = self.extractor.extract_batch([("a", "Steve Jobs founded Apple.")])
+
+        entities, relationships = batch.results["a"]
+        assert [(entity.name, entity.entity_type) for entity in entities] == [
+            ("Apple", "organization"), ("Steve Jobs", "other")
+        ]
+        assert len(relationships) == 1
+        assert relationships[0].relationship_type == "founded"
+        assert relationships[0].source_node_id == entities[1].id
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
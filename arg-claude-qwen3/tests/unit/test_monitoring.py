@@ -4,11 +4,12 @@ Unit tests for the monitoring module.
 
 import pytest
 import logging
+import threading
 from unittest.mock import Mock, patch
 from src.lib.monitoring import (
     MetricsCollector, get_metrics_collector, log_function_call,
     log_execution_block, log_document_processing, log_search_query,
-    log_chat_interaction
+    log_chat_interaction, MetricsRegistry, SystemMetricsSampler, OVERFLOW_LABEL
 )
 
 
@@ -164,5 +165,156 @@ class TestMonitoringFunctions:
         assert "Chat interaction in session session_123" in self.logger.info.call_args[0][0]
 
 
+class TestMetricsRegistry:
+    """Test the metrics registry."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.registry = MetricsRegistry()
+
+    def test_counter_increments_from_many_threads(self):
+        """Increments from concurrent threads are all counted."""
+        counter = self.registry.counter("requests_total", "Requests")
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.labels().value == 80000
+
+    def test_histogram_percentiles(self):
+        """Percentiles are interpolated within fixed buckets."""
+        histogram = self.registry.histogram("latency_seconds", "Latency", buckets=[1, 2, 5, 10])
+        assert histogram.labels().quantile(0.5) is None
+
+        for value in range(1, 101):
+            histogram.observe(value / 10)
+
+        percentiles = histogram.labels().percentiles()
+        assert percentiles["p50"] == pytest.approx(5.0)
+        assert 9.0 < percentiles["p95"] <= 10.0
+        assert 9.0 < percentiles["p99"] <= 10.0
+
+    def test_label_cardinality_is_capped(self):
+        """Label combinations beyond the cap share an overflow series."""
+        family = self.registry.counter("sessions_total", "Sessions", ["session"], max_series=3)
+        for i in range(10):
+            family.labels(f"s{i}").inc()
+
+        series = {labels["session"]: child.value for labels, child in family.series()}
+        assert len(series) == 4
+        assert series[OVERFLOW_LABEL] == 7
+        assert family.overflowed == 7
+
+    def test_conflicting_registration(self):
+        """Re-registering a name returns the family only if it matches."""
+        family = self.registry.counter("events_total", "Events", ["event"])
+        assert self.registry.counter("events_total", "Events", ["event"]) is family
+        with pytest.raises(ValueError):
+            self.registry.gauge("events_total", "Events")
+        with pytest.raises(ValueError):
+            family.inc()
+
+    def test_render_prometheus(self):
+        """Metrics are exported in the Prometheus text format."""
+        self.registry.counter("hits_total", "Cache hits", ["cache"]).labels('a"b').inc(2)
+        self.registry.gauge("queue_depth", "Queue depth").set(1.5)
+        histogram = self.registry.histogram("op_seconds", "Operation time", buckets=[0.1, 1])
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(3)
+
+        text = self.registry.render_prometheus()
+        assert "# TYPE hits_total counter" in text
+        assert 'hits_total{cache="a\\"b"} 2' in text
+        assert "queue_depth 1.5" in text
+        assert 'op_seconds_bucket{le="0.1"} 1' in text
+        assert 'op_seconds_bucket{le="1"} 2' in text
+        assert 'op_seconds_bucket{le="+Inf"} 3' in text
+        assert "op_seconds_sum 3.55" in text
+        assert "op_seconds_count 3" in text
+
+    def test_write_textfile(self, tmp_path):
+        """The exposition is written to a file."""
+        self.registry.gauge("up", "Up").set(1)
+        path = tmp_path / "metrics.prom"
+        self.registry.write_textfile(str(path))
+        assert "up 1" in path.read_text()
+
+    def test_sampler_updates_gauges(self):
+        """The background sampler records system gauges."""
+        sampler = SystemMetricsSampler(self.registry, interval=60)
+        sampler.start()
+        try:
+            assert sampler.running
+        finally:
+            sampler.stop()
+        assert not sampler.running
+        assert self.registry.get("process_resident_memory_bytes").labels().value > 0
+
+
+class TestBoundedCollector:
+    """Test that the collector keeps memory bounded."""
+
+    def test_metric_names_are_capped(self):
+        """New names beyond the cap are dropped from the metrics dict."""
+        collector = MetricsCollector(Mock(spec=logging.Logger), max_metrics=5)
+        for i in range(20):
+            collector.gauge(f"gauge.{i}", i)
+        assert len(collector.metrics) == 5
+        assert collector.dropped_metrics == 15
+
+    def test_chat_sessions_do_not_create_metrics(self):
+        """Chat interactions aggregate lengths instead of per-session gauges."""
+        import src.lib.monitoring
+        src.lib.monitoring._metrics_collector = None
+        logger = Mock(spec=logging.Logger)
+        for i in range(50):
+            log_chat_interaction(logger, f"session_{i}", 10, 100)
+
+        collector = get_metrics_collector()
+        assert set(collector.metrics) == {"chat.interaction"}
+        assert collector.chat_response_length.labels().count == 50
+
+    def test_timer_percentiles(self):
+        """Timers feed a latency histogram."""
+        collector = MetricsCollector(Mock(spec=logging.Logger))
+        for _ in range(10):
+            collector.timer("search", 0.02)
+        assert 0.01 < collector.percentiles("search")["p50"] <= 0.025
+
+
+class TestCliMetrics:
+    """Test that CLI commands sample and export metrics."""
+
+    def test_command_samples_and_exports_metrics(self, tmp_path):
+        """A command runs with the sampler on and leaves a Prometheus textfile behind."""
+        import src.lib.monitoring
+        from src.cli import main as cli_main
+
+        src.lib.monitoring._metrics_collector = None
+        path = tmp_path / "rag.prom"
+        sampler_running = []
+
+        def search_documents(**kwargs):
+            sampler_running.append(get_metrics_collector().sampler.running)
+
+        with patch("sys.argv", ["main.py", "search", "--name", "docs", "--question", "q"]), \
+                patch("src.cli.search.search_documents", side_effect=search_documents), \
+                patch.object(src.lib.monitoring.config, "metrics_export_path", str(path)):
+            cli_main.main()
+
+        assert sampler_running == [True]
+        assert not get_metrics_collector().sampler.running
+        assert "process_resident_memory_bytes" in path.read_text()
+        src.lib.monitoring._metrics_collector = None
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Unit tests for the staged pipeline and checkpoint store.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import pytest
+from src.lib.pipeline import CheckpointStore, Stage, StagedPipeline
+
+
+class TestStagedPipeline:
+    """Test stage execution, fan-out and error handling."""
+
+    def test_items_flow_through_all_stages(self):
+        """Each stage transforms, splits or drops items."""
+        pipeline = StagedPipeline([
+            Stage("split", lambda n: [n] * n, workers=2),
+            Stage("square", lambda n: [n * n], workers=3),
+            Stage("drop_odd", lambda n: [n] if n % 2 == 0 else [], workers=1),
+        ], queue_size=2)
+
+        results = pipeline.run(range(5))
+
+        assert sorted(results) == [4, 4, 16, 16, 16, 16]
+        stages = pipeline.report()["stages"]
+        assert [stage["items"] for stage in stages] == [5, 10, 10]
+
+    def test_failed_items_are_reported_and_dropped(self):
+        """A failing item goes to on_error and the others continue."""
+        errors = []
+
+        def check(n):
+            if n == 3:
+                raise ValueError("bad item")
+            return [n]
+
+        pipeline = StagedPipeline(
+            [Stage("check", check, workers=2)],
+            on_error=lambda stage, item, error: errors.append((stage, item, str(error)))
+        )
+
+        assert sorted(pipeline.run(range(5))) == [0, 1, 2, 4]
+        assert errors == [("check", 3, "bad item")]
+        assert pipeline.report()["stages"][0]["errors"] == 1
+
+    def test_stage_workers_run_concurrently(self):
+        """A stage with several workers processes items in parallel."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow(n):
+            with lock:
+                active.append(n)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(n)
+            return [n]
+
+        pipeline = StagedPipeline([Stage("slow", slow, workers=4, units=lambda n: 2)])
+        pipeline.run(range(8))
+
+        summary = pipeline.report()["stages"][0]
+        assert max(peak) > 1
+        assert summary["units"] == 16
+        assert summary["throughput"] > 0
+
+    def test_stage_requires_a_worker(self):
+        """Stages without workers are rejected."""
+        with pytest.raises(ValueError):
+            Stage("empty", lambda item: [item], workers=0)
+
+
+class TestCheckpointStore:
+    """Test checkpoint persistence."""
+
+    def test_entries_survive_reload(self):
+        """Updates are written to disk and loaded by a new store."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "nested", "batch.json")
+            store = CheckpointStore(path)
+            store.update("a", document_id="doc-1", status="started")
+            store.update("a", status="done")
+
+            reloaded = CheckpointStore(path)
+            assert reloaded.get("a") == {"document_id": "doc-1", "status": "done"}
+            assert reloaded.get("b") is None
+
+            reloaded.remove()
+            assert not os.path.exists(path)
+
+    def test_unreadable_checkpoint_is_ignored(self):
+        """A corrupt checkpoint starts over instead of failing."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "batch.json")
+            with open(path, "w") as f:
+                f.write("{not json")
+            assert CheckpointStore(path).get("a") is None
@@ -0,0 +1,81 @@
+"""
+Unit tests for the query result cache.
+"""
+
+import os
+import tempfile
+import pytest
+from src.lib.query_cache import QueryResultCache, normalize_query
+
+
+class TestQueryResultCache:
+    """Test keys, corpus versions and the two cache tiers."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.cache = QueryResultCache(max_entries=10, ttl=60)
+        self.options = {"top_k": 5, "reranking": True}
+
+    def test_normalize_query(self):
+        """Case, spacing and trailing punctuation do not change the key."""
+        assert normalize_query("  What IS\tRAG? ") == "what is rag"
+        key = self.cache.make_key("What is RAG?", "docs", self.options)
+        assert self.cache.make_key("what  is rag", "docs", self.options) == key
+        assert self.cache.make_key("what is rag", "other", self.options) != key
+        assert self.cache.make_key("what is rag", "docs", {"top_k": 3, "reranking": True}) != key
+
+    def test_bumping_version_invalidates_collection(self):
+        """Indexing a collection changes its keys and leaves others alone."""
+        key = self.cache.make_key("query", "docs", self.options)
+        other_key = self.cache.make_key("query", "other", self.options)
+        self.cache.put(key, "docs", [("a", 0.9)])
+        self.cache.put(other_key, "other", [("b", 0.8)])
+
+        assert self.cache.bump_version("docs") == 1
+
+        assert self.cache.make_key("query", "docs", self.options) != key
+        assert self.cache.make_key("query", "other", self.options) == other_key
+        assert self.cache.get(other_key) == [("b", 0.8)]
+
+    def test_hit_ratios(self):
+        """Stats count hits and misses of each tier."""
+        key = self.cache.make_key("query", "docs", self.options)
+        assert self.cache.get(key) is None
+        self.cache.put(key, "docs", [("a", 0.9)])
+        assert self.cache.get(key) == [("a", 0.9)]
+
+        stats = self.cache.get_stats()
+        assert stats["lookups"] == 2
+        assert stats["hit_ratio"] == 0.5
+        assert stats["memory_hits"] == 1 and stats["disk_hits"] == 0
+
+    def test_disabled_cache(self):
+        """A cache of size zero stores nothing."""
+        cache = QueryResultCache(max_entries=0, ttl=60)
+        cache.put("key", "docs", [("a", 0.9)])
+        assert cache.get("key") is None
+
+    def test_disk_tier_is_shared(self):
+        """Results and versions in the SQLite tier outlive the process's memory tier."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "query_cache.sqlite3")
+            writer = QueryResultCache(max_entries=10, ttl=60, db_path=path)
+            reader = QueryResultCache(max_entries=10, ttl=60, db_path=path)
+            key = writer.make_key("query", "docs", self.options)
+            writer.put(key, "docs", [("a", 0.9), ("b", 0.5)])
+
+            assert reader.make_key("query", "docs", self.options) == key
+            assert reader.get(key) == [("a", 0.9), ("b", 0.5)]
+            assert reader.get(key) == [("a", 0.9), ("b", 0.5)]
+            stats = reader.get_stats()
+            assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+            writer.bump_version("docs")
+            assert reader.make_key("query", "docs", self.options) != key
+            assert reader.get_stats()["misses"] == 0
+            writer.close()
+            reader.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -2,6 +2,7 @@
 Unit tests for the rate limiting module.
 """
 
+import asyncio
 import pytest
 import time
 from unittest.mock import Mock
@@ -244,5 +245,114 @@ class TestRateLimitingDecorators:
             test_function("client1")
 
 
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestExactWaits:
+    """Test that waiters reserve slots and sleep exactly once."""
+
+    def test_token_bucket_reservations_are_ordered(self):
+        """Each waiter reserves its tokens and gets a later slot than the previous one."""
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(2, 4.0, clock=clock)
+        assert limiter.consume(2) is True
+
+        assert limiter._reserve(1, 1.0) == pytest.approx(0.25)
+        assert limiter._reserve(1, 1.0) == pytest.approx(0.5)
+        assert limiter._reserve(4, 1.0) is None
+        assert limiter.consume(1) is False
+        assert limiter.time_until_available(1) == pytest.approx(0.75)
+
+        clock.now += 0.75
+        assert limiter.consume(1) is True
+
+    def test_wait_and_consume_sleeps_once(self, monkeypatch):
+        """Waiting sleeps for the computed delay instead of polling."""
+        sleeps = []
+        monkeypatch.setattr(time, "sleep", sleeps.append)
+        limiter = TokenBucketRateLimiter(1, 2.0, clock=FakeClock())
+        limiter.tokens = 0
+
+        assert limiter.wait_and_consume(1) is True
+        assert sleeps == [pytest.approx(0.5)]
+
+    def test_sliding_window_waits_for_oldest_slot(self):
+        """A full window hands out slots as its oldest entries expire."""
+        clock = FakeClock()
+        limiter = SlidingWindowRateLimiter(2, 10.0, clock=clock)
+        assert limiter.is_allowed("k") is True
+        clock.now += 1
+        assert limiter.is_allowed("k") is True
+
+        assert limiter.time_until_allowed("k") == pytest.approx(9.0)
+        assert limiter._reserve("k", 20.0) == pytest.approx(1010.0)
+        assert limiter._reserve("k", 20.0) == pytest.approx(1011.0)
+        assert limiter.is_allowed("other") is True
+
+        # Requests do not jump ahead of pending reservations
+        clock.now = 1010.5
+        assert limiter.is_allowed("k") is False
+
+    def test_idle_keys_are_evicted(self):
+        """Keys whose requests have all expired are dropped."""
+        clock = FakeClock()
+        limiter = SlidingWindowRateLimiter(3, 1.0, shards=1, clock=clock)
+        for i in range(100):
+            limiter.is_allowed(f"client{i}")
+        assert len(limiter) == 100
+
+        clock.now += 2
+        for i in range(10):
+            limiter.is_allowed(f"fresh{i}")
+        assert len(limiter) < 100
+        assert limiter.purge_idle() > 0
+        assert len(limiter) == 10
+
+    def test_async_acquire(self):
+        """Coroutines wait with asyncio and give their slot back on cancellation."""
+        limiter = SlidingWindowRateLimiter(1, 0.05)
+        bucket = TokenBucketRateLimiter(1, 1.0)
+        bucket.tokens = 0
+
+        async def scenario():
+            assert await limiter.acquire("k") is True
+            started = time.monotonic()
+            assert await limiter.acquire("k", timeout=1.0) is True
+            waited = time.monotonic() - started
+            assert await limiter.acquire("k", timeout=0.0) is False
+
+            task = asyncio.create_task(bucket.acquire(1))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return waited
+
+        waited = asyncio.run(scenario())
+        assert 0.03 < waited < 0.5
+        assert bucket.tokens > -0.5
+
+    def test_async_decorator(self):
+        """Decorated coroutine functions are rate limited without blocking."""
+        manager = get_rate_limiter_manager()
+        manager.add_sliding_window_limiter("async_function", 1, 60.0)
+
+        @rate_limit_by_sliding_window("async_function")
+        async def handler(client_id):
+            return client_id
+
+        assert asyncio.run(handler("a")) == "a"
+        with pytest.raises(RateLimitExceededError):
+            asyncio.run(handler("a"))
+        assert handler.__name__ == "handler"
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Unit tests for reranking in the retrieval service.
+"""
+
+from unittest.mock import MagicMock
+from src.lib.query_cache import QueryResultCache
+from src.lib.utils import truncate_to_token_budget
+from src.services.retrieval_service import RetrievalService
+
+
+class TestRerankResults:
+    """Test the rerank stage of hybrid retrieval."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.service = RetrievalService()
+        self.service.vector_search = MagicMock()
+        self.service.rerank_client = MagicMock()
+        self.service.rerank_client.model = "test-rerank"
+        self.service.rerank_cache.clear()
+        self.service.rerank_min_candidates = 3
+        self.service.rerank_max_tokens = 512
+        self.service.rerank_batch_size = 20
+        self.texts = {"a": "alpha text", "b": "beta text", "c": "gamma text", "d": "delta text"}
+        self.service.vector_search.get_chunk_texts.side_effect = (
+            lambda ids: {chunk_id: self.texts[chunk_id] for chunk_id in ids if chunk_id in self.texts}
+        )
+        relevance = {"alpha text": 0.1, "beta text": 0.9, "gamma text": 0.5, "delta text": 0.7}
+        self.service.rerank_client.rerank_scores.side_effect = (
+            lambda query, documents, batch_size: [relevance[document] for document in documents]
+        )
+
+    def test_reranks_real_chunk_texts(self):
+        """Candidates are scored on their stored text in one fetch."""
+        results = [("a", 0.9), ("b", 0.8), ("c", 0.7), ("d", 0.6)]
+
+        reranked = self.service._rerank_results("query", results, top_k=3)
+
+        assert reranked == [("b", 0.9), ("d", 0.7), ("c", 0.5)]
+        self.service.vector_search.get_chunk_texts.assert_called_once_with(["a", "b", "c", "d"])
+        query, documents, batch_size = self.service.rerank_client.rerank_scores.call_args.args
+        assert documents == ["alpha text", "beta text", "gamma text", "delta text"]
+        assert batch_size == 20
+        assert self.service.get_rerank_stats()["reranked_queries"] == 1
+
+    def test_scores_are_cached_per_query(self):
+        """A repeated query only scores chunks it has not seen."""
+        self.service._rerank_results("query", [("a", 0.9), ("b", 0.8), ("c", 0.7)], top_k=3)
+        self.service._rerank_results("query", [("a", 0.9), ("b", 0.8), ("c", 0.7), ("d", 0.6)], top_k=4)
+        self.service._rerank_results("other", [("a", 0.9), ("b", 0.8), ("c", 0.7)], top_k=3)
+
+        calls = self.service.rerank_client.rerank_scores.call_args_list
+        assert [call.args[1] for call in calls] == [
+            ["alpha text", "beta text", "gamma text"],
+            ["delta text"],
+            ["alpha text", "beta text", "gamma text"],
+        ]
+        assert self.service.get_rerank_stats()["cache"]["hits"] == 3
+
+    def test_small_candidate_sets_are_not_reranked(self):
+        """Below the threshold the original order is kept without calls."""
+        assert self.service._rerank_results("query", [("a", 0.9), ("b", 0.8)], top_k=5) == [("a", 0.9), ("b", 0.8)]
+        self.service.rerank_client.rerank_scores.assert_not_called()
+        assert self.service.get_rerank_stats()["skipped_queries"] == 1
+
+    def test_chunks_without_text_keep_their_order_last(self):
+        """Candidates whose text is missing follow the reranked ones."""
+        results = [("x", 0.95), ("a", 0.9), ("y", 0.85), ("b", 0.8)]
+        assert self.service._rerank_results("query", results, top_k=4) == [
+            ("b", 0.9), ("a", 0.1), ("x", 0.95), ("y", 0.85)
+        ]
+
+    def test_long_texts_are_truncated(self):
+        """Texts are cut to the token budget before reranking."""
+        self.service.rerank_max_tokens = 1
+        self.service.rerank_client.rerank_scores.side_effect = (
+            lambda query, documents, batch_size: [0.5] * len(documents)
+        )
+        self.service._rerank_results("query", [("a", 0.9), ("b", 0.8), ("c", 0.7)], top_k=3)
+        assert self.service.rerank_client.rerank_scores.call_args.args[1] == ["alph", "beta", "gamm"]
+
+    def test_reranker_failure_returns_original_order(self):
+        """Errors fall back to the fused ranking."""
+        self.service.rerank_client.rerank_scores.side_effect = Exception("rerank unavailable")
+        results = [("a", 0.9), ("b", 0.8), ("c", 0.7)]
+        degraded = []
+        assert self.service._rerank_results("query", results, top_k=2, degraded=degraded) == results[:2]
+        assert degraded == ["reranking"]
+
+
+class TestQueryResultCaching:
+    """Test the result cache in front of hybrid search."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.service = RetrievalService()
+        self.service.query_cache = QueryResultCache(max_entries=10, ttl=60)
+        self.service._search = MagicMock(return_value=([("a", 0.9), ("b", 0.8)], []))
+
+    def test_repeated_query_is_served_from_cache(self):
+        """A repeated question skips the search steps but gets fresh result objects."""
+        first = self.service.hybrid_search("What is RAG?", "docs", top_k=2)
+        second = self.service.hybrid_search("what is rag", "docs", top_k=2)
+
+        assert self.service._search.call_count == 1
+        assert [(r.chunk_id, r.relevance_score, r.rank) for r in second] == [("a", 0.9, 1), ("b", 0.8, 2)]
+        assert first[0].query_id != second[0].query_id
+        assert self.service.get_query_cache_stats()["hit_ratio"] == 0.5
+
+    def test_options_and_corpus_version_are_part_of_key(self):
+        """Other options and a reindexed collection miss the cache."""
+        self.service.hybrid_search("query", "docs", top_k=2)
+        self.service.hybrid_search("query", "docs", top_k=2, enable_reranking=False)
+        self.service.query_cache.bump_version("docs")
+        self.service.hybrid_search("query", "docs", top_k=2)
+
+        assert self.service._search.call_count == 3
+
+    def test_degraded_results_are_not_cached(self):
+        """A search that fell back on a failed step runs again next time."""
+        self.service._search.return_value = ([("a", 0.9), ("b", 0.8)], ["reranking"])
+        self.service.hybrid_search("query", "docs", top_k=2)
+        self.service.hybrid_search("query", "docs", top_k=2)
+
+        assert self.service._search.call_count == 2
+
+
+class TestTruncateToTokenBudget:
+    """Test token budget truncation."""
+
+    def test_short_text_is_unchanged(self):
+        """Text within the budget is returned whole."""
+        assert truncate_to_token_budget("short text", 10) == "short text"
+
+    def test_cjk_characters_count_as_tokens(self):
+        """Each CJK character is one token."""
+        assert truncate_to_token_budget("华为公司的基本法是什么", 3) == "华为公"
+
+    def test_words_and_punctuation(self):
+        """Long words count one token per four characters."""
+        assert truncate_to_token_budget("Hello, wonderful world", 4) == "Hello, wond"
+        assert truncate_to_token_budget("anything", 0) == ""
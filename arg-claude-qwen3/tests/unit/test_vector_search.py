@@ -0,0 +1,221 @@
+"""
+Unit tests for vector storage and the vector search service.
+"""
+
+import pytest
+import random
+from unittest.mock import MagicMock
+from src.lib.exceptions import SearchError
+from src.lib.vector_store import GraphVectorStore, InMemoryVectorStore, create_vector_store
+from src.models.document_chunk import DocumentChunk
+from src.models.vector_embedding import VectorEmbedding
+from src.services.vector_search import VectorSearchService
+
+
+def random_vectors(count, dimension=16, seed=0):
+    """Generate reproducible random vectors."""
+    rng = random.Random(seed)
+    return [[rng.gauss(0, 1) for _ in range(dimension)] for _ in range(count)]
+
+
+class TestInMemoryVectorStore:
+    """Test the in-process matrix scan."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.store = InMemoryVectorStore()
+
+    def test_search_orders_by_cosine_similarity(self):
+        """The closest vectors come first, and collections are kept apart."""
+        self.store.add("c1", [
+            {"id": "a", "document_id": "d1", "embedding": [1.0, 0.0]},
+            {"id": "b", "document_id": "d1", "embedding": [0.6, 0.8]},
+            {"id": "c", "document_id": "d2", "embedding": [0.0, 1.0]},
+        ])
+        self.store.add("c2", [{"id": "x", "document_id": "d3", "embedding": [1.0, 0.0]}])
+
+        results = self.store.search([2.0, 0.0], 2, "c1")
+        assert [chunk_id for chunk_id, _ in results] == ["a", "b"]
+        assert results[0][1] == pytest.approx(1.0)
+        assert results[1][1] == pytest.approx(0.6)
+        assert self.store.search([1.0, 0.0], 5, "missing") == []
+
+    def test_document_filter(self):
+        """Only chunks of the requested documents are returned."""
+        self.store.add("c1", [
+            {"id": "a", "document_id": "d1", "embedding": [1.0, 0.0]},
+            {"id": "b", "document_id": "d2", "embedding": [0.9, 0.1]},
+        ])
+        results = self.store.search([1.0, 0.0], 5, "c1", document_ids=["d2"])
+        assert [chunk_id for chunk_id, _ in results] == ["b"]
+
+    def test_get_texts(self):
+        """Stored chunk content is returned by ID."""
+        self.store.add("c1", [
+            {"id": "a", "document_id": "d1", "content": "first", "embedding": [1.0, 0.0]},
+            {"id": "b", "document_id": "d1", "embedding": [0.0, 1.0]},
+        ])
+        assert self.store.get_texts(["a", "b", "missing"]) == {"a": "first"}
+
+    def test_growth_and_replacement(self):
+        """The matrix grows past its initial size and re-added chunks are replaced."""
+        vectors = random_vectors(100)
+        self.store.add("c", [{"id": str(i), "document_id": "d", "embedding": v} for i, v in enumerate(vectors)])
+        self.store.add("c", [{"id": "5", "document_id": "d", "embedding": vectors[7]}])
+
+        assert len(self.store) == 100
+        top = self.store.search(vectors[7], 2, "c")
+        assert {chunk_id for chunk_id, _ in top} == {"5", "7"}
+
+    def test_delete(self):
+        """Deleted chunks are no longer found and the remaining rows stay searchable."""
+        self.store.add("c1", [
+            {"id": "a", "document_id": "d1", "content": "first", "embedding": [1.0, 0.0]},
+            {"id": "b", "document_id": "d1", "embedding": [0.6, 0.8]},
+            {"id": "c", "document_id": "d2", "content": "third", "embedding": [0.0, 1.0]},
+        ])
+
+        assert self.store.delete(["a", "missing"]) == 1
+        assert len(self.store) == 2
+        assert [chunk_id for chunk_id, _ in self.store.search([1.0, 0.0], 5, "c1")] == ["b", "c"]
+        assert self.store.get_texts(["a", "c"]) == {"c": "third"}
+        assert self.store.search([0.0, 1.0], 1, "c1", document_ids=["d2"])[0][0] == "c"
+
+    def test_dimension_mismatch(self):
+        """Vectors of a different dimension are rejected."""
+        self.store.add("c", [{"id": "a", "document_id": "d", "embedding": [1.0, 0.0]}])
+        with pytest.raises(ValueError):
+            self.store.add("c", [{"id": "b", "document_id": "d", "embedding": [1.0, 0.0, 0.0]}])
+
+
+class TestGraphVectorStore:
+    """Test the Cypher issued by the graph-backed store."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.db = MagicMock()
+        self.session = self.db.connect.return_value.session.return_value.__enter__.return_value
+        self.store = GraphVectorStore(self.db, exact_scan_limit=10)
+
+    def test_ensure_index_falls_back_to_memgraph(self):
+        """The Memgraph statement is tried when the Neo4j syntax is rejected."""
+        def run(statement, *args, **kwargs):
+            if "OPTIONS" in statement:
+                raise Exception("Invalid input")
+            return MagicMock()
+
+        self.session.run.side_effect = run
+        self.store.ensure_index(8)
+        self.store.ensure_index(8)
+
+        assert self.store.dialect == "memgraph"
+        statements = [call.args[0] for call in self.session.run.call_args_list]
+        assert sum("CREATE VECTOR INDEX" in s for s in statements) == 2
+        assert any('"dimension": 8' in s for s in statements)
+
+    def test_search_uses_query_nodes(self):
+        """Collection-wide searches go through the native index."""
+        self.store.dialect = "neo4j"
+        self.store._indexed_dimension = 2
+        self.session.execute_read.return_value = [{"chunk_id": "a", "score": 0.9}]
+
+        results = self.store.search([1.0, 0.0], 1, "c1")
+
+        assert results == [("a", 0.9)]
+        tx = MagicMock()
+        self.session.execute_read.call_args.args[0](tx)
+        query = tx.run.call_args.args[0]
+        assert "db.index.vector.queryNodes" in query
+        assert tx.run.call_args.kwargs["k"] == 4
+
+    def test_selective_filter_is_scored_exactly(self):
+        """A document filter matching few chunks is pre-filtered and scanned."""
+        self.store.dialect = "neo4j"
+        self.store._indexed_dimension = 2
+        count = MagicMock()
+        count.__getitem__.return_value = 2
+        self.session.execute_read.side_effect = [
+            count,
+            [{"chunk_id": "a", "embedding": [0.0, 1.0]}, {"chunk_id": "b", "embedding": [1.0, 0.0]}],
+        ]
+
+        results = self.store.search([1.0, 0.0], 1, "c1", document_ids=["d1"])
+
+        assert results == [("b", pytest.approx(1.0))]
+
+    def test_unknown_backend(self):
+        """Unknown backend names are rejected."""
+        with pytest.raises(SearchError):
+            create_vector_store("faiss", self.db)
+
+    def test_auto_requires_database(self):
+        """Auto never falls back to the in-memory store, which would lose embeddings at exit."""
+        self.db.test_connection.return_value = False
+        with pytest.raises(SearchError, match="VECTOR_BACKEND=memory"):
+            create_vector_store("auto", self.db)
+
+        self.db.test_connection.return_value = True
+        assert isinstance(create_vector_store("auto", self.db), GraphVectorStore)
+
+
+class TestVectorSearchService:
+    """Test the vector search service with the in-memory store."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.embedding_client = MagicMock()
+        self.service = VectorSearchService(
+            store=InMemoryVectorStore(), embedding_client=self.embedding_client, recall_sample_rate=1.0
+        )
+        self.vectors = random_vectors(50, seed=1)
+        self.chunks = [DocumentChunk(f"doc{i % 5}", f"chunk {i}", i) for i in range(50)]
+        embeddings = [VectorEmbedding(chunk.id, vector) for chunk, vector in zip(self.chunks, self.vectors)]
+        assert self.service.add_embeddings("papers", self.chunks, embeddings) == 50
+
+    def test_search_by_vector(self):
+        """Query text is embedded and the nearest chunks are returned."""
+        self.embedding_client.generate_embedding.return_value = self.vectors[3]
+
+        results = self.service.search_by_vector("query", "papers", top_k=3)
+
+        assert results[0][0] == self.chunks[3].id
+        assert len(results) == 3
+
+    def test_search_with_document_filter(self):
+        """Filters restrict results to the given documents."""
+        self.embedding_client.generate_embedding.return_value = self.vectors[3]
+
+        results = self.service.search_by_vector_with_filter(
+            "query", "papers", {"document_id": "doc1"}, top_k=20
+        )
+
+        allowed = {chunk.id for chunk in self.chunks if chunk.document_id == "doc1"}
+        assert {chunk_id for chunk_id, _ in results} == allowed
+        with pytest.raises(SearchError):
+            self.service.search_by_vector_with_filter("query", "papers", {"author": "x"})
+
+    def test_latency_and_recall_tracking(self):
+        """Queries record latency, and sampled queries record recall."""
+        for vector in self.vectors[:5]:
+            self.service.search_by_embedding(vector, "papers", top_k=5)
+
+        stats = self.service.get_stats()
+        assert stats["backend"] == "memory"
+        assert stats["queries"] == 5
+        assert stats["recall_samples"] == 5
+        assert stats["mean_recall"] == 1.0
+        assert stats["latency_p50"] is not None
+
+        report = self.service.evaluate_recall(self.vectors[:3], "papers", top_k=5)
+        assert report["queries"] == 3
+        assert report["recall"] == 1.0
+
+    def test_embedding_failure(self):
+        """Embedding errors surface as SearchError."""
+        self.embedding_client.generate_embedding.side_effect = RuntimeError("boom")
+        with pytest.raises(SearchError):
+            self.service.search_by_vector("query", "papers")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,109 @@
+"""Measure Memgraph connection overhead per search with and without the shared pool.
+
+The "per_call" mode reproduces the old behaviour: every search opened a new
+driver, re-ran the schema DDL and closed the driver again. The "pooled"
+mode constructs a GraphStore per search as retrieval does now, reusing the
+process-wide driver. Each mode runs the same lightweight namespace query.
+Needs a running Memgraph at DATABASE_URL.
+
+Usage:
+    python benchmarks/benchmark_graph_store.py --queries 50 --name docs
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from neo4j import GraphDatabase  # noqa: E402
+
+from src.config.settings import settings  # noqa: E402
+from src.storage.graph_store import (  # noqa: E402
+    SCHEMA_MIGRATIONS,
+    GraphStore,
+    close_driver,
+    health_check,
+)
+
+
+def _per_call_search(name: str) -> None:
+    """Run one query the way searches did before the shared pool."""
+    driver = GraphDatabase.driver(
+        settings.database_url,
+        auth=(settings.database_user, settings.database_password)
+        if settings.database_user
+        else None,
+    )
+    with driver.session() as session:
+        for _, statements in SCHEMA_MIGRATIONS:
+            for statement in statements:
+                try:
+                    session.run(statement).consume()
+                except Exception:
+                    pass
+        session.run(
+            "MATCH (d:Document {namespace: $namespace}) RETURN count(d) AS count", namespace=name
+        ).single()
+    driver.close()
+
+
+def _pooled_search(name: str) -> None:
+    """Run one query through a GraphStore on the shared pool."""
+    GraphStore().namespace_exists(name)
+
+
+def _summarize(latencies: list[float]) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "queries": len(latencies),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+def measure(queries: int, name: str) -> dict:
+    """Time the first (startup) query and steady-state queries of both modes."""
+    report = {}
+    for label, search in (("per_call", _per_call_search), ("pooled", _pooled_search)):
+        close_driver()
+        start = time.perf_counter()
+        search(name)
+        startup_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        latencies = []
+        for _ in range(queries):
+            start = time.perf_counter()
+            search(name)
+            latencies.append(time.perf_counter() - start)
+        report[label] = dict(_summarize(latencies), startup_ms=startup_ms)
+
+    report["health"] = health_check()
+    close_driver()
+    return report
+
+
+def main() -> int:
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=50, help="Queries per mode")
+    parser.add_argument("--name", default="benchmark", help="Namespace queried")
+    args = parser.parse_args()
+
+    try:
+        report = measure(args.queries, args.name)
+    except Exception as e:
+        print(f"Error: benchmark needs a reachable Memgraph at {settings.database_url}: {e}",
+              file=sys.stderr)
+        return 1
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Compare keyword search latency of the BM25 index and a linear scan.
+
+Chunks are synthetic: sentences drawn from a Zipf-distributed vocabulary,
+with a share of CJK chunks, so common and rare query terms both occur.
+Queries are two or three words taken from random chunks.
+
+The BM25 index runs in process over segments in a temporary directory.
+The scan stands in for the "contains" backend's Cypher query: it
+lower-cases every chunk of the namespace and tests each query term as a
+substring, which is linear in the corpus whatever the query.
+
+Usage:
+    python benchmarks/benchmark_keyword_search.py --sizes 10000,100000
+    python benchmarks/benchmark_keyword_search.py --sizes 100000 --batch 500 --queries 200
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.storage.keyword_index import KeywordIndex  # noqa: E402
+
+_CJK_WORDS = ["华为", "公司", "基本法", "价值观", "数据", "检索", "向量", "图谱", "文档", "模型"]
+
+
+def _corpus(size: int, vocabulary: int, seed: int = 5) -> list[tuple[str, str]]:
+    """Generate (chunk_id, text) pairs over a Zipf-distributed vocabulary."""
+    rng = random.Random(seed)
+    words = [f"term{i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    chunks = []
+    for i in range(size):
+        if i % 10 == 0:
+            text = "".join(rng.choices(_CJK_WORDS, k=rng.randint(20, 60)))
+        else:
+            text = " ".join(rng.choices(words, weights, k=rng.randint(40, 120)))
+        chunks.append((str(i), text))
+    return chunks
+
+
+def _queries(chunks: list[tuple[str, str]], count: int, seed: int = 17) -> list[str]:
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        text = rng.choice(chunks)[1]
+        if " " in text:
+            queries.append(" ".join(rng.sample(text.split(), min(3, len(text.split())))))
+        else:
+            start = rng.randrange(max(1, len(text) - 4))
+            queries.append(text[start:start + 4])
+    return queries
+
+
+def _scan(chunks: list[tuple[str, str]], query: str, limit: int) -> list[str]:
+    """Match every chunk against every query term, like a CONTAINS scan."""
+    terms = query.lower().split()
+    matches = []
+    for chunk_id, text in chunks:
+        lowered = text.lower()
+        if any(term in lowered for term in terms):
+            matches.append(chunk_id)
+            if len(matches) >= limit:
+                break
+    return matches
+
+
+def _stats(latencies: list[float]) -> dict:
+    return {
+        "queries": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000, 3),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+    }
+
+
+def measure(size: int, vocabulary: int, batch: int, queries: int, limit: int) -> dict:
+    """Build the index for one corpus size and time both methods."""
+    chunks = _corpus(size, vocabulary)
+    query_texts = _queries(chunks, queries)
+    report: dict = {"size": size}
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = KeywordIndex(directory)
+        start = time.perf_counter()
+        for offset in range(0, size, batch):
+            index.add_chunks("benchmark", chunks[offset:offset + batch])
+        report["index_seconds"] = round(time.perf_counter() - start, 2)
+
+        start = time.perf_counter()
+        report["index"] = KeywordIndex(directory).get_stats("benchmark")
+        report["load_seconds"] = round(time.perf_counter() - start, 2)
+
+        latencies = []
+        for query in query_texts:
+            start = time.perf_counter()
+            index.search("benchmark", query, limit)
+            latencies.append(time.perf_counter() - start)
+        report["bm25"] = _stats(latencies)
+
+    # An unbounded scan (no LIMIT) is what ranking all matches requires
+    latencies = []
+    for query in query_texts:
+        start = time.perf_counter()
+        _scan(chunks, query, size)
+        latencies.append(time.perf_counter() - start)
+    report["linear_scan"] = _stats(latencies)
+    return report
+
+
+def main() -> int:
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated corpus sizes")
+    parser.add_argument("--vocabulary", type=int, default=50000, help="Distinct words")
+    parser.add_argument("--batch", type=int, default=1000, help="Chunks per segment write")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per method")
+    parser.add_argument("--limit", type=int, default=20, help="Results per query")
+    args = parser.parse_args()
+
+    reports = [
+        measure(int(size), args.vocabulary, args.batch, args.queries, args.limit)
+        for size in args.sizes.split(",")
+    ]
+    print(json.dumps({"limit": args.limit, "results": reports}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
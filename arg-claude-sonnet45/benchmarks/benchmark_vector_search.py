@@ -0,0 +1,164 @@
+"""Compare vector search latency and recall across backends and corpus sizes.
+
+Embeddings are synthetic: unit vectors drawn around a few hundred random
+topic centres, so nearest neighbours are meaningful. Recall@k is measured
+against exact cosine ranking.
+
+Without --database the benchmark runs in process: the numpy index used by
+the "python" backend against a pure-Python per-element cosine scan, which
+stands in for the Cypher reduce() query. With --database it loads the
+chunks into a Memgraph namespace and times the "brute_force", "native" and
+"python" backends of GraphStore.vector_similarity_search, then deletes them.
+
+Usage:
+    python benchmarks/benchmark_vector_search.py --sizes 10000,100000 --dimension 1024
+    python benchmarks/benchmark_vector_search.py --sizes 10000,100000,1000000 --database
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.settings import settings  # noqa: E402
+from src.storage.vector_index import NamespaceVectorIndex  # noqa: E402
+
+
+def _corpus(size: int, dimension: int, seed: int = 11) -> np.ndarray:
+    """Draw unit vectors clustered around random topic centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((max(10, size // 500), dimension)).astype(np.float32)
+    vectors = centres[rng.integers(0, len(centres), size)]
+    vectors += 0.6 * rng.standard_normal((size, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _exact(vectors: np.ndarray, query: np.ndarray, k: int) -> list[int]:
+    return list(np.argsort(-(vectors @ query), kind="stable")[:k])
+
+
+def _python_scan(vectors: list[list[float]], query: list[float], k: int) -> list[int]:
+    """Cosine per element in interpreted code, like the Cypher reduce() query."""
+    scores = []
+    for i, vector in enumerate(vectors):
+        dot = norm1 = norm2 = 0.0
+        for a, b in zip(vector, query):
+            dot += a * b
+            norm1 += a * a
+            norm2 += b * b
+        scores.append((dot / ((norm1 ** 0.5) * (norm2 ** 0.5)), i))
+    return [i for _, i in sorted(scores, reverse=True)[:k]]
+
+
+def _stats(latencies: list[float], recalls: list[float]) -> dict:
+    return {
+        "queries": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "recall_at_k": round(statistics.mean(recalls), 4),
+    }
+
+
+def measure_in_process(size: int, dimension: int, queries: int, scan_queries: int, k: int) -> dict:
+    """Time the numpy index and the interpreted scan on one corpus."""
+    vectors = _corpus(size, dimension)
+    query_vectors = _corpus(queries, dimension, seed=29)
+    ids = [str(i) for i in range(size)]
+
+    start = time.perf_counter()
+    index = NamespaceVectorIndex(ids, vectors)
+    report = {"size": size, "build_seconds": round(time.perf_counter() - start, 3)}
+
+    latencies, recalls = [], []
+    for query in query_vectors:
+        start = time.perf_counter()
+        found = [int(chunk_id) for chunk_id, _ in index.search(query, k)]
+        latencies.append(time.perf_counter() - start)
+        recalls.append(len(set(found) & set(_exact(vectors, query, k))) / k)
+    report["python_index"] = _stats(latencies, recalls)
+
+    rows = vectors.tolist()
+    latencies, recalls = [], []
+    for query in query_vectors[:scan_queries]:
+        start = time.perf_counter()
+        found = _python_scan(rows, query.tolist(), k)
+        latencies.append(time.perf_counter() - start)
+        recalls.append(len(set(found) & set(_exact(vectors, query, k))) / k)
+    report["interpreted_scan"] = _stats(latencies, recalls)
+    return report
+
+
+def measure_database(size: int, dimension: int, queries: int, scan_queries: int, k: int) -> dict:
+    """Load a namespace into Memgraph and time each GraphStore backend."""
+    from src.storage.graph_store import GraphStore, _vector_indexes
+
+    store = GraphStore()
+    namespace = f"vector_benchmark_{uuid.uuid4().hex[:8]}"
+    document_id = uuid.uuid4()
+    vectors = _corpus(size, dimension)
+    query_vectors = _corpus(queries, dimension, seed=29)
+    ids = [str(uuid.uuid4()) for _ in range(size)]
+
+    store.create_document_node(document_id, namespace, "benchmark.pdf", "benchmark.pdf", size)
+    start = time.perf_counter()
+    for offset in range(0, size, 1000):
+        store.batch_create_chunks_with_embeddings(namespace, document_id, [
+            (ids[i], f"chunk {i}", vectors[i].tolist(), i, 0, {})
+            for i in range(offset, min(size, offset + 1000))
+        ])
+    report = {"size": size, "load_seconds": round(time.perf_counter() - start, 1)}
+
+    position = {chunk_id: i for i, chunk_id in enumerate(ids)}
+    configured = settings.vector_search_backend
+    try:
+        for backend in ("brute_force", "native", "python"):
+            settings.vector_search_backend = backend
+            _vector_indexes.clear()
+            store.vector_similarity_search(namespace, query_vectors[0].tolist(), k)  # warm up
+            latencies, recalls = [], []
+            for query in query_vectors[: scan_queries if backend == "brute_force" else queries]:
+                start = time.perf_counter()
+                chunks = store.vector_similarity_search(namespace, query.tolist(), k)
+                latencies.append(time.perf_counter() - start)
+                found = {position[chunk["chunk_id"]] for chunk in chunks}
+                recalls.append(len(found & set(_exact(vectors, query, k))) / k)
+            report[backend] = _stats(latencies, recalls)
+    finally:
+        settings.vector_search_backend = configured
+        with store.driver.session() as session:
+            session.run(
+                "MATCH (n) WHERE n.namespace = $namespace DETACH DELETE n", namespace=namespace
+            ).consume()
+    return report
+
+
+def main() -> int:
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated corpus sizes")
+    parser.add_argument("--dimension", type=int, default=1024, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=50, help="Queries per backend")
+    parser.add_argument("--scan-queries", type=int, default=3, help="Queries for the slow scans")
+    parser.add_argument("--k", type=int, default=20, help="Results per query")
+    parser.add_argument("--database", action="store_true", help="Benchmark against Memgraph")
+    args = parser.parse_args()
+
+    measure = measure_database if args.database else measure_in_process
+    reports = [
+        measure(int(size), args.dimension, args.queries, args.scan_queries, args.k)
+        for size in args.sizes.split(",")
+    ]
+    print(json.dumps({"dimension": args.dimension, "k": args.k, "results": reports}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Evaluate hybrid retrieval ranking quality and latency against labeled questions.
+
+The labels file is JSON Lines. Each line holds a "question" and a list of
+"relevant" entries. An entry is either a chunk ID or a text snippet; a
+retrieved chunk is relevant if its ID is listed or its text contains one
+of the snippets (case-insensitive). tests/fixtures/retrieval_labels.jsonl
+labels tests/fixtures/test_document.pdf.
+
+Every question first runs the search branches concurrently, as
+hybrid_search does. Each fusion configuration (single branches, RRF,
+weighted scores) is then scored on those same branch results, so every
+configuration sees identical input. The report gives recall@k, MRR and
+nDCG@k per configuration, plus latency per branch and for the concurrent
+search. Live runs need Memgraph and the embedding API. --save-runs stores
+the branch results, and --runs evaluates saved results offline, for
+example to tune weights or rrf_k.
+
+Usage:
+    python benchmarks/evaluate_hybrid_retrieval.py --name docs --index tests/fixtures/test_document.pdf
+    python benchmarks/evaluate_hybrid_retrieval.py --name docs --save-runs runs.json
+    python benchmarks/evaluate_hybrid_retrieval.py --runs runs.json --rrf-k 20 --k 5
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.settings import settings  # noqa: E402
+from src.models.query import QueryOptions  # noqa: E402
+from src.rag.retrieval import fuse_rankings  # noqa: E402
+
+DEFAULT_LABELS = Path(__file__).parent.parent / "tests" / "fixtures" / "retrieval_labels.jsonl"
+
+
+def load_labels(path: str) -> list[dict]:
+    """Read labeled questions from a JSON Lines file."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def is_relevant(chunk: dict, relevant: list[str]) -> bool:
+    """Check a chunk against a question's relevant IDs and snippets."""
+    text = chunk["text"].lower()
+    return any(entry == chunk["chunk_id"] or entry.lower() in text for entry in relevant)
+
+
+def score_ranking(chunks: list[dict], relevant: list[str], k: int) -> dict:
+    """Compute recall@k, reciprocal rank and nDCG@k for one ranking."""
+    hits = [is_relevant(chunk, relevant) for chunk in chunks[:k]]
+    # Each label counts once, however many chunks contain it
+    found = {entry for chunk in chunks[:k] for entry in relevant if is_relevant(chunk, [entry])}
+    first = next((rank for rank, hit in enumerate(hits, 1) if hit), None)
+    dcg = sum(1 / math.log2(rank + 1) for rank, hit in enumerate(hits, 1) if hit)
+    ideal = sum(1 / math.log2(rank + 1) for rank in range(1, min(len(relevant), k) + 1))
+    return {
+        "recall": len(found) / len(relevant) if relevant else 0.0,
+        "mrr": 1 / first if first else 0.0,
+        "ndcg": dcg / ideal if ideal else 0.0,
+    }
+
+
+def run_branches(name: str, labels: list[dict]) -> list[dict]:
+    """Run the search branches for every question and record their results."""
+    from src.rag.retrieval import get_query_embedding, run_search_branches
+
+    options = QueryOptions()
+    runs = []
+    for label in labels:
+        embedding = get_query_embedding(label["question"])
+        start = time.perf_counter()
+        rankings, durations, errors = run_search_branches(name, label["question"], embedding, options)
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        for branch, error in errors.items():
+            print(f"{branch} search failed for {label['question']!r}: {error}", file=sys.stderr)
+        runs.append({
+            "question": label["question"],
+            "relevant": label["relevant"],
+            "rankings": {
+                branch: [
+                    {
+                        "chunk_id": str(chunk["chunk_id"]),
+                        "text": chunk["text"],
+                        "similarity_score": chunk["similarity_score"],
+                        "source": chunk["source"],
+                    }
+                    for chunk in chunks
+                ]
+                for branch, chunks in rankings.items()
+            },
+            "retrieval_duration_ms": duration_ms,
+            "branch_durations_ms": durations,
+        })
+    return runs
+
+
+def evaluate(runs: list[dict], k: int, rrf_k: int, weights: dict[str, float]) -> dict:
+    """Score every fusion configuration over recorded branch results."""
+    configurations = {
+        "vector_only": lambda rankings: rankings.get("vector", []),
+        "keyword_only": lambda rankings: rankings.get("keyword", []),
+        "rrf": lambda rankings: fuse_rankings(rankings, "rrf", weights, rrf_k, limit=k),
+        "weighted": lambda rankings: fuse_rankings(rankings, "weighted", weights, rrf_k, limit=k),
+    }
+    report = {}
+    for configuration, fuse in configurations.items():
+        scores = [score_ranking(fuse(run["rankings"]), run["relevant"], k) for run in runs]
+        report[configuration] = {
+            metric: round(statistics.mean(score[metric] for score in scores), 4)
+            for metric in ("recall", "mrr", "ndcg")
+        }
+
+    latencies = {"hybrid": [run["retrieval_duration_ms"] for run in runs]}
+    for run in runs:
+        for branch, duration in run["branch_durations_ms"].items():
+            latencies.setdefault(branch, []).append(duration)
+    report["latency_ms"] = {
+        branch: {"p50": statistics.median(values), "max": max(values)}
+        for branch, values in latencies.items()
+    }
+    return report
+
+
+def main() -> int:
+    """Run the evaluation and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--name", help="Namespace to search (live runs)")
+    parser.add_argument("--labels", default=str(DEFAULT_LABELS), help="Labeled questions (JSON Lines)")
+    parser.add_argument("--index", help="PDF to index into the namespace first")
+    parser.add_argument("--runs", help="Evaluate saved branch results instead of searching")
+    parser.add_argument("--save-runs", help="Save branch results to this file")
+    parser.add_argument("--k", type=int, default=5, help="Cutoff for recall and nDCG")
+    parser.add_argument("--rrf-k", type=int, default=settings.hybrid_rrf_k, help="RRF rank offset")
+    parser.add_argument("--vector-weight", type=float, default=settings.hybrid_vector_weight)
+    parser.add_argument("--keyword-weight", type=float, default=settings.hybrid_keyword_weight)
+    args = parser.parse_args()
+
+    if args.runs:
+        with open(args.runs, encoding="utf-8") as f:
+            runs = json.load(f)
+    else:
+        if not args.name:
+            parser.error("--name is required unless --runs is given")
+        try:
+            if args.index:
+                from src.rag.orchestration import index_document
+
+                index_document(args.name, args.index)
+            start = time.perf_counter()
+            runs = run_branches(args.name, load_labels(args.labels))
+            print(f"Searched {len(runs)} questions in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        except Exception as e:
+            print(f"Error: evaluation needs Memgraph and the embedding API: {e}", file=sys.stderr)
+            return 1
+        if args.save_runs:
+            with open(args.save_runs, "w", encoding="utf-8") as f:
+                json.dump(runs, f, ensure_ascii=False, indent=2)
+
+    weights = {"vector": args.vector_weight, "keyword": args.keyword_weight}
+    report = evaluate(runs, args.k, args.rrf_k, weights)
+    print(json.dumps({"questions": len(runs), "k": args.k, "rrf_k": args.rrf_k, **report}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
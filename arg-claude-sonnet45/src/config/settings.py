@@ -24,6 +24,51 @@ class Settings(BaseSettings):
     database_url: str = "bolt://127.0.0.1:7687"
     database_user: str = ""
     database_password: str = ""
+    database_max_pool_size: int = 50
+    database_acquisition_timeout: float = 60.0
+    database_connection_timeout: float = 30.0
+    database_max_connection_lifetime: int = 3600
+
+    # Embedding Configuration
+    # Batches run concurrently within a request rate budget (0 = unlimited);
+    # failing batches are retried, then split down to single chunks
+    embedding_batch_size: int = 25
+    embedding_concurrency: int = 4
+    embedding_requests_per_second: float = 10.0
+    embedding_max_retries: int = 3
+    embedding_retry_backoff: float = 0.5
+
+    # Vector Search Configuration
+    # Backend: "native" (Memgraph vector index), "python" (in-process index),
+    # "brute_force" (Cypher scan) or "auto" (native, else python)
+    vector_search_backend: str = "auto"
+    vector_index_name: str = "chunk_embedding"
+    embedding_dimension: int = 1024
+    vector_index_capacity: int = 1_000_000
+    vector_search_overfetch: int = 4
+    vector_search_max_candidates: int = 10_000
+
+    # Keyword Search Configuration
+    # Backend: "bm25" (embedded inverted index), "fulltext" (Memgraph text
+    # index, needs --experimental-enabled=text-search) or "contains" (Cypher scan)
+    keyword_search_backend: str = "bm25"
+    keyword_index_dir: str = ".keyword_index"
+    keyword_index_max_segments: int = 8
+    text_index_name: str = "chunk_text"
+
+    # Hybrid Retrieval Configuration
+    # Fusion: "rrf" (reciprocal rank fusion) or "weighted" (weighted sum of
+    # per-branch min-max normalized scores)
+    hybrid_fusion: str = "rrf"
+    hybrid_rrf_k: int = 60
+    hybrid_vector_weight: float = 1.0
+    hybrid_keyword_weight: float = 1.0
+    hybrid_graph_weight: float = 1.0
+    hybrid_vector_top_k: int = 20
+    hybrid_keyword_top_k: int = 20
+    hybrid_graph_top_k: int = 10
+    hybrid_branch_timeout: float = 10.0
+    hybrid_max_results: int = 40
 
     # RAG Configuration
     chunk_size: int = 512
@@ -17,6 +17,12 @@ class QueryOptions(BaseModel):
         enable_vector_search: Enable vector similarity search
         enable_keyword_search: Enable keyword/BM25 search
         enable_graph_search: Enable graph traversal search
+        fusion: How hybrid search merges branches ("rrf" or "weighted";
+            defaults to HYBRID_FUSION)
+        branch_top_k: Results requested per branch, by branch name
+            (defaults to HYBRID_<BRANCH>_TOP_K)
+        branch_timeout: Seconds each branch may take, by branch name
+            (defaults to HYBRID_BRANCH_TIMEOUT)
     """
 
     top_k: int = 5
@@ -25,6 +31,9 @@ class QueryOptions(BaseModel):
     enable_vector_search: bool = True
     enable_keyword_search: bool = True
     enable_graph_search: bool = False
+    fusion: Literal["rrf", "weighted"] | None = None
+    branch_top_k: dict[str, int] = Field(default_factory=dict)
+    branch_timeout: dict[str, float] = Field(default_factory=dict)
 
 
 class Query(BaseModel):
@@ -74,6 +83,9 @@ class RetrievalResult(BaseModel):
         retrieval_methods_used: Which methods contributed
         timestamp: When retrieval completed
         retrieval_duration_ms: Time taken for retrieval
+        branch_durations_ms: Time each search branch took, by branch name
+        branch_errors: Why a branch contributed nothing, by branch name
+            (e.g. a timeout)
     """
 
     query_id: UUID
@@ -81,6 +93,8 @@ class RetrievalResult(BaseModel):
     retrieval_methods_used: list[str]
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     retrieval_duration_ms: int
+    branch_durations_ms: dict[str, int] = Field(default_factory=dict)
+    branch_errors: dict[str, str] = Field(default_factory=dict)
 
 
 class Citation(BaseModel):
@@ -1,6 +1,8 @@
 """Document indexing pipeline: PDF parsing, chunking, embedding, and storage."""
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from uuid import UUID
 
@@ -111,17 +113,127 @@ def chunk_text(markdown: str, chunk_size: int = 512, overlap: int = 50) -> list[
         raise
 
 
+class _RateLimiter:
+    """Spaces calls evenly to stay within a requests-per-second budget."""
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the next request may be sent."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _EmbeddingError(RuntimeError):
+    """A failed embedding call; retryable unless the request itself was rejected."""
+
+    def __init__(self, message: str, retryable: bool = True) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _call_embedding_api(texts: list[str], limiter: _RateLimiter) -> list[list[float]]:
+    """Embed one batch, returning vectors in the order of texts.
+
+    Raises:
+        _EmbeddingError: If the call fails or returns an incomplete result
+    """
+    limiter.acquire()
+    try:
+        response = TextEmbedding.call(
+            model="text-embedding-v4",
+            input=texts,
+            api_key=settings.qwen_api_key,
+        )
+    except Exception as e:
+        raise _EmbeddingError(f"Embedding API call failed: {e}") from e
+
+    if response.status_code != 200:
+        # Rate limiting and server errors are transient; other 4xx reject the input
+        retryable = response.status_code == 429 or response.status_code >= 500
+        raise _EmbeddingError(
+            f"Embedding API error {response.status_code}: {response.message}", retryable
+        )
+
+    items = response.output["embeddings"]
+    if len(items) != len(texts):
+        raise _EmbeddingError(f"Embedding API returned {len(items)} embeddings for {len(texts)} texts")
+    # Results carry the index of their input; do not rely on response order
+    items = sorted(items, key=lambda item: item.get("text_index", 0))
+    return [item["embedding"] for item in items]
+
+
+def _embed_batch(texts: list[str], start: int, limiter: _RateLimiter) -> list[list[float]]:
+    """Embed a batch with retries, splitting it in halves if it keeps failing.
+
+    Splitting isolates a chunk the API rejects, so the rest of its batch
+    still gets embedded and the error names the chunk.
+
+    Args:
+        texts: Chunk texts
+        start: Position of the first text in the document
+        limiter: Shared request rate limiter
+
+    Returns:
+        Embedding vectors in the order of texts
+
+    Raises:
+        RuntimeError: If a single chunk cannot be embedded
+    """
+    for attempt in range(settings.embedding_max_retries + 1):
+        try:
+            return _call_embedding_api(texts, limiter)
+        except _EmbeddingError as e:
+            error = e
+            if not e.retryable or attempt == settings.embedding_max_retries:
+                break
+            delay = settings.embedding_retry_backoff * 2**attempt
+            logger.warning(
+                f"Embedding chunks {start}-{start + len(texts) - 1} failed, retrying in {delay:.1f}s: {e}",
+                extra={"stage": "embed_chunks", "attempt": attempt + 1},
+            )
+            time.sleep(delay)
+
+    if len(texts) == 1:
+        raise RuntimeError(f"Failed to embed chunk {start}: {error}") from error
+
+    middle = len(texts) // 2
+    logger.warning(
+        f"Splitting failed batch of chunks {start}-{start + len(texts) - 1}: {error}",
+        extra={"stage": "embed_chunks", "size": len(texts)},
+    )
+    return _embed_batch(texts[:middle], start, limiter) + _embed_batch(
+        texts[middle:], start + middle, limiter
+    )
+
+
 def embed_chunks(chunks: list[str]) -> list[tuple[str, list[float]]]:
     """Generate embeddings for text chunks using Qwen text-embedding-v4.
 
+    Batches of EMBEDDING_BATCH_SIZE chunks are sent by EMBEDDING_CONCURRENCY
+    threads at no more than EMBEDDING_REQUESTS_PER_SECOND. A failing batch
+    is retried with exponential backoff and then split down to single
+    chunks. Results are placed by chunk position, and unless every chunk
+    is embedded the call fails, so a document is never stored with missing
+    or misaligned embeddings.
+
     Args:
         chunks: List of text chunks
 
     Returns:
-        List of (chunk_text, embedding_vector) pairs
+        List of (chunk_text, embedding_vector) pairs, in chunk order
 
     Raises:
-        RuntimeError: If embedding API is unavailable
+        RuntimeError: If any chunk cannot be embedded
         ValueError: If chunks list is empty
     """
     if not chunks:
@@ -134,47 +246,40 @@ def embed_chunks(chunks: list[str]) -> list[tuple[str, list[float]]]:
         )
         start_time = time.time()
 
-        # Batch embed (DashScope supports up to 25 texts per call)
-        batch_size = 25
-        all_embeddings = []
-
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i : i + batch_size]
-
+        batch_size = max(1, settings.embedding_batch_size)
+        limiter = _RateLimiter(settings.embedding_requests_per_second)
+        embeddings: list[list[float] | None] = [None] * len(chunks)
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, settings.embedding_concurrency),
+            thread_name_prefix="embed",
+        ) as executor:
+            futures = {
+                executor.submit(_embed_batch, chunks[i : i + batch_size], i, limiter): i
+                for i in range(0, len(chunks), batch_size)
+            }
             try:
-                response = TextEmbedding.call(
-                    model="text-embedding-v4",
-                    input=batch,
-                    api_key=settings.qwen_api_key,
-                )
-
-                if response.status_code == 200:
-                    batch_embeddings = [item["embedding"] for item in response.output["embeddings"]]
-                    all_embeddings.extend(batch_embeddings)
-                else:
-                    raise RuntimeError(f"Embedding API error: {response.message}")
-
-            except Exception as e:
-                logger.warning(
-                    f"Failed to embed batch {i // batch_size + 1}: {e}",
-                    extra={"stage": "embed_chunks", "batch": i // batch_size + 1},
-                )
-                # Skip failed batch
-                continue
-
-        if len(all_embeddings) != len(chunks):
-            logger.warning(
-                f"Embedded only {len(all_embeddings)}/{len(chunks)} chunks",
-                extra={"stage": "embed_chunks"},
-            )
-
-        duration_ms = int((time.time() - start_time) * 1000)
+                for future in as_completed(futures):
+                    i = futures[future]
+                    batch_embeddings = future.result()
+                    embeddings[i : i + len(batch_embeddings)] = batch_embeddings
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        duration = time.time() - start_time
         logger.info(
-            f"Embedded {len(all_embeddings)} chunks successfully",
-            extra={"stage": "embed_chunks", "count": len(all_embeddings), "duration_ms": duration_ms},
+            f"Embedded {len(chunks)} chunks successfully",
+            extra={
+                "stage": "embed_chunks",
+                "count": len(chunks),
+                "duration_ms": int(duration * 1000),
+                "chunks_per_second": round(len(chunks) / duration, 1) if duration else None,
+            },
         )
 
-        return list(zip(chunks[: len(all_embeddings)], all_embeddings))
+        return list(zip(chunks, embeddings))
 
     except Exception as e:
         logger.error(
@@ -201,13 +306,17 @@ def store_document(
         Unique document ID
 
     Raises:
-        ValueError: If name invalid or metadata missing required keys
+        ValueError: If name invalid, metadata missing required keys, or a chunk lacks an embedding
         RuntimeError: If storage operations fail
     """
     required_keys = {"filename", "file_path", "file_size"}
     if not required_keys.issubset(metadata.keys()):
         raise ValueError(f"metadata must contain: {required_keys}")
 
+    # A partially embedded document would be searchable with gaps or misaligned vectors
+    if not embeddings or any(not embedding for _, embedding in embeddings):
+        raise ValueError("every chunk must have an embedding")
+
     try:
         logger.info(
             f"Storing document with {len(embeddings)} chunks in Memgraph",
@@ -277,8 +386,6 @@ def store_document(
             chunks_data=chunks_data,
         )
 
-        graph_store.close()
-
         duration_ms = int((time.time() - start_time) * 1000)
         logger.info(
             f"Stored document successfully in Memgraph",
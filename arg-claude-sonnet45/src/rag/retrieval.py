@@ -1,6 +1,9 @@
 """Document retrieval: vector, keyword, and graph search."""
 
 import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any
 from uuid import UUID
 
 from dashscope import TextEmbedding
@@ -12,6 +15,10 @@ from src.storage.graph_store import GraphStore
 
 logger = get_logger(__name__)
 
+# Shared by all hybrid searches. A branch past its timeout holds its thread
+# until the query returns, so there is room beyond one search's branches.
+_branch_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hybrid-search")
+
 
 def get_query_embedding(question: str) -> list[float]:
     """Generate embedding vector for user query.
@@ -111,8 +118,6 @@ def vector_search(name: str, query_embedding: list[float], top_k: int = 20) -> l
             }
             chunks.append(chunk)
 
-        graph_store.close()
-
         duration_ms = int((time.time() - start_time) * 1000)
         logger.info(
             f"Vector search found {len(chunks)} chunks",
@@ -131,7 +136,7 @@ def vector_search(name: str, query_embedding: list[float], top_k: int = 20) -> l
 
 
 def keyword_search(name: str, question: str, top_k: int = 20) -> list[dict]:
-    """Perform keyword/BM25-style search in Memgraph.
+    """Perform BM25 keyword search over the namespace's chunks.
 
     Args:
         name: Document namespace
@@ -158,9 +163,8 @@ def keyword_search(name: str, question: str, top_k: int = 20) -> list[dict]:
         if not graph_store.namespace_exists(name):
             raise ValueError(f"No documents found for namespace '{name}'")
 
-        # Perform keyword search (full text search with text stored in Memgraph)
+        # Backend chosen by KEYWORD_SEARCH_BACKEND (BM25 index by default)
         results = graph_store.keyword_search(name, question, limit=top_k)
-        graph_store.close()
 
         # Format results
         chunks = []
@@ -212,6 +216,178 @@ def graph_search(name: str, question: str, top_k: int = 10) -> list[dict]:
     return []  # Optional feature for future
 
 
+def fuse_rankings(
+    rankings: dict[str, list[dict]],
+    method: str = "rrf",
+    weights: dict[str, float] | None = None,
+    rrf_k: int = 60,
+    limit: int = 40,
+) -> list[dict]:
+    """Merge the ranked results of several search branches into one ranking.
+
+    - "rrf": reciprocal rank fusion. A chunk scores the sum over branches
+      of weight / (rrf_k + rank). Only ranks are used, so branches whose
+      scores live on different scales (cosine similarity, BM25) combine
+      without calibration.
+    - "weighted": each branch's scores are min-max normalized to [0, 1]
+      and summed with the branch weights.
+
+    Fused scores are divided by the best possible score, a chunk ranked
+    first by every branch, so they stay in [0, 1].
+
+    Args:
+        rankings: Result chunks per branch name, best first
+        method: "rrf" or "weighted"
+        weights: Weight per branch name (default 1.0)
+        rrf_k: RRF rank offset; larger values flatten the rank curve
+        limit: Maximum number of results
+
+    Returns:
+        Unique chunks, best first, with the fused "similarity_score" and
+        the "source" of the branch that contributed most to them
+
+    Raises:
+        ValueError: If method is unknown
+    """
+    if method not in ("rrf", "weighted"):
+        raise ValueError(f"Unknown fusion method: {method}")
+    weights = weights or {}
+
+    scores: dict[Any, float] = {}
+    best_contribution: dict[Any, float] = {}
+    chunks_by_id: dict[Any, dict] = {}
+    total_weight = 0.0
+    for branch, chunks in rankings.items():
+        weight = weights.get(branch, 1.0)
+        if not chunks or weight <= 0:
+            continue
+        total_weight += weight
+        if method == "rrf":
+            contributions = [weight / (rrf_k + rank) for rank in range(1, len(chunks) + 1)]
+        else:
+            raw = [chunk["similarity_score"] for chunk in chunks]
+            low, high = min(raw), max(raw)
+            contributions = [
+                weight * ((score - low) / (high - low) if high > low else 1.0) for score in raw
+            ]
+
+        seen = set()
+        for chunk, contribution in zip(chunks, contributions):
+            chunk_id = chunk["chunk_id"]
+            if chunk_id in seen:
+                continue
+            seen.add(chunk_id)
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + contribution
+            if contribution > best_contribution.get(chunk_id, -1.0):
+                best_contribution[chunk_id] = contribution
+                chunks_by_id[chunk_id] = chunk
+
+    if not scores:
+        return []
+    best_possible = total_weight / (rrf_k + 1) if method == "rrf" else total_weight
+    ranked = sorted(scores, key=scores.get, reverse=True)[:limit]
+    return [
+        {**chunks_by_id[chunk_id], "similarity_score": scores[chunk_id] / best_possible}
+        for chunk_id in ranked
+    ]
+
+
+def _run_branch(search, *args, **kwargs) -> tuple[list[dict], int, Exception | None]:
+    """Run one search branch, capturing its duration and any error."""
+    start_time = time.perf_counter()
+    try:
+        chunks, error = search(*args, **kwargs), None
+    except Exception as e:
+        chunks, error = [], e
+    return chunks, int((time.perf_counter() - start_time) * 1000), error
+
+
+def run_search_branches(
+    name: str,
+    question: str,
+    query_embedding: list[float],
+    options: QueryOptions,
+) -> tuple[dict[str, list[dict]], dict[str, int], dict[str, str]]:
+    """Run the enabled search branches concurrently.
+
+    Each branch is given options.branch_top_k and options.branch_timeout
+    for its name, falling back to the HYBRID_* settings. A branch that
+    fails or runs past its timeout contributes no results; the wait for it
+    ends at the timeout, but its thread finishes in the background.
+
+    Args:
+        name: Document namespace
+        question: Original or preprocessed query
+        query_embedding: Query embedding vector
+        options: Search configuration
+
+    Returns:
+        Tuple of the chunks per successful branch (best first), the
+        duration per branch in milliseconds, and the error per failed branch
+
+    Raises:
+        ValueError: If no search methods are enabled
+    """
+    branches = {}
+    if options.enable_vector_search:
+        branches["vector"] = (vector_search, (name, query_embedding), settings.hybrid_vector_top_k)
+    if options.enable_keyword_search:
+        branches["keyword"] = (keyword_search, (name, question), settings.hybrid_keyword_top_k)
+    if options.enable_graph_search:
+        branches["graph"] = (graph_search, (name, question), settings.hybrid_graph_top_k)
+    if not branches:
+        raise ValueError("No search methods enabled")
+
+    started = time.monotonic()
+    futures = {
+        branch: _branch_executor.submit(
+            _run_branch, search, *args, top_k=options.branch_top_k.get(branch, top_k)
+        )
+        for branch, (search, args, top_k) in branches.items()
+    }
+    timeouts = {
+        branch: options.branch_timeout.get(branch, settings.hybrid_branch_timeout)
+        for branch in branches
+    }
+
+    rankings: dict[str, list[dict]] = {}
+    durations: dict[str, int] = {}
+    errors: dict[str, str] = {}
+    for branch in sorted(futures, key=timeouts.get):
+        try:
+            chunks, durations[branch], error = futures[branch].result(
+                timeout=max(0.0, started + timeouts[branch] - time.monotonic())
+            )
+        except FuturesTimeoutError:
+            futures[branch].cancel()
+            durations[branch] = int(timeouts[branch] * 1000)
+            errors[branch] = f"timed out after {timeouts[branch]}s"
+        else:
+            if error is not None:
+                errors[branch] = str(error)
+            else:
+                # Chunks without text cannot be used as context
+                rankings[branch] = [chunk for chunk in chunks if chunk["text"]]
+
+        if branch in errors:
+            logger.warning(
+                f"{branch.capitalize()} search failed in hybrid search: {errors[branch]}",
+                extra={"stage": "hybrid_search", "branch": branch},
+            )
+        else:
+            logger.info(
+                f"{branch.capitalize()} search contributed {len(rankings[branch])} chunks",
+                extra={"stage": "hybrid_search", "branch": branch, "duration_ms": durations[branch]},
+            )
+
+    # Report branches in the order they were enabled
+    return (
+        {branch: rankings[branch] for branch in branches if branch in rankings},
+        {branch: durations[branch] for branch in branches},
+        errors,
+    )
+
+
 def hybrid_search(
     name: str,
     question: str,
@@ -220,6 +396,11 @@ def hybrid_search(
 ) -> RetrievalResult:
     """Execute hybrid retrieval combining vector, keyword, and graph search.
 
+    The enabled branches run concurrently (see run_search_branches), so
+    retrieval takes as long as the slowest branch rather than their sum.
+    Their results are merged with fuse_rankings using HYBRID_FUSION, or
+    options.fusion when it is set.
+
     Args:
         name: Document namespace
         question: Original or preprocessed query
@@ -227,10 +408,10 @@ def hybrid_search(
         options: Search configuration
 
     Returns:
-        RetrievalResult with merged and deduplicated chunks
+        RetrievalResult with fused chunks, per-branch durations and errors
 
     Raises:
-        ValueError: If namespace does not exist or no search methods enabled
+        ValueError: If no search methods are enabled or all of them failed
     """
     try:
         logger.info(
@@ -239,77 +420,22 @@ def hybrid_search(
         )
         start_time = time.time()
 
-        all_chunks = []
-        methods_used = []
-
-        # Vector search
-        if options.enable_vector_search:
-            try:
-                vector_chunks = vector_search(name, query_embedding, top_k=20)
-                all_chunks.extend(vector_chunks)
-                methods_used.append("vector")
-                logger.info(
-                    f"Vector search contributed {len(vector_chunks)} chunks",
-                    extra={"stage": "hybrid_search"},
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Vector search failed in hybrid search: {e}",
-                    extra={"stage": "hybrid_search"},
-                )
-
-        # Keyword search
-        if options.enable_keyword_search:
-            try:
-                keyword_chunks = keyword_search(name, question, top_k=20)
-                # Filter out chunks without text (placeholder implementation)
-                keyword_chunks = [c for c in keyword_chunks if c["text"]]
-                all_chunks.extend(keyword_chunks)
-                if keyword_chunks:
-                    methods_used.append("keyword")
-                logger.info(
-                    f"Keyword search contributed {len(keyword_chunks)} chunks",
-                    extra={"stage": "hybrid_search"},
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Keyword search failed in hybrid search: {e}",
-                    extra={"stage": "hybrid_search"},
-                )
-
-        # Graph search (optional)
-        if options.enable_graph_search:
-            try:
-                graph_chunks = graph_search(name, question, top_k=10)
-                all_chunks.extend(graph_chunks)
-                if graph_chunks:
-                    methods_used.append("graph")
-                logger.info(
-                    f"Graph search contributed {len(graph_chunks)} chunks",
-                    extra={"stage": "hybrid_search"},
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Graph search failed in hybrid search: {e}",
-                    extra={"stage": "hybrid_search"},
-                )
-
-        if not methods_used:
-            raise ValueError("No search methods enabled or all failed")
-
-        # Deduplicate by chunk_id
-        seen_ids = set()
-        unique_chunks = []
-        for chunk in all_chunks:
-            if chunk["chunk_id"] not in seen_ids:
-                seen_ids.add(chunk["chunk_id"])
-                unique_chunks.append(chunk)
-
-        # Sort by similarity score (descending)
-        unique_chunks.sort(key=lambda x: x["similarity_score"], reverse=True)
-
-        # Take top 40 (or all if fewer)
-        unique_chunks = unique_chunks[:40]
+        rankings, durations, errors = run_search_branches(name, question, query_embedding, options)
+        if not rankings:
+            raise ValueError("All search methods failed")
+        methods_used = [branch for branch, chunks in rankings.items() if chunks]
+
+        fused = fuse_rankings(
+            rankings,
+            method=options.fusion or settings.hybrid_fusion,
+            weights={
+                "vector": settings.hybrid_vector_weight,
+                "keyword": settings.hybrid_keyword_weight,
+                "graph": settings.hybrid_graph_weight,
+            },
+            rrf_k=settings.hybrid_rrf_k,
+            limit=settings.hybrid_max_results,
+        )
 
         # Convert to RetrievedChunk models
         retrieved_chunks = [
@@ -320,7 +446,7 @@ def hybrid_search(
                 source=chunk["source"],
                 metadata=chunk["metadata"],
             )
-            for chunk in unique_chunks
+            for chunk in fused
         ]
 
         duration_ms = int((time.time() - start_time) * 1000)
@@ -330,6 +456,8 @@ def hybrid_search(
             chunks=retrieved_chunks,
             retrieval_methods_used=methods_used,
             retrieval_duration_ms=duration_ms,
+            branch_durations_ms=durations,
+            branch_errors=errors,
         )
 
         logger.info(
@@ -339,6 +467,7 @@ def hybrid_search(
                 "count": len(retrieved_chunks),
                 "methods": methods_used,
                 "duration_ms": duration_ms,
+                "branch_durations_ms": durations,
             },
         )
 
@@ -1,58 +1,308 @@
 """Memgraph unified storage for both graph relationships and vector embeddings."""
 
+import atexit
 import json
+import threading
+import time
 from typing import Any, List, Optional, Tuple
 from uuid import UUID
 
-from neo4j import Driver, GraphDatabase
+from neo4j import Driver, GraphDatabase, Session
+from neo4j.exceptions import Neo4jError
 
 from src.config.logging import get_logger
 from src.config.settings import settings
+from src.storage.keyword_index import get_keyword_index
+from src.storage.vector_index import NamespaceVectorIndex, VectorIndexCache
 
 logger = get_logger(__name__)
 
+# Versioned schema migrations, applied in order. Never edit an applied
+# migration; append a new version instead. Versions 2 and 3 created the
+# vector and text indexes, which depend on settings and optional database
+# features and are now managed by _ensure_search_indexes; the next
+# migration is version 4.
+SCHEMA_MIGRATIONS: List[Tuple[int, List[str]]] = [
+    (
+        1,
+        [
+            "CREATE CONSTRAINT ON (d:Document) ASSERT d.id IS UNIQUE;",
+            "CREATE CONSTRAINT ON (c:Chunk) ASSERT c.id IS UNIQUE;",
+            "CREATE INDEX ON :Document(name);",
+            "CREATE INDEX ON :Document(namespace);",
+            "CREATE INDEX ON :Chunk(document_id);",
+            "CREATE INDEX ON :Chunk(namespace);",
+        ],
+    ),
+]
+
+_driver: Optional[Driver] = None
+_driver_lock = threading.Lock()
+_migrated_databases: set[str] = set()
+
+# Per-namespace indexes of the "python" vector search backend
+_vector_indexes = VectorIndexCache()
+_native_vector_search_unavailable = False
+
+_CHUNK_FIELDS = """
+    c.id AS chunk_id,
+    c.text AS text,
+    c.document_id AS document_id,
+    c.position AS position,
+    c.metadata AS metadata
+"""
+
+
+def get_driver() -> Driver:
+    """Get the process-wide Memgraph driver, creating it on first use.
+
+    The driver owns a connection pool sized by the DATABASE_MAX_POOL_SIZE
+    setting and is shared by every GraphStore. The first call also brings
+    the database schema up to date and creates the search indexes the
+    configured backends use.
+
+    Returns:
+        Shared Neo4j driver
+
+    Raises:
+        RuntimeError: If the database cannot be reached
+    """
+    global _driver
+    if _driver is not None:
+        return _driver
+    with _driver_lock:
+        if _driver is None:
+            start_time = time.time()
+            driver = GraphDatabase.driver(
+                settings.database_url,
+                auth=(settings.database_user, settings.database_password)
+                if settings.database_user
+                else None,
+                max_connection_pool_size=settings.database_max_pool_size,
+                connection_acquisition_timeout=settings.database_acquisition_timeout,
+                connection_timeout=settings.database_connection_timeout,
+                max_connection_lifetime=settings.database_max_connection_lifetime,
+            )
+            try:
+                driver.verify_connectivity()
+                _apply_schema_migrations(driver)
+                _ensure_search_indexes(driver)
+            except Exception as e:
+                driver.close()
+                raise RuntimeError(f"Failed to connect to Memgraph: {e}") from e
+            _driver = driver
+            logger.info(
+                "Initialized Memgraph connection pool",
+                extra={
+                    "stage": "graph_store_init",
+                    "duration_ms": int((time.time() - start_time) * 1000),
+                },
+            )
+    return _driver
+
+
+def _apply_schema_migrations(driver: Driver) -> None:
+    """Apply schema migrations newer than the version recorded in the database.
+
+    The applied version is stored on a SchemaVersion node, so each migration
+    runs once per database rather than once per connection or process. A
+    statement failing for any reason other than the object already existing
+    stops the migrations without recording its version. The driver is kept
+    either way, so the migration is retried by the next process to connect.
+
+    Args:
+        driver: Driver connected to the database
+    """
+    if settings.database_url in _migrated_databases:
+        return
+
+    with driver.session() as session:
+        record = session.run(
+            "MATCH (v:SchemaVersion {id: 'graph_store'}) RETURN v.version AS version"
+        ).single()
+        current = record["version"] if record else 0
+
+        for version, statements in SCHEMA_MIGRATIONS:
+            if version <= current:
+                continue
+            for statement in statements:
+                try:
+                    session.run(statement).consume()
+                except Exception as e:
+                    if "already exists" not in str(e).lower():
+                        logger.error(
+                            f"Schema migration {version} failed, will retry on next start: {e}",
+                            extra={"stage": "schema_init"},
+                        )
+                        return
+                    # Databases set up before versioning already have these
+                    logger.debug(
+                        f"Schema migration {version} note: {e}", extra={"stage": "schema_init"}
+                    )
+            session.run(
+                "MERGE (v:SchemaVersion {id: 'graph_store'}) SET v.version = $version",
+                version=version,
+            ).consume()
+            current = version
+            logger.info(
+                f"Applied schema migration {version}", extra={"stage": "schema_init"}
+            )
+
+    _migrated_databases.add(settings.database_url)
+
+
+def _ensure_search_indexes(driver: Driver) -> None:
+    """Create the vector and text indexes used by the configured search backends.
+
+    The vector index is only needed by the "native" and "auto" vector
+    search backends and the text index only by the "fulltext" keyword
+    backend. An existing vector index whose dimension or capacity differs
+    from the settings is dropped and recreated. These indexes rely on
+    optional Memgraph features, so failures are logged and leave the
+    backend to fail (or, for "auto", fall back) at search time.
+
+    Args:
+        driver: Driver connected to the database
+    """
+    with driver.session() as session:
+        if settings.vector_search_backend in ("native", "auto"):
+            _ensure_vector_index(session)
+        if settings.keyword_search_backend == "fulltext":
+            _create_search_index(
+                session,
+                f"CREATE TEXT INDEX {settings.text_index_name} ON :Chunk;",
+                "Text index unavailable (needs --experimental-enabled=text-search)",
+            )
+
+
+def _ensure_vector_index(session: Session) -> None:
+    """Create the vector index, recreating it if its config no longer matches the settings."""
+    try:
+        existing = next(
+            (
+                record
+                for record in session.run(
+                    "CALL vector_search.show_index_info() "
+                    "YIELD index_name, dimension, capacity "
+                    "RETURN index_name, dimension, capacity"
+                )
+                if record["index_name"] == settings.vector_index_name
+            ),
+            None,
+        )
+    except Exception as e:
+        logger.warning(
+            f"Vector index unavailable: {e}", extra={"stage": "schema_init"}
+        )
+        return
+
+    if existing is not None:
+        if (
+            existing["dimension"] == settings.embedding_dimension
+            and existing["capacity"] == settings.vector_index_capacity
+        ):
+            return
+        logger.warning(
+            f"Recreating vector index {settings.vector_index_name}: dimension "
+            f"{existing['dimension']} and capacity {existing['capacity']} differ from "
+            f"the configured {settings.embedding_dimension} and {settings.vector_index_capacity}",
+            extra={"stage": "schema_init"},
+        )
+        if not _create_search_index(
+            session,
+            f"DROP VECTOR INDEX {settings.vector_index_name};",
+            "Failed to drop vector index",
+        ):
+            return
+
+    _create_search_index(
+        session,
+        f"CREATE VECTOR INDEX {settings.vector_index_name} ON :Chunk(embedding) "
+        f'WITH CONFIG {{"dimension": {settings.embedding_dimension}, '
+        f'"capacity": {settings.vector_index_capacity}, "metric": "cos"}};',
+        "Vector index unavailable",
+    )
+
+
+def _create_search_index(session: Session, statement: str, failure: str) -> bool:
+    """Run index DDL, logging failures other than the index already existing.
+
+    Returns:
+        False if the statement failed
+    """
+    try:
+        session.run(statement).consume()
+    except Exception as e:
+        if "already exists" in str(e).lower():
+            return True
+        logger.warning(f"{failure}: {e}", extra={"stage": "schema_init"})
+        return False
+    return True
+
+
+def health_check() -> dict[str, Any]:
+    """Check that the shared connection pool can reach the database.
+
+    Returns:
+        Dict with "healthy", the round-trip "latency_ms" and the applied
+        "schema_version", or an "error" message
+    """
+    start_time = time.time()
+    try:
+        with get_driver().session() as session:
+            record = session.run(
+                "OPTIONAL MATCH (v:SchemaVersion {id: 'graph_store'}) RETURN v.version AS version"
+            ).single()
+        return {
+            "healthy": True,
+            "latency_ms": round((time.time() - start_time) * 1000, 2),
+            "schema_version": record["version"] if record else None,
+        }
+    except Exception as e:
+        logger.warning(f"Memgraph health check failed: {e}", extra={"stage": "health_check"})
+        return {"healthy": False, "error": str(e)}
+
+
+def close_driver() -> None:
+    """Close the shared driver and its pooled connections.
+
+    Called at interpreter exit; a later get_driver() call opens a new pool.
+    """
+    global _driver
+    with _driver_lock:
+        driver, _driver = _driver, None
+    if driver is not None:
+        driver.close()
+        logger.info("Closed Memgraph connection pool", extra={"stage": "graph_store_close"})
+
+
+atexit.register(close_driver)
+
 
 class GraphStore:
     """Unified Memgraph storage for graph operations and vector similarity search.
 
     Handles document and chunk node storage, relationships, graph queries,
     and vector embedding storage with similarity search capabilities.
+    All stores share one pooled driver (see get_driver), so constructing a
+    GraphStore costs no connection setup or schema work.
     """
 
-    def __init__(self) -> None:
-        """Initialize Memgraph connection."""
-        self.driver: Driver = GraphDatabase.driver(
-            settings.database_url,
-            auth=(settings.database_user, settings.database_password)
-            if settings.database_user
-            else None,
-        )
-        logger.info("Initialized Memgraph connection", extra={"stage": "graph_store_init"})
-        self._initialize_schema()
+    def __init__(self, driver: Optional[Driver] = None) -> None:
+        """Initialize the store.
 
-    def _initialize_schema(self) -> None:
-        """Initialize graph schema with constraints and indexes."""
-        with self.driver.session() as session:
-            try:
-                # Create uniqueness constraints
-                session.run("CREATE CONSTRAINT ON (d:Document) ASSERT d.id IS UNIQUE;")
-                session.run("CREATE CONSTRAINT ON (c:Chunk) ASSERT c.id IS UNIQUE;")
-                # Create indexes for performance
-                session.run("CREATE INDEX ON :Document(name);")
-                session.run("CREATE INDEX ON :Document(namespace);")
-                session.run("CREATE INDEX ON :Chunk(document_id);")
-                session.run("CREATE INDEX ON :Chunk(namespace);")
-                logger.info("Initialized graph schema with vector support", extra={"stage": "schema_init"})
-            except Exception as e:
-                # Constraints/indexes may already exist
-                logger.debug(
-                    f"Schema initialization note: {e}", extra={"stage": "schema_init"}
-                )
+        Args:
+            driver: Driver to use (defaults to the shared pool)
+        """
+        self.driver: Driver = driver or get_driver()
 
     def close(self) -> None:
-        """Close the database connection."""
-        self.driver.close()
-        logger.info("Closed Memgraph connection", extra={"stage": "graph_store_close"})
+        """Release the store.
+
+        The shared driver stays open for other stores; it is closed by
+        close_driver() at shutdown.
+        """
+        logger.debug("Released GraphStore", extra={"stage": "graph_store_close"})
 
     def create_document_node(
         self,
@@ -154,6 +404,8 @@ class GraphStore:
                     char_offset=char_offset,
                     metadata=json.dumps(metadata) if metadata else "{}",
                 )
+                _vector_indexes.add(namespace, [chunk_id], [embedding])
+                self._update_keyword_index(session, namespace, [(chunk_id, text)])
                 logger.debug(
                     f"Created chunk with embedding: {chunk_id}",
                     extra={"stage": "chunk_create", "chunk_id": chunk_id},
@@ -216,6 +468,14 @@ class GraphStore:
                     doc_id=str(document_id),
                     chunks=chunks,
                 )
+                _vector_indexes.add(
+                    namespace,
+                    [chunk["id"] for chunk in chunks],
+                    [chunk["embedding"] for chunk in chunks],
+                )
+                self._update_keyword_index(
+                    session, namespace, [(chunk["id"], chunk["text"]) for chunk in chunks]
+                )
                 logger.info(
                     f"Created {len(chunks)} chunks with embeddings",
                     extra={
@@ -241,6 +501,20 @@ class GraphStore:
     ) -> List[dict[str, Any]]:
         """Perform vector similarity search using cosine similarity.
 
+        The VECTOR_SEARCH_BACKEND setting picks the method:
+
+        - "native": Memgraph's vector index. The index spans all namespaces,
+          so it is asked for VECTOR_SEARCH_OVERFETCH times the results and
+          matches are filtered by namespace, widening the request until
+          enough are found. Beyond VECTOR_SEARCH_MAX_CANDIDATES the
+          namespace is small relative to the corpus and is scanned exactly.
+        - "python": an exact in-process index per namespace, loaded once
+          and rebuilt when the namespace's chunk count changes.
+        - "brute_force": cosine similarity computed in Cypher over every
+          chunk of the namespace.
+        - "auto": "native", switching to "python" for the rest of the
+          process if the database has no vector search.
+
         Args:
             namespace: Document namespace to search in
             query_embedding: Query vector embedding
@@ -250,48 +524,39 @@ class GraphStore:
         Returns:
             List of chunks with similarity scores, sorted by relevance
         """
+        global _native_vector_search_unavailable
+        backend = settings.vector_search_backend
+        if backend == "auto":
+            backend = "python" if _native_vector_search_unavailable else "native"
+
         with self.driver.session() as session:
             try:
-                # Memgraph doesn't have built-in vector functions yet,
-                # so we'll compute cosine similarity in Cypher
-                # This will be optimized when Memgraph adds native vector support
-                result = session.run(
-                    """
-                    MATCH (c:Chunk {namespace: $namespace})
-                    WITH c,
-                         reduce(dot = 0.0, i IN range(0, size($query_embedding)-1) |
-                                dot + c.embedding[i] * $query_embedding[i]) AS dot_product,
-                         sqrt(reduce(sum1 = 0.0, val IN c.embedding | sum1 + val * val)) AS norm1,
-                         sqrt(reduce(sum2 = 0.0, val IN $query_embedding | sum2 + val * val)) AS norm2
-                    WITH c, dot_product / (norm1 * norm2) AS similarity
-                    WHERE similarity >= $threshold
-                    RETURN c.id AS chunk_id,
-                           c.text AS text,
-                           c.document_id AS document_id,
-                           c.position AS position,
-                           c.metadata AS metadata,
-                           similarity
-                    ORDER BY similarity DESC
-                    LIMIT $limit
-                    """,
-                    namespace=namespace,
-                    query_embedding=query_embedding,
-                    threshold=similarity_threshold,
-                    limit=limit,
-                )
-
-                chunks = []
-                for record in result:
-                    chunk_data = {
-                        "chunk_id": record["chunk_id"],
-                        "text": record["text"],
-                        "document_id": record["document_id"],
-                        "position": record["position"],
-                        "metadata": json.loads(record["metadata"]) if record["metadata"] else {},
-                        "similarity_score": float(record["similarity"]),
-                    }
-                    chunks.append(chunk_data)
-
+                if backend == "native":
+                    try:
+                        matches = self._native_vector_search(
+                            session, namespace, query_embedding, limit, similarity_threshold
+                        )
+                    except Neo4jError as e:
+                        if settings.vector_search_backend != "auto":
+                            raise
+                        _native_vector_search_unavailable = True
+                        logger.warning(
+                            f"Native vector search unavailable, using in-process index: {e}",
+                            extra={"stage": "vector_search"},
+                        )
+                        backend = "python"
+                if backend == "python":
+                    matches = self._python_vector_search(
+                        session, namespace, query_embedding, limit, similarity_threshold
+                    )
+                elif backend == "brute_force":
+                    matches = self._brute_force_vector_search(
+                        session, namespace, query_embedding, limit, similarity_threshold
+                    )
+                elif backend != "native":
+                    raise ValueError(f"Unknown vector search backend: {backend}")
+
+                chunks = self._fetch_chunks(session, namespace, matches)
                 logger.info(
                     f"Vector search found {len(chunks)} similar chunks",
                     extra={"stage": "vector_search", "count": len(chunks)},
@@ -306,6 +571,203 @@ class GraphStore:
                 )
                 return []
 
+    def _native_vector_search(
+        self,
+        session: Session,
+        namespace: str,
+        query_embedding: List[float],
+        limit: int,
+        similarity_threshold: float,
+    ) -> List[Tuple[str, float]]:
+        """Query Memgraph's vector index, keeping matches in the namespace.
+
+        Returns:
+            (chunk_id, similarity) pairs, most similar first
+
+        Raises:
+            Neo4jError: If the database has no vector index support
+        """
+        candidates = limit * settings.vector_search_overfetch
+        while True:
+            records = list(
+                session.run(
+                    """
+                    CALL vector_search.search($index_name, $candidates, $query_embedding)
+                    YIELD node, similarity
+                    RETURN node.id AS chunk_id, node.namespace AS namespace, similarity
+                    """,
+                    index_name=settings.vector_index_name,
+                    candidates=candidates,
+                    query_embedding=query_embedding,
+                )
+            )
+            matches = [
+                (record["chunk_id"], float(record["similarity"]))
+                for record in records
+                if record["namespace"] == namespace
+                and record["similarity"] >= similarity_threshold
+            ]
+            # Done when enough matched or the whole index was returned
+            if len(matches) >= limit or len(records) < candidates:
+                return sorted(matches, key=lambda m: m[1], reverse=True)[:limit]
+            candidates *= 4
+            if candidates > settings.vector_search_max_candidates:
+                logger.info(
+                    f"Namespace {namespace} is sparse in the vector index, scanning it exactly",
+                    extra={"stage": "vector_search"},
+                )
+                return self._brute_force_vector_search(
+                    session, namespace, query_embedding, limit, similarity_threshold
+                )
+
+    def _python_vector_search(
+        self,
+        session: Session,
+        namespace: str,
+        query_embedding: List[float],
+        limit: int,
+        similarity_threshold: float,
+    ) -> List[Tuple[str, float]]:
+        """Search the namespace's in-process index, (re)loading it if stale.
+
+        Returns:
+            (chunk_id, similarity) pairs, most similar first
+        """
+        count = session.run(
+            "MATCH (c:Chunk {namespace: $namespace}) RETURN count(c) AS count",
+            namespace=namespace,
+        ).single()["count"]
+        index = _vector_indexes.get(namespace)
+        if index is None or len(index) != count:
+            records = list(
+                session.run(
+                    "MATCH (c:Chunk {namespace: $namespace}) RETURN c.id AS chunk_id, c.embedding AS embedding",
+                    namespace=namespace,
+                )
+            )
+            index = NamespaceVectorIndex(
+                [record["chunk_id"] for record in records],
+                [record["embedding"] for record in records],
+            )
+            _vector_indexes.put(namespace, index)
+            logger.info(
+                f"Loaded vector index of {len(index)} chunks for namespace {namespace}",
+                extra={"stage": "vector_search"},
+            )
+        return index.search(query_embedding, limit, similarity_threshold)
+
+    def _brute_force_vector_search(
+        self,
+        session: Session,
+        namespace: str,
+        query_embedding: List[float],
+        limit: int,
+        similarity_threshold: float,
+    ) -> List[Tuple[str, float]]:
+        """Compute cosine similarity in Cypher over every chunk of the namespace.
+
+        Returns:
+            (chunk_id, similarity) pairs, most similar first
+        """
+        result = session.run(
+            """
+            MATCH (c:Chunk {namespace: $namespace})
+            WITH c,
+                 reduce(dot = 0.0, i IN range(0, size($query_embedding)-1) |
+                        dot + c.embedding[i] * $query_embedding[i]) AS dot_product,
+                 sqrt(reduce(sum1 = 0.0, val IN c.embedding | sum1 + val * val)) AS norm1,
+                 sqrt(reduce(sum2 = 0.0, val IN $query_embedding | sum2 + val * val)) AS norm2
+            WITH c, dot_product / (norm1 * norm2) AS similarity
+            WHERE similarity >= $threshold
+            RETURN c.id AS chunk_id, similarity
+            ORDER BY similarity DESC
+            LIMIT $limit
+            """,
+            namespace=namespace,
+            query_embedding=query_embedding,
+            threshold=similarity_threshold,
+            limit=limit,
+        )
+        return [(record["chunk_id"], float(record["similarity"])) for record in result]
+
+    def _fetch_chunks(
+        self, session: Session, namespace: str, matches: List[Tuple[str, float]]
+    ) -> List[dict[str, Any]]:
+        """Load the chunks of search matches, keeping their order.
+
+        Matches outside the namespace are dropped.
+
+        Args:
+            session: Open database session
+            namespace: Namespace the matches must belong to
+            matches: (chunk_id, similarity) pairs
+
+        Returns:
+            Chunk data dicts with "similarity_score"
+        """
+        if not matches:
+            return []
+        result = session.run(
+            f"MATCH (c:Chunk) WHERE c.id IN $chunk_ids AND c.namespace = $namespace "
+            f"RETURN {_CHUNK_FIELDS}",
+            chunk_ids=[chunk_id for chunk_id, _ in matches],
+            namespace=namespace,
+        )
+        records = {record["chunk_id"]: record for record in result}
+        chunks = []
+        for chunk_id, similarity in matches:
+            record = records.get(chunk_id)
+            if record is None:
+                continue
+            chunks.append({
+                "chunk_id": record["chunk_id"],
+                "text": record["text"],
+                "document_id": record["document_id"],
+                "position": record["position"],
+                "metadata": json.loads(record["metadata"]) if record["metadata"] else {},
+                "similarity_score": similarity,
+            })
+        return chunks
+
+    def _update_keyword_index(
+        self, session: Session, namespace: str, chunks: List[Tuple[str, str]]
+    ) -> None:
+        """Add newly written chunks to the BM25 keyword index.
+
+        A namespace without segments yet (new, or written before the index
+        existed) is indexed from the database in full, which includes the
+        new chunks. Failures are logged and leave the chunks unindexed
+        rather than failing the write.
+
+        Args:
+            session: Open database session
+            namespace: Document namespace
+            chunks: (chunk_id, text) pairs just written
+        """
+        if settings.keyword_search_backend != "bm25":
+            return
+        try:
+            index = get_keyword_index()
+            if index.has_namespace(namespace):
+                index.add_chunks(namespace, chunks)
+            else:
+                self._build_keyword_index(session, namespace)
+        except Exception as e:
+            logger.warning(
+                f"Failed to update keyword index: {e}",
+                extra={"stage": "keyword_index", "namespace": namespace},
+            )
+
+    def _build_keyword_index(self, session: Session, namespace: str) -> None:
+        """Index every chunk of a namespace for BM25 keyword search."""
+        result = session.run(
+            "MATCH (c:Chunk {namespace: $namespace}) RETURN c.id AS chunk_id, c.text AS text",
+            namespace=namespace,
+        )
+        get_keyword_index().add_chunks(
+            namespace, [(record["chunk_id"], record["text"] or "") for record in result]
+        )
+
     def keyword_search(
         self,
         namespace: str,
@@ -314,46 +776,39 @@ class GraphStore:
     ) -> List[dict[str, Any]]:
         """Perform keyword search on chunk text.
 
+        The KEYWORD_SEARCH_BACKEND setting picks the method:
+
+        - "bm25": the embedded inverted index of src.storage.keyword_index,
+          built from the database on first use and extended on every chunk
+          write. Scores are BM25 normalized to [0, 1].
+        - "fulltext": Memgraph's text index. It reports no scores, so
+          matches are scored by rank.
+        - "contains": a case-insensitive substring scan over every chunk of
+          the namespace, all scored 1.0.
+
         Args:
             namespace: Document namespace
             query: Search query
             limit: Maximum results
 
         Returns:
-            List of chunk data dicts
+            List of chunk data dicts with "relevance_score", best first
         """
+        backend = settings.keyword_search_backend
         with self.driver.session() as session:
             try:
-                # Simple text containment search
-                # For production, consider Memgraph's full-text search capabilities
-                result = session.run(
-                    """
-                    MATCH (c:Chunk {namespace: $namespace})
-                    WHERE toLower(c.text) CONTAINS toLower($query)
-                    RETURN c.id AS chunk_id,
-                           c.text AS text,
-                           c.document_id AS document_id,
-                           c.position AS position,
-                           c.metadata AS metadata,
-                           1.0 AS relevance_score
-                    LIMIT $limit
-                    """,
-                    namespace=namespace,
-                    query=query,
-                    limit=limit,
-                )
-
-                chunks = []
-                for record in result:
-                    chunk_data = {
-                        "chunk_id": record["chunk_id"],
-                        "text": record["text"],
-                        "document_id": record["document_id"],
-                        "position": record["position"],
-                        "metadata": json.loads(record["metadata"]) if record["metadata"] else {},
-                        "relevance_score": float(record["relevance_score"]),
-                    }
-                    chunks.append(chunk_data)
+                if backend == "bm25":
+                    matches = self._bm25_keyword_search(session, namespace, query, limit)
+                elif backend == "fulltext":
+                    matches = self._fulltext_keyword_search(session, namespace, query, limit)
+                elif backend == "contains":
+                    matches = self._contains_keyword_search(session, namespace, query, limit)
+                else:
+                    raise ValueError(f"Unknown keyword search backend: {backend}")
+
+                chunks = self._fetch_chunks(session, namespace, matches)
+                for chunk in chunks:
+                    chunk["relevance_score"] = chunk.pop("similarity_score")
 
                 logger.info(
                     f"Keyword search found {len(chunks)} matching chunks",
@@ -368,6 +823,67 @@ class GraphStore:
                 )
                 return []
 
+    def _bm25_keyword_search(
+        self, session: Session, namespace: str, query: str, limit: int
+    ) -> List[Tuple[str, float]]:
+        """Rank chunks with the BM25 index, building it if missing.
+
+        Returns:
+            (chunk_id, score) pairs, best first
+        """
+        index = get_keyword_index()
+        if not index.has_namespace(namespace):
+            self._build_keyword_index(session, namespace)
+            logger.info(
+                f"Built keyword index for namespace {namespace}",
+                extra={"stage": "keyword_search", **index.get_stats(namespace)},
+            )
+        return index.search(namespace, query, limit)
+
+    def _fulltext_keyword_search(
+        self, session: Session, namespace: str, query: str, limit: int
+    ) -> List[Tuple[str, float]]:
+        """Query Memgraph's text index, scoring matches by rank.
+
+        Returns:
+            (chunk_id, score) pairs, best first
+        """
+        result = session.run(
+            """
+            CALL text_search.search_all($index_name, $query) YIELD node
+            WITH node AS c
+            WHERE c.namespace = $namespace
+            RETURN c.id AS chunk_id
+            LIMIT $limit
+            """,
+            index_name=settings.text_index_name,
+            namespace=namespace,
+            query=query,
+            limit=limit,
+        )
+        return [(record["chunk_id"], 1.0 / (rank + 1)) for rank, record in enumerate(result)]
+
+    def _contains_keyword_search(
+        self, session: Session, namespace: str, query: str, limit: int
+    ) -> List[Tuple[str, float]]:
+        """Scan the namespace's chunks for the query as a substring.
+
+        Returns:
+            (chunk_id, score) pairs
+        """
+        result = session.run(
+            """
+            MATCH (c:Chunk {namespace: $namespace})
+            WHERE toLower(c.text) CONTAINS toLower($query)
+            RETURN c.id AS chunk_id
+            LIMIT $limit
+            """,
+            namespace=namespace,
+            query=query,
+            limit=limit,
+        )
+        return [(record["chunk_id"], 1.0) for record in result]
+
     def get_document_info(self, namespace: str, filename: str) -> Optional[dict]:
         """Get document information by namespace and filename.
 
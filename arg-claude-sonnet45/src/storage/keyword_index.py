@@ -0,0 +1,373 @@
+"""Embedded BM25 inverted index over chunk text, stored as on-disk segments."""
+
+import json
+import math
+import os
+import re
+import string
+import threading
+import unicodedata
+import uuid
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows: segment writes are only serialized within a process
+    fcntl = None
+
+from src.config.logging import get_logger
+from src.config.settings import settings
+
+logger = get_logger(__name__)
+
+# Kana, CJK ideographs (with extension A and compatibility forms) and Hangul
+_CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+# Single CJK characters, or runs of letters and digits in other scripts
+_TOKEN = re.compile(f"[{_CJK_RANGES}]|[^\\W_{_CJK_RANGES}]+")
+_CJK = re.compile(f"[{_CJK_RANGES}]")
+_SAFE_PATH_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
+
+def _namespace_component(namespace: str) -> str:
+    """Encode a namespace as one path component, distinct for every namespace.
+
+    ASCII letters, digits, "_" and "-" are kept; every other UTF-8 byte,
+    including "." and "%", becomes %XX. The empty namespace is "%".
+    """
+    if not namespace:
+        return "%"
+    return "".join(
+        chr(byte) if chr(byte) in _SAFE_PATH_CHARS else f"%{byte:02X}"
+        for byte in namespace.encode("utf-8")
+    )
+
+
+@contextmanager
+def _directory_lock(path: Path, shared: bool = False) -> Iterator[None]:
+    """Hold an OS lock on a namespace directory across processes.
+
+    Writers take it exclusively to number, write and merge segments one at
+    a time; readers take it shared so they never list a merge half done.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path / ".lock", "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into index terms.
+
+    Text is NFKC-normalized and case-folded. Words in space-delimited
+    scripts become one term each; CJK text, which has no spaces, becomes
+    its single characters plus overlapping character bigrams, so phrases
+    match without a dictionary-based segmenter.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms in text order
+    """
+    terms: list[str] = []
+    previous_cjk, previous_end = "", -1
+    for match in _TOKEN.finditer(unicodedata.normalize("NFKC", text).casefold()):
+        token = match.group()
+        if _CJK.fullmatch(token):
+            terms.append(token)
+            # Only characters that were adjacent in the text form a bigram
+            if previous_cjk and match.start() == previous_end:
+                terms.append(previous_cjk + token)
+            previous_cjk, previous_end = token, match.end()
+        else:
+            terms.append(token)
+            previous_cjk = ""
+    return terms
+
+
+class _Segment:
+    """An immutable batch of indexed chunks with its postings."""
+
+    def __init__(self, chunk_ids: list[str], lengths: list[int], postings: dict[str, list[list[int]]]):
+        self.chunk_ids = chunk_ids
+        self.lengths = lengths
+        # term -> [[local chunk number, term frequency], ...]
+        self.postings = postings
+
+    @classmethod
+    def build(cls, chunks: Sequence[tuple[str, str]]) -> "_Segment":
+        chunk_ids, lengths = [], []
+        postings: dict[str, list[list[int]]] = {}
+        for number, (chunk_id, text) in enumerate(chunks):
+            terms = tokenize(text)
+            chunk_ids.append(chunk_id)
+            lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                postings.setdefault(term, []).append([number, frequency])
+        return cls(chunk_ids, lengths, postings)
+
+    @classmethod
+    def merge(cls, segments: Sequence["_Segment"]) -> "_Segment":
+        chunk_ids: list[str] = []
+        lengths: list[int] = []
+        postings: dict[str, list[list[int]]] = {}
+        for segment in segments:
+            offset = len(chunk_ids)
+            chunk_ids.extend(segment.chunk_ids)
+            lengths.extend(segment.lengths)
+            for term, entries in segment.postings.items():
+                postings.setdefault(term, []).extend([number + offset, tf] for number, tf in entries)
+        return cls(chunk_ids, lengths, postings)
+
+    @classmethod
+    def load(cls, path: Path) -> "_Segment":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(data["chunk_ids"], data["lengths"], data["postings"])
+
+    def save(self, path: Path) -> None:
+        temporary = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp")
+        temporary.write_text(
+            json.dumps(
+                {"chunk_ids": self.chunk_ids, "lengths": self.lengths, "postings": self.postings},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        os.replace(temporary, path)
+
+
+class _NamespaceIndex:
+    """The loaded segments of one namespace and their corpus statistics."""
+
+    def __init__(self, files: list[tuple[str, int, int]], segments: list[_Segment]):
+        # (name, mtime in ns, size) of each segment file, to notice rewrites
+        self.files = files
+        self.segments = segments
+        self.document_count = sum(len(segment.chunk_ids) for segment in segments)
+        total_length = sum(sum(segment.lengths) for segment in segments)
+        self.average_length = total_length / self.document_count if self.document_count else 0.0
+
+    def document_frequency(self, term: str) -> int:
+        return sum(len(segment.postings.get(term, ())) for segment in self.segments)
+
+
+class KeywordIndex:
+    """BM25 keyword search over per-namespace inverted index segments.
+
+    Each store_document call writes one immutable segment file under
+    <directory>/<namespace>/, so indexing never rewrites existing data; once
+    a namespace has more than max_segments segments its newest ones are
+    merged. A query only visits the postings of its own terms, so its cost
+    grows with the number of matching chunks rather than with the corpus.
+
+    Scores are BM25 divided by the best score the query could reach (every
+    query term present in a short chunk), which puts them in [0, 1] and
+    makes them comparable across queries and with vector similarities.
+    Other processes' new segments are picked up on the next search.
+    Processes sharing the directory serialize writes through a lock file in
+    each namespace directory.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_segments: int = 8,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            directory: Directory holding the segment files
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            max_segments: Segments per namespace before they are merged
+        """
+        self.directory = Path(directory)
+        self.k1 = k1
+        self.b = b
+        self.max_segments = max_segments
+        self._namespaces: dict[str, _NamespaceIndex] = {}
+        self._lock = threading.Lock()
+        # Serializes this process's writers, also where no OS lock is available
+        self._write_lock = threading.Lock()
+
+    def _namespace_dir(self, namespace: str) -> Path:
+        return self.directory / _namespace_component(namespace)
+
+    def _segment_names(self, namespace: str) -> list[str]:
+        path = self._namespace_dir(namespace)
+        if not path.is_dir():
+            return []
+        return sorted(name for name in os.listdir(path) if name.endswith(".json"))
+
+    def _load(self, namespace: str) -> _NamespaceIndex:
+        """Get a namespace's segments, reloading them if files changed on disk."""
+        path = self._namespace_dir(namespace)
+        if not path.is_dir():
+            return _NamespaceIndex([], [])
+        with _directory_lock(path, shared=True):
+            files = []
+            for name in self._segment_names(namespace):
+                stat = (path / name).stat()
+                files.append((name, stat.st_mtime_ns, stat.st_size))
+            with self._lock:
+                loaded = self._namespaces.get(namespace)
+                if loaded is not None and loaded.files == files:
+                    return loaded
+                cached = dict(zip(loaded.files, loaded.segments)) if loaded else {}
+                segments = [cached.get(file) or _Segment.load(path / file[0]) for file in files]
+                loaded = _NamespaceIndex(files, segments)
+                self._namespaces[namespace] = loaded
+                return loaded
+
+    def has_namespace(self, namespace: str) -> bool:
+        """Check whether any chunks of a namespace are indexed.
+
+        Args:
+            namespace: Document namespace
+
+        Returns:
+            True if the namespace has segments
+        """
+        return bool(self._segment_names(namespace))
+
+    def add_chunks(self, namespace: str, chunks: Sequence[tuple[str, str]]) -> None:
+        """Index chunks as a new segment.
+
+        Args:
+            namespace: Document namespace
+            chunks: (chunk_id, text) pairs
+        """
+        if not chunks:
+            return
+        segment = _Segment.build(chunks)
+        path = self._namespace_dir(namespace)
+        path.mkdir(parents=True, exist_ok=True)
+        with self._write_lock, _directory_lock(path):
+            existing = self._segment_names(namespace)
+            name = _next_segment_name(existing)
+            segment.save(path / name)
+            names = existing + [name]
+            if len(names) > self.max_segments:
+                self._merge(namespace, self._merge_candidates(path, names))
+        logger.info(
+            f"Indexed {len(chunks)} chunks for keyword search",
+            extra={"stage": "keyword_index", "count": len(chunks)},
+        )
+
+    def _merge_candidates(self, path: Path, names: list[str]) -> list[str]:
+        """Pick the newest segments to merge, keeping segment sizes tiered.
+
+        The newest segments are merged together with each older one no
+        larger than them combined, so a merge rewrites data in proportion
+        to its own size and each chunk is rewritten O(log n) times, rather
+        than every merge rewriting the whole namespace.
+        """
+        sizes = [(path / name).stat().st_size for name in names]
+        count = max(2, len(names) - self.max_segments + 1)
+        while count < len(names) and sizes[-count - 1] <= sum(sizes[-count:]):
+            count += 1
+        return names[-count:]
+
+    def _merge(self, namespace: str, names: list[str]) -> None:
+        """Replace a namespace's newest segments with one (called with the write locks held)."""
+        path = self._namespace_dir(namespace)
+        merged = _Segment.merge([_Segment.load(path / name) for name in names])
+        # A new name, so no reader can load the merge under a merged segment's name
+        merged.save(path / _next_segment_name(names))
+        for name in names:
+            (path / name).unlink(missing_ok=True)
+
+    def search(self, namespace: str, query: str, limit: int = 20) -> list[tuple[str, float]]:
+        """Rank a namespace's chunks against a query with BM25.
+
+        Args:
+            namespace: Document namespace
+            query: Query text
+            limit: Maximum number of results
+
+        Returns:
+            (chunk_id, score) pairs with scores in [0, 1], best first
+        """
+        index = self._load(namespace)
+        terms = set(tokenize(query))
+        if not terms or not index.document_count:
+            return []
+
+        scores: dict[tuple[int, int], float] = {}
+        best_possible = 0.0
+        for term in terms:
+            frequency = index.document_frequency(term)
+            idf = math.log(1 + (index.document_count - frequency + 0.5) / (frequency + 0.5))
+            best_possible += idf * (self.k1 + 1)
+            if not frequency:
+                continue
+            for segment_number, segment in enumerate(index.segments):
+                for number, tf in segment.postings.get(term, ()):
+                    norm = self.k1 * (
+                        1 - self.b + self.b * segment.lengths[number] / index.average_length
+                    )
+                    key = (segment_number, number)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            (index.segments[s].chunk_ids[n], min(1.0, score / best_possible))
+            for (s, n), score in ranked
+        ]
+
+    def get_stats(self, namespace: str) -> dict[str, Any]:
+        """Describe a namespace's index.
+
+        Args:
+            namespace: Document namespace
+
+        Returns:
+            Dict with chunk, segment and term counts
+        """
+        index = self._load(namespace)
+        terms: set[str] = set()
+        for segment in index.segments:
+            terms.update(segment.postings)
+        return {
+            "chunks": index.document_count,
+            "segments": len(index.segments),
+            "terms": len(terms),
+            "average_length": round(index.average_length, 1),
+        }
+
+
+def _next_segment_name(names: list[str]) -> str:
+    """Name a segment after the newest of names, so segments sort oldest first."""
+    number = int(names[-1].split(".")[0]) + 1 if names else 0
+    return f"{number:08d}.json"
+
+
+_keyword_index: KeywordIndex | None = None
+_keyword_index_lock = threading.Lock()
+
+
+def get_keyword_index() -> KeywordIndex:
+    """Get the process-wide keyword index at KEYWORD_INDEX_DIR.
+
+    Returns:
+        Shared KeywordIndex
+    """
+    global _keyword_index
+    with _keyword_index_lock:
+        if _keyword_index is None:
+            _keyword_index = KeywordIndex(
+                settings.keyword_index_dir, max_segments=settings.keyword_index_max_segments
+            )
+        return _keyword_index
@@ -0,0 +1,114 @@
+"""In-process exact vector index for databases without native vector search."""
+
+import threading
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class NamespaceVectorIndex:
+    """Unit-normalized float32 embeddings of one namespace's chunks.
+
+    Cosine similarity against all chunks is one matrix-vector product, and
+    the top results are selected with argpartition, so a query touches no
+    database rows and does no interpreted per-element arithmetic.
+    """
+
+    def __init__(self, chunk_ids: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """Build the index.
+
+        Args:
+            chunk_ids: Chunk IDs, one per embedding
+            embeddings: Embedding vectors, all of the same dimension
+        """
+        self.chunk_ids: list[str] = list(chunk_ids)
+        if self.chunk_ids:
+            self.matrix = _normalize(
+                np.asarray(embeddings, dtype=np.float32).reshape(len(self.chunk_ids), -1)
+            )
+        else:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def add(self, chunk_ids: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """Append chunks to the index.
+
+        Args:
+            chunk_ids: Chunk IDs, one per embedding
+            embeddings: Embedding vectors
+        """
+        if not chunk_ids:
+            return
+        rows = _normalize(np.asarray(embeddings, dtype=np.float32).reshape(len(chunk_ids), -1))
+        # IDs first, so a concurrent search never sees rows without IDs
+        self.chunk_ids = self.chunk_ids + list(chunk_ids)
+        self.matrix = np.vstack([self.matrix, rows]) if len(self.matrix) else rows
+
+    def search(
+        self, query_embedding: Sequence[float], limit: int, similarity_threshold: float = 0.0
+    ) -> list[tuple[str, float]]:
+        """Find the chunks most similar to a query.
+
+        Args:
+            query_embedding: Query vector
+            limit: Maximum number of results
+            similarity_threshold: Minimum cosine similarity
+
+        Returns:
+            (chunk_id, similarity) pairs, most similar first
+        """
+        if not self.chunk_ids or limit <= 0:
+            return []
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+        scores = self.matrix @ query
+        if limit < len(scores):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (self.chunk_ids[i], float(scores[i])) for i in top if scores[i] >= similarity_threshold
+        ]
+
+
+class VectorIndexCache:
+    """Process-wide NamespaceVectorIndex per namespace.
+
+    Entries record the chunk count they were built from; callers compare it
+    with the database's current count and rebuild when chunks were added
+    elsewhere.
+    """
+
+    def __init__(self) -> None:
+        self._indexes: dict[str, NamespaceVectorIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str) -> NamespaceVectorIndex | None:
+        """Get a namespace's index, if built."""
+        with self._lock:
+            return self._indexes.get(namespace)
+
+    def put(self, namespace: str, index: NamespaceVectorIndex) -> None:
+        """Store a namespace's index."""
+        with self._lock:
+            self._indexes[namespace] = index
+
+    def add(self, namespace: str, chunk_ids: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """Append chunks to a namespace's index if it is built."""
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is not None:
+                index.add(chunk_ids, embeddings)
+
+    def clear(self) -> None:
+        """Drop every index."""
+        with self._lock:
+            self._indexes.clear()
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
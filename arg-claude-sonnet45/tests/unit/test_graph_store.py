@@ -0,0 +1,179 @@
+"""Unit tests for the shared Memgraph driver and schema migrations."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.storage import graph_store
+
+
+@pytest.fixture
+def fake_driver():
+    """Patch the driver factory with a mock and reset the shared pool around the test."""
+    graph_store.close_driver()
+    graph_store._migrated_databases.clear()
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+    session.run.return_value.single.return_value = None
+    with patch.object(graph_store.GraphDatabase, "driver", return_value=driver) as factory:
+        yield factory, driver, session
+    graph_store.close_driver()
+    graph_store._migrated_databases.clear()
+
+
+def _failing_run(session, prefix, message):
+    """Make statements starting with prefix raise message and record the versions that get stored."""
+    result = session.run.return_value
+
+    def run(statement, **params):
+        if statement.startswith(prefix):
+            raise RuntimeError(message)
+        run.statements.append(statement)
+        if "version" in params:
+            run.versions.append(params["version"])
+        return result
+
+    run.statements = []
+    run.versions = []
+    return run
+
+
+class TestSharedDriver:
+    """Test that stores share one lazily created driver."""
+
+    def test_stores_share_one_driver(self, fake_driver):
+        """Constructing stores opens the pool and runs migrations only once."""
+        factory, driver, session = fake_driver
+
+        stores = [graph_store.GraphStore() for _ in range(3)]
+        for store in stores:
+            store.close()
+
+        assert factory.call_count == 1
+        assert all(store.driver is driver for store in stores)
+        assert factory.call_args.kwargs["max_connection_pool_size"] == (
+            graph_store.settings.database_max_pool_size
+        )
+        driver.close.assert_not_called()
+
+        graph_store.close_driver()
+        driver.close.assert_called_once()
+
+    def test_migrations_run_once_per_version(self, fake_driver):
+        """Only migrations newer than the recorded version are applied."""
+        _, _, session = fake_driver
+
+        graph_store.get_driver()
+
+        statements = [call.args[0] for call in session.run.call_args_list]
+        assert statements[1:7] == graph_store.SCHEMA_MIGRATIONS[0][1]
+        assert "SET v.version = $version" in statements[7]
+
+    def test_recorded_version_skips_migrations(self, fake_driver):
+        """A database already at the latest version gets no DDL."""
+        _, _, session = fake_driver
+        session.run.return_value.single.return_value = {
+            "version": graph_store.SCHEMA_MIGRATIONS[-1][0]
+        }
+
+        graph_store.get_driver()
+
+        statements = [call.args[0] for call in session.run.call_args_list]
+        assert not set(statements) & set(graph_store.SCHEMA_MIGRATIONS[0][1])
+        assert not any("SET v.version" in statement for statement in statements)
+
+    def test_existing_objects_do_not_block_migrations(self, fake_driver):
+        """Statements failing because their index already exists still record the version."""
+        _, _, session = fake_driver
+        run = _failing_run(session, "CREATE INDEX ON :Chunk(namespace)", "Index already exists.")
+        session.run.side_effect = run
+
+        graph_store.get_driver()
+
+        assert run.versions == [version for version, _ in graph_store.SCHEMA_MIGRATIONS]
+
+    def test_failed_migration_is_not_recorded(self, fake_driver):
+        """Other failures stop the migrations and leave them to be retried."""
+        _, _, session = fake_driver
+        run = _failing_run(session, "CREATE INDEX ON :Chunk(namespace)", "Disk full.")
+        session.run.side_effect = run
+
+        graph_store.get_driver()
+
+        assert run.versions == []
+        assert graph_store.settings.database_url not in graph_store._migrated_databases
+
+    def test_search_indexes_follow_backends(self, fake_driver):
+        """Only the indexes the configured backends use are created."""
+        _, _, session = fake_driver
+        run = _failing_run(session, "CREATE TEXT INDEX", "Text search is not enabled.")
+        session.run.side_effect = run
+
+        with patch.multiple(
+            graph_store.settings, vector_search_backend="python", keyword_search_backend="bm25"
+        ):
+            graph_store.get_driver()
+
+        assert not any("VECTOR" in s or "TEXT INDEX" in s for s in run.statements)
+
+    def test_unavailable_text_index_does_not_block(self, fake_driver):
+        """A text index the database cannot create is logged and skipped."""
+        _, _, session = fake_driver
+        run = _failing_run(session, "CREATE TEXT INDEX", "Text search is not enabled.")
+        session.run.side_effect = run
+
+        with patch.object(graph_store.settings, "keyword_search_backend", "fulltext"):
+            graph_store.get_driver()
+
+        assert run.versions == [version for version, _ in graph_store.SCHEMA_MIGRATIONS]
+        assert graph_store.settings.database_url in graph_store._migrated_databases
+
+    def test_vector_index_is_recreated_when_settings_change(self, fake_driver):
+        """An existing vector index with a different capacity is dropped and recreated."""
+        _, _, session = fake_driver
+        session.run.return_value.__iter__.return_value = iter([
+            {
+                "index_name": graph_store.settings.vector_index_name,
+                "dimension": graph_store.settings.embedding_dimension,
+                "capacity": 10,
+            }
+        ])
+
+        with patch.object(graph_store.settings, "vector_search_backend", "native"):
+            graph_store.get_driver()
+
+        statements = [call.args[0] for call in session.run.call_args_list]
+        drop = statements.index(f"DROP VECTOR INDEX {graph_store.settings.vector_index_name};")
+        assert statements[drop + 1].startswith("CREATE VECTOR INDEX")
+        assert f'"capacity": {graph_store.settings.vector_index_capacity}' in statements[drop + 1]
+
+    def test_matching_vector_index_is_kept(self, fake_driver):
+        """A vector index matching the settings is left alone."""
+        _, _, session = fake_driver
+        session.run.return_value.__iter__.return_value = iter([
+            {
+                "index_name": graph_store.settings.vector_index_name,
+                "dimension": graph_store.settings.embedding_dimension,
+                "capacity": graph_store.settings.vector_index_capacity,
+            }
+        ])
+
+        graph_store.get_driver()
+
+        statements = [call.args[0] for call in session.run.call_args_list]
+        assert not any("VECTOR INDEX" in statement for statement in statements)
+
+    def test_unreachable_database(self, fake_driver):
+        """Connection failures raise and leave no half-open pool behind."""
+        factory, driver, _ = fake_driver
+        driver.verify_connectivity.side_effect = OSError("connection refused")
+
+        with pytest.raises(RuntimeError, match="Failed to connect"):
+            graph_store.get_driver()
+
+        driver.close.assert_called_once()
+        assert graph_store.health_check() == {
+            "healthy": False,
+            "error": "Failed to connect to Memgraph: connection refused",
+        }
+        assert factory.call_count == 2
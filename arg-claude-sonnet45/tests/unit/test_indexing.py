@@ -0,0 +1,115 @@
+"""Unit tests for concurrent chunk embedding."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.rag import indexing
+
+
+def _response(texts, status_code=200, reverse=False):
+    items = [
+        {"text_index": i, "embedding": [float(len(text)), float(i)]} for i, text in enumerate(texts)
+    ]
+    if reverse:
+        items.reverse()
+    return SimpleNamespace(
+        status_code=status_code, message="error", output={"embeddings": items}
+    )
+
+
+class TestEmbedChunks:
+    """Test batching, retries, splitting and ordered reassembly."""
+
+    def setup_method(self):
+        """Use small batches, no rate limit and no backoff."""
+        self.settings = patch.multiple(
+            indexing.settings,
+            embedding_batch_size=4,
+            embedding_concurrency=4,
+            embedding_requests_per_second=0,
+            embedding_max_retries=2,
+            embedding_retry_backoff=0,
+        )
+        self.settings.start()
+        self.chunks = ["x" * (i + 1) for i in range(23)]
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def teardown_method(self):
+        """Restore settings."""
+        self.settings.stop()
+
+    def _embed(self, fake):
+        def call(model, input, api_key):
+            with self.lock:
+                self.calls.append(list(input))
+            return fake(input)
+
+        with patch.object(indexing.TextEmbedding, "call", side_effect=call):
+            return indexing.embed_chunks(self.chunks)
+
+    def _assert_aligned(self, result):
+        assert [text for text, _ in result] == self.chunks
+        # The fake embeds a text as [its length, ...], so misalignment would show
+        assert [embedding[0] for _, embedding in result] == [len(text) for text in self.chunks]
+
+    def test_batches_are_reassembled_in_chunk_order(self):
+        """Concurrent batches and shuffled responses still line up with their chunks."""
+        result = self._embed(lambda texts: _response(texts, reverse=True))
+
+        self._assert_aligned(result)
+        assert sorted(len(batch) for batch in self.calls) == [3, 4, 4, 4, 4, 4]
+
+    def test_transient_failures_are_retried(self):
+        """A batch failing once with a server error succeeds on retry."""
+        failed = set()
+
+        def fake(texts):
+            if texts[0] not in failed:
+                failed.add(texts[0])
+                return _response(texts, status_code=503)
+            return _response(texts)
+
+        self._assert_aligned(self._embed(fake))
+        assert len(self.calls) == 12
+
+    def test_rejected_batch_is_split_down_to_the_bad_chunk(self):
+        """A batch the API rejects is split until only the offending chunk fails."""
+        bad = self.chunks[9]
+
+        def fake(texts):
+            return _response(texts, status_code=400 if bad in texts else 200)
+
+        with pytest.raises(RuntimeError, match="Failed to embed chunk 9"):
+            self._embed(fake)
+        # Rejections are not retried: [8..11] -> [8, 9] and [10, 11] -> [9] alone
+        assert [texts for texts in self.calls if bad in texts] == [
+            self.chunks[8:12], self.chunks[8:10], [bad]
+        ]
+
+    def test_incomplete_response_is_not_stored(self):
+        """A response missing embeddings fails the document instead of shifting vectors."""
+
+        def fake(texts):
+            response = _response(texts)
+            response.output["embeddings"] = response.output["embeddings"][:-1]
+            return response
+
+        with pytest.raises(RuntimeError, match="Failed to embed chunks"):
+            self._embed(fake)
+
+
+def test_store_document_rejects_missing_embeddings():
+    """Documents with unembedded chunks are refused before anything is written."""
+    with patch.object(indexing, "GraphStore") as graph_store:
+        with pytest.raises(ValueError, match="every chunk must have an embedding"):
+            indexing.store_document(
+                "docs",
+                [("a", [0.1]), ("b", [])],
+                {"filename": "a.pdf", "file_path": "/a.pdf", "file_size": 1},
+            )
+
+    graph_store.assert_not_called()
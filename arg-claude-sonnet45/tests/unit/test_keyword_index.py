@@ -0,0 +1,187 @@
+"""Unit tests for the BM25 keyword index and keyword search backends."""
+
+import multiprocessing
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.storage import graph_store
+from src.storage.keyword_index import KeywordIndex, _Segment, tokenize
+
+CHUNKS = [
+    ("c1", "Memgraph stores the document graph and chunk embeddings."),
+    ("c2", "BM25 ranks chunks by term frequency and inverse document frequency."),
+    ("c3", "The quick brown fox jumps over the lazy dog."),
+    ("c4", "华为公司的基本法规定了公司的核心价值观。"),
+    ("c5", "Keyword search with BM25 complements vector search on rare terms like SKU-4711."),
+]
+
+
+def _add_chunks_one_by_one(directory, prefix, count):
+    """Index chunks one segment at a time, as a separate writer process does."""
+    index = KeywordIndex(directory, max_segments=3)
+    for number in range(count):
+        index.add_chunks("docs", [(f"{prefix}{number}", f"shared {prefix} text {number}")])
+
+
+class TestTokenize:
+    """Test term extraction."""
+
+    def test_words_are_normalized(self):
+        """Words are case-folded and NFKC-normalized; punctuation splits them."""
+        assert tokenize("Hello, WORLD! ＡＢＣ sku-4711 naïve") == [
+            "hello", "world", "abc", "sku", "4711", "naïve"
+        ]
+
+    def test_cjk_unigrams_and_bigrams(self):
+        """Adjacent CJK characters also form bigrams; separated ones do not."""
+        assert tokenize("华为公司") == ["华", "为", "华为", "公", "为公", "司", "公司"]
+        assert tokenize("华 为") == ["华", "为"]
+        assert tokenize("한국어") == ["한", "국", "한국", "어", "국어"]
+
+
+class TestKeywordIndex:
+    """Test BM25 ranking and on-disk segments."""
+
+    def setup_method(self):
+        """Create an index in a temporary directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = KeywordIndex(self.tmp.name, max_segments=3)
+
+    def teardown_method(self):
+        """Remove the index directory."""
+        self.tmp.cleanup()
+
+    def test_ranks_matching_chunks_with_scores_in_unit_range(self):
+        """Chunks with more query terms rank higher and scores are in [0, 1]."""
+        self.index.add_chunks("docs", CHUNKS)
+
+        results = self.index.search("docs", "BM25 keyword search", limit=10)
+
+        assert [chunk_id for chunk_id, _ in results] == ["c5", "c2"]
+        assert all(0.0 < score <= 1.0 for _, score in results)
+        assert results[0][1] > results[1][1]
+        assert self.index.search("docs", "zebra") == []
+        assert self.index.search("other", "BM25") == []
+
+    def test_cjk_phrase_search(self):
+        """CJK queries match through characters and bigrams without spaces."""
+        self.index.add_chunks("docs", CHUNKS)
+
+        assert self.index.search("docs", "基本法")[0][0] == "c4"
+
+    def test_segments_merge_and_reload(self):
+        """Each batch is a segment, segments are merged past the limit, and a new instance reads them."""
+        for chunk in CHUNKS:
+            self.index.add_chunks("docs", [chunk])
+
+        names = sorted(n for n in os.listdir(os.path.join(self.tmp.name, "docs")) if n.endswith(".json"))
+        assert names == ["00000004.json", "00000005.json"]
+        assert self.index.get_stats("docs")["chunks"] == 5
+
+        reopened = KeywordIndex(self.tmp.name)
+        assert reopened.search("docs", "fox")[0][0] == "c3"
+        assert reopened.search("docs", "BM25") == self.index.search("docs", "BM25")
+
+    def test_picks_up_segments_written_elsewhere(self):
+        """Segments added by another instance are seen on the next search."""
+        self.index.add_chunks("docs", CHUNKS[:2])
+        assert self.index.search("docs", "fox") == []
+
+        KeywordIndex(self.tmp.name).add_chunks("docs", CHUNKS[2:])
+
+        assert self.index.search("docs", "fox")[0][0] == "c3"
+
+    def test_rewritten_segment_is_reloaded(self):
+        """A segment file replaced under the same name is not served from the cache."""
+        self.index.add_chunks("docs", CHUNKS[:1])
+        assert self.index.search("docs", "fox") == []
+
+        _Segment.build(CHUNKS[2:3]).save(Path(self.tmp.name, "docs", "00000000.json"))
+
+        assert self.index.search("docs", "fox")[0][0] == "c3"
+
+    def test_concurrent_writer_processes_keep_every_chunk(self):
+        """Processes adding and merging segments in one namespace lose no chunks."""
+        context = multiprocessing.get_context("spawn")
+        writers = [
+            context.Process(target=_add_chunks_one_by_one, args=(self.tmp.name, prefix, 12))
+            for prefix in ("a", "b", "c")
+        ]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join(timeout=60)
+
+        assert all(writer.exitcode == 0 for writer in writers)
+        assert self.index.get_stats("docs")["chunks"] == 36
+        assert not [n for n in os.listdir(os.path.join(self.tmp.name, "docs")) if n.endswith(".tmp")]
+
+    def test_namespaces_are_single_path_components(self):
+        """Namespaces cannot escape the index directory."""
+        self.index.add_chunks("../escape", CHUNKS[:1])
+
+        assert self.index.has_namespace("../escape")
+        assert os.listdir(self.tmp.name) == ["%2E%2E%2Fescape"]
+
+    def test_similar_namespaces_do_not_share_segments(self):
+        """Namespaces differing only in characters unsafe in paths stay apart."""
+        self.index.add_chunks("my docs", CHUNKS[:1])
+        self.index.add_chunks("my_docs", CHUNKS[1:2])
+        self.index.add_chunks("..", CHUNKS[2:3])
+
+        assert self.index.get_stats("my docs")["chunks"] == 1
+        assert self.index.get_stats("my_docs")["chunks"] == 1
+        assert self.index.search("my_docs", "fox") == []
+        assert sorted(os.listdir(self.tmp.name)) == ["%2E%2E", "my%20docs", "my_docs"]
+
+
+class TestKeywordSearchBackends:
+    """Test backend selection in GraphStore.keyword_search."""
+
+    def setup_method(self):
+        """Create a store on a mock driver."""
+        self.store = graph_store.GraphStore(driver=MagicMock())
+
+    def test_bm25_builds_missing_index_from_database(self):
+        """The first BM25 search of a namespace indexes its chunks from the database."""
+        index = MagicMock()
+        index.has_namespace.return_value = False
+        index.search.return_value = [("c1", 0.8)]
+        index.get_stats.return_value = {"chunks": 1}
+        session = self.store.driver.session.return_value.__enter__.return_value
+        session.run.return_value = iter([{"chunk_id": "c1", "text": "hello"}])
+
+        with patch.object(graph_store, "get_keyword_index", return_value=index), patch.object(
+            graph_store.settings, "keyword_search_backend", "bm25"
+        ), patch.object(
+            self.store,
+            "_fetch_chunks",
+            side_effect=lambda session, namespace, matches: [
+                {"chunk_id": chunk_id, "similarity_score": score} for chunk_id, score in matches
+            ],
+        ):
+            results = self.store.keyword_search("docs", "hello")
+
+        index.add_chunks.assert_called_once_with("docs", [("c1", "hello")])
+        assert results == [{"chunk_id": "c1", "relevance_score": 0.8}]
+
+    def test_chunk_writes_extend_existing_index(self):
+        """Written chunks are added to an already indexed namespace as one segment."""
+        index = MagicMock()
+        index.has_namespace.return_value = True
+
+        with patch.object(graph_store, "get_keyword_index", return_value=index), patch.object(
+            graph_store.settings, "keyword_search_backend", "bm25"
+        ):
+            self.store.batch_create_chunks_with_embeddings(
+                "docs", "doc-1", [("c1", "one", [0.1], 0, 0, {}), ("c2", "two", [0.2], 1, 3, {})]
+            )
+
+        index.add_chunks.assert_called_once_with("docs", [("c1", "one"), ("c2", "two")])
+
+    def test_unknown_backend_returns_no_results(self):
+        """A misconfigured backend fails the search softly like other errors."""
+        with patch.object(graph_store.settings, "keyword_search_backend", "nope"):
+            assert self.store.keyword_search("docs", "hello") == []
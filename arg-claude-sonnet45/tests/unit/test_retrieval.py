@@ -0,0 +1,118 @@
+"""Unit tests for rank fusion and concurrent hybrid search."""
+
+import time
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from src.models.query import QueryOptions
+from src.rag import retrieval
+
+IDS = [uuid4() for _ in range(6)]
+
+
+def _chunk(i, score, source):
+    return {
+        "chunk_id": IDS[i],
+        "text": f"chunk {i}",
+        "similarity_score": score,
+        "source": source,
+        "metadata": {"filename": "a.pdf", "position": i},
+    }
+
+
+class TestFuseRankings:
+    """Test reciprocal rank and weighted score fusion."""
+
+    def setup_method(self):
+        """Vector scores are cosines near 0.8; keyword scores are BM25 near 0.1."""
+        self.rankings = {
+            "vector": [_chunk(0, 0.85, "vector"), _chunk(1, 0.84, "vector"), _chunk(2, 0.80, "vector")],
+            "keyword": [_chunk(2, 0.30, "keyword"), _chunk(3, 0.10, "keyword"), _chunk(4, 0.05, "keyword")],
+        }
+
+    def test_rrf_promotes_chunks_found_by_several_branches(self):
+        """A chunk ranked by both branches beats ones ranked first by one."""
+        fused = retrieval.fuse_rankings(self.rankings, method="rrf")
+
+        assert [chunk["chunk_id"] for chunk in fused] == [IDS[2], IDS[0], IDS[1], IDS[3], IDS[4]]
+        assert fused[0]["source"] == "keyword"
+        assert all(0.0 < chunk["similarity_score"] <= 1.0 for chunk in fused)
+
+    def test_weights_shift_the_ranking(self):
+        """Weighting a branch up moves its results up."""
+        fused = retrieval.fuse_rankings(self.rankings, method="rrf", weights={"keyword": 3.0})
+
+        assert [chunk["chunk_id"] for chunk in fused][:3] == [IDS[2], IDS[3], IDS[4]]
+
+    def test_weighted_normalizes_each_branch(self):
+        """Scores are min-max normalized per branch before they are summed."""
+        fused = retrieval.fuse_rankings(self.rankings, method="weighted", limit=3)
+
+        # chunk 0 is 1.0 + 0; chunk 2 is 0 (last in vector) + 1.0; chunk 1 is 0.8
+        assert [chunk["chunk_id"] for chunk in fused] == [IDS[0], IDS[2], IDS[1]]
+        assert [chunk["similarity_score"] for chunk in fused] == pytest.approx([0.5, 0.5, 0.4])
+
+    def test_unknown_method(self):
+        """Misconfigured fusion fails loudly."""
+        with pytest.raises(ValueError):
+            retrieval.fuse_rankings(self.rankings, method="max")
+
+
+class TestHybridSearch:
+    """Test concurrent branches, timeouts and timings."""
+
+    def _search(self, vector_delay, keyword_delay, options=None, keyword_error=None):
+        def vector_search(name, query_embedding, top_k):
+            time.sleep(vector_delay)
+            return [_chunk(0, 0.9, "vector"), _chunk(1, 0.8, "vector")][:top_k]
+
+        def keyword_search(name, question, top_k):
+            time.sleep(keyword_delay)
+            if keyword_error:
+                raise keyword_error
+            return [_chunk(1, 0.4, "keyword")]
+
+        with patch.object(retrieval, "vector_search", side_effect=vector_search), patch.object(
+            retrieval, "keyword_search", side_effect=keyword_search
+        ):
+            return retrieval.hybrid_search("docs", "question", [0.1], options or QueryOptions())
+
+    def test_branches_run_concurrently(self):
+        """Retrieval takes about as long as the slowest branch and reports each branch's time."""
+        start = time.perf_counter()
+        result = self._search(0.3, 0.3)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.55
+        assert result.retrieval_methods_used == ["vector", "keyword"]
+        assert set(result.branch_durations_ms) == {"vector", "keyword"}
+        assert all(duration >= 290 for duration in result.branch_durations_ms.values())
+        assert [chunk.chunk_id for chunk in result.chunks] == [IDS[1], IDS[0]]
+
+    def test_slow_branch_is_dropped_after_its_timeout(self):
+        """A branch past its timeout is left out instead of delaying the results."""
+        options = QueryOptions(branch_timeout={"keyword": 0.1}, branch_top_k={"vector": 1})
+
+        start = time.perf_counter()
+        result = self._search(0.0, 0.5, options)
+
+        assert time.perf_counter() - start < 0.4
+        assert "timed out" in result.branch_errors["keyword"]
+        assert result.retrieval_methods_used == ["vector"]
+        assert [chunk.chunk_id for chunk in result.chunks] == [IDS[0]]
+
+    def test_failed_branch_is_reported(self):
+        """Errors of one branch are recorded and the others still return results."""
+        result = self._search(0.0, 0.0, keyword_error=RuntimeError("index offline"))
+
+        assert result.branch_errors == {"keyword": "index offline"}
+        assert len(result.chunks) == 2
+
+    def test_no_branches_enabled(self):
+        """Disabling every branch is an error."""
+        options = QueryOptions(enable_vector_search=False, enable_keyword_search=False)
+
+        with pytest.raises(ValueError, match="No search methods enabled"):
+            self._search(0.0, 0.0, options)
@@ -0,0 +1,103 @@
+"""Unit tests for the in-process vector index and vector search backends."""
+
+import math
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+from neo4j.exceptions import ClientError
+
+from src.storage import graph_store
+from src.storage.vector_index import NamespaceVectorIndex
+
+
+def _cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    return dot / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+
+class TestNamespaceVectorIndex:
+    """Test exact search over normalized embeddings."""
+
+    def setup_method(self):
+        """Build an index of random vectors."""
+        rng = random.Random(3)
+        self.vectors = [[rng.uniform(-1, 1) for _ in range(16)] for _ in range(200)]
+        self.ids = [f"chunk-{i}" for i in range(200)]
+        self.index = NamespaceVectorIndex(self.ids, self.vectors)
+
+    def test_matches_brute_force_cosine(self):
+        """Top results equal a brute-force cosine ranking."""
+        query = self.vectors[7]
+        expected = sorted(
+            ((chunk_id, _cosine(query, vector)) for chunk_id, vector in zip(self.ids, self.vectors)),
+            key=lambda m: m[1],
+            reverse=True,
+        )[:10]
+
+        results = self.index.search(query, 10)
+
+        assert [chunk_id for chunk_id, _ in results] == [chunk_id for chunk_id, _ in expected]
+        assert results[0] == ("chunk-7", pytest.approx(1.0, abs=1e-5))
+        for (_, score), (_, reference) in zip(results, expected):
+            assert score == pytest.approx(reference, abs=1e-5)
+
+    def test_threshold_and_limit(self):
+        """Results below the threshold are dropped and limits beyond the size are fine."""
+        results = self.index.search(self.vectors[0], 1000, similarity_threshold=0.5)
+        assert results and len(results) < 200
+        assert all(score >= 0.5 for _, score in results)
+
+    def test_add_and_empty_index(self):
+        """Chunks can be appended to an index built empty."""
+        index = NamespaceVectorIndex([], [])
+        assert index.search([1.0, 0.0], 5) == []
+
+        index.add(["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+        index.add(["c"], [[0.0, 0.0]])
+
+        assert len(index) == 3
+        assert index.search([2.0, 0.1], 1) == [("a", pytest.approx(0.9988, abs=1e-3))]
+
+
+class TestVectorSearchBackends:
+    """Test backend selection in GraphStore.vector_similarity_search."""
+
+    def setup_method(self):
+        """Create a store on a mock driver."""
+        self.store = graph_store.GraphStore(driver=MagicMock())
+        graph_store._native_vector_search_unavailable = False
+
+    def teardown_method(self):
+        """Reset the process-wide fallback flag."""
+        graph_store._native_vector_search_unavailable = False
+
+    def test_auto_falls_back_to_python_index(self):
+        """Without native vector search, auto mode switches to the in-process index for good."""
+        with patch.object(
+            self.store, "_native_vector_search", side_effect=ClientError("no vector_search")
+        ) as native, patch.object(
+            self.store, "_python_vector_search", return_value=[("a", 0.9)]
+        ) as python, patch.object(
+            self.store, "_fetch_chunks", side_effect=lambda session, namespace, matches: matches
+        ):
+            assert self.store.vector_similarity_search("docs", [0.1, 0.2]) == [("a", 0.9)]
+            assert self.store.vector_similarity_search("docs", [0.1, 0.2]) == [("a", 0.9)]
+
+        assert native.call_count == 1
+        assert python.call_count == 2
+
+    def test_native_widens_until_namespace_has_enough_matches(self):
+        """The vector index is asked for more candidates when the namespace filter drops them."""
+        session = MagicMock()
+        other = [{"chunk_id": f"o{i}", "namespace": "other", "similarity": 0.9} for i in range(8)]
+        ours = [{"chunk_id": "d1", "namespace": "docs", "similarity": 0.5}]
+        session.run.side_effect = [
+            iter(other),
+            iter(other * 4 + ours + [{"chunk_id": "d2", "namespace": "docs", "similarity": 0.7}]),
+        ]
+
+        matches = self.store._native_vector_search(session, "docs", [0.1], 2, 0.0)
+
+        assert matches == [("d2", 0.7), ("d1", 0.5)]
+        assert [call.kwargs["candidates"] for call in session.run.call_args_list] == [8, 32]
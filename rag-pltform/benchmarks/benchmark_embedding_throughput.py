@@ -0,0 +1,61 @@
+"""
+Measure embedding throughput (chunks per second) against the offline fake provider.
+
+Usage:
+    python benchmarks/benchmark_embedding_throughput.py --chunks 2000 --latency 0.2
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lib.fake_provider import FakeEmbeddings, FakeOpenAIClient
+from src.lib.llm_client import QwenClient
+
+
+def measure(chunks: int, latency: float, batch_size: int, concurrency: int, failure_rate: float) -> dict:
+    """Embed synthetic chunks and return throughput statistics."""
+    provider = FakeEmbeddings(dimension=256, latency=latency, max_batch_size=batch_size, failure_rate=failure_rate)
+    client = QwenClient(client=FakeOpenAIClient(provider))
+    client.embedding_cache = None
+    texts = [f"synthetic chunk {i} " * 20 for i in range(chunks)]
+
+    start = time.perf_counter()
+    for _ in client.iter_embeddings(texts, batch_size=batch_size, max_concurrency=concurrency):
+        pass
+    seconds = time.perf_counter() - start
+
+    return {
+        "batch_size": batch_size,
+        "concurrency": concurrency,
+        "seconds": round(seconds, 3),
+        "chunks_per_second": round(chunks / seconds, 1),
+        "requests": provider.requests,
+        "failed_requests": provider.failures,
+    }
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=1000, help="Number of chunks to embed")
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated seconds per request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Injected transient failure rate")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10], help="Inputs per request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8], help="Concurrent requests")
+    args = parser.parse_args()
+
+    results = [
+        measure(args.chunks, args.latency, batch_size, concurrency, args.failure_rate)
+        for batch_size in args.batch_sizes
+        for concurrency in args.concurrency
+    ]
+    print(json.dumps({"chunks": args.chunks, "latency": args.latency, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare per-item knowledge graph writes with the bulk GraphStore.store_graph path.
+
+Requires a running database at DATABASE_URL; only nodes created by the benchmark
+are deleted afterwards.
+
+Usage:
+    python benchmarks/benchmark_graph_writes.py --entities 2000 --concepts 200 --relationships 5000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lib.config import config
+from src.lib.database import DatabaseConnection
+from src.lib.graph_store import GraphStore
+from src.models.knowledge_graph import EntityNode, ConceptNode, Relationship
+
+
+def synthetic_graph(rng: random.Random, entities: int, concepts: int, relationships: int):
+    """Generate a random graph with edges between entities and concepts."""
+    entity_nodes = [EntityNode(name=f"entity {i}", type="bench") for i in range(entities)]
+    concept_nodes = [ConceptNode(name=f"concept {i}", description="bench") for i in range(concepts)]
+    nodes = entity_nodes + concept_nodes
+    edges = [
+        Relationship(source_id=rng.choice(nodes).id, target_id=rng.choice(nodes).id, type="RELATED_TO")
+        for _ in range(relationships)
+    ]
+    return entity_nodes, concept_nodes, edges
+
+
+def per_item(store: GraphStore, entities, concepts, relationships) -> None:
+    """Write the graph with one session per node and edge."""
+    for entity in entities:
+        store.store_entity(entity)
+    for concept in concepts:
+        store.store_concept(concept)
+    for relationship in relationships:
+        store.store_relationship(relationship)
+
+
+def cleanup(db: DatabaseConnection, node_ids) -> None:
+    """Delete benchmark nodes and their relationships."""
+    with db.get_driver().session() as session:
+        session.run("""
+        UNWIND $ids AS id
+        MATCH (n {id: id}) WHERE n:Entity OR n:Concept
+        DETACH DELETE n
+        """, {"ids": node_ids}).consume()
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entities", type=int, default=1000, help="Number of entity nodes")
+    parser.add_argument("--concepts", type=int, default=100, help="Number of concept nodes")
+    parser.add_argument("--relationships", type=int, default=2000, help="Number of relationships")
+    parser.add_argument("--batch-size", type=int, default=config.GRAPH_WRITE_BATCH_SIZE, help="Rows per UNWIND")
+    parser.add_argument("--skip-per-item", action="store_true", help="Only time the bulk path")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    db = DatabaseConnection(config.database_url, config.database_user, config.database_password)
+    db.connect()
+    store = GraphStore(db)
+    store.ensure_constraints()
+    results = {}
+
+    try:
+        modes = ["bulk"] if args.skip_per_item else ["per_item", "bulk"]
+        for mode in modes:
+            entities, concepts, relationships = synthetic_graph(
+                rng, args.entities, args.concepts, args.relationships
+            )
+            start = time.perf_counter()
+            if mode == "bulk":
+                store.store_graph(entities, concepts, relationships, batch_size=args.batch_size)
+            else:
+                per_item(store, entities, concepts, relationships)
+            seconds = time.perf_counter() - start
+            cleanup(db, [node.id for node in entities + concepts])
+            results[mode] = {
+                "seconds": round(seconds, 3),
+                "items_per_second": round((len(entities) + len(concepts) + len(relationships)) / seconds, 1),
+            }
+    finally:
+        db.disconnect()
+
+    if "per_item" in results:
+        results["speedup"] = round(results["per_item"]["seconds"] / results["bulk"]["seconds"], 1)
+    print(json.dumps({
+        "entities": args.entities,
+        "concepts": args.concepts,
+        "relationships": args.relationships,
+        "batch_size": args.batch_size,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
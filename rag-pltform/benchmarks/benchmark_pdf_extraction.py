@@ -0,0 +1,61 @@
+"""
+Measure PDF extraction throughput (pages per second) for different worker counts.
+
+Usage:
+    python benchmarks/benchmark_pdf_extraction.py --workers 1 2 4 8 --repeat 3
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lib.pdf_parser import PDFParser
+
+# Sample PDFs shipped with the repository
+SAMPLE_DIR = Path(__file__).parent.parent.parent / "documents"
+
+
+def measure(path: str, workers: int, repeat: int) -> dict:
+    """Extract every page of a PDF and return throughput statistics."""
+    parser = PDFParser(workers=workers)
+    pages = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        metadata, texts = parser.parse_with_metadata(path)
+        for _ in texts:
+            pass
+        pages += metadata["page_count"]
+    seconds = time.perf_counter() - start
+
+    return {
+        "workers": workers,
+        "seconds": round(seconds, 3),
+        "pages_per_second": round(pages / seconds, 1),
+    }
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="PDF files (defaults to the bundled samples)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker process counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Extractions per file and worker count")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(str(path) for path in SAMPLE_DIR.glob("*.pdf"))
+    if not paths:
+        parser.error(f"No PDF files given and none found in {SAMPLE_DIR}")
+
+    report = [
+        {"path": path, "results": [measure(path, workers, args.repeat) for workers in args.workers]}
+        for path in paths
+    ]
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
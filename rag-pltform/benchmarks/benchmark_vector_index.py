@@ -0,0 +1,60 @@
+"""
+Benchmark HNSW vector index recall and latency against brute-force search.
+
+Usage:
+    python benchmarks/benchmark_vector_index.py --size 20000 --dim 128 --ef 16 64 128
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lib.vector_index import HNSWIndex
+
+
+def random_vectors(rng: random.Random, count: int, dim: int, clusters: int):
+    """Generate clustered random vectors, which resemble real embeddings better than noise."""
+    centers = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(clusters)]
+    vectors = []
+    for _ in range(count):
+        center = rng.choice(centers)
+        vectors.append([c + rng.gauss(0, 0.5) for c in center])
+    return vectors
+
+
+def main():
+    """Run the benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=10000, help="Number of indexed vectors")
+    parser.add_argument("--dim", type=int, default=128, help="Vector dimension")
+    parser.add_argument("--queries", type=int, default=100, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--m", type=int, default=16, help="HNSW M parameter")
+    parser.add_argument("--ef-construction", type=int, default=200, help="HNSW efConstruction")
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128], help="efSearch values")
+    parser.add_argument("--clusters", type=int, default=50, help="Number of synthetic clusters")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vectors = random_vectors(rng, args.size, args.dim, args.clusters)
+    queries = random_vectors(rng, args.queries, args.dim, args.clusters)
+
+    index = HNSWIndex(m=args.m, ef_construction=args.ef_construction, seed=args.seed)
+    start = time.perf_counter()
+    for i, vector in enumerate(vectors):
+        index.add(f"v{i}", vector)
+    build_seconds = time.perf_counter() - start
+
+    report = index.recall_report(queries, k=args.k, ef_values=args.ef)
+    report["build_seconds"] = build_seconds
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,8 +12,13 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.lib.database import DatabaseConnection
 from src.lib.config import config
+from src.lib.llm_client import QwenClient
+from src.lib.vector_store import VectorStore
+from src.services.generation import GenerationService
 from src.services.indexing import IndexingService
 from src.services.orchestration import OrchestrationService
+from src.services.pre_retrieval import PreRetrievalService
+from src.services.retrieval import RetrievalService
 from src.models.document import Document
 from src.models.conversation import Conversation
 
@@ -30,7 +35,9 @@ class RAGPlatformCLI:
     def __init__(self):
         """Initialize the CLI application."""
         self.db_connection: Optional[DatabaseConnection] = None
+        self.vector_store: Optional[VectorStore] = None
         self.indexing_service: Optional[IndexingService] = None
+        self.retrieval_service: Optional[RetrievalService] = None
         self.orchestration_service: Optional[OrchestrationService] = None
         self.current_conversation: Optional[Conversation] = None
 
@@ -58,9 +65,32 @@ class RAGPlatformCLI:
             self.db_connection.connect()
             logger.info("Connected to database successfully")
 
-            # Initialize services
-            self.indexing_service = IndexingService(self.db_connection)
-            self.orchestration_service = OrchestrationService(self.db_connection)
+            # Share one vector store so indexing and retrieval use the same vector index
+            self.vector_store = VectorStore(
+                self.db_connection,
+                index_path=config.vector_index_path or None
+            )
+            if self.vector_store.index is not None:
+                logger.info("Vector index enabled with %d vectors", len(self.vector_store.index))
+
+            # Initialize services around one long-lived LLM client
+            llm_client = QwenClient()
+            pre_retrieval_service = PreRetrievalService()
+            self.retrieval_service = RetrievalService(
+                self.db_connection,
+                vector_store=self.vector_store,
+                llm_client=llm_client,
+                pre_retrieval_service=pre_retrieval_service
+            )
+            self.indexing_service = IndexingService(
+                self.db_connection, llm_client=llm_client, vector_store=self.vector_store
+            )
+            self.orchestration_service = OrchestrationService(
+                self.db_connection,
+                pre_retrieval_service=pre_retrieval_service,
+                retrieval_service=self.retrieval_service,
+                generation_service=GenerationService(llm_client)
+            )
 
             logger.info("RAG platform initialized successfully")
         except Exception as e:
@@ -69,6 +99,10 @@ class RAGPlatformCLI:
 
     def shutdown(self):
         """Shutdown the RAG platform services."""
+        if self.orchestration_service:
+            self.orchestration_service.close()
+        if self.vector_store:
+            self.vector_store.save_index()
         if self.db_connection:
             self.db_connection.disconnect()
             logger.info("Disconnected from database")
@@ -111,7 +145,7 @@ class RAGPlatformCLI:
         if not self.orchestration_service:
             raise RuntimeError("RAG platform not initialized")
 
-        response, conversation = self.orchestration_service.chat(
+        stream, conversation = self.orchestration_service.chat_stream(
             name=collection_name,
             question=question,
             conversation=self.current_conversation,
@@ -122,7 +156,10 @@ class RAGPlatformCLI:
         self.current_conversation = conversation
 
         print(f"\nQuestion: {question}")
-        print(f"Answer: {response.content}")
+        print("Answer: ", end="", flush=True)
+        for text in stream:
+            print(text, end="", flush=True)
+        print()
         print()
 
     def run(self):
@@ -2,13 +2,52 @@
 Document chunker for splitting text into smaller segments.
 """
 import re
-from typing import List, Tuple
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
 from ..models.chunk import Chunk
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class PageOffsetTable:
+    """Maps character offsets in a concatenated document to page numbers.
+
+    Stores one (start offset, page number) pair per page, so lookups are a
+    bisect over a table whose size is the page count rather than the text length.
+    """
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self._starts = array("q")
+        self._pages = array("q")
+
+    def add_page(self, start_offset: int, page_number: int) -> None:
+        """Record that a page begins at start_offset.
+
+        Args:
+            start_offset: Offset of the page's first character
+            page_number: Page number
+
+        Raises:
+            ValueError: If pages are not added in offset order
+        """
+        if self._starts and start_offset < self._starts[-1]:
+            raise ValueError("Pages must be added in offset order")
+        self._starts.append(start_offset)
+        self._pages.append(page_number)
+
+    def page_at(self, offset: int) -> Optional[int]:
+        """Get the page containing an offset, or None before the first page."""
+        index = bisect_right(self._starts, offset) - 1
+        return self._pages[index] if index >= 0 else None
+
+    def __len__(self) -> int:
+        """Number of pages in the table."""
+        return len(self._starts)
+
+
 class DocumentChunker:
     """Chunker for splitting documents into smaller segments."""
 
@@ -42,50 +81,122 @@ class DocumentChunker:
         if not text.strip():
             return []
 
-        chunks = []
+        chunks = list(self.iter_chunks(document_id, [(None, text)]))
+        logger.info("Created %d chunks from document %s", len(chunks), document_id)
+        return chunks
+
+    def iter_chunks(
+        self,
+        document_id: str,
+        pages: Iterable[Tuple[Optional[int], str]]
+    ) -> Iterator[Chunk]:
+        """Split a document into chunks as its pages arrive.
+
+        Pages are concatenated in order. Only the text not yet covered by an
+        emitted chunk is buffered, so memory stays bounded by the largest page
+        plus one chunk regardless of document length. Each chunk's metadata
+        records its start and end offset in the concatenated text and, when
+        page numbers are given, the pages it starts and ends on.
+
+        Args:
+            document_id: ID of the parent document
+            pages: (page number, text) pairs in document order; the page
+                number may be None for text without page information
+
+        Yields:
+            Chunk objects in document order
+        """
+        page_table = PageOffsetTable()
+        buffer = ""
+        base = 0  # Document offset of buffer[0]
+        start = 0  # Start of the next chunk, relative to buffer
         position = 0
-        start = 0
-
-        while start < len(text):
-            # Calculate end position
-            end = min(start + self.chunk_size, len(text))
-
-            # If we're not at the end of the text, try to find a good split point
-            if end < len(text):
-                # Look for the best separator within the overlap window
-                best_split = end
-                for separator in self.separators:
-                    # Look for separator in the overlap window
-                    search_start = max(end - self.chunk_overlap, start)
-                    split_pos = text.rfind(separator, search_start, end)
-                    if split_pos != -1:
-                        best_split = split_pos + len(separator)
-                        break
-
-                end = best_split
-
-            # Extract chunk content
-            content = text[start:end].strip()
-
-            # Only create chunk if it has content
-            if content:
-                chunk = Chunk(
-                    document_id=document_id,
-                    content=content,
-                    position=position
-                )
-                chunks.append(chunk)
+
+        for page_number, text in pages:
+            if page_number is not None:
+                page_table.add_page(base + len(buffer), page_number)
+            buffer = buffer[start:] + text
+            base += start
+            start = 0
+
+            # A split point is final once the text past the chunk window is known
+            while start + self.chunk_size < len(buffer):
+                end = self._split_point(buffer, start, final=False)
+                chunk = self._make_chunk(document_id, buffer, base, start, end, position, page_table)
+                if chunk:
+                    position += 1
+                    yield chunk
+                start = end - self.chunk_overlap
+                # If we're not making progress, stop like chunk() always has
+                if base + start <= 0:
+                    return
+
+        while start < len(buffer):
+            end = self._split_point(buffer, start, final=True)
+            chunk = self._make_chunk(document_id, buffer, base, start, end, position, page_table)
+            if chunk:
                 position += 1
+                yield chunk
+            if end == len(buffer):
+                break
+            start = end - self.chunk_overlap
+            if base + start <= 0:
+                break
 
-            # Move start position
-            start = end - self.chunk_overlap if end < len(text) else end
+    def _split_point(self, text: str, start: int, final: bool) -> int:
+        """Find where the chunk beginning at start should end.
 
-            # If we're not making progress, force advancement
-            if start <= 0 or (end == len(text) and start >= end):
-                break
+        Args:
+            text: Buffered text
+            start: Start of the chunk in text
+            final: Whether text holds the end of the document
 
-        logger.info("Created %d chunks from document %s", len(chunks), document_id)
-        return chunks
+        Returns:
+            End offset of the chunk in text
+        """
+        end = min(start + self.chunk_size, len(text))
+        if final and end == len(text):
+            return end
+
+        # Look for the best separator within the overlap window
+        search_start = max(end - self.chunk_overlap, start)
+        for separator in self.separators:
+            split_pos = text.rfind(separator, search_start, end)
+            if split_pos != -1:
+                return split_pos + len(separator)
+        return end
+
+    def _make_chunk(
+        self,
+        document_id: str,
+        text: str,
+        base: int,
+        start: int,
+        end: int,
+        position: int,
+        page_table: PageOffsetTable
+    ) -> Optional[Chunk]:
+        """Create a chunk from text[start:end] with offset and page metadata.
+
+        Returns:
+            Chunk object, or None if the span is only whitespace
+        """
+        raw = text[start:end]
+        stripped = raw.lstrip()
+        content = stripped.rstrip()
+        if not content:
+            return None
+
+        start_offset = base + start + len(raw) - len(stripped)
+        end_offset = start_offset + len(content)
+        metadata = {"start_offset": start_offset, "end_offset": end_offset}
+
+        first_page = page_table.page_at(start_offset)
+        if first_page is not None:
+            metadata["page_number"] = first_page
+            metadata["page_end"] = page_table.page_at(end_offset - 1)
+
+        return Chunk(document_id=document_id, content=content, position=position, metadata=metadata)
 
     def chunk_with_metadata(self, document_id: str, text: str, page_numbers: List[int] = None) -> List[Chunk]:
         """Split text into chunks with page number metadata.
@@ -98,15 +209,15 @@ class DocumentChunker:
         Returns:
             List of Chunk objects with page number metadata
         """
-        chunks = self.chunk(document_id, text)
-
-        if page_numbers and len(page_numbers) == len(text):
-            # Add page number metadata to chunks
-            for chunk in chunks:
-                # Find the page number for this chunk
-                start_pos = text.find(chunk.content)
-                if start_pos != -1:
-                    page_num = page_numbers[start_pos]
-                    chunk.metadata["page_number"] = page_num
-
-        return chunks
\ No newline at end of file
+        if not page_numbers or len(page_numbers) != len(text):
+            return self.chunk(document_id, text)
+
+        # Collapse the per-character page list into one span per page
+        pages = []
+        span_start = 0
+        for i in range(1, len(text) + 1):
+            if i == len(text) or page_numbers[i] != page_numbers[span_start]:
+                pages.append((page_numbers[span_start], text[span_start:i]))
+                span_start = i
+
+        return list(self.iter_chunks(document_id, pages))
@@ -21,11 +21,48 @@ class Config:
         # Qwen Configuration
         self.QWEN_API_BASE = os.getenv("QWEN_API_BASE", "https://dashscope.aliyuncs.com/compatible-mode/v1")
         self.QWEN_API_KEY = os.getenv("QWEN_API_KEY", "")
+        # "qwen" for the DashScope API, "fake" for the offline fake provider
+        self.LLM_PROVIDER = os.getenv("LLM_PROVIDER", "qwen")
+
+        # Embedding Request Configuration
+        self.EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "10"))
+        self.EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+        self.EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+        self.EMBEDDING_RETRY_BASE_DELAY = float(os.getenv("EMBEDDING_RETRY_BASE_DELAY", "0.5"))
+        self.VECTOR_WRITE_BATCH_SIZE = int(os.getenv("VECTOR_WRITE_BATCH_SIZE", "200"))
+
+        # PDF Extraction Configuration (1 extracts pages in-process)
+        self.PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", "1"))
 
         # Memgraph Database Configuration
         self.DATABASE_URL = os.getenv("DATABASE_URL", "bolt://127.0.0.1:7687")
         self.DATABASE_USER = os.getenv("DATABASE_USER", "")
         self.DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD", "")
+        self.GRAPH_WRITE_BATCH_SIZE = int(os.getenv("GRAPH_WRITE_BATCH_SIZE", "1000"))
+        # Retrieval Configuration: per-query latency budget in seconds (0 disables)
+        self.RETRIEVAL_TIMEOUT = float(os.getenv("RETRIEVAL_TIMEOUT", "10"))
+        self.RETRIEVAL_MAX_WORKERS = int(os.getenv("RETRIEVAL_MAX_WORKERS", "8"))
+        # Conversation Storage Configuration
+        self.CONVERSATION_WINDOW_SIZE = int(os.getenv("CONVERSATION_WINDOW_SIZE", "10"))
+        self.CONVERSATION_CACHE_SIZE = int(os.getenv("CONVERSATION_CACHE_SIZE", "1000"))
+        self.CONVERSATION_WRITE_BEHIND = os.getenv("CONVERSATION_WRITE_BEHIND", "false").lower() == "true"
+        # Number of recently retrieved chunks kept in memory (0 disables)
+        self.CHUNK_CACHE_SIZE = int(os.getenv("CHUNK_CACHE_SIZE", "1024"))
+
+        # Vector Index Configuration (builds run at roughly 150 inserts/s at
+        # dimension 1024; see README before indexing hundreds of thousands of chunks)
+        self.VECTOR_INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", "")
+        self.HNSW_M = int(os.getenv("HNSW_M", "16"))
+        self.HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+        self.HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "64"))
+
+        # Embedding Cache Configuration (empty path disables the cache; the
+        # memory tier takes about 4 KB per entry at dimension 1024)
+        default_cache_dir = os.getenv("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+        self.EMBEDDING_CACHE_PATH = os.path.expanduser(os.getenv(
+            "EMBEDDING_CACHE_PATH", os.path.join(default_cache_dir, "rag-pltform", "embeddings.sqlite3")
+        ))
+        self.EMBEDDING_CACHE_MEMORY_SIZE = int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "10000"))
 
     @property
     def qwen_api_key(self) -> str:
@@ -47,11 +84,16 @@ class Config:
         """Get database password."""
         return self.DATABASE_PASSWORD
 
+    @property
+    def vector_index_path(self) -> str:
+        """Get local directory of the persisted vector index."""
+        return self.VECTOR_INDEX_PATH
+
     def validate(self) -> None:
         """Validate required configuration."""
         missing_vars = []
 
-        if not self.QWEN_API_KEY:
+        if not self.QWEN_API_KEY and self.LLM_PROVIDER != "fake":
             missing_vars.append("QWEN_API_KEY")
 
         if missing_vars:
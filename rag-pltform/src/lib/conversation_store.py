@@ -0,0 +1,269 @@
+"""
+Conversation store for persisting chat turns.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from ..models.conversation import Conversation
+from ..models.query import Query
+from ..models.response import Response
+from ..lib.config import config
+from ..lib.database import DatabaseConnection
+from ..lib.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of queued turns written in one transaction by the write-behind thread
+WRITE_BEHIND_BATCH_SIZE = 50
+
+# Attempts per write-behind batch before its turns are dropped
+WRITE_BEHIND_ATTEMPTS = 3
+
+# Turns queued for write-behind before save_turn blocks
+WRITE_BEHIND_QUEUE_SIZE = 1000
+
+_STOP = object()
+
+
+class ConversationStore:
+    """Store for conversation turns with an in-memory window of recent turns.
+
+    Each turn (query, response and their links to the conversation) is written
+    in one transaction. The most recent turns of each conversation are kept in
+    memory, so follow-up questions do not re-read history from the database.
+    With write-behind enabled, turns are queued and written by a background
+    thread in batches; close() flushes the queue.
+    """
+
+    def __init__(
+        self,
+        db_connection: DatabaseConnection,
+        window_size: Optional[int] = None,
+        max_conversations: Optional[int] = None,
+        write_behind: Optional[bool] = None
+    ):
+        """Initialize conversation store.
+
+        Args:
+            db_connection: Database connection instance
+            window_size: Recent turns kept per conversation (defaults to CONVERSATION_WINDOW_SIZE)
+            max_conversations: Conversations kept in memory (defaults to CONVERSATION_CACHE_SIZE)
+            write_behind: Write turns from a background thread (defaults to CONVERSATION_WRITE_BEHIND)
+        """
+        self.db_connection = db_connection
+        self.window_size = window_size or config.CONVERSATION_WINDOW_SIZE
+        self.max_conversations = max_conversations or config.CONVERSATION_CACHE_SIZE
+        self.write_behind = config.CONVERSATION_WRITE_BEHIND if write_behind is None else write_behind
+        self._windows: "OrderedDict[str, Deque[Tuple[Query, Response]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.dropped_turns = 0
+
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        if self.write_behind:
+            self._queue = queue.Queue(maxsize=WRITE_BEHIND_QUEUE_SIZE)
+            self._writer = threading.Thread(target=self._write_behind_loop, name="conversation-writer", daemon=True)
+            self._writer.start()
+
+    def start_conversation(self, conversation: Conversation) -> None:
+        """Register a conversation that has no stored history yet.
+
+        Args:
+            conversation: Newly created conversation
+        """
+        with self._lock:
+            self._remember(conversation.id, deque(maxlen=self.window_size))
+
+    def save_turn(self, conversation: Conversation, query: Query, response: Response) -> None:
+        """Store one turn of a conversation.
+
+        The turn is added to the in-memory window immediately. Without
+        write-behind it is written before this method returns; otherwise it is
+        queued for the background writer.
+
+        Args:
+            conversation: Conversation the turn belongs to
+            query: Query asked in this turn
+            response: Response generated for the query
+
+        Raises:
+            DatabaseError: If writing fails (synchronous mode only)
+        """
+        conversation_data = conversation.to_dict()
+        conversation_data["context"] = dict(conversation.context)
+        turn = {
+            "conversation": conversation_data,
+            "query": query.to_dict(),
+            "response": response.to_dict()
+        }
+
+        with self._lock:
+            window = self._windows.get(conversation.id)
+            if window is not None:
+                window.append((query, response))
+                self._windows.move_to_end(conversation.id)
+
+        if self._queue is not None:
+            self._queue.put(turn)
+        else:
+            self._write_turns([turn])
+
+    def recent_turns(self, conversation_id: str, limit: Optional[int] = None) -> List[Tuple[Query, Response]]:
+        """Get the most recent turns of a conversation in chronological order.
+
+        Served from memory when the conversation's window is loaded; otherwise
+        the window is loaded with one query.
+
+        Args:
+            conversation_id: ID of the conversation
+            limit: Maximum number of turns (defaults to the window size)
+
+        Returns:
+            List of (Query, Response) tuples, oldest first
+
+        Raises:
+            DatabaseError: If loading the window fails
+        """
+        limit = min(limit or self.window_size, self.window_size)
+        with self._lock:
+            window = self._windows.get(conversation_id)
+            if window is not None:
+                self._windows.move_to_end(conversation_id)
+                return list(window)[-limit:]
+
+        # Queued turns of a conversation without a window are not visible in memory
+        self.flush()
+        turns = self._load_turns(conversation_id)
+        with self._lock:
+            # A turn saved while loading is already in the database or the queue
+            window = self._windows.get(conversation_id)
+            if window is None:
+                window = deque(turns, maxlen=self.window_size)
+                self._remember(conversation_id, window)
+            return list(window)[-limit:]
+
+    def recent_responses(self, conversation_id: str, limit: Optional[int] = None) -> List[Response]:
+        """Get the most recent responses of a conversation in chronological order.
+
+        Args:
+            conversation_id: ID of the conversation
+            limit: Maximum number of responses (defaults to the window size)
+
+        Returns:
+            List of Response objects, oldest first
+
+        Raises:
+            DatabaseError: If loading the window fails
+        """
+        return [response for _, response in self.recent_turns(conversation_id, limit)]
+
+    def flush(self) -> None:
+        """Wait until every queued turn has been written."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write any queued turns and stop the background writer.
+
+        Turns saved afterwards are written synchronously.
+        """
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+            logger.info("Conversation writer stopped")
+        self._writer = None
+        self._queue = None
+
+    def _remember(self, conversation_id: str, window: Deque[Tuple[Query, Response]]) -> None:
+        """Cache a conversation window, evicting the least recently used one."""
+        self._windows[conversation_id] = window
+        self._windows.move_to_end(conversation_id)
+        while len(self._windows) > self.max_conversations:
+            self._windows.popitem(last=False)
+
+    def _load_turns(self, conversation_id: str) -> List[Tuple[Query, Response]]:
+        """Read the most recent turns of a conversation from the database."""
+        try:
+            driver = self.db_connection.get_driver()
+            with driver.session() as session:
+                query = """
+                MATCH (c:Conversation {id: $conversation_id})-[:HAS_QUERY]->(q:Query)-[:GENERATED]->(r:Response)
+                RETURN q, r
+                ORDER BY r.generated_at DESC
+                LIMIT $limit
+                """
+                result = session.run(query, {"conversation_id": conversation_id, "limit": self.window_size})
+                turns = [
+                    (Query.from_dict(dict(record["q"])), Response.from_dict(dict(record["r"])))
+                    for record in result
+                ]
+        except Exception as e:
+            logger.error("Failed to load conversation %s: %s", conversation_id, str(e))
+            raise DatabaseError(f"Failed to load conversation: {str(e)}")
+
+        turns.reverse()
+        return turns
+
+    def _write_turns(self, turns: List[Dict[str, Any]]) -> None:
+        """Write turns in a single managed transaction.
+
+        Raises:
+            DatabaseError: If writing fails
+        """
+        try:
+            driver = self.db_connection.get_driver()
+            with driver.session() as session:
+                session.execute_write(_write_turns_tx, turns)
+            logger.debug("Stored %d conversation turns", len(turns))
+        except Exception as e:
+            logger.error("Failed to store %d conversation turns: %s", len(turns), str(e))
+            raise DatabaseError(f"Failed to store conversation data: {str(e)}")
+
+    def _write_behind_loop(self) -> None:
+        """Drain the queue in batches until close() is called."""
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BEHIND_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            turns = [item for item in batch if item is not _STOP]
+            stopping = len(turns) < len(batch)
+            if turns:
+                self._write_with_retries(turns)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_with_retries(self, turns: List[Dict[str, Any]]) -> None:
+        """Write a batch from the background thread, dropping it after repeated failures."""
+        for attempt in range(WRITE_BEHIND_ATTEMPTS):
+            try:
+                self._write_turns(turns)
+                return
+            except DatabaseError:
+                if attempt + 1 < WRITE_BEHIND_ATTEMPTS:
+                    time.sleep(0.5 * 2 ** attempt)
+
+        self.dropped_turns += len(turns)
+        logger.error("Dropped %d conversation turns after %d attempts", len(turns), WRITE_BEHIND_ATTEMPTS)
+
+
+def _write_turns_tx(tx, turns: List[Dict[str, Any]]) -> None:
+    """Transaction function writing conversation turns with one statement."""
+    query = """
+    UNWIND $turns AS turn
+    MERGE (c:Conversation {id: turn.conversation.id})
+    SET c += turn.conversation
+    CREATE (q:Query)
+    SET q = turn.query
+    CREATE (r:Response)
+    SET r = turn.response
+    CREATE (c)-[:HAS_QUERY]->(q), (c)-[:HAS_RESPONSE]->(r), (q)-[:GENERATED]->(r)
+    """
+    tx.run(query, {"turns": turns}).consume()
@@ -0,0 +1,251 @@
+"""
+Persistent content-addressed cache for text embeddings.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH_SIZE = 500
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share a cache entry.
+
+    Applies Unicode NFKC normalization and collapses runs of whitespace.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def text_hash(text: str) -> str:
+    """Content hash of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: an in-memory LRU in front of a SQLite file.
+
+    Entries are keyed by (model_name, SHA-256 of the normalized text), so the
+    same text embedded by different models never collides. The memory tier
+    holds float32 arrays, about 4 KB per 1024-dimensional embedding, so the
+    default 10000 entries take roughly 40 MB.
+    """
+
+    def __init__(self, path: str, memory_size: int = 10000):
+        """Initialize embedding cache.
+
+        Args:
+            path: SQLite database file (created on first use)
+            memory_size: Maximum number of embeddings kept in the memory tier
+        """
+        self.path = path
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[Tuple[str, str], array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def get(self, model_name: str, text: str) -> Optional[List[float]]:
+        """Look up the embedding of a single text.
+
+        Args:
+            model_name: Embedding model name
+            text: Text that was embedded
+
+        Returns:
+            Cached embedding or None on a miss
+        """
+        return self.get_many(model_name, [text])[0]
+
+    def get_many(self, model_name: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Look up the embeddings of many texts with one disk query per batch.
+
+        Args:
+            model_name: Embedding model name
+            texts: Texts that were embedded
+
+        Returns:
+            List aligned with texts holding cached embeddings or None on a miss
+        """
+        hashes = [text_hash(text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, digest in enumerate(hashes):
+                key = (model_name, digest)
+                embedding = self._memory.get(key)
+                if embedding is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = embedding.tolist()
+                    self.memory_hits += 1
+                else:
+                    pending.setdefault(digest, []).append(i)
+
+            if pending:
+                digests = list(pending)
+                connection = self._connect()
+                for start in range(0, len(digests), _SQL_BATCH_SIZE):
+                    batch = digests[start:start + _SQL_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = connection.execute(
+                        f"SELECT text_hash, embedding FROM embeddings "
+                        f"WHERE model_name = ? AND text_hash IN ({placeholders})",
+                        [model_name, *batch]
+                    )
+                    for digest, blob in rows:
+                        values = _unpack(blob)
+                        self._remember((model_name, digest), values)
+                        embedding = values.tolist()
+                        for i in pending.pop(digest):
+                            results[i] = embedding
+                            self.disk_hits += 1
+
+                self.misses += sum(len(indexes) for indexes in pending.values())
+
+        return results
+
+    def put(self, model_name: str, text: str, embedding: List[float]) -> None:
+        """Store the embedding of a single text.
+
+        Args:
+            model_name: Embedding model name
+            text: Text that was embedded
+            embedding: Embedding values
+        """
+        self.put_many(model_name, [(text, embedding)])
+
+    def put_many(self, model_name: str, items: Sequence[Tuple[str, List[float]]]) -> None:
+        """Store many embeddings in a single transaction.
+
+        Args:
+            model_name: Embedding model name
+            items: (text, embedding) pairs
+        """
+        if not items:
+            return
+
+        rows = []
+        now = time.time()
+        with self._lock:
+            for text, embedding in items:
+                digest = text_hash(text)
+                values = array("f", embedding)
+                self._remember((model_name, digest), values)
+                rows.append((model_name, digest, len(values), values.tobytes(), now))
+
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings "
+                    "(model_name, text_hash, dimension, embedding, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+            self.writes += len(rows)
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters.
+
+        Returns:
+            Dictionary with memory hits, disk hits, misses, writes, hit ratio and
+            the number of embeddings held in memory
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_ratio": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+    def clear(self) -> None:
+        """Remove every cached embedding from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM embeddings")
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _remember(self, key: Tuple[str, str], embedding: array) -> None:
+        """Insert into the memory tier, evicting the least recently used entry."""
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite file and create the schema on first use."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model_name TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    dimension INTEGER NOT NULL,
+                    embedding BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (model_name, text_hash)
+                ) WITHOUT ROWID
+            """)
+            self._connection = connection
+            logger.info("Opened embedding cache at %s", self.path)
+        return self._connection
+
+
+def _unpack(blob: bytes) -> array:
+    """Unpack float32 bytes into an embedding."""
+    values = array("f")
+    values.frombytes(blob)
+    return values
+
+
+_shared_caches: Dict[Tuple[str, int], EmbeddingCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_embedding_cache(path: str, memory_size: int = 10000) -> EmbeddingCache:
+    """Get the process-wide cache for a path, so every client shares one memory tier.
+
+    Args:
+        path: SQLite database file
+        memory_size: Maximum number of embeddings kept in the memory tier
+
+    Returns:
+        EmbeddingCache instance
+    """
+    key = (os.path.abspath(path), memory_size)
+    with _shared_lock:
+        if key not in _shared_caches:
+            _shared_caches[key] = EmbeddingCache(path, memory_size)
+        return _shared_caches[key]
@@ -0,0 +1,276 @@
+"""
+Offline fake of the OpenAI-compatible API used for tests and benchmarks.
+"""
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FakeProviderError(Exception):
+    """Transient failure injected by the fake provider."""
+    pass
+
+
+class FakeEmbeddings:
+    """Fake embeddings endpoint returning deterministic vectors."""
+
+    def __init__(
+        self,
+        dimension: int = 1024,
+        latency: float = 0.0,
+        max_batch_size: int = 10,
+        failure_rate: float = 0.0,
+        seed: int = 0
+    ):
+        """Initialize fake embeddings endpoint.
+
+        Args:
+            dimension: Embedding dimension
+            latency: Simulated round-trip time per request, in seconds
+            max_batch_size: Maximum inputs per request, like the real provider
+            failure_rate: Probability that a request fails transiently
+            seed: Seed for failure injection
+        """
+        self.dimension = dimension
+        self.latency = latency
+        self.max_batch_size = max_batch_size
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.inputs = 0
+        self.failures = 0
+
+    def create(self, model: str, input: List[str], **kwargs) -> SimpleNamespace:
+        """Embed a batch of texts.
+
+        Raises:
+            ValueError: If the batch exceeds max_batch_size
+            FakeProviderError: When a transient failure is injected
+        """
+        if len(input) > self.max_batch_size:
+            raise ValueError(f"Batch size {len(input)} exceeds limit {self.max_batch_size}")
+
+        with self._lock:
+            self.requests += 1
+            fail = self._rng.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+            else:
+                self.inputs += len(input)
+
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise FakeProviderError("Injected transient failure")
+
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=self.embed(text))
+                for i, text in enumerate(input)
+            ],
+            model=model
+        )
+
+    def embed(self, text: str) -> List[float]:
+        """Deterministic unit vector derived from the text."""
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+        rng = random.Random(seed)
+        values = [rng.gauss(0, 1) for _ in range(self.dimension)]
+        norm = math.sqrt(math.sumprod(values, values))
+        return [x / norm for x in values]
+
+
+class FakeCompletions:
+    """Fake chat completions endpoint that answers with a fixed or echoed reply."""
+
+    def __init__(
+        self,
+        reply: Optional[str] = None,
+        first_token_delay: float = 0.0,
+        token_delay: float = 0.0
+    ):
+        """Initialize fake chat completions endpoint.
+
+        Args:
+            reply: Text to answer with (optional, defaults to echoing the prompt's last line)
+            first_token_delay: Simulated seconds before the first token
+            token_delay: Simulated seconds between tokens
+        """
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.requests = 0
+
+    def create(self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs) -> Any:
+        """Answer a chat request, as one response or as a stream of chunks."""
+        self.requests += 1
+        tokens = self.tokens(messages)
+        if stream:
+            return self._stream(model, tokens)
+
+        time.sleep(self.first_token_delay + self.token_delay * len(tokens))
+        return SimpleNamespace(
+            choices=[SimpleNamespace(index=0, message=SimpleNamespace(role="assistant", content="".join(tokens)))],
+            model=model
+        )
+
+    def tokens(self, messages: List[Dict[str, str]]) -> List[str]:
+        """Split the reply into word-sized tokens, keeping whitespace."""
+        reply = self.reply
+        if reply is None:
+            prompt = messages[-1]["content"].strip() if messages else ""
+            reply = f"Fake answer to: {prompt.splitlines()[-1] if prompt else ''}"
+        return re.findall(r"\S+\s*|\s+", reply)
+
+    def _stream(self, model: str, tokens: List[str]) -> Iterator[SimpleNamespace]:
+        """Yield tokens as chat completion chunks with the configured delays."""
+        time.sleep(self.first_token_delay)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.token_delay)
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=token), finish_reason=None)],
+                model=model
+            )
+
+
+class FakeOpenAIClient:
+    """Drop-in replacement for openai.OpenAI that never leaves the process."""
+
+    def __init__(
+        self,
+        embeddings: Optional[FakeEmbeddings] = None,
+        completions: Optional[FakeCompletions] = None
+    ):
+        """Initialize fake client.
+
+        Args:
+            embeddings: Fake embeddings endpoint (optional, defaults to zero latency)
+            completions: Fake chat completions endpoint (optional, defaults to echoing)
+        """
+        self.embeddings = embeddings or FakeEmbeddings()
+        self.chat = SimpleNamespace(completions=completions or FakeCompletions())
+        logger.info("Using offline fake LLM provider")
+
+
+class FakeStreamingServer:
+    """Local HTTP server speaking the OpenAI chat completions protocol.
+
+    Streams replies as server-sent events, so the real openai client and its
+    SSE parsing can be exercised without network access:
+
+        with FakeStreamingServer(FakeCompletions(reply="Hello world")) as server:
+            client = openai.OpenAI(base_url=server.base_url, api_key="test")
+    """
+
+    def __init__(self, completions: Optional[FakeCompletions] = None):
+        """Initialize fake streaming server.
+
+        Args:
+            completions: Fake chat completions endpoint (optional, defaults to echoing)
+        """
+        self.completions = completions or FakeCompletions()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to the openai client."""
+        if self._server is None:
+            raise RuntimeError("Server not started. Call start() first.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeStreamingServer":
+        """Start serving on a free localhost port in a background thread."""
+        completions = self.completions
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                model = body.get("model", "fake")
+                result = completions.create(model, body.get("messages", []), stream=bool(body.get("stream")))
+                if body.get("stream"):
+                    self._send_stream(model, result)
+                else:
+                    self._send_json({
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": result.choices[0].message.content},
+                            "finish_reason": "stop"
+                        }]
+                    })
+
+            def _send_json(self, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, model, chunks):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                for chunk in chunks:
+                    self._send_event(model, {"role": "assistant", "content": chunk.choices[0].delta.content}, None)
+                self._send_event(model, {}, "stop")
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _send_event(self, model, delta, finish_reason):
+                payload = {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                }
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                logger.debug("Fake server: " + format, *args)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info("Fake streaming server listening at %s", self.base_url)
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for its thread to exit."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> "FakeStreamingServer":
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
@@ -1,14 +1,26 @@
 """
 Graph store for managing knowledge graph entities and relationships.
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Sequence
 import logging
+import threading
 from ..models.knowledge_graph import EntityNode, ConceptNode, Relationship
+from ..lib.config import config
 from ..lib.database import DatabaseConnection
 from ..lib.exceptions import DatabaseError
 
 logger = logging.getLogger(__name__)
 
+# Labels of knowledge graph nodes that relationships may connect
+NODE_LABELS = ("Entity", "Concept")
+
+# Schema statements tried in order for each label: Neo4j 5 syntax first, then
+# Memgraph, whose unique constraints do not create the lookup index themselves
+_ID_SCHEMA_STATEMENTS = (
+    ("CREATE CONSTRAINT {name}_id IF NOT EXISTS FOR (n:{label}) REQUIRE n.id IS UNIQUE",),
+    ("CREATE INDEX ON :{label}(id)", "CREATE CONSTRAINT ON (n:{label}) ASSERT n.id IS UNIQUE"),
+)
+
 
 class GraphStore:
     """Store for managing knowledge graph entities and relationships in the database."""
@@ -20,6 +32,184 @@ class GraphStore:
             db_connection: Database connection instance
         """
         self.db_connection = db_connection
+        self._constraints_ready = False
+        self._constraints_lock = threading.Lock()
+
+    def ensure_constraints(self) -> None:
+        """Create the unique id constraints that back labeled node lookups.
+
+        Runs once per store; the statements are idempotent, so stores sharing a
+        database are safe to call it concurrently.
+        """
+        if self._constraints_ready:
+            return
+
+        with self._constraints_lock:
+            if self._constraints_ready:
+                return
+            driver = self.db_connection.get_driver()
+            with driver.session() as session:
+                for label in NODE_LABELS:
+                    if not self._create_id_constraint(session, label):
+                        logger.warning("Could not create id constraint for :%s, lookups will scan", label)
+            self._constraints_ready = True
+
+    def _create_id_constraint(self, session, label: str) -> bool:
+        """Create the id constraint for a label using the first dialect the server accepts."""
+        for statements in _ID_SCHEMA_STATEMENTS:
+            try:
+                for statement in statements:
+                    session.run(statement.format(name=label.lower(), label=label)).consume()
+                return True
+            except Exception as e:
+                logger.debug("Schema statement for :%s rejected: %s", label, str(e))
+        return False
+
+    def store_graph(
+        self,
+        entities: Sequence[EntityNode] = (),
+        concepts: Sequence[ConceptNode] = (),
+        relationships: Sequence[Relationship] = (),
+        batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Store a whole knowledge graph in a single managed transaction.
+
+        Nodes are merged on their id and relationships are attached through
+        labeled lookups, with each statement unwinding at most batch_size rows.
+        Relationships whose endpoints do not exist are skipped.
+
+        Args:
+            entities: Entity nodes to store
+            concepts: Concept nodes to store
+            relationships: Relationships between entities and/or concepts
+            batch_size: Rows per statement (defaults to GRAPH_WRITE_BATCH_SIZE)
+
+        Returns:
+            Dictionary with the number of entities, concepts and relationships
+            written and the number of relationships skipped
+
+        Raises:
+            ValueError: If batch_size is not positive
+            DatabaseError: If storing fails
+        """
+        batch_size = batch_size or config.GRAPH_WRITE_BATCH_SIZE
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        try:
+            self.ensure_constraints()
+            driver = self.db_connection.get_driver()
+            with driver.session() as session:
+                counts = session.execute_write(
+                    self._write_graph, list(entities), list(concepts), list(relationships), batch_size
+                )
+            logger.info(
+                "Stored graph with %d entities, %d concepts, %d relationships (%d skipped)",
+                counts["entities"], counts["concepts"], counts["relationships"], counts["skipped_relationships"]
+            )
+            return counts
+        except Exception as e:
+            logger.error("Failed to store graph: %s", str(e))
+            raise DatabaseError(f"Failed to store graph: {str(e)}")
+
+    def _write_graph(
+        self,
+        tx,
+        entities: List[EntityNode],
+        concepts: List[ConceptNode],
+        relationships: List[Relationship],
+        batch_size: int
+    ) -> Dict[str, int]:
+        """Transaction function for store_graph; safe to retry since every write is a MERGE."""
+        entity_rows = [{
+            "id": entity.id,
+            "name": entity.name,
+            "type": entity.type,
+            "properties": entity.properties,
+            "created_at": entity.created_at.isoformat(),
+            "updated_at": entity.updated_at.isoformat()
+        } for entity in entities]
+        concept_rows = [{
+            "id": concept.id,
+            "name": concept.name,
+            "description": concept.description,
+            "created_at": concept.created_at.isoformat(),
+            "updated_at": concept.updated_at.isoformat()
+        } for concept in concepts]
+
+        for label, rows in (("Entity", entity_rows), ("Concept", concept_rows)):
+            query = f"""
+            UNWIND $rows AS row
+            MERGE (n:{label} {{id: row.id}})
+            SET n += row
+            """
+            for batch in _batches(rows, batch_size):
+                tx.run(query, {"rows": batch}).consume()
+
+        labels = {row["id"]: "Entity" for row in entity_rows}
+        labels.update({row["id"]: "Concept" for row in concept_rows})
+        unknown = {rel.source_id for rel in relationships} | {rel.target_id for rel in relationships}
+        labels.update(self._resolve_labels(tx, unknown - labels.keys(), batch_size))
+
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        skipped = 0
+        for rel in relationships:
+            pair = (labels.get(rel.source_id), labels.get(rel.target_id))
+            if None in pair:
+                skipped += 1
+                continue
+            groups.setdefault(pair, []).append({
+                "source_id": rel.source_id,
+                "target_id": rel.target_id,
+                "id": rel.id,
+                "properties": {
+                    "id": rel.id,
+                    "type": rel.type,
+                    "confidence": rel.confidence,
+                    "source_chunk_id": rel.source_chunk_id,
+                    "created_at": rel.created_at.isoformat(),
+                    "updated_at": rel.updated_at.isoformat()
+                }
+            })
+
+        written = 0
+        for (source_label, target_label), rows in groups.items():
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (source:{source_label} {{id: row.source_id}})
+            MATCH (target:{target_label} {{id: row.target_id}})
+            MERGE (source)-[r:RELATIONSHIP {{id: row.id}}]->(target)
+            SET r += row.properties
+            RETURN count(r) AS written
+            """
+            for batch in _batches(rows, batch_size):
+                record = tx.run(query, {"rows": batch}).single()
+                written += record["written"] if record else 0
+
+        if skipped:
+            logger.warning("Skipped %d relationships with missing endpoints", skipped)
+
+        return {
+            "entities": len(entity_rows),
+            "concepts": len(concept_rows),
+            "relationships": written,
+            "skipped_relationships": skipped
+        }
+
+    def _resolve_labels(self, tx, node_ids: Iterable[str], batch_size: int) -> Dict[str, str]:
+        """Look up which knowledge graph label each existing node id carries."""
+        query = """
+        UNWIND $ids AS id
+        OPTIONAL MATCH (e:Entity {id: id})
+        OPTIONAL MATCH (c:Concept {id: id})
+        RETURN id, CASE WHEN e IS NOT NULL THEN 'Entity' WHEN c IS NOT NULL THEN 'Concept' END AS label
+        """
+        labels = {}
+        for batch in _batches(sorted(node_ids), batch_size):
+            for record in tx.run(query, {"ids": batch}):
+                if record["label"]:
+                    labels[record["id"]] = record["label"]
+        return labels
 
     def store_entity(self, entity: EntityNode) -> None:
         """Store an entity node in the database.
@@ -243,4 +433,10 @@ class GraphStore:
                 return result.consume().counters.nodes_deleted > 0
         except Exception as e:
             logger.error("Failed to delete entity %s: %s", entity_id, str(e))
-            raise DatabaseError(f"Failed to delete entity: {str(e)}")
\ No newline at end of file
+            raise DatabaseError(f"Failed to delete entity: {str(e)}")
+
+
+def _batches(items: List[Any], size: int) -> Iterable[List[Any]]:
+    """Split a list into consecutive slices of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -2,28 +2,69 @@
 Qwen API client for LLM operations.
 """
 import openai
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import random
+import time
 from .config import config
+from .embedding_cache import EmbeddingCache, get_embedding_cache
 from .exceptions import LLMError
+from .fake_provider import FakeOpenAIClient
 
 logger = logging.getLogger(__name__)
 
+# Errors that retrying cannot fix
+NON_RETRYABLE_ERRORS = (
+    LLMError,
+    openai.BadRequestError,
+    openai.AuthenticationError,
+    openai.PermissionDeniedError,
+    openai.NotFoundError,
+)
+
+# Upper bound for a single retry backoff, in seconds
+MAX_RETRY_DELAY = 30.0
+
+# Batches dispatched ahead of the consumer, per concurrent request
+EMBEDDING_WINDOW_FACTOR = 2
+
 
 class QwenClient:
     """Client for interacting with Qwen models via DashScope API."""
 
-    def __init__(self):
-        """Initialize Qwen client."""
-        self.client = openai.OpenAI(
-            base_url=config.QWEN_API_BASE,
-            api_key=config.QWEN_API_KEY
-        )
+    def __init__(self, embedding_cache: Optional[EmbeddingCache] = None, client: Any = None):
+        """Initialize Qwen client.
+
+        Args:
+            embedding_cache: Embedding cache (optional, defaults to the shared cache
+                at EMBEDDING_CACHE_PATH, or no cache when that path is empty)
+            client: OpenAI-compatible API client (optional, defaults to the DashScope
+                endpoint, or an offline fake provider when LLM_PROVIDER=fake)
+        """
+        if client is None:
+            if config.LLM_PROVIDER == "fake":
+                client = FakeOpenAIClient()
+            else:
+                client = openai.OpenAI(
+                    base_url=config.QWEN_API_BASE,
+                    api_key=config.QWEN_API_KEY
+                )
+        self.client = client
         self.embedding_model = "text-embedding-v4"
         self.generation_model = "qwen3-max"
+        self.max_retries = config.EMBEDDING_MAX_RETRIES
+        self.retry_base_delay = config.EMBEDDING_RETRY_BASE_DELAY
+
+        if embedding_cache is None and config.EMBEDDING_CACHE_PATH:
+            embedding_cache = get_embedding_cache(
+                config.EMBEDDING_CACHE_PATH, config.EMBEDDING_CACHE_MEMORY_SIZE
+            )
+        self.embedding_cache = embedding_cache
 
     def generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text.
+        """Generate embedding for text, reusing a cached embedding when available.
 
         Args:
             text: Text to generate embedding for
@@ -34,15 +75,158 @@ class QwenClient:
         Raises:
             LLMError: If embedding generation fails
         """
+        return self.generate_embeddings([text])[0]
+
+    def generate_embeddings(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[List[float]]:
+        """Generate embeddings for many texts, embedding only texts not in the cache.
+
+        Args:
+            texts: Texts to generate embeddings for
+            batch_size: Maximum inputs per request (defaults to EMBEDDING_BATCH_SIZE)
+            max_concurrency: Maximum concurrent requests (defaults to EMBEDDING_MAX_CONCURRENCY)
+
+        Returns:
+            List of embeddings aligned with texts
+
+        Raises:
+            LLMError: If embedding generation fails for any text. Batches that
+                completed before the failure are still cached.
+        """
+        embeddings = [None] * len(texts)
+        for i, embedding in self.iter_embeddings(texts, batch_size, max_concurrency):
+            embeddings[i] = embedding
+        return embeddings
+
+    def iter_embeddings(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> Iterator[Tuple[int, List[float]]]:
+        """Embed texts in concurrent batches, yielding results in input order.
+
+        Cached texts are served without an API call. The remaining texts are
+        packed into requests of up to batch_size inputs with at most
+        max_concurrency requests running at once. Only a bounded window of
+        batches is dispatched ahead of the consumer, so a slow consumer (such as
+        a database writer) throttles API traffic instead of buffering results.
+
+        Args:
+            texts: Texts to generate embeddings for
+            batch_size: Maximum inputs per request (defaults to EMBEDDING_BATCH_SIZE)
+            max_concurrency: Maximum concurrent requests (defaults to EMBEDDING_MAX_CONCURRENCY)
+
+        Yields:
+            (index, embedding) tuples in input order
+
+        Raises:
+            LLMError: If a batch still fails after retries
+        """
+        batch_size = batch_size or config.EMBEDDING_BATCH_SIZE
+        max_concurrency = max_concurrency or config.EMBEDDING_MAX_CONCURRENCY
+        if batch_size <= 0 or max_concurrency <= 0:
+            raise ValueError("batch_size and max_concurrency must be positive")
+
+        if self.embedding_cache is not None:
+            embeddings = self._cached_embeddings(texts)
+        else:
+            embeddings = [None] * len(texts)
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        batches = iter([missing[i:i + batch_size] for i in range(0, len(missing), batch_size)])
+        if missing:
+            logger.debug("Embedding %d of %d texts (rest cached)", len(missing), len(texts))
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="embedding")
+        in_flight = deque()
+
+        def submit_next() -> None:
+            batch = next(batches, None)
+            if batch:
+                in_flight.append((batch, executor.submit(self._embed_batch, [texts[i] for i in batch])))
+
         try:
-            response = self.client.embeddings.create(
-                model=self.embedding_model,
-                input=[text]
-            )
-            return response.data[0].embedding
+            for _ in range(max_concurrency * EMBEDDING_WINDOW_FACTOR):
+                submit_next()
+
+            for i in range(len(texts)):
+                if embeddings[i] is None:
+                    # Missing texts are batched in index order, so this text
+                    # belongs to the oldest batch still in flight
+                    batch, future = in_flight.popleft()
+                    for index, embedding in zip(batch, future.result()):
+                        embeddings[index] = embedding
+                    submit_next()
+                yield i, embeddings[i]
+                # Drop the reference so memory stays bounded by the window
+                embeddings[i] = None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one batch and cache it as soon as it completes.
+
+        Raises:
+            LLMError: If the request still fails after retries
+        """
+        embeddings = self._create_embeddings(texts)
+        self._cache_embeddings(list(zip(texts, embeddings)))
+        return embeddings
+
+    def _create_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Call the embedding API for one batch, retrying transient failures with backoff.
+
+        Raises:
+            LLMError: If the request fails permanently or retries are exhausted
+        """
+        attempt = 0
+        while True:
+            try:
+                response = self.client.embeddings.create(
+                    model=self.embedding_model,
+                    input=texts
+                )
+                data = sorted(response.data, key=lambda item: item.index)
+                if len(data) != len(texts):
+                    raise LLMError(f"Expected {len(texts)} embeddings, got {len(data)}")
+                return [item.embedding for item in data]
+            except NON_RETRYABLE_ERRORS as e:
+                logger.error("Failed to generate embeddings: %s", str(e))
+                raise LLMError(f"Failed to generate embedding: {str(e)}")
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    logger.error("Failed to generate embeddings after %d attempts: %s", attempt, str(e))
+                    raise LLMError(f"Failed to generate embedding: {str(e)}")
+                delay = min(self.retry_base_delay * 2 ** (attempt - 1), MAX_RETRY_DELAY)
+                delay *= 0.5 + random.random() / 2
+                logger.warning(
+                    "Embedding request failed (attempt %d/%d), retrying in %.2f seconds: %s",
+                    attempt, self.max_retries + 1, delay, str(e)
+                )
+                time.sleep(delay)
+
+    def _cached_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Bulk cache lookup; cache failures are treated as misses."""
+        try:
+            return self.embedding_cache.get_many(self.embedding_model, texts)
+        except Exception as e:
+            logger.warning("Embedding cache lookup failed: %s", str(e))
+            return [None] * len(texts)
+
+    def _cache_embeddings(self, items: List[Tuple[str, List[float]]]) -> None:
+        """Bulk cache write; cache failures never fail the embedding call."""
+        if self.embedding_cache is None or not items:
+            return
+        try:
+            self.embedding_cache.put_many(self.embedding_model, items)
         except Exception as e:
-            logger.error("Failed to generate embedding: %s", str(e))
-            raise LLMError(f"Failed to generate embedding: {str(e)}")
+            logger.warning("Embedding cache write failed: %s", str(e))
 
     def generate_text(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> str:
         """Generate text response from prompt.
@@ -72,6 +256,37 @@ class QwenClient:
             logger.error("Failed to generate text: %s", str(e))
             raise LLMError(f"Failed to generate text: {str(e)}")
 
+    def stream_text(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> Iterator[str]:
+        """Generate text response from prompt, yielding it piece by piece as it arrives.
+
+        Args:
+            prompt: Input prompt
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature (0.0 to 1.0)
+
+        Yields:
+            Text deltas in generation order
+
+        Raises:
+            LLMError: If text generation fails, before or during the stream
+        """
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.generation_model,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error("Failed to stream text: %s", str(e))
+            raise LLMError(f"Failed to stream text: {str(e)}")
+
     def rerank(self, query: str, documents: List[str]) -> List[Dict[str, Any]]:
         """Rerank documents based on relevance to query.
 
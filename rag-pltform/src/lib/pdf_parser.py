@@ -3,20 +3,47 @@ PDF parser for extracting text content from PDF files.
 """
 import fitz  # PyMuPDF
 import os
-from typing import Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
 from ..models.document import Document
+from ..lib.config import config
 from ..lib.exceptions import DocumentProcessingError
 
 logger = logging.getLogger(__name__)
 
+# Pages extracted per task submitted to the worker pool
+PAGES_PER_TASK = 8
+
+# Tasks kept in flight per worker, bounding how far extraction runs ahead of the consumer
+TASKS_PER_WORKER = 2
+
+# Document opened once per worker process by _init_worker
+_worker_document = None
+
+
+def _init_worker(file_path: str) -> None:
+    """Open the PDF once in a worker process."""
+    global _worker_document
+    _worker_document = fitz.open(file_path)
+
+
+def _extract_page_range(start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) from the worker's document."""
+    return [_worker_document.load_page(page_num).get_text() for page_num in range(start, stop)]
+
 
 class PDFParser:
     """Parser for PDF documents."""
 
-    def __init__(self):
-        """Initialize PDF parser."""
-        pass
+    def __init__(self, workers: Optional[int] = None):
+        """Initialize PDF parser.
+
+        Args:
+            workers: Worker processes used to extract pages (defaults to PDF_PARSE_WORKERS)
+        """
+        self.workers = workers or config.PDF_PARSE_WORKERS
 
     def parse(self, file_path: str) -> str:
         """Parse PDF file and extract text content.
@@ -30,55 +57,126 @@ class PDFParser:
         Raises:
             DocumentProcessingError: If parsing fails
         """
-        # Validate file exists and is readable
-        if not os.path.exists(file_path):
-            raise DocumentProcessingError(f"File not found: {file_path}", file_path)
+        text_content = [text for _, text in self.iter_pages(file_path)]
+        full_text = "".join(text_content)
+        logger.info("Successfully parsed PDF file: %s (%d pages)", file_path, len(text_content))
+        return full_text
 
-        if not os.access(file_path, os.R_OK):
-            raise DocumentProcessingError(f"File not readable: {file_path}", file_path)
+    def iter_pages(self, file_path: str) -> Iterator[Tuple[int, str]]:
+        """Extract text content one page at a time.
 
-        # Validate file is a PDF
-        if not self._is_pdf(file_path):
-            raise DocumentProcessingError(f"File is not a valid PDF: {file_path}", file_path)
+        Pages without text are skipped. Concatenating the yielded texts gives
+        exactly the output of parse(), so offsets agree between the two.
 
-        try:
-            # Open PDF document
-            doc = fitz.open(file_path)
+        Args:
+            file_path: Path to the PDF file
 
-            # Extract text from all pages
-            text_content = []
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text = page.get_text()
-                if text.strip():
-                    text_content.append(f"## Page {page_num + 1}\n\n{text}\n")
+        Yields:
+            (page number, page text in markdown format) tuples in page order
 
-            doc.close()
+        Raises:
+            DocumentProcessingError: If parsing fails
+        """
+        _, pages = self.parse_with_metadata(file_path)
+        return pages
 
-            # Combine all text content
-            full_text = "\n".join(text_content)
-            logger.info("Successfully parsed PDF file: %s (%d pages)", file_path, len(text_content))
+    def parse_with_metadata(self, file_path: str) -> Tuple[Dict[str, Any], Iterator[Tuple[int, str]]]:
+        """Validate a PDF, read its metadata and start streaming its pages.
 
-            return full_text
+        The file is opened once for validation and metadata. With more than one
+        worker, page ranges are extracted by a process pool, each worker opening
+        the file once, and pages are yielded in order as their range completes.
 
-        except Exception as e:
-            logger.error("Failed to parse PDF file %s: %s", file_path, str(e))
-            raise DocumentProcessingError(f"Failed to parse PDF file: {str(e)}", file_path)
+        Args:
+            file_path: Path to the PDF file
 
-    def _is_pdf(self, file_path: str) -> bool:
-        """Check if file is a valid PDF.
+        Returns:
+            Tuple of (metadata dictionary, iterator of (page number, page text))
+
+        Raises:
+            DocumentProcessingError: If the file is not a readable PDF
+        """
+        doc = self._open(file_path)
+        metadata = self._metadata(doc)
+
+        if self.workers > 1 and len(doc) > PAGES_PER_TASK:
+            doc.close()
+            texts = self._extract_parallel(file_path, metadata["page_count"])
+        else:
+            texts = self._extract_serial(doc)
+
+        return metadata, self._format_pages(file_path, texts)
+
+    def _open(self, file_path: str) -> fitz.Document:
+        """Open a file after checking that it exists, is readable and is a PDF.
 
         Args:
             file_path: Path to the file
 
         Returns:
-            True if file is a valid PDF, False otherwise
+            Open PyMuPDF document
+
+        Raises:
+            DocumentProcessingError: If the file cannot be parsed
         """
+        if not os.path.exists(file_path):
+            raise DocumentProcessingError(f"File not found: {file_path}", file_path)
+
+        if not os.access(file_path, os.R_OK):
+            raise DocumentProcessingError(f"File not readable: {file_path}", file_path)
+
         try:
-            with fitz.open(file_path) as doc:
-                return doc.is_pdf
-        except:
-            return False
+            doc = fitz.open(file_path)
+        except Exception:
+            raise DocumentProcessingError(f"File is not a valid PDF: {file_path}", file_path)
+
+        if not doc.is_pdf:
+            doc.close()
+            raise DocumentProcessingError(f"File is not a valid PDF: {file_path}", file_path)
+
+        return doc
+
+    def _extract_serial(self, doc: fitz.Document) -> Iterator[Tuple[int, str]]:
+        """Extract pages in-process from an open document, closing it when done."""
+        with doc:
+            for page_num in range(len(doc)):
+                yield page_num + 1, doc.load_page(page_num).get_text()
+
+    def _extract_parallel(self, file_path: str, page_count: int) -> Iterator[Tuple[int, str]]:
+        """Extract page ranges on a process pool and yield pages in order."""
+        ranges = deque(
+            (start, min(start + PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PAGES_PER_TASK)
+        )
+        workers = min(self.workers, len(ranges))
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(file_path,))
+        in_flight = deque()
+        try:
+            while ranges or in_flight:
+                while ranges and len(in_flight) < workers * TASKS_PER_WORKER:
+                    start, stop = ranges.popleft()
+                    in_flight.append((start, executor.submit(_extract_page_range, start, stop)))
+
+                start, future = in_flight.popleft()
+                for offset, text in enumerate(future.result()):
+                    yield start + offset + 1, text
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _format_pages(self, file_path: str, texts: Iterator[Tuple[int, str]]) -> Iterator[Tuple[int, str]]:
+        """Skip empty pages and format the rest as markdown sections."""
+        try:
+            emitted = 0
+            for page_number, text in texts:
+                if text.strip():
+                    separator = "\n" if emitted else ""
+                    emitted += 1
+                    yield page_number, f"{separator}## Page {page_number}\n\n{text}\n"
+        except Exception as e:
+            logger.error("Failed to parse PDF file %s: %s", file_path, str(e))
+            raise DocumentProcessingError(f"Failed to parse PDF file: {str(e)}", file_path)
+        finally:
+            texts.close()
 
     def get_metadata(self, file_path: str) -> dict:
         """Get PDF metadata.
@@ -91,17 +189,21 @@ class PDFParser:
         """
         try:
             with fitz.open(file_path) as doc:
-                metadata = doc.metadata
-                return {
-                    "title": metadata.get("title", ""),
-                    "author": metadata.get("author", ""),
-                    "subject": metadata.get("subject", ""),
-                    "creator": metadata.get("creator", ""),
-                    "producer": metadata.get("producer", ""),
-                    "creationDate": metadata.get("creationDate", ""),
-                    "modDate": metadata.get("modDate", ""),
-                    "page_count": len(doc)
-                }
+                return self._metadata(doc)
         except Exception as e:
             logger.warning("Failed to extract metadata from PDF %s: %s", file_path, str(e))
-            return {}
\ No newline at end of file
+            return {}
+
+    def _metadata(self, doc: fitz.Document) -> dict:
+        """Read metadata from an open document."""
+        metadata = doc.metadata or {}
+        return {
+            "title": metadata.get("title", ""),
+            "author": metadata.get("author", ""),
+            "subject": metadata.get("subject", ""),
+            "creator": metadata.get("creator", ""),
+            "producer": metadata.get("producer", ""),
+            "creationDate": metadata.get("creationDate", ""),
+            "modDate": metadata.get("modDate", ""),
+            "page_count": len(doc)
+        }
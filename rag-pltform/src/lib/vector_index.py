@@ -0,0 +1,633 @@
+"""
+In-process approximate nearest neighbour index for vector embeddings.
+"""
+import heapq
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Metadata and vectors share one file so that replacing it is atomic
+INDEX_FILE = "index.bin"
+
+
+class IndexHit(NamedTuple):
+    """A single search hit returned by a vector index."""
+
+    key: str
+    score: float
+    payload: Optional[str] = None
+
+
+def _dot(a: List[float], b: List[float]) -> float:
+    """Dot product of two equally sized vectors."""
+    return math.sumprod(a, b)
+
+
+def _normalize(vector: Iterable[float]) -> List[float]:
+    """Scale a vector to unit length so that dot product equals cosine similarity.
+
+    Raises:
+        ValueError: If the vector is empty or has zero norm
+    """
+    values = [float(x) for x in vector]
+    norm = math.sqrt(_dot(values, values))
+    if not values or norm == 0.0:
+        raise ValueError("Cannot index an empty or zero-norm vector")
+    return [x / norm for x in values]
+
+
+def _unit_array(vector: Iterable[float]) -> np.ndarray:
+    """Like _normalize, but returning a float32 array.
+
+    Raises:
+        ValueError: If the vector is empty or has zero norm
+    """
+    values = np.asarray(vector, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(values)) if values.size else 0.0
+    if norm == 0.0 or not math.isfinite(norm):
+        raise ValueError("Cannot index an empty or zero-norm vector")
+    return values / norm
+
+
+class VectorIndex(ABC):
+    """Base class for pluggable vector indexes using cosine similarity."""
+
+    @abstractmethod
+    def add(self, key: str, vector: List[float], payload: Optional[str] = None) -> None:
+        """Add or replace a vector.
+
+        Args:
+            key: Unique key of the vector
+            vector: Embedding values
+            payload: Optional string stored alongside the vector (e.g. chunk ID)
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, key: str) -> bool:
+        """Remove a vector.
+
+        Args:
+            key: Key of the vector to remove
+
+        Returns:
+            True if removed, False if not found
+        """
+        pass
+
+    @abstractmethod
+    def search(self, query: List[float], k: int, ef: Optional[int] = None) -> List[IndexHit]:
+        """Find the vectors most similar to a query.
+
+        Args:
+            query: Query embedding
+            k: Number of hits to return
+            ef: Search breadth (ignored by exact indexes)
+
+        Returns:
+            List of IndexHit objects ordered by descending similarity
+        """
+        pass
+
+    @abstractmethod
+    def save(self, path: str) -> None:
+        """Persist the index to a local directory.
+
+        Args:
+            path: Directory to write the index files to
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of live vectors in the index."""
+        pass
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key is present in the index."""
+        return False
+
+
+class BruteForceIndex(VectorIndex):
+    """Exact index scanning every vector; used as the recall baseline."""
+
+    def __init__(self):
+        """Initialize brute-force index."""
+        self._vectors: Dict[str, Tuple[List[float], Optional[str]]] = {}
+
+    def add(self, key: str, vector: List[float], payload: Optional[str] = None) -> None:
+        """Add or replace a vector."""
+        self._vectors[key] = (_normalize(vector), payload)
+
+    def remove(self, key: str) -> bool:
+        """Remove a vector."""
+        return self._vectors.pop(key, None) is not None
+
+    def search(self, query: List[float], k: int, ef: Optional[int] = None) -> List[IndexHit]:
+        """Score the query against every vector and return the best k."""
+        if k <= 0 or not self._vectors:
+            return []
+        q = _normalize(query)
+        scored = (
+            (_dot(q, vector), key, payload)
+            for key, (vector, payload) in self._vectors.items()
+        )
+        return [IndexHit(key, score, payload) for score, key, payload in heapq.nlargest(k, scored)]
+
+    def save(self, path: str) -> None:
+        """Persist the index to a local directory."""
+        keys = list(self._vectors)
+        meta = {
+            "type": "brute_force",
+            "keys": keys,
+            "payloads": [self._vectors[key][1] for key in keys],
+        }
+        _write_index_files(path, meta, [self._vectors[key][0] for key in keys])
+
+    @classmethod
+    def load(cls, path: str) -> 'BruteForceIndex':
+        """Load an index previously written with save().
+
+        Args:
+            path: Directory containing the index files
+
+        Returns:
+            BruteForceIndex instance
+        """
+        meta, vectors = _read_index_files(path)
+        index = cls()
+        for key, payload, vector in zip(meta["keys"], meta["payloads"], vectors.tolist()):
+            index._vectors[key] = (vector, payload)
+        return index
+
+    def __len__(self) -> int:
+        """Number of vectors in the index."""
+        return len(self._vectors)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key is present in the index."""
+        return key in self._vectors
+
+
+class HNSWIndex(VectorIndex):
+    """Hierarchical Navigable Small World graph index.
+
+    Vectors are normalized on insertion, so scores are cosine similarities.
+    They are kept in one float32 matrix, and each step of a graph walk
+    scores all unvisited neighbours of a node with a single matrix-vector
+    product. Removals are tombstones: removed nodes keep routing searches
+    but are never returned. Call compact() to rebuild the graph once many
+    vectors are removed.
+    """
+
+    def __init__(
+        self,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        seed: Optional[int] = None
+    ):
+        """Initialize HNSW index.
+
+        Args:
+            m: Maximum number of links per node on upper layers (2*m on layer 0)
+            ef_construction: Candidate list size used while inserting
+            ef_search: Default candidate list size used while searching
+            seed: Optional random seed for reproducible level assignment
+        """
+        if m < 2:
+            raise ValueError("m must be at least 2")
+        if ef_construction <= 0 or ef_search <= 0:
+            raise ValueError("ef_construction and ef_search must be positive")
+
+        self.m = m
+        self.m0 = 2 * m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.seed = seed
+
+        self._level_mult = 1 / math.log(m)
+        self._lock = threading.RLock()
+        self._reset()
+
+    def add(self, key: str, vector: List[float], payload: Optional[str] = None) -> None:
+        """Add or replace a vector.
+
+        Raises:
+            ValueError: If the vector dimension does not match the index
+        """
+        values = _unit_array(vector)
+
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = len(values)
+                self._data = np.zeros((64, self.dimension), dtype=np.float32)
+            elif len(values) != self.dimension:
+                raise ValueError(
+                    f"Vector dimension {len(values)} does not match index dimension {self.dimension}"
+                )
+
+            if key in self._key_to_node:
+                self._deleted.add(self._key_to_node[key])
+
+            node = len(self._keys)
+            if node == len(self._data):
+                grown = np.zeros((2 * node, self.dimension), dtype=np.float32)
+                grown[:node] = self._data
+                self._data = grown
+            self._data[node] = values
+
+            level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+            self._keys.append(key)
+            self._payloads.append(payload)
+            self._links.append([[] for _ in range(level + 1)])
+            self._key_to_node[key] = node
+
+            if self._entry_point is None:
+                self._entry_point = node
+                self._max_level = level
+                return
+
+            entry = self._entry_point
+            entry_score = float(self._data[entry] @ values)
+            for layer in range(self._max_level, level, -1):
+                entry, entry_score = self._greedy_search(values, entry, entry_score, layer)
+
+            entry_points = [(entry_score, entry)]
+            for layer in range(min(level, self._max_level), -1, -1):
+                candidates = self._search_layer(values, entry_points, self.ef_construction, layer)
+                neighbours = self._select_neighbours(candidates, self.m)
+                self._links[node][layer] = neighbours
+                max_links = self.m0 if layer == 0 else self.m
+                for neighbour in neighbours:
+                    self._connect(neighbour, node, layer, max_links)
+                entry_points = candidates
+
+            if level > self._max_level:
+                self._entry_point = node
+                self._max_level = level
+
+    def remove(self, key: str) -> bool:
+        """Remove a vector by marking its node as deleted."""
+        with self._lock:
+            node = self._key_to_node.pop(key, None)
+            if node is None:
+                return False
+            self._deleted.add(node)
+            return True
+
+    def search(self, query: List[float], k: int, ef: Optional[int] = None) -> List[IndexHit]:
+        """Find approximately the k vectors most similar to a query.
+
+        Args:
+            query: Query embedding
+            k: Number of hits to return
+            ef: Candidate list size (defaults to ef_search, never below k)
+
+        Returns:
+            List of IndexHit objects ordered by descending similarity
+        """
+        if k <= 0 or not self._key_to_node:
+            return []
+
+        values = _unit_array(query)
+        if self.dimension is not None and len(values) != self.dimension:
+            raise ValueError(
+                f"Query dimension {len(values)} does not match index dimension {self.dimension}"
+            )
+
+        with self._lock:
+            entry = self._entry_point
+            max_level = self._max_level
+
+        entry_score = float(self._data[entry] @ values)
+        for layer in range(max_level, 0, -1):
+            entry, entry_score = self._greedy_search(values, entry, entry_score, layer)
+
+        found = self._search_layer(
+            values, [(entry_score, entry)], max(ef or self.ef_search, k), 0, skip_deleted=True
+        )
+        return [IndexHit(self._keys[node], score, self._payloads[node]) for score, node in found[:k]]
+
+    def compact(self) -> None:
+        """Rebuild the graph from live vectors, dropping deleted nodes."""
+        with self._lock:
+            live = [
+                (self._keys[node], self._data[node].copy(), self._payloads[node])
+                for node in sorted(self._key_to_node.values())
+            ]
+            removed = len(self._deleted)
+            self._reset()
+            for key, vector, payload in live:
+                self.add(key, vector, payload)
+        logger.info("Compacted HNSW index: %d live vectors, %d tombstones dropped", len(live), removed)
+
+    def exact_search(self, query: List[float], k: int) -> List[IndexHit]:
+        """Brute-force search over the live vectors of this index.
+
+        Args:
+            query: Query embedding
+            k: Number of hits to return
+
+        Returns:
+            List of IndexHit objects ordered by descending similarity
+        """
+        if k <= 0 or not self._key_to_node:
+            return []
+        values = _unit_array(query)
+        nodes = np.fromiter(self._key_to_node.values(), dtype=np.int64)
+        scores = self._data[nodes] @ values
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [
+            IndexHit(self._keys[int(nodes[i])], float(scores[i]), self._payloads[int(nodes[i])])
+            for i in top
+        ]
+
+    def recall_report(
+        self,
+        queries: List[List[float]],
+        k: int = 10,
+        ef_values: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """Measure recall@k and latency against brute-force search.
+
+        Args:
+            queries: Query embeddings to evaluate
+            k: Number of neighbours compared per query
+            ef_values: Search breadths to evaluate (defaults to ef_search only)
+
+        Returns:
+            Dictionary with the brute-force baseline latency and, per ef value,
+            the mean recall and mean search latency in milliseconds
+        """
+        if not queries:
+            raise ValueError("At least one query is required")
+
+        start = time.perf_counter()
+        truth = [{hit.key for hit in self.exact_search(q, k)} for q in queries]
+        brute_force_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        results = []
+        for ef in ef_values or [self.ef_search]:
+            hits = 0
+            expected = 0
+            start = time.perf_counter()
+            for q, exact in zip(queries, truth):
+                found = {hit.key for hit in self.search(q, k, ef=ef)}
+                hits += len(found & exact)
+                expected += len(exact)
+            latency_ms = (time.perf_counter() - start) * 1000 / len(queries)
+            results.append({
+                "ef": ef,
+                "recall": hits / expected if expected else 1.0,
+                "avg_latency_ms": latency_ms,
+                "speedup": brute_force_ms / latency_ms if latency_ms else float("inf")
+            })
+
+        return {
+            "size": len(self),
+            "dimension": self.dimension,
+            "m": self.m,
+            "ef_construction": self.ef_construction,
+            "k": k,
+            "queries": len(queries),
+            "brute_force_avg_latency_ms": brute_force_ms,
+            "results": results
+        }
+
+    def save(self, path: str) -> None:
+        """Persist the index to a local directory."""
+        with self._lock:
+            meta = {
+                "type": "hnsw",
+                "m": self.m,
+                "ef_construction": self.ef_construction,
+                "ef_search": self.ef_search,
+                "seed": self.seed,
+                "dimension": self.dimension,
+                "entry_point": self._entry_point,
+                "max_level": self._max_level,
+                "keys": self._keys,
+                "payloads": self._payloads,
+                "links": self._links,
+                "deleted": sorted(self._deleted),
+            }
+            _write_index_files(path, meta, self._data[:len(self._keys)])
+        logger.info("Saved HNSW index with %d vectors to %s", len(self), path)
+
+    @classmethod
+    def load(cls, path: str) -> 'HNSWIndex':
+        """Load an index previously written with save().
+
+        Args:
+            path: Directory containing the index files
+
+        Returns:
+            HNSWIndex instance
+        """
+        meta, vectors = _read_index_files(path)
+        if meta.get("type") != "hnsw":
+            raise ValueError(f"Index at {path} is not an HNSW index")
+
+        index = cls(
+            m=meta["m"],
+            ef_construction=meta["ef_construction"],
+            ef_search=meta["ef_search"],
+            seed=meta.get("seed")
+        )
+        index.dimension = meta["dimension"]
+        index._entry_point = meta["entry_point"]
+        index._max_level = meta["max_level"]
+        index._keys = meta["keys"]
+        index._payloads = meta["payloads"]
+        index._links = meta["links"]
+        index._data = vectors
+        index._deleted = set(meta["deleted"])
+        index._key_to_node = {
+            key: node for node, key in enumerate(index._keys) if node not in index._deleted
+        }
+        logger.info("Loaded HNSW index with %d vectors from %s", len(index), path)
+        return index
+
+    def __len__(self) -> int:
+        """Number of live vectors in the index."""
+        return len(self._key_to_node)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key is present in the index."""
+        return key in self._key_to_node
+
+    def _reset(self) -> None:
+        """Clear all graph state."""
+        self.dimension: Optional[int] = None
+        self._rng = random.Random(self.seed)
+        self._keys: List[str] = []
+        self._payloads: List[Optional[str]] = []
+        # Rows beyond len(self._keys) are spare capacity
+        self._data = np.zeros((0, 0), dtype=np.float32)
+        self._links: List[List[List[int]]] = []
+        self._key_to_node: Dict[str, int] = {}
+        self._deleted: Set[int] = set()
+        self._entry_point: Optional[int] = None
+        self._max_level = -1
+
+    def _greedy_search(
+        self, query: np.ndarray, entry: int, entry_score: float, layer: int
+    ) -> Tuple[int, float]:
+        """Walk a layer greedily towards the query, returning the closest node."""
+        while True:
+            links = self._links[entry][layer]
+            if not links:
+                return entry, entry_score
+            scores = self._data[links] @ query
+            best = int(scores.argmax())
+            if scores[best] <= entry_score:
+                return entry, entry_score
+            entry, entry_score = links[best], float(scores[best])
+
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entry_points: List[Tuple[float, int]],
+        ef: int,
+        layer: int,
+        skip_deleted: bool = False
+    ) -> List[Tuple[float, int]]:
+        """Beam search within a single layer.
+
+        Returns:
+            Up to ef (score, node) pairs ordered by descending score
+        """
+        visited = {node for _, node in entry_points}
+        candidates = [(-score, node) for score, node in entry_points]
+        heapq.heapify(candidates)
+        results = [
+            (score, node) for score, node in entry_points
+            if not (skip_deleted and node in self._deleted)
+        ]
+        heapq.heapify(results)
+
+        while candidates:
+            neg_score, node = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_score < results[0][0]:
+                break
+            fresh = [n for n in self._links[node][layer] if n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+            scores = (self._data[fresh] @ query).tolist()
+            for neighbour, score in zip(fresh, scores):
+                if len(results) < ef or score > results[0][0]:
+                    heapq.heappush(candidates, (-score, neighbour))
+                    if skip_deleted and neighbour in self._deleted:
+                        continue
+                    heapq.heappush(results, (score, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+
+        return sorted(results, reverse=True)
+
+    def _select_neighbours(self, candidates: List[Tuple[float, int]], max_links: int) -> List[int]:
+        """Pick diverse neighbours using the HNSW selection heuristic.
+
+        A candidate is kept only if it is closer to the base node than to any
+        neighbour already selected, which preserves long-range links.
+        """
+        selected: List[int] = []
+        for score, candidate in candidates:
+            if len(selected) >= max_links:
+                break
+            if not selected or float((self._data[selected] @ self._data[candidate]).max()) < score:
+                selected.append(candidate)
+        return selected
+
+    def _connect(self, node: int, new_neighbour: int, layer: int, max_links: int) -> None:
+        """Add a back-link and prune the node's links if it exceeds max_links."""
+        links = self._links[node][layer]
+        links.append(new_neighbour)
+        if len(links) <= max_links:
+            return
+        scores = (self._data[links] @ self._data[node]).tolist()
+        candidates = sorted(zip(scores, links), reverse=True)
+        self._links[node][layer] = self._select_neighbours(candidates, max_links)
+
+
+def index_exists(path: str) -> bool:
+    """Check whether a directory holds a saved index."""
+    return os.path.exists(os.path.join(path, INDEX_FILE))
+
+
+def _write_index_files(path: str, meta: Dict[str, Any], vectors: Any) -> None:
+    """Write index metadata and float32 vectors to one file, atomically.
+
+    The file holds the length of the JSON metadata as an 8-byte little-endian
+    integer, the metadata, and the packed vectors. It is written next to the
+    old one and swapped in with a single rename, so a crash leaves either
+    the previous index or the new one, never a mix.
+    """
+    os.makedirs(path, exist_ok=True)
+    header = json.dumps(meta).encode("utf-8")
+    packed = np.ascontiguousarray(vectors, dtype=np.float32)
+
+    index_path = os.path.join(path, INDEX_FILE)
+    with open(index_path + ".tmp", "wb") as f:
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        f.write(packed.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(index_path + ".tmp", index_path)
+
+
+def _read_meta(f) -> Dict[str, Any]:
+    size = int.from_bytes(f.read(8), "little")
+    return json.loads(f.read(size).decode("utf-8"))
+
+
+def _read_index_files(path: str) -> Tuple[Dict[str, Any], np.ndarray]:
+    """Read an index file written by _write_index_files.
+
+    Returns:
+        Tuple of the metadata and a (count, dimension) float32 matrix
+    """
+    if not index_exists(path):
+        raise FileNotFoundError(f"No vector index found at {path}")
+
+    with open(os.path.join(path, INDEX_FILE), "rb") as f:
+        meta = _read_meta(f)
+        packed = np.frombuffer(f.read(), dtype=np.float32)
+
+    count = len(meta["keys"])
+    dimension = len(packed) // count if count else 0
+    # Copy so the matrix is writable and can grow
+    return meta, packed.reshape(count, dimension).copy()
+
+
+def load_vector_index(path: str) -> VectorIndex:
+    """Load a persisted index of any supported type.
+
+    Args:
+        path: Directory containing the index files
+
+    Returns:
+        VectorIndex instance
+    """
+    if not index_exists(path):
+        raise FileNotFoundError(f"No vector index found at {path}")
+    with open(os.path.join(path, INDEX_FILE), "rb") as f:
+        index_type = _read_meta(f).get("type")
+    if index_type == "hnsw":
+        return HNSWIndex.load(path)
+    if index_type == "brute_force":
+        return BruteForceIndex.load(path)
+    raise ValueError(f"Unknown vector index type: {index_type}")
@@ -4,8 +4,10 @@ Vector store for managing vector embeddings.
 from typing import List, Optional, Dict, Any
 import logging
 from ..models.vector import Vector
+from ..lib.config import config
 from ..lib.database import DatabaseConnection
 from ..lib.exceptions import DatabaseError
+from ..lib.vector_index import VectorIndex, HNSWIndex, IndexHit, index_exists, load_vector_index
 
 logger = logging.getLogger(__name__)
 
@@ -13,13 +15,35 @@ logger = logging.getLogger(__name__)
 class VectorStore:
     """Store for managing vector embeddings in the database."""
 
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(
+        self,
+        db_connection: DatabaseConnection,
+        index: Optional[VectorIndex] = None,
+        index_path: Optional[str] = None
+    ):
         """Initialize vector store.
 
         Args:
             db_connection: Database connection instance
+            index: In-process vector index kept in sync with stored vectors (optional)
+            index_path: Directory the index is loaded from and saved to (optional).
+                When given without an index, an existing index is loaded from it or
+                an HNSW index is created with the configured parameters, and the
+                index is rebuilt from the database if it does not match it.
         """
         self.db_connection = db_connection
+        self.index_path = index_path
+        self.index = index
+
+        if self.index is None and index_path:
+            if index_exists(index_path):
+                self.index = load_vector_index(index_path)
+            else:
+                self.index = self._new_index()
+            try:
+                self.sync_index()
+            except DatabaseError as e:
+                logger.warning("Could not check vector index against the database: %s", str(e))
 
     def store_vector(self, vector: Vector) -> None:
         """Store a vector in the database.
@@ -51,6 +75,8 @@ class VectorStore:
                     "created_at": vector.created_at.isoformat(),
                     "updated_at": vector.updated_at.isoformat()
                 })
+            if self.index is not None:
+                self.index.add(vector.id, vector.embedding, vector.chunk_id)
             logger.info("Stored vector %s for chunk %s", vector.id, vector.chunk_id)
         except Exception as e:
             logger.error("Failed to store vector %s: %s", vector.id, str(e))
@@ -92,6 +118,9 @@ class VectorStore:
                     })
 
                 session.run(query, {"vectors": vector_data})
+            if self.index is not None:
+                for vector in vectors:
+                    self.index.add(vector.id, vector.embedding, vector.chunk_id)
             logger.info("Stored %d vectors", len(vectors))
         except Exception as e:
             logger.error("Failed to store vectors: %s", str(e))
@@ -180,7 +209,120 @@ class VectorStore:
                 DELETE v
                 """
                 result = session.run(query, {"vector_id": vector_id})
-                return result.consume().counters.nodes_deleted > 0
+                deleted = result.consume().counters.nodes_deleted > 0
+            if self.index is not None:
+                self.index.remove(vector_id)
+            return deleted
         except Exception as e:
             logger.error("Failed to delete vector %s: %s", vector_id, str(e))
-            raise DatabaseError(f"Failed to delete vector: {str(e)}")
\ No newline at end of file
+            raise DatabaseError(f"Failed to delete vector: {str(e)}")
+
+    def search_index(self, embedding: List[float], k: int, ef: Optional[int] = None) -> List[IndexHit]:
+        """Search the in-process vector index.
+
+        Args:
+            embedding: Query embedding
+            k: Number of hits to return
+            ef: Search breadth passed to the index (optional)
+
+        Returns:
+            List of IndexHit objects whose payload is the chunk ID
+
+        Raises:
+            RuntimeError: If no index is configured
+        """
+        if self.index is None:
+            raise RuntimeError("Vector index not configured")
+        return self.index.search(embedding, k, ef=ef)
+
+    def count_vectors(self) -> int:
+        """Count the vectors stored in the database.
+
+        Returns:
+            Number of Vector nodes
+
+        Raises:
+            DatabaseError: If counting fails
+        """
+        try:
+            driver = self.db_connection.get_driver()
+            with driver.session() as session:
+                record = session.run("MATCH (v:Vector) RETURN count(v) AS count").single()
+                return record["count"] if record else 0
+        except Exception as e:
+            logger.error("Failed to count vectors: %s", str(e))
+            raise DatabaseError(f"Failed to count vectors: {str(e)}")
+
+    def sync_index(self) -> bool:
+        """Rebuild the index from the database if their vector counts differ.
+
+        The index is only saved on shutdown, so after a crash the saved index
+        can be missing vectors written since, or still hold deleted ones.
+
+        Returns:
+            True if the index was rebuilt
+
+        Raises:
+            RuntimeError: If no index is configured
+            DatabaseError: If reading vectors fails
+        """
+        if self.index is None:
+            raise RuntimeError("Vector index not configured")
+
+        stored = self.count_vectors()
+        if len(self.index) == stored:
+            return False
+
+        logger.warning(
+            "Vector index holds %d vectors but the database has %d, rebuilding",
+            len(self.index), stored
+        )
+        self.index = self._new_index()
+        self.rebuild_index()
+        return True
+
+    def rebuild_index(self) -> int:
+        """Load every stored vector from the database into the index.
+
+        Used to build the index for a database populated before the index was
+        enabled, or after the index files were lost.
+
+        Returns:
+            Number of vectors added to the index
+
+        Raises:
+            RuntimeError: If no index is configured
+            DatabaseError: If reading vectors fails
+        """
+        if self.index is None:
+            raise RuntimeError("Vector index not configured")
+
+        try:
+            driver = self.db_connection.get_driver()
+            count = 0
+            with driver.session() as session:
+                query = """
+                MATCH (v:Vector)
+                RETURN v.id AS id, v.chunk_id AS chunk_id, v.embedding AS embedding
+                """
+                for record in session.run(query):
+                    self.index.add(record["id"], record["embedding"], record["chunk_id"])
+                    count += 1
+            logger.info("Rebuilt vector index with %d vectors", count)
+            return count
+        except Exception as e:
+            logger.error("Failed to rebuild vector index: %s", str(e))
+            raise DatabaseError(f"Failed to rebuild vector index: {str(e)}")
+
+    def _new_index(self) -> VectorIndex:
+        """Create an empty HNSW index with the configured parameters."""
+        return HNSWIndex(
+            m=config.HNSW_M,
+            ef_construction=config.HNSW_EF_CONSTRUCTION,
+            ef_search=config.HNSW_EF_SEARCH
+        )
+
+    def save_index(self) -> None:
+        """Persist the vector index to index_path, if both are configured."""
+        if self.index is not None and self.index_path:
+            self.index.save(self.index_path)
\ No newline at end of file
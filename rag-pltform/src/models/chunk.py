@@ -2,6 +2,7 @@
 Chunk model for the RAG system.
 """
 from typing import Dict, Any, Optional, Union
+from datetime import datetime
 from .base import BaseModel
 
 
@@ -3,7 +3,7 @@ Generation service for creating responses to user queries.
 """
 import logging
 import time
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional
 from ..models.query import Query
 from ..models.response import Response
 from ..models.search_result import SearchResult
@@ -13,6 +13,83 @@ from ..lib.exceptions import LLMError
 
 logger = logging.getLogger(__name__)
 
+# Shown to the user when generation fails
+GENERATION_ERROR_MESSAGE = "Sorry, I encountered an error while generating a response. Please try again."
+
+
+class ResponseStream:
+    """Iterator over generated text that builds the Response once the stream ends.
+
+    Iterating yields text as the model produces it. After the last piece,
+    response holds the complete Response, time-to-first-token and total
+    generation time are recorded, and on_complete is called with the response.
+    If generation fails mid-stream, the error message is yielded and becomes
+    part of the response instead of raising.
+    """
+
+    def __init__(
+        self,
+        text_stream: Iterator[str],
+        query_id: str,
+        model_used: str,
+        on_complete: Optional[Callable[[Response], None]] = None
+    ):
+        """Initialize response stream.
+
+        Args:
+            text_stream: Text deltas from the LLM client
+            query_id: ID of the originating query
+            model_used: Name of the generating model
+            on_complete: Callback invoked with the finished response (optional)
+        """
+        self._text_stream = text_stream
+        self.query_id = query_id
+        self.model_used = model_used
+        self.on_complete = on_complete
+        self.response: Optional[Response] = None
+        self.time_to_first_token: Optional[float] = None
+        self.total_time: Optional[float] = None
+        self.chunks = 0
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield text deltas as they arrive."""
+        if self.response is not None:
+            raise RuntimeError("Response stream has already been consumed")
+
+        start_time = time.perf_counter()
+        parts = []
+        model_used = self.model_used
+        try:
+            for text in self._text_stream:
+                if self.time_to_first_token is None:
+                    self.time_to_first_token = time.perf_counter() - start_time
+                    logger.info("First token after %.3f seconds", self.time_to_first_token)
+                self.chunks += 1
+                parts.append(text)
+                yield text
+        except Exception as e:
+            logger.error("Failed to generate response: %s", str(e))
+            message = f"\n{GENERATION_ERROR_MESSAGE}" if parts else GENERATION_ERROR_MESSAGE
+            parts.append(message)
+            model_used = "error-handler"
+            yield message
+
+        self.total_time = time.perf_counter() - start_time
+        self.response = Response(query_id=self.query_id, content="".join(parts), model_used=model_used)
+        logger.info(
+            "Streamed response completed in %.2f seconds (first token %.3f seconds, %d chunks)",
+            self.total_time, self.time_to_first_token or 0.0, self.chunks
+        )
+        if self.on_complete:
+            self.on_complete(self.response)
+
+    def read(self) -> Response:
+        """Consume the rest of the stream and return the complete response."""
+        if self.response is None:
+            for _ in self:
+                pass
+        return self.response
+
 
 class GenerationService:
     """Service for generating responses to user queries."""
@@ -87,6 +164,53 @@ class GenerationService:
             logger.error("Failed to generate response: %s", str(e))
             raise LLMError(f"Failed to generate response: {str(e)}")
 
+    def stream_response(
+        self,
+        query: Query,
+        search_results: List[SearchResult],
+        chunk_contents: List[str],
+        previous_responses: Optional[List[Response]] = None,
+        conversation_context: Optional[dict] = None,
+        on_complete: Optional[Callable[[Response], None]] = None
+    ) -> ResponseStream:
+        """Generate a response to a user query as a stream of text.
+
+        Uses the follow-up prompt when previous responses are given. Nothing is
+        sent to the LLM until the returned stream is iterated.
+
+        Args:
+            query: Query object
+            search_results: List of SearchResult objects
+            chunk_contents: List of chunk content strings corresponding to search results
+            previous_responses: Previous Response objects in the conversation (optional)
+            conversation_context: Optional conversation context
+            on_complete: Callback invoked with the finished response (optional)
+
+        Returns:
+            ResponseStream yielding the generated text
+
+        Raises:
+            ValueError: If inputs are invalid
+        """
+        logger.info("Streaming response for query: %s", query.original_text)
+
+        # Validate inputs
+        if not query or not isinstance(query, Query):
+            raise ValueError("Invalid query object")
+
+        if len(search_results) != len(chunk_contents):
+            raise ValueError("Mismatch between search results and chunk contents length")
+
+        if previous_responses:
+            prompt = self._assemble_follow_up_prompt(
+                query, search_results, chunk_contents, previous_responses, conversation_context
+            )
+        else:
+            prompt = self._assemble_prompt(query, search_results, chunk_contents, conversation_context)
+
+        text_stream = self.llm_client.stream_text(prompt, max_tokens=1000, temperature=0.7)
+        return ResponseStream(text_stream, query.id, self.llm_client.generation_model, on_complete)
+
     def _assemble_prompt(
         self,
         query: Query,
@@ -1,9 +1,10 @@
 """
 Indexing service for processing documents through the RAG pipeline.
 """
+import itertools
 import logging
 import time
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from ..models.document import Document
 from ..models.chunk import Chunk
 from ..models.vector import Vector
@@ -12,6 +13,7 @@ from ..lib.chunker import DocumentChunker
 from ..lib.llm_client import QwenClient
 from ..lib.vector_store import VectorStore
 from ..lib.graph_store import GraphStore
+from ..lib.config import config
 from ..lib.database import DatabaseConnection
 from ..lib.exceptions import DocumentProcessingError, DatabaseError, LLMError
 
@@ -28,7 +30,8 @@ class IndexingService:
         chunker: Optional[DocumentChunker] = None,
         llm_client: Optional[QwenClient] = None,
         vector_store: Optional[VectorStore] = None,
-        graph_store: Optional[GraphStore] = None
+        graph_store: Optional[GraphStore] = None,
+        vector_write_batch_size: Optional[int] = None
     ):
         """Initialize indexing service.
 
@@ -39,6 +42,7 @@ class IndexingService:
             llm_client: LLM client instance (optional, will create default if not provided)
             vector_store: Vector store instance (optional, will create default if not provided)
             graph_store: Graph store instance (optional, will create default if not provided)
+            vector_write_batch_size: Vectors written per store call (optional, defaults to VECTOR_WRITE_BATCH_SIZE)
         """
         self.db_connection = db_connection
         self.pdf_parser = pdf_parser or PDFParser()
@@ -46,6 +50,7 @@ class IndexingService:
         self.llm_client = llm_client or QwenClient()
         self.vector_store = vector_store or VectorStore(db_connection)
         self.graph_store = graph_store or GraphStore(db_connection)
+        self.vector_write_batch_size = vector_write_batch_size or config.VECTOR_WRITE_BATCH_SIZE
 
     def index_document(self, name: str, file_path: str) -> Document:
         """Index a document through the complete RAG pipeline.
@@ -77,81 +82,35 @@ class IndexingService:
         document.status = "processing"
 
         try:
-            # 1. Parse PDF document
-            logger.info("Parsing PDF document: %s", file_path)
-            parse_start = time.time()
-            text_content = self.pdf_parser.parse(file_path)
-            parse_duration = time.time() - parse_start
-            logger.info("PDF parsing completed in %.2f seconds", parse_duration)
+            # 1-2. Parse PDF document and chunk it page by page as it is extracted
+            logger.info("Parsing and chunking PDF document: %s", file_path)
+            pages = self.pdf_parser.iter_pages(file_path)
+            chunks = iter(self.chunker.iter_chunks(document.id, pages))
 
             # Validate parsed content
-            if not text_content or not text_content.strip():
+            first_chunk = next(chunks, None)
+            if first_chunk is None:
                 raise DocumentProcessingError("No text content found in PDF", file_path)
 
-            # 2. Chunk document
-            logger.info("Chunking document: %s", document.id)
-            chunk_start = time.time()
-            chunks = self.chunker.chunk(document.id, text_content)
-            chunk_duration = time.time() - chunk_start
-            logger.info("Document chunking completed in %.2f seconds", chunk_duration)
-
-            if not chunks:
-                logger.warning("No chunks created from document: %s", document.id)
-                # Create a single chunk with all content if chunking failed
-                from ..models.chunk import Chunk
-                chunk = Chunk(document_id=document.id, content=text_content[:1000], position=0)
-                chunks = [chunk]
-
-            document.chunk_count = len(chunks)
-            logger.info("Created %d chunks from document", len(chunks))
-
-            # 3. Process each chunk
-            vectors = []
-            failed_chunks = 0
-            embedding_start = time.time()
-
-            for i, chunk in enumerate(chunks):
-                logger.debug("Processing chunk %d/%d", i + 1, len(chunks))
-
-                # Generate vector embedding
-                try:
-                    embedding = self.llm_client.generate_embedding(chunk.content)
-                    vector = Vector(
-                        chunk_id=chunk.id,
-                        embedding=embedding,
-                        model_name="text-embedding-v4"
-                    )
-                    vectors.append(vector)
-                except LLMError as e:
-                    logger.warning("Failed to generate embedding for chunk %s: %s", chunk.id, str(e))
-                    failed_chunks += 1
-                    # Continue with other chunks
-
-            embedding_duration = time.time() - embedding_start
-            logger.info("Embedding generation completed in %.2f seconds", embedding_duration)
+            # 3-5. Store the document, then store, embed and write its chunks as they are produced
+            self._store_document(document)
+            index_start = time.time()
+            chunk_count, stored_vectors, failed_chunks = self._index_chunks(
+                itertools.chain([first_chunk], chunks), document.id
+            )
+            index_duration = time.time() - index_start
+            document.chunk_count = chunk_count
+            logger.info(
+                "Indexed %d chunks and stored %d vectors in %.2f seconds (%.1f chunks/s)",
+                chunk_count, stored_vectors, index_duration,
+                chunk_count / index_duration if index_duration > 0 else 0.0
+            )
+            if self.llm_client.embedding_cache is not None:
+                logger.info("Embedding cache stats: %s", self.llm_client.embedding_cache.stats())
 
             # Log statistics
             if failed_chunks > 0:
-                logger.warning("Failed to generate embeddings for %d/%d chunks", failed_chunks, len(chunks))
-
-            # 4. Store data in database
-            logger.info("Storing document data in database")
-            store_start = time.time()
-
-            # Store document
-            self._store_document(document)
-
-            # Store chunks
-            self._store_chunks(chunks)
-
-            # Store vectors
-            self._store_vectors(vectors)
-
-            # Store knowledge graph (placeholder for now)
-            self._store_knowledge_graph(chunks, document.id)
-
-            store_duration = time.time() - store_start
-            logger.info("Database storage completed in %.2f seconds", store_duration)
+                logger.warning("Failed to generate embeddings for %d/%d chunks", failed_chunks, chunk_count)
 
             # Mark document as completed
             document.mark_as_indexed()
@@ -233,6 +192,86 @@ class IndexingService:
             logger.error("Failed to store chunks: %s", str(e))
             raise DatabaseError(f"Failed to store chunks: {str(e)}")
 
+    def _index_chunks(self, chunks: Iterator[Chunk], document_id: str) -> Tuple[int, int, int]:
+        """Store, embed and write chunks one window at a time as they are produced.
+
+        Each window of VECTOR_WRITE_BATCH_SIZE chunks is stored and its vectors
+        written before the next window is pulled from the chunker, so memory
+        stays bounded by one window regardless of document length.
+
+        Args:
+            chunks: Chunks in document order
+            document_id: ID of the parent document
+
+        Returns:
+            Tuple of (number of chunks, vectors stored, chunks that failed to embed)
+        """
+        chunk_count = 0
+        stored = 0
+        failed = 0
+        while True:
+            window = list(itertools.islice(chunks, self.vector_write_batch_size))
+            if not window:
+                break
+            self._store_chunks(window)
+            window_stored, window_failed = self._embed_and_store_vectors(window)
+            self._store_knowledge_graph(window, document_id)
+            chunk_count += len(window)
+            stored += window_stored
+            failed += window_failed
+        return chunk_count, stored, failed
+
+    def _embed_and_store_vectors(self, chunks: List[Chunk]) -> Tuple[int, int]:
+        """Embed chunks in concurrent batches and write vectors as they arrive.
+
+        Vectors are flushed to the vector store every VECTOR_WRITE_BATCH_SIZE
+        chunks. Embedding results are consumed in order and new API requests are
+        only dispatched as the consumer advances, so a slow store throttles the
+        embedding requests instead of accumulating vectors in memory.
+
+        Args:
+            chunks: Chunks to embed
+
+        Returns:
+            Tuple of (number of vectors stored, number of chunks that failed)
+        """
+        pending: List[Vector] = []
+        stored = 0
+        failed = 0
+        embedded = 0
+
+        def add_vector(chunk: Chunk, embedding: List[float]) -> None:
+            nonlocal pending, stored
+            pending.append(Vector(
+                chunk_id=chunk.id,
+                embedding=embedding,
+                model_name=self.llm_client.embedding_model
+            ))
+            if len(pending) >= self.vector_write_batch_size:
+                self._store_vectors(pending)
+                stored += len(pending)
+                pending = []
+
+        try:
+            for i, embedding in self.llm_client.iter_embeddings([chunk.content for chunk in chunks]):
+                add_vector(chunks[i], embedding)
+                embedded = i + 1
+        except LLMError as e:
+            # Fall back to per-chunk embedding so one bad chunk does not fail the
+            # document; batches that already completed are served from cache
+            logger.warning("Batch embedding failed, retrying remaining chunks one by one: %s", str(e))
+            for chunk in chunks[embedded:]:
+                try:
+                    add_vector(chunk, self.llm_client.generate_embedding(chunk.content))
+                except LLMError as chunk_error:
+                    logger.warning("Failed to generate embedding for chunk %s: %s", chunk.id, str(chunk_error))
+                    failed += 1
+                    # Continue with other chunks
+
+        self._store_vectors(pending)
+        stored += len(pending)
+        return stored, failed
+
     def _store_vectors(self, vectors: List[Vector]) -> None:
         """Store vectors in database.
 
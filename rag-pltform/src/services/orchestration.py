@@ -9,12 +9,13 @@ from ..models.query import Query
 from ..models.search_result import SearchResult
 from ..models.response import Response
 from ..models.conversation import Conversation
+from ..lib.conversation_store import ConversationStore
 from ..lib.database import DatabaseConnection
 from ..lib.exceptions import DatabaseError
 from ..services.pre_retrieval import PreRetrievalService
 from ..services.retrieval import RetrievalService
 from ..services.post_retrieval import PostRetrievalService
-from ..services.generation import GenerationService
+from ..services.generation import GENERATION_ERROR_MESSAGE, GenerationService, ResponseStream
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +29,8 @@ class OrchestrationService:
         pre_retrieval_service: Optional[PreRetrievalService] = None,
         retrieval_service: Optional[RetrievalService] = None,
         post_retrieval_service: Optional[PostRetrievalService] = None,
-        generation_service: Optional[GenerationService] = None
+        generation_service: Optional[GenerationService] = None,
+        conversation_store: Optional[ConversationStore] = None
     ):
         """Initialize orchestration service.
 
@@ -38,12 +40,16 @@ class OrchestrationService:
             retrieval_service: Retrieval service (optional, will create default if not provided)
             post_retrieval_service: Post-retrieval service (optional, will create default if not provided)
             generation_service: Generation service (optional, will create default if not provided)
+            conversation_store: Conversation store (optional, will create default if not provided)
         """
         self.db_connection = db_connection
         self.pre_retrieval_service = pre_retrieval_service or PreRetrievalService()
-        self.retrieval_service = retrieval_service or RetrievalService(db_connection)
+        self.retrieval_service = retrieval_service or RetrievalService(
+            db_connection, pre_retrieval_service=self.pre_retrieval_service
+        )
         self.post_retrieval_service = post_retrieval_service or PostRetrievalService()
         self.generation_service = generation_service or GenerationService()
+        self.conversation_store = conversation_store or ConversationStore(db_connection)
 
     def search(
         self,
@@ -105,18 +111,7 @@ class OrchestrationService:
 
             # 4. Retrieve chunk contents
             logger.info("Step 4: Retrieving chunk contents")
-            chunk_contents = []
-            for result in search_results:
-                try:
-                    chunk = self.retrieval_service.get_chunk_content(result.chunk_id)
-                    if chunk:
-                        chunk_contents.append(chunk.content)
-                    else:
-                        chunk_contents.append("[Content not available]")
-                        logger.warning("Chunk content not found for chunk_id: %s", result.chunk_id)
-                except Exception as e:
-                    chunk_contents.append("[Content retrieval failed]")
-                    logger.error("Failed to retrieve chunk content for chunk_id %s: %s", result.chunk_id, str(e))
+            chunk_contents = self._get_chunk_contents(search_results)
 
             total_duration = time.time() - start_time
             logger.info("Search operation completed in %.2f seconds, returning %d results", total_duration, len(search_results))
@@ -177,50 +172,11 @@ class OrchestrationService:
             raise ValueError("top_k must be positive")
 
         try:
-            # Create or update conversation
-            if conversation is None:
-                conversation = Conversation(session_id=f"chat_{int(time.time())}")
-                logger.info("Created new conversation: %s", conversation.id)
-            else:
-                conversation.update_last_activity()
-                logger.info("Using existing conversation: %s", conversation.id)
-
-            # 1. Process query (pre-retrieval)
-            logger.info("Step 1: Processing query")
-            query = self.pre_retrieval_service.process_query(question, expand_query=expand_query)
-
-            # 2. Retrieve relevant documents
-            logger.info("Step 2: Retrieving documents")
-            search_results = self.retrieval_service.search(
-                query, name, top_k=top_k,
-                enable_vector_search=enable_vector_search,
-                enable_graph_search=enable_graph_search
+            conversation, query, search_results, chunk_contents, previous_responses = self._prepare_chat(
+                name, question, conversation, top_k, expand_query, rerank,
+                enable_vector_search, enable_graph_search
             )
 
-            # 3. Post-process results
-            logger.info("Step 3: Post-processing results")
-            search_results = self.post_retrieval_service.process_results(search_results, query, rerank=rerank)
-
-            # 4. Retrieve chunk contents
-            logger.info("Step 4: Retrieving chunk contents")
-            chunk_contents = []
-            for result in search_results:
-                try:
-                    chunk = self.retrieval_service.get_chunk_content(result.chunk_id)
-                    if chunk:
-                        chunk_contents.append(chunk.content)
-                    else:
-                        chunk_contents.append("[Content not available]")
-                        logger.warning("Chunk content not found for chunk_id: %s", result.chunk_id)
-                except Exception as e:
-                    chunk_contents.append("[Content retrieval failed]")
-                    logger.error("Failed to retrieve chunk content for chunk_id %s: %s", result.chunk_id, str(e))
-
-            # 5. Get previous responses for context (if in conversation)
-            previous_responses = []
-            if conversation.id:
-                previous_responses = self._get_previous_responses(conversation.id)
-
             # 6. Generate response
             logger.info("Step 5: Generating response")
             try:
@@ -236,23 +192,12 @@ class OrchestrationService:
                 logger.error("Failed to generate response: %s", str(e))
                 response = Response(
                     query_id=query.id,
-                    content="Sorry, I encountered an error while generating a response. Please try again.",
+                    content=GENERATION_ERROR_MESSAGE,
                     model_used="error-handler"
                 )
 
             # 7. Store conversation data
-            logger.info("Step 6: Storing conversation data")
-            try:
-                self._store_conversation_data(conversation, query, response)
-            except Exception as e:
-                logger.error("Failed to store conversation data: %s", str(e))
-                # Continue without storing data
-
-            # Update conversation context
-            conversation.update_context({
-                "last_question": question,
-                "last_response_length": len(response.content)
-            })
+            self._finish_chat(conversation, query, response, question)
 
             total_duration = time.time() - start_time
             logger.info("Chat operation completed in %.2f seconds", total_duration)
@@ -269,36 +214,187 @@ class OrchestrationService:
             logger.error("Chat operation failed: %s", str(e))
             raise DatabaseError(f"Chat operation failed: {str(e)}")
 
-    def _get_previous_responses(self, conversation_id: str) -> List[Response]:
-        """Get previous responses in a conversation.
+    def chat_stream(
+        self,
+        name: str,
+        question: str,
+        conversation: Optional[Conversation] = None,
+        top_k: int = 5,
+        expand_query: bool = True,
+        rerank: bool = True,
+        enable_vector_search: bool = True,
+        enable_graph_search: bool = True
+    ) -> Tuple[ResponseStream, Conversation]:
+        """Engage in a conversation, streaming the response as it is generated.
+
+        Retrieval runs before this method returns; generation starts when the
+        returned stream is iterated. Conversation data is stored once the
+        stream has been fully consumed.
 
         Args:
-            conversation_id: ID of the conversation
+            name: Name of the document collection to chat about
+            question: Question to ask about the documents
+            conversation: Existing conversation (optional)
+            top_k: Number of results to return
+            expand_query: Enable query expansion
+            rerank: Enable result reranking
+            enable_vector_search: Enable vector search
+            enable_graph_search: Enable graph search
 
         Returns:
-            List of Response objects
+            Tuple of (response stream, updated conversation)
+
+        Raises:
+            ValueError: If inputs are invalid
+            DatabaseError: If database operations fail
         """
+        logger.info("Starting streaming chat operation for collection: %s, question: %s", name, question)
+
+        # Validate inputs
+        if not name or not name.strip():
+            raise ValueError("Collection name cannot be empty")
+
+        if not question or not question.strip():
+            raise ValueError("Question cannot be empty")
+
+        if top_k <= 0:
+            raise ValueError("top_k must be positive")
+
         try:
-            driver = self.db_connection.get_driver()
-            with driver.session() as session:
-                query = """
-                MATCH (c:Conversation {id: $conversation_id})-[:HAS_RESPONSE]->(r:Response)
-                RETURN r
-                ORDER BY r.generated_at DESC
-                LIMIT 5
-                """
+            conversation, query, search_results, chunk_contents, previous_responses = self._prepare_chat(
+                name, question, conversation, top_k, expand_query, rerank,
+                enable_vector_search, enable_graph_search
+            )
 
-                result = session.run(query, {"conversation_id": conversation_id})
+            logger.info("Step 5: Streaming response")
+            stream = self.generation_service.stream_response(
+                query, search_results, chunk_contents, previous_responses, conversation.context,
+                on_complete=lambda response: self._finish_chat(conversation, query, response, question)
+            )
+            return stream, conversation
 
-                responses = []
-                for record in result:
-                    node = record["r"]
-                    responses.append(Response.from_dict(dict(node)))
+        except ValueError:
+            # Re-raise value errors
+            raise
+        except DatabaseError:
+            # Re-raise database errors
+            raise
+        except Exception as e:
+            logger.error("Chat operation failed: %s", str(e))
+            raise DatabaseError(f"Chat operation failed: {str(e)}")
+
+    def _prepare_chat(
+        self,
+        name: str,
+        question: str,
+        conversation: Optional[Conversation],
+        top_k: int,
+        expand_query: bool,
+        rerank: bool,
+        enable_vector_search: bool,
+        enable_graph_search: bool
+    ) -> Tuple[Conversation, Query, List[SearchResult], List[str], List[Response]]:
+        """Run the retrieval steps of a chat turn.
 
-                # Reverse to get chronological order
-                responses.reverse()
-                return responses
+        Returns:
+            Tuple of (conversation, query, search results, chunk contents,
+            previous responses)
+        """
+        # Create or update conversation
+        if conversation is None:
+            conversation = Conversation(session_id=f"chat_{int(time.time())}")
+            self.conversation_store.start_conversation(conversation)
+            logger.info("Created new conversation: %s", conversation.id)
+        else:
+            conversation.update_last_activity()
+            logger.info("Using existing conversation: %s", conversation.id)
+
+        # 1. Process query (pre-retrieval)
+        logger.info("Step 1: Processing query")
+        query = self.pre_retrieval_service.process_query(question, expand_query=expand_query)
+
+        # 2. Retrieve relevant documents
+        logger.info("Step 2: Retrieving documents")
+        search_results = self.retrieval_service.search(
+            query, name, top_k=top_k,
+            enable_vector_search=enable_vector_search,
+            enable_graph_search=enable_graph_search
+        )
+
+        # 3. Post-process results
+        logger.info("Step 3: Post-processing results")
+        search_results = self.post_retrieval_service.process_results(search_results, query, rerank=rerank)
+
+        # 4. Retrieve chunk contents
+        logger.info("Step 4: Retrieving chunk contents")
+        chunk_contents = self._get_chunk_contents(search_results)
+
+        # Get previous responses for context (if in conversation)
+        previous_responses = []
+        if conversation.id:
+            previous_responses = self._get_previous_responses(conversation.id)
+
+        return conversation, query, search_results, chunk_contents, previous_responses
+
+    def _finish_chat(self, conversation: Conversation, query: Query, response: Response, question: str) -> None:
+        """Store a completed chat turn and update the conversation context.
 
+        Args:
+            conversation: Conversation object
+            query: Query object
+            response: Generated response
+            question: Question as asked by the user
+        """
+        logger.info("Step 6: Storing conversation data")
+        try:
+            self._store_conversation_data(conversation, query, response)
+        except Exception as e:
+            logger.error("Failed to store conversation data: %s", str(e))
+            # Continue without storing data
+
+        # Update conversation context
+        conversation.update_context({
+            "last_question": question,
+            "last_response_length": len(response.content)
+        })
+
+    def _get_chunk_contents(self, search_results: List[SearchResult]) -> List[str]:
+        """Fetch the content of every result's chunk in one batch.
+
+        Args:
+            search_results: Search results to fetch content for
+
+        Returns:
+            List of chunk contents aligned with search_results, with placeholders
+            for chunks that could not be retrieved
+        """
+        try:
+            chunks = self.retrieval_service.hydrate_chunks([result.chunk_id for result in search_results])
+        except Exception as e:
+            logger.error("Failed to retrieve chunk contents: %s", str(e))
+            return ["[Content retrieval failed]"] * len(search_results)
+
+        chunk_contents = []
+        for result in search_results:
+            hydrated = chunks.get(result.chunk_id)
+            if hydrated:
+                chunk_contents.append(hydrated.chunk.content)
+            else:
+                chunk_contents.append("[Content not available]")
+                logger.warning("Chunk content not found for chunk_id: %s", result.chunk_id)
+        return chunk_contents
+
+    def _get_previous_responses(self, conversation_id: str) -> List[Response]:
+        """Get previous responses in a conversation.
+
+        Args:
+            conversation_id: ID of the conversation
+
+        Returns:
+            List of Response objects
+        """
+        try:
+            return self.conversation_store.recent_responses(conversation_id, limit=5)
         except Exception as e:
             logger.error("Failed to retrieve previous responses: %s", str(e))
             return []  # Return empty list on failure
@@ -311,67 +407,12 @@ class OrchestrationService:
             query: Query object
             response: Response object
         """
-        try:
-            driver = self.db_connection.get_driver()
-            with driver.session() as session:
-                # Store conversation if it's new
-                if conversation.created_at == conversation.updated_at:
-                    conv_query = """
-                    CREATE (c:Conversation {
-                        id: $id,
-                        session_id: $session_id,
-                        context: $context,
-                        started_at: $started_at,
-                        last_activity: $last_activity,
-                        created_at: $created_at,
-                        updated_at: $updated_at
-                    })
-                    """
-                    session.run(conv_query, conversation.to_dict())
-
-                # Store query
-                query_query = """
-                CREATE (q:Query {
-                    id: $id,
-                    original_text: $original_text,
-                    expanded_text: $expanded_text,
-                    user_id: $user_id,
-                    timestamp: $timestamp,
-                    created_at: $created_at,
-                    updated_at: $updated_at
-                })
-                """
-                session.run(query_query, query.to_dict())
-
-                # Store response
-                response_query = """
-                CREATE (r:Response {
-                    id: $id,
-                    query_id: $query_id,
-                    content: $content,
-                    model_used: $model_used,
-                    tokens_used: $tokens_used,
-                    generated_at: $generated_at,
-                    created_at: $created_at,
-                    updated_at: $updated_at
-                })
-                """
-                session.run(response_query, response.to_dict())
+        self.conversation_store.save_turn(conversation, query, response)
 
-                # Create relationships
-                rel_query = """
-                MATCH (c:Conversation {id: $conversation_id}), (q:Query {id: $query_id}), (r:Response {id: $response_id})
-                CREATE (c)-[:HAS_QUERY]->(q), (c)-[:HAS_RESPONSE]->(r), (q)-[:GENERATED]->(r)
-                """
-                session.run(rel_query, {
-                    "conversation_id": conversation.id,
-                    "query_id": query.id,
-                    "response_id": response.id
-                })
-
-        except Exception as e:
-            logger.error("Failed to store conversation data: %s", str(e))
-            raise DatabaseError(f"Failed to store conversation data: {str(e)}")
+    def close(self) -> None:
+        """Write pending conversation data and release background workers."""
+        self.conversation_store.close()
+        self.retrieval_service.close()
 
     def get_conversation_history(self, conversation_id: str) -> List[Tuple[Query, Response]]:
         """Get conversation history.
@@ -386,6 +427,8 @@ class OrchestrationService:
             DatabaseError: If database operations fail
         """
         try:
+            # Queued turns must be written before history is read back
+            self.conversation_store.flush()
             driver = self.db_connection.get_driver()
             with driver.session() as session:
                 query = """
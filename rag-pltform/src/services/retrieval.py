@@ -2,19 +2,43 @@
 Retrieval service for searching indexed documents.
 """
 import logging
+import threading
 import time
-from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 from ..models.query import Query
 from ..models.search_result import SearchResult
 from ..models.chunk import Chunk
 from ..models.vector import Vector
+from ..lib.config import config
 from ..lib.database import DatabaseConnection
 from ..lib.vector_store import VectorStore
 from ..lib.graph_store import GraphStore
+from ..lib.llm_client import QwenClient
 from ..lib.exceptions import DatabaseError
+from ..services.pre_retrieval import PreRetrievalService
 
 logger = logging.getLogger(__name__)
 
+# Minimum cosine similarity for a vector hit to be returned
+MIN_VECTOR_SIMILARITY = 0.1
+
+# Candidate multiplier used when filtering index hits down to one collection
+INDEX_OVERFETCH_FACTOR = 4
+
+
+class HydratedChunk(NamedTuple):
+    """A retrieved chunk with the metadata of its parent document."""
+    chunk: Chunk
+    document_name: Optional[str]
+    file_path: Optional[str]
+
+    @property
+    def page_number(self) -> Optional[int]:
+        """Page the chunk starts on, if the chunker recorded it."""
+        return self.chunk.metadata.get("page_number")
+
 
 class RetrievalService:
     """Service for retrieving relevant documents based on queries."""
@@ -23,7 +47,11 @@ class RetrievalService:
         self,
         db_connection: DatabaseConnection,
         vector_store: Optional[VectorStore] = None,
-        graph_store: Optional[GraphStore] = None
+        graph_store: Optional[GraphStore] = None,
+        chunk_cache_size: Optional[int] = None,
+        llm_client: Optional[QwenClient] = None,
+        pre_retrieval_service: Optional[PreRetrievalService] = None,
+        timeout: Optional[float] = None
     ):
         """Initialize retrieval service.
 
@@ -31,10 +59,31 @@ class RetrievalService:
             db_connection: Database connection instance
             vector_store: Vector store instance (optional, will create default if not provided)
             graph_store: Graph store instance (optional, will create default if not provided)
+            chunk_cache_size: Number of hydrated chunks kept in memory (defaults to CHUNK_CACHE_SIZE)
+            llm_client: LLM client for query embeddings (optional, will create default if not provided)
+            pre_retrieval_service: Service for keyword extraction (optional, will create default if not provided)
+            timeout: Per-query latency budget in seconds, 0 for none (defaults to RETRIEVAL_TIMEOUT)
         """
         self.db_connection = db_connection
         self.vector_store = vector_store or VectorStore(db_connection)
         self.graph_store = graph_store or GraphStore(db_connection)
+        # Created on first use, so services that never embed need no API key
+        self._llm_client = llm_client
+        self.pre_retrieval_service = pre_retrieval_service or PreRetrievalService()
+        self.timeout = config.RETRIEVAL_TIMEOUT if timeout is None else timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.RETRIEVAL_MAX_WORKERS, thread_name_prefix="retrieval"
+        )
+        self.chunk_cache_size = config.CHUNK_CACHE_SIZE if chunk_cache_size is None else chunk_cache_size
+        self._chunk_cache: "OrderedDict[str, HydratedChunk]" = OrderedDict()
+        self._chunk_cache_lock = threading.Lock()
+
+    @property
+    def llm_client(self) -> QwenClient:
+        """LLM client used for query embeddings."""
+        if self._llm_client is None:
+            self._llm_client = QwenClient()
+        return self._llm_client
 
     def search(
         self,
@@ -56,6 +105,38 @@ class RetrievalService:
         Returns:
             List of SearchResult objects
 
+        Raises:
+            ValueError: If inputs are invalid
+            DatabaseError: If database operations fail
+        """
+        results, _ = self.search_with_timings(
+            query, name, top_k,
+            enable_vector_search=enable_vector_search,
+            enable_graph_search=enable_graph_search
+        )
+        return results
+
+    def search_with_timings(
+        self,
+        query: Query,
+        name: str,
+        top_k: int = 5,
+        enable_vector_search: bool = True,
+        enable_graph_search: bool = True
+    ) -> Tuple[List[SearchResult], Dict[str, Dict[str, Any]]]:
+        """Search for relevant documents, running vector and graph search concurrently.
+
+        Args:
+            query: Query object
+            name: Name of the document collection to search
+            top_k: Number of results to return
+            enable_vector_search: Enable vector similarity search
+            enable_graph_search: Enable graph-based search
+
+        Returns:
+            Tuple of (SearchResult objects, per-branch timings keyed by branch
+            name with status "ok", "failed", "timeout" or "disabled")
+
         Raises:
             ValueError: If inputs are invalid
             DatabaseError: If database operations fail
@@ -76,33 +157,11 @@ class RetrievalService:
         if not enable_vector_search and not enable_graph_search:
             raise ValueError("At least one search method must be enabled")
 
-        all_results = []
-
-        # Vector search
-        if enable_vector_search:
-            logger.info("Performing vector search")
-            vector_start = time.time()
-            try:
-                vector_results = self._vector_search(query, name, top_k * 2)  # Get more results for reranking
-                vector_duration = time.time() - vector_start
-                logger.info("Vector search completed in %.2f seconds, found %d results", vector_duration, len(vector_results))
-                all_results.extend(vector_results)
-            except Exception as e:
-                logger.error("Vector search failed: %s", str(e))
-                # Continue with other search methods if available
-
-        # Graph search
-        if enable_graph_search:
-            logger.info("Performing graph search")
-            graph_start = time.time()
-            try:
-                graph_results = self._graph_search(query, name, top_k * 2)  # Get more results for reranking
-                graph_duration = time.time() - graph_start
-                logger.info("Graph search completed in %.2f seconds, found %d results", graph_duration, len(graph_results))
-                all_results.extend(graph_results)
-            except Exception as e:
-                logger.error("Graph search failed: %s", str(e))
-                # Continue with other search methods if available
+        # Get more results per branch for reranking
+        all_results, timings = self._run_branches(query, name, top_k * 2, {
+            "vector": self._vector_search if enable_vector_search else None,
+            "graph": self._graph_search if enable_graph_search else None
+        })
 
         # Deduplicate results by chunk_id
         unique_results = {}
@@ -126,9 +185,77 @@ class RetrievalService:
             result.rank = i + 1
 
         total_duration = time.time() - start_time
-        logger.info("Search completed in %.2f seconds, returning %d results", total_duration, len(results))
+        logger.info(
+            "Search completed in %.2f seconds, returning %d results (branches: %s)",
+            total_duration, len(results), timings
+        )
 
-        return results
+        return results, timings
+
+    def _run_branches(
+        self,
+        query: Query,
+        name: str,
+        limit: int,
+        branches: Dict[str, Optional[Callable[[Query, str, int], List[SearchResult]]]]
+    ) -> Tuple[List[SearchResult], Dict[str, Dict[str, Any]]]:
+        """Run the enabled search branches concurrently within the latency budget.
+
+        Branches that fail or are still running when the budget runs out are
+        left out, so the caller gets partial results from the branches that
+        finished. A branch that overruns keeps its worker thread until it
+        returns; only its result is discarded.
+
+        Args:
+            query: Query object
+            name: Name of the document collection
+            limit: Maximum number of results per branch
+            branches: Search function per branch name, or None if disabled
+
+        Returns:
+            Tuple of (results from finished branches, per-branch timings with
+            status, seconds and result count)
+        """
+        start = time.perf_counter()
+        futures = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+        for branch, search in branches.items():
+            if search is None:
+                timings[branch] = {"status": "disabled", "seconds": 0.0, "results": 0}
+            else:
+                logger.info("Performing %s search", branch)
+                futures[branch] = self._executor.submit(_timed, search, query, name, limit)
+
+        # Wait for every branch, or until the budget runs out
+        wait(futures.values(), timeout=self.timeout if self.timeout > 0 else None)
+
+        all_results = []
+        for branch, future in futures.items():
+            if not future.done():
+                future.cancel()
+                timings[branch] = {"status": "timeout", "seconds": round(time.perf_counter() - start, 3), "results": 0}
+                logger.warning("%s search exceeded the %.2f second budget", branch.capitalize(), self.timeout)
+                continue
+
+            try:
+                branch_results, seconds = future.result()
+            except Exception as e:
+                timings[branch] = {"status": "failed", "seconds": round(time.perf_counter() - start, 3), "results": 0}
+                logger.error("%s search failed: %s", branch.capitalize(), str(e))
+                continue
+
+            timings[branch] = {"status": "ok", "seconds": round(seconds, 3), "results": len(branch_results)}
+            logger.info(
+                "%s search completed in %.2f seconds, found %d results",
+                branch.capitalize(), seconds, len(branch_results)
+            )
+            all_results.extend(branch_results)
+
+        return all_results, timings
+
+    def close(self) -> None:
+        """Stop the worker threads used for concurrent search."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
     def _vector_search(self, query: Query, name: str, limit: int) -> List[SearchResult]:
         """Perform vector similarity search.
@@ -158,45 +285,37 @@ class RetrievalService:
             driver = self.db_connection.get_driver()
             with driver.session() as session:
                 # Generate query embedding
-                from ..lib.llm_client import QwenClient
-                llm_client = QwenClient()
-                query_embedding = llm_client.generate_embedding(query.expanded_text)
-
-                # Find relevant document IDs for the collection
-                doc_query = """
-                MATCH (d:Document {name: $name})
-                RETURN d.id AS document_id
-                """
-                doc_result = session.run(doc_query, {"name": name})
-                document_ids = [record["document_id"] for record in doc_result]
-
-                if not document_ids:
-                    logger.warning("No documents found for collection: %s", name)
-                    return []
-
-                # Perform vector similarity search
-                vector_query = """
-                MATCH (v:Vector)-[:BELONGS_TO]->(c:Chunk)-[:PART_OF]->(d:Document)
-                WHERE d.id IN $document_ids
-                WITH v, c, gds.alpha.similarity.cosine($query_embedding, v.embedding) AS similarity
-                WHERE similarity > 0.1
-                RETURN c.id AS chunk_id, similarity AS score
-                ORDER BY similarity DESC
-                LIMIT $limit
-                """
-
-                vector_result = session.run(vector_query, {
-                    "document_ids": document_ids,
-                    "query_embedding": query_embedding,
-                    "limit": limit
-                })
+                query_embedding = self.llm_client.generate_embedding(query.expanded_text)
+
+                # An empty index would return nothing, so scan the database instead
+                index = self.vector_store.index
+                if index is not None and len(index) > 0:
+                    scored_chunks = self._index_vector_search(session, query_embedding, name, limit)
+                else:
+                    # Perform vector similarity search
+                    vector_query = """
+                    MATCH (v:Vector)-[:BELONGS_TO]->(c:Chunk)-[:PART_OF]->(d:Document {name: $name})
+                    WITH v, c, gds.alpha.similarity.cosine($query_embedding, v.embedding) AS similarity
+                    WHERE similarity > $min_similarity
+                    RETURN c.id AS chunk_id, similarity AS score
+                    ORDER BY similarity DESC
+                    LIMIT $limit
+                    """
+
+                    vector_result = session.run(vector_query, {
+                        "name": name,
+                        "query_embedding": query_embedding,
+                        "min_similarity": MIN_VECTOR_SIMILARITY,
+                        "limit": limit
+                    })
+                    scored_chunks = [(record["chunk_id"], record["score"]) for record in vector_result]
 
                 results = []
-                for i, record in enumerate(vector_result):
+                for i, (chunk_id, score) in enumerate(scored_chunks):
                     result = SearchResult(
                         query_id=query.id,
-                        chunk_id=record["chunk_id"],
-                        score=record["score"],
+                        chunk_id=chunk_id,
+                        score=score,
                         rank=i + 1,
                         retrieval_method="vector"
                     )
@@ -208,6 +327,65 @@ class RetrievalService:
             logger.error("Vector search failed: %s", str(e))
             raise DatabaseError(f"Vector search failed: {str(e)}")
 
+    def _index_vector_search(
+        self,
+        session,
+        query_embedding: List[float],
+        name: str,
+        limit: int
+    ) -> List[Tuple[str, float]]:
+        """Search the in-process vector index and keep hits from the collection.
+
+        The index spans all collections, so candidates are over-fetched and
+        filtered against the collection's documents in a single query. The
+        candidate pool grows until enough hits survive or the index is exhausted.
+
+        Args:
+            session: Open database session
+            query_embedding: Query embedding
+            name: Name of the document collection
+            limit: Maximum number of results to return
+
+        Returns:
+            List of (chunk_id, score) tuples ordered by descending score
+        """
+        index_size = len(self.vector_store.index)
+        candidate_k = min(limit * INDEX_OVERFETCH_FACTOR, index_size)
+
+        while candidate_k > 0:
+            hits = [
+                hit for hit in self.vector_store.search_index(query_embedding, candidate_k)
+                if hit.score > MIN_VECTOR_SIMILARITY
+            ]
+
+            filter_query = """
+            MATCH (c:Chunk)
+            WHERE c.id IN $chunk_ids
+            MATCH (d:Document {id: c.document_id, name: $name})
+            RETURN DISTINCT c.id AS chunk_id
+            """
+            filter_result = session.run(filter_query, {
+                "chunk_ids": [hit.payload for hit in hits],
+                "name": name
+            })
+            in_collection = {record["chunk_id"] for record in filter_result}
+
+            scored_chunks = []
+            seen = set()
+            for hit in hits:
+                if hit.payload in in_collection and hit.payload not in seen:
+                    seen.add(hit.payload)
+                    scored_chunks.append((hit.payload, hit.score))
+
+            # Stop once enough hits survive, the index is exhausted, or the
+            # similarity threshold already cut off the candidate list
+            if len(scored_chunks) >= limit or candidate_k >= index_size or len(hits) < candidate_k:
+                return scored_chunks[:limit]
+
+            candidate_k = min(candidate_k * INDEX_OVERFETCH_FACTOR, index_size)
+
+        return []
+
     def _graph_search(self, query: Query, name: str, limit: int) -> List[SearchResult]:
         """Perform graph-based search.
 
@@ -236,37 +414,23 @@ class RetrievalService:
             driver = self.db_connection.get_driver()
             with driver.session() as session:
                 # Extract keywords from query
-                from ..services.pre_retrieval import PreRetrievalService
-                pre_service = PreRetrievalService()
-                keywords = pre_service.extract_keywords(query.expanded_text)
+                keywords = self.pre_retrieval_service.extract_keywords(query.expanded_text)
 
                 if not keywords:
                     logger.warning("No keywords extracted from query: %s", query.expanded_text)
                     return []
 
-                # Find relevant document IDs for the collection
-                doc_query = """
-                MATCH (d:Document {name: $name})
-                RETURN d.id AS document_id
-                """
-                doc_result = session.run(doc_query, {"name": name})
-                document_ids = [record["document_id"] for record in doc_result]
-
-                if not document_ids:
-                    logger.warning("No documents found for collection: %s", name)
-                    return []
-
                 # Search for entities matching keywords
                 entity_query = """
-                MATCH (e:Entity)-[:MENTIONED_IN]->(c:Chunk)-[:PART_OF]->(d:Document)
-                WHERE d.id IN $document_ids AND e.name IN $keywords
+                MATCH (e:Entity)-[:MENTIONED_IN]->(c:Chunk)-[:PART_OF]->(d:Document {name: $name})
+                WHERE e.name IN $keywords
                 RETURN c.id AS chunk_id, count(e) AS relevance_count
                 ORDER BY relevance_count DESC
                 LIMIT $limit
                 """
 
                 entity_result = session.run(entity_query, {
-                    "document_ids": document_ids,
+                    "name": name,
                     "keywords": keywords,
                     "limit": limit
                 })
@@ -298,22 +462,76 @@ class RetrievalService:
 
         Returns:
             Chunk object or None if not found
+
+        Raises:
+            DatabaseError: If retrieval fails
+        """
+        hydrated = self.hydrate_chunks([chunk_id]).get(chunk_id)
+        return hydrated.chunk if hydrated else None
+
+    def hydrate_chunks(self, chunk_ids: List[str]) -> Dict[str, HydratedChunk]:
+        """Retrieve chunks with their document metadata in a single query.
+
+        Recently hydrated chunks are served from an in-memory LRU; only the
+        remaining ids are fetched from the database. Chunks are immutable once
+        indexed, so cached entries never go stale.
+
+        Args:
+            chunk_ids: IDs of the chunks to retrieve
+
+        Returns:
+            Dictionary mapping chunk ID to HydratedChunk; missing chunks are omitted
+
+        Raises:
+            DatabaseError: If retrieval fails
         """
+        hydrated: Dict[str, HydratedChunk] = {}
+        with self._chunk_cache_lock:
+            for chunk_id in chunk_ids:
+                cached = self._chunk_cache.get(chunk_id)
+                if cached is not None:
+                    self._chunk_cache.move_to_end(chunk_id)
+                    hydrated[chunk_id] = cached
+
+        missing = list(dict.fromkeys(chunk_id for chunk_id in chunk_ids if chunk_id not in hydrated))
+        if not missing:
+            return hydrated
+
         try:
             driver = self.db_connection.get_driver()
             with driver.session() as session:
                 query = """
-                MATCH (c:Chunk {id: $chunk_id})
-                RETURN c
+                MATCH (c:Chunk)
+                WHERE c.id IN $chunk_ids
+                OPTIONAL MATCH (d:Document {id: c.document_id})
+                WHERE d.name IS NOT NULL
+                RETURN c, d.name AS document_name, d.file_path AS file_path
                 """
-                result = session.run(query, {"chunk_id": chunk_id})
-                record = result.single()
-
-                if not record:
-                    return None
+                result = session.run(query, {"chunk_ids": missing})
 
-                node = record["c"]
-                return Chunk.from_dict(dict(node))
+                fetched = {}
+                for record in result:
+                    chunk = Chunk.from_dict(dict(record["c"]))
+                    fetched.setdefault(chunk.id, HydratedChunk(chunk, record["document_name"], record["file_path"]))
         except Exception as e:
-            logger.error("Failed to retrieve chunk %s: %s", chunk_id, str(e))
-            raise DatabaseError(f"Failed to retrieve chunk: {str(e)}")
\ No newline at end of file
+            logger.error("Failed to retrieve %d chunks: %s", len(missing), str(e))
+            raise DatabaseError(f"Failed to retrieve chunks: {str(e)}")
+
+        hydrated.update(fetched)
+        if self.chunk_cache_size > 0:
+            with self._chunk_cache_lock:
+                for chunk_id, entry in fetched.items():
+                    self._chunk_cache[chunk_id] = entry
+                    self._chunk_cache.move_to_end(chunk_id)
+                while len(self._chunk_cache) > self.chunk_cache_size:
+                    self._chunk_cache.popitem(last=False)
+
+        logger.debug("Hydrated %d chunks (%d from cache)", len(hydrated), len(hydrated) - len(fetched))
+        return hydrated
+
+
+def _timed(function: Callable[..., Any], *args) -> Tuple[Any, float]:
+    """Call a function and return its result with the elapsed seconds."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
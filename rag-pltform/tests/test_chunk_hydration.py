@@ -0,0 +1,74 @@
+"""
+Unit tests for batched chunk hydration.
+"""
+import sys
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.models.chunk import Chunk
+from src.models.search_result import SearchResult
+from src.services.orchestration import OrchestrationService
+from src.services.retrieval import RetrievalService
+
+
+class TestChunkHydration(unittest.TestCase):
+    """Test RetrievalService.hydrate_chunks and its use in orchestration."""
+
+    def setUp(self):
+        self.chunks = {
+            f"c{i}": Chunk(document_id="doc", content=f"content {i}", position=i, id=f"c{i}",
+                           metadata={"page_number": i + 1})
+            for i in range(5)
+        }
+        db = MagicMock()
+        self.session = db.get_driver.return_value.session.return_value.__enter__.return_value
+
+        def run(query, params):
+            return [
+                {"c": self.chunks[cid].to_dict(), "document_name": "docs", "file_path": "/tmp/doc.pdf"}
+                for cid in params["chunk_ids"] if cid in self.chunks
+            ]
+
+        self.session.run.side_effect = run
+        self.service = RetrievalService(db, vector_store=MagicMock(), graph_store=MagicMock(), chunk_cache_size=3)
+
+    def test_single_query_with_document_metadata(self):
+        """All ids are fetched in one query with document and page info."""
+        hydrated = self.service.hydrate_chunks(["c0", "c1", "missing", "c1"])
+
+        self.assertEqual(self.session.run.call_count, 1)
+        self.assertEqual(set(hydrated), {"c0", "c1"})
+        self.assertEqual(hydrated["c1"].chunk.content, "content 1")
+        self.assertEqual(hydrated["c1"].document_name, "docs")
+        self.assertEqual(hydrated["c1"].page_number, 2)
+
+    def test_hot_chunks_served_from_cache(self):
+        """Cached chunks are not fetched again and the cache stays bounded."""
+        self.service.hydrate_chunks(["c0", "c1"])
+        self.service.hydrate_chunks(["c0", "c1"])
+        self.assertEqual(self.session.run.call_count, 1)
+
+        self.service.hydrate_chunks(["c2", "c3"])
+        self.assertEqual(list(self.service._chunk_cache), ["c1", "c2", "c3"])
+        self.assertEqual(self.service.get_chunk_content("c3").content, "content 3")
+        self.assertEqual(self.session.run.call_count, 2)
+
+    def test_orchestration_contents_aligned(self):
+        """Orchestration hydrates results in one call and fills placeholders."""
+        orchestration = OrchestrationService(
+            MagicMock(), MagicMock(), self.service, MagicMock(), MagicMock()
+        )
+        results = [SearchResult(query_id="q", chunk_id=cid, score=1.0, rank=1) for cid in ["c4", "gone", "c0"]]
+
+        contents = orchestration._get_chunk_contents(results)
+
+        self.assertEqual(contents, ["content 4", "[Content not available]", "content 0"])
+        self.assertEqual(self.session.run.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit tests for page-aware streaming chunking.
+"""
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+import fitz  # PyMuPDF
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.lib.chunker import DocumentChunker, PageOffsetTable
+from src.lib.pdf_parser import PDFParser
+
+
+def _sample_text(words: int) -> str:
+    vocabulary = ["alpha", "beta.", "gamma\n", "delta!", "\n\n", "epsilon?"]
+    return " ".join(vocabulary[i % len(vocabulary)] + str(i) for i in range(words))
+
+
+class TestPageOffsetTable(unittest.TestCase):
+    """Test offset to page lookups."""
+
+    def test_page_at(self):
+        """Offsets map to the page whose span contains them."""
+        table = PageOffsetTable()
+        table.add_page(0, 1)
+        table.add_page(100, 3)
+        self.assertEqual(table.page_at(0), 1)
+        self.assertEqual(table.page_at(99), 1)
+        self.assertEqual(table.page_at(100), 3)
+        self.assertEqual(len(table), 2)
+        with self.assertRaises(ValueError):
+            table.add_page(50, 4)
+
+
+class TestStreamingChunker(unittest.TestCase):
+    """Test DocumentChunker.iter_chunks."""
+
+    def setUp(self):
+        self.chunker = DocumentChunker(chunk_size=120, chunk_overlap=20)
+        self.text = _sample_text(600)
+
+    def test_pages_match_whole_text_chunking(self):
+        """Streaming pages produces the same chunks as chunking the joined text."""
+        pages = [(i + 1, self.text[i * 500:(i + 1) * 500]) for i in range(len(self.text) // 500 + 1)]
+
+        streamed = list(self.chunker.iter_chunks("doc", pages))
+        whole = self.chunker.chunk("doc", self.text)
+
+        self.assertEqual([c.content for c in streamed], [c.content for c in whole])
+        self.assertEqual([c.position for c in streamed], list(range(len(streamed))))
+        for chunk in streamed:
+            start, end = chunk.metadata["start_offset"], chunk.metadata["end_offset"]
+            self.assertEqual(self.text[start:end], chunk.content)
+            self.assertEqual(chunk.metadata["page_number"], start // 500 + 1)
+            self.assertEqual(chunk.metadata["page_end"], (end - 1) // 500 + 1)
+
+    def test_chunk_with_metadata_uses_page_spans(self):
+        """Per-character page numbers are turned into page ranges."""
+        text = "a" * 150 + "b" * 150
+        chunks = self.chunker.chunk_with_metadata("doc", text, [1] * 150 + [2] * 150)
+
+        self.assertEqual(chunks[0].metadata["page_number"], 1)
+        self.assertEqual(chunks[1].metadata["page_number"], 1)
+        self.assertEqual(chunks[1].metadata["page_end"], 2)
+        self.assertEqual(chunks[-1].metadata["page_number"], 2)
+
+    def test_pdf_pages_stream_into_chunker(self):
+        """Parsed PDF pages concatenate to parse() output and carry page numbers."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "sample.pdf")
+            doc = fitz.open()
+            for i in range(3):
+                page = doc.new_page()
+                if i != 1:
+                    page.insert_text((72, 72), f"Page {i + 1} body text")
+            doc.save(path)
+            doc.close()
+
+            parser = PDFParser()
+            pages = list(parser.iter_pages(path))
+            self.assertEqual([number for number, _ in pages], [1, 3])
+            self.assertEqual("".join(text for _, text in pages), parser.parse(path))
+
+            chunks = list(DocumentChunker(chunk_size=30, chunk_overlap=5).iter_chunks("doc", pages))
+            self.assertEqual(chunks[0].metadata["page_number"], 1)
+            self.assertEqual(chunks[-1].metadata["page_number"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
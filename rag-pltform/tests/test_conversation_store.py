@@ -0,0 +1,101 @@
+"""
+Unit tests for conversation persistence.
+"""
+import sys
+import threading
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.lib.conversation_store import ConversationStore
+from src.models.conversation import Conversation
+from src.models.query import Query
+from src.models.response import Response
+
+
+def _turn(text):
+    query = Query(original_text=text)
+    return query, Response(query_id=query.id, content=f"answer to {text}")
+
+
+class TestConversationStore(unittest.TestCase):
+    """Test turn writes and the in-memory window."""
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.session = self.db.get_driver.return_value.session.return_value.__enter__.return_value
+        self.tx = MagicMock()
+        self.written = []
+        self.write_lock = threading.Lock()
+
+        def execute_write(fn, turns):
+            with self.write_lock:
+                self.written.append([turn["query"]["original_text"] for turn in turns])
+            return fn(self.tx, turns)
+
+        self.session.execute_write.side_effect = execute_write
+
+    def test_turn_written_in_one_transaction(self):
+        """A turn is a single transaction with one statement."""
+        store = ConversationStore(self.db, window_size=3, write_behind=False)
+        conversation = Conversation(session_id="s")
+
+        store.save_turn(conversation, *_turn("q1"))
+
+        self.assertEqual(self.written, [["q1"]])
+        self.assertEqual(self.tx.run.call_count, 1)
+        turn = self.tx.run.call_args.args[1]["turns"][0]
+        self.assertEqual(turn["conversation"]["id"], conversation.id)
+
+    def test_window_serves_recent_turns(self):
+        """New conversations never hit the database for history and the window is bounded."""
+        store = ConversationStore(self.db, window_size=3, write_behind=False)
+        conversation = Conversation(session_id="s")
+        store.start_conversation(conversation)
+
+        for i in range(5):
+            store.save_turn(conversation, *_turn(f"q{i}"))
+
+        responses = store.recent_responses(conversation.id)
+        self.assertEqual([r.content for r in responses], ["answer to q2", "answer to q3", "answer to q4"])
+        self.assertEqual(len(store.recent_responses(conversation.id, limit=2)), 2)
+        self.session.run.assert_not_called()
+
+    def test_unknown_conversation_loaded_once(self):
+        """History of an unknown conversation is read with one query, then cached."""
+        query, response = _turn("old")
+        self.session.run.return_value = [{"q": query.to_dict(), "r": response.to_dict()}]
+        store = ConversationStore(self.db, write_behind=False)
+
+        self.assertEqual([r.content for r in store.recent_responses("c1")], ["answer to old"])
+        self.assertEqual([r.content for r in store.recent_responses("c1")], ["answer to old"])
+        self.assertEqual(self.session.run.call_count, 1)
+
+    def test_write_behind_flushes_on_close(self):
+        """Queued turns are batched by the background writer and written before close returns."""
+        release = threading.Event()
+        original = self.session.execute_write.side_effect
+
+        def slow_write(fn, turns):
+            release.wait(2)
+            return original(fn, turns)
+
+        self.session.execute_write.side_effect = slow_write
+        store = ConversationStore(self.db, write_behind=True)
+        conversation = Conversation(session_id="s")
+        for i in range(5):
+            store.save_turn(conversation, *_turn(f"q{i}"))
+
+        self.assertEqual(self.written, [])
+        release.set()
+        store.close()
+
+        self.assertEqual([text for batch in self.written for text in batch], [f"q{i}" for i in range(5)])
+        self.assertLess(len(self.written), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
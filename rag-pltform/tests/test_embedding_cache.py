@@ -0,0 +1,128 @@
+"""
+Unit tests for the persistent embedding cache.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.lib.config import Config
+from src.lib.embedding_cache import EmbeddingCache, normalize_text, text_hash
+from src.lib.exceptions import LLMError
+from src.lib.llm_client import QwenClient
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test the two-tier embedding cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "embeddings.sqlite3")
+        self.cache = EmbeddingCache(self.path, memory_size=2)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_normalization(self):
+        """Whitespace and Unicode variants normalize to the same text."""
+        self.assertEqual(normalize_text("  hello\n\tworld "), "hello world")
+        self.assertEqual(normalize_text("ＡＢＣ"), "ABC")
+
+    def test_round_trip_and_counters(self):
+        """Stored embeddings are returned from memory, then from disk."""
+        self.cache.put("model-a", "hello world", [0.5, 0.25])
+        self.assertEqual(self.cache.get("model-a", "hello   world"), [0.5, 0.25])
+        self.assertIsNone(self.cache.get("model-b", "hello world"))
+
+        reopened = EmbeddingCache(self.path)
+        self.assertEqual(reopened.get("model-a", "hello world"), [0.5, 0.25])
+        reopened.close()
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["memory_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["writes"], 1)
+
+    def test_bulk_lookup_and_lru_eviction(self):
+        """Bulk lookups preserve order and evicted entries come back from disk."""
+        self.cache.put_many("m", [("a", [1.0]), ("b", [2.0]), ("c", [3.0])])
+        self.assertEqual(self.cache.stats()["memory_entries"], 2)
+
+        results = self.cache.get_many("m", ["c", "x", "a", "a"])
+        self.assertEqual(results, [[3.0], None, [1.0], [1.0]])
+        stats = self.cache.stats()
+        self.assertEqual(stats["memory_hits"], 1)
+        self.assertEqual(stats["disk_hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+
+
+    def test_memory_tier_holds_float32(self):
+        """Memory entries are compact float32 arrays and read back like disk entries."""
+        self.cache.put("m", "a", [0.1, 0.2])
+        self.assertEqual(self.cache._memory[("m", text_hash("a"))].itemsize, 4)
+
+        from_memory = self.cache.get("m", "a")
+        reopened = EmbeddingCache(self.path)
+        self.assertIsInstance(from_memory, list)
+        self.assertEqual(from_memory, reopened.get("m", "a"))
+        reopened.close()
+
+    def test_default_path_ignores_working_directory(self):
+        """The default cache file is absolute, so every working directory shares it."""
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": ""}):
+            os.environ.pop("EMBEDDING_CACHE_PATH", None)
+            path = Config().EMBEDDING_CACHE_PATH
+        self.assertTrue(os.path.isabs(path))
+        self.assertTrue(path.endswith(os.path.join("rag-pltform", "embeddings.sqlite3")))
+
+
+class TestQwenClientEmbeddingCache(unittest.TestCase):
+    """Test that the client only embeds text missing from the cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = EmbeddingCache(str(Path(self.tmp.name) / "cache.sqlite3"))
+        self.client = QwenClient(client=MagicMock(), embedding_cache=self.cache)
+
+        def create(model, input):
+            response = MagicMock()
+            response.data = [MagicMock(index=i, embedding=[float(len(text))]) for i, text in enumerate(input)]
+            return response
+
+        self.client.client.embeddings.create.side_effect = create
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_only_new_text_is_embedded(self):
+        """Repeated texts are served from the cache."""
+        self.assertEqual(self.client.generate_embeddings(["ab", "abc"], batch_size=1), [[2.0], [3.0]])
+        self.assertEqual(self.client.generate_embeddings(["abc", "abcd"], batch_size=1), [[3.0], [4.0]])
+        self.assertEqual(self.client.generate_embedding("ab"), [2.0])
+        self.assertEqual(self.client.client.embeddings.create.call_count, 3)
+
+    def test_partial_failure_keeps_successes(self):
+        """Embeddings generated before a failure are cached."""
+        create = self.client.client.embeddings.create.side_effect
+
+        def flaky(model, input):
+            if input == ["bad"]:
+                raise RuntimeError("boom")
+            return create(model, input)
+
+        self.client.client.embeddings.create.side_effect = flaky
+        self.client.max_retries = 0
+        with self.assertRaises(LLMError):
+            self.client.generate_embeddings(["good", "bad"], batch_size=1)
+        self.assertEqual(self.cache.get(self.client.embedding_model, "good"), [4.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
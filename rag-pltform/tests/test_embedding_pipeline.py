@@ -0,0 +1,120 @@
+"""
+Unit tests for batched, concurrent embedding generation.
+"""
+import sys
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.lib.fake_provider import FakeEmbeddings, FakeOpenAIClient
+from src.lib.exceptions import LLMError
+from src.lib.llm_client import QwenClient
+from src.models.chunk import Chunk
+from src.services.indexing import IndexingService
+
+
+def _client(**kwargs):
+    embeddings = FakeEmbeddings(dimension=8, **kwargs)
+    client = QwenClient(client=FakeOpenAIClient(embeddings))
+    client.embedding_cache = None
+    client.retry_base_delay = 0.001
+    return client, embeddings
+
+
+class TestBatchedEmbeddings(unittest.TestCase):
+    """Test the batched embedding API on QwenClient."""
+
+    def test_batches_preserve_order(self):
+        """Texts are packed into provider-sized batches and returned in order."""
+        client, provider = _client(latency=0.005)
+        texts = [f"text {i}" for i in range(95)]
+
+        embeddings = client.generate_embeddings(texts, batch_size=10, max_concurrency=4)
+
+        self.assertEqual(embeddings, [provider.embed(text) for text in texts])
+        self.assertEqual(provider.requests, 10)
+
+    def test_transient_failures_are_retried(self):
+        """Injected failures are retried until the batch succeeds."""
+        client, provider = _client(failure_rate=0.3, seed=3)
+        client.max_retries = 10
+        texts = [f"text {i}" for i in range(50)]
+
+        embeddings = client.generate_embeddings(texts, batch_size=5, max_concurrency=3)
+
+        self.assertEqual(embeddings, [provider.embed(text) for text in texts])
+        self.assertGreater(provider.failures, 0)
+        self.assertEqual(provider.inputs, 50)
+
+    def test_exhausted_retries_raise(self):
+        """A batch that keeps failing raises LLMError."""
+        client, _ = _client(failure_rate=1.0)
+        client.max_retries = 1
+        with self.assertRaises(LLMError):
+            client.generate_embeddings(["a", "b"])
+
+    def test_backpressure_limits_dispatched_batches(self):
+        """Only a bounded window of batches is dispatched ahead of the consumer."""
+        client, provider = _client(latency=0.01)
+        iterator = client.iter_embeddings([f"t{i}" for i in range(200)], batch_size=2, max_concurrency=2)
+
+        next(iterator)
+        iterator.close()
+
+        self.assertLessEqual(provider.requests, 5)
+
+
+class TestIndexingVectorStreaming(unittest.TestCase):
+    """Test that indexing streams vectors into the vector store."""
+
+    def test_vectors_flushed_in_batches(self):
+        """Vectors are written in fixed-size flushes and aligned with chunks."""
+        client, provider = _client()
+        vector_store = MagicMock()
+        service = IndexingService(
+            MagicMock(), llm_client=client, vector_store=vector_store, vector_write_batch_size=4
+        )
+        chunks = [Chunk(document_id="doc", content=f"chunk {i}", position=i) for i in range(10)]
+
+        stored, failed = service._embed_and_store_vectors(chunks)
+
+        self.assertEqual((stored, failed), (10, 0))
+        batches = [call.args[0] for call in vector_store.store_vectors.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+        vectors = [vector for batch in batches for vector in batch]
+        self.assertEqual([v.chunk_id for v in vectors], [c.id for c in chunks])
+        self.assertEqual(vectors[7].embedding, provider.embed("chunk 7"))
+
+    def test_chunks_are_indexed_as_they_are_produced(self):
+        """index_document pulls chunks from the chunker one write window at a time."""
+        client, _ = _client()
+        produced = []
+
+        def iter_chunks(document_id, pages):
+            for i in range(10):
+                produced.append(i)
+                yield Chunk(document_id=document_id, content=f"chunk {i}", position=i)
+
+        chunker = MagicMock()
+        chunker.iter_chunks.side_effect = iter_chunks
+        vector_store = MagicMock()
+        pulled_at_write = []
+        vector_store.store_vectors.side_effect = lambda vectors: pulled_at_write.append(len(produced))
+        service = IndexingService(
+            MagicMock(), pdf_parser=MagicMock(), chunker=chunker, llm_client=client,
+            vector_store=vector_store, vector_write_batch_size=4
+        )
+
+        document = service.index_document("docs", "doc.pdf")
+
+        self.assertEqual(document.chunk_count, 10)
+        self.assertEqual(document.status, "completed")
+        # Each write happens before the chunker runs more than one window ahead
+        self.assertEqual(pulled_at_write, [4, 8, 10])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Unit tests for bulk knowledge graph writes.
+"""
+import sys
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.lib.exceptions import DatabaseError
+from src.lib.graph_store import GraphStore
+from src.models.knowledge_graph import EntityNode, ConceptNode, Relationship
+
+
+class TestStoreGraph(unittest.TestCase):
+    """Test GraphStore.store_graph."""
+
+    def setUp(self):
+        self.session = MagicMock()
+        self.tx = MagicMock()
+        self.session.execute_write.side_effect = lambda fn, *args: fn(self.tx, *args)
+        db = MagicMock()
+        db.get_driver.return_value.session.return_value.__enter__.return_value = self.session
+        self.store = GraphStore(db)
+
+        # Existing nodes resolved from the database, and relationship row counts
+        self.existing = {}
+
+        def run(query, params):
+            result = MagicMock()
+            if "RETURN id" in query:
+                result.__iter__.return_value = iter([
+                    {"id": node_id, "label": self.existing.get(node_id)} for node_id in params["ids"]
+                ])
+            else:
+                result.single.return_value = {"written": len(params["rows"])}
+            return result
+
+        self.tx.run.side_effect = run
+
+    def _queries(self, fragment):
+        return [call.args for call in self.tx.run.call_args_list if fragment in call.args[0]]
+
+    def test_batches_and_labeled_lookups(self):
+        """Nodes and edges are unwound in batches inside one transaction."""
+        entities = [EntityNode(name=f"e{i}", type="person") for i in range(5)]
+        concept = ConceptNode(name="c", description="d")
+        relationships = [
+            Relationship(source_id=entities[i].id, target_id=concept.id, type="RELATED_TO")
+            for i in range(3)
+        ]
+
+        counts = self.store.store_graph(entities, [concept], relationships, batch_size=2)
+
+        self.assertEqual(counts, {"entities": 5, "concepts": 1, "relationships": 3, "skipped_relationships": 0})
+        self.session.execute_write.assert_called_once()
+        entity_writes = self._queries("MERGE (n:Entity")
+        self.assertEqual([len(args[1]["rows"]) for args in entity_writes], [2, 2, 1])
+        edge_writes = self._queries("MERGE (source)")
+        self.assertEqual(len(edge_writes), 2)
+        self.assertIn("MATCH (source:Entity", edge_writes[0][0])
+        self.assertIn("MATCH (target:Concept", edge_writes[0][0])
+        self.assertEqual(self._queries("RETURN id"), [])
+
+    def test_existing_endpoints_resolved_and_missing_skipped(self):
+        """Endpoints outside the graph are looked up by label; unknown ones are skipped."""
+        self.existing = {"old-concept": "Concept"}
+        entity = EntityNode(name="e", type="org")
+        relationships = [
+            Relationship(source_id=entity.id, target_id="old-concept", type="IS_A"),
+            Relationship(source_id=entity.id, target_id="missing", type="IS_A"),
+        ]
+
+        counts = self.store.store_graph([entity], [], relationships)
+
+        self.assertEqual(counts["relationships"], 1)
+        self.assertEqual(counts["skipped_relationships"], 1)
+        self.assertEqual(len(self._queries("RETURN id")), 1)
+
+    def test_constraints_created_once(self):
+        """Schema statements run only on the first write."""
+        self.store.store_graph([EntityNode(name="a", type="t")])
+        self.store.store_graph([EntityNode(name="b", type="t")])
+
+        statements = [call.args[0] for call in self.session.run.call_args_list]
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(all("CONSTRAINT" in statement for statement in statements))
+
+    def test_failure_wrapped(self):
+        """Driver errors surface as DatabaseError."""
+        self.session.execute_write.side_effect = RuntimeError("down")
+        with self.assertRaises(DatabaseError):
+            self.store.store_graph([EntityNode(name="a", type="t")])
+        with self.assertRaises(ValueError):
+            self.store.store_graph([], batch_size=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
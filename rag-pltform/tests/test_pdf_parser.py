@@ -0,0 +1,68 @@
+"""
+Unit tests for PDF page extraction.
+"""
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+import fitz  # PyMuPDF
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.lib.exceptions import DocumentProcessingError
+from src.lib.pdf_parser import PDFParser
+
+
+class TestPDFParser(unittest.TestCase):
+    """Test serial and multi-process page extraction."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = str(Path(cls.tmp.name) / "manual.pdf")
+        doc = fitz.open()
+        for i in range(30):
+            page = doc.new_page()
+            if i % 7 != 3:
+                page.insert_text((72, 72), f"Section {i + 1}: body text for page {i + 1}")
+        doc.set_metadata({"title": "Manual"})
+        doc.save(cls.path)
+        doc.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_parallel_matches_serial(self):
+        """Worker processes return the same pages, in order, as in-process extraction."""
+        serial = list(PDFParser(workers=1).iter_pages(self.path))
+        parallel = list(PDFParser(workers=3).iter_pages(self.path))
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(len(serial), 26)
+        self.assertEqual([number for number, _ in serial[:4]], [1, 2, 3, 5])
+
+    def test_metadata_with_pages(self):
+        """Metadata is read from the same open as validation."""
+        metadata, pages = PDFParser(workers=2).parse_with_metadata(self.path)
+
+        self.assertEqual(metadata["title"], "Manual")
+        self.assertEqual(metadata["page_count"], 30)
+        self.assertEqual(next(pages)[0], 1)
+        pages.close()
+
+    def test_invalid_files_rejected(self):
+        """Missing and non-PDF files raise DocumentProcessingError."""
+        text_path = Path(self.tmp.name) / "notes.txt"
+        text_path.write_text("not a pdf")
+        parser = PDFParser()
+        with self.assertRaises(DocumentProcessingError):
+            parser.iter_pages(str(Path(self.tmp.name) / "missing.pdf"))
+        with self.assertRaises(DocumentProcessingError):
+            parser.parse(str(text_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for concurrent retrieval with a latency budget.
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.models.query import Query
+from src.models.search_result import SearchResult
+from src.services.retrieval import RetrievalService
+
+
+def _results(method, chunk_ids, score):
+    return [SearchResult(query_id="q", chunk_id=cid, score=score, rank=1, retrieval_method=method) for cid in chunk_ids]
+
+
+class TestConcurrentRetrieval(unittest.TestCase):
+    """Test RetrievalService.search_with_timings."""
+
+    def _service(self, timeout):
+        service = RetrievalService(
+            MagicMock(), vector_store=MagicMock(), graph_store=MagicMock(),
+            llm_client=MagicMock(), pre_retrieval_service=MagicMock(), timeout=timeout
+        )
+        self.addCleanup(service.close)
+        return service
+
+    def test_branches_run_concurrently(self):
+        """Total latency tracks the slower branch, not the sum."""
+        service = self._service(timeout=5)
+        barrier = threading.Barrier(2, timeout=2)
+
+        def vector(query, name, limit):
+            barrier.wait()
+            time.sleep(0.2)
+            return _results("vector", ["a", "b"], 0.9)
+
+        def graph(query, name, limit):
+            barrier.wait()
+            time.sleep(0.2)
+            return _results("graph", ["b", "c"], 0.5)
+
+        service._vector_search, service._graph_search = vector, graph
+        start = time.perf_counter()
+        results, timings = service.search_with_timings(Query(original_text="q"), "docs", top_k=5)
+
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual([r.chunk_id for r in results], ["a", "b", "c"])
+        self.assertEqual(timings["vector"]["status"], "ok")
+        self.assertEqual(timings["graph"]["results"], 2)
+
+    def test_budget_returns_partial_results(self):
+        """A branch that overruns the budget is dropped and reported as timed out."""
+        service = self._service(timeout=0.1)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow_graph(query, name, limit):
+            release.wait(2)
+            return _results("graph", ["z"], 1.0)
+
+        service._vector_search = lambda query, name, limit: _results("vector", ["a"], 0.9)
+        service._graph_search = slow_graph
+        results, timings = service.search_with_timings(Query(original_text="q"), "docs")
+
+        self.assertEqual([r.chunk_id for r in results], ["a"])
+        self.assertEqual(timings["graph"]["status"], "timeout")
+
+    def test_failed_and_disabled_branches(self):
+        """Failures are isolated and disabled branches are reported."""
+        service = self._service(timeout=1)
+
+        def broken(query, name, limit):
+            raise RuntimeError("boom")
+
+        service._vector_search = broken
+        results, timings = service.search_with_timings(
+            Query(original_text="q"), "docs", enable_graph_search=False
+        )
+
+        self.assertEqual(results, [])
+        self.assertEqual(timings["vector"]["status"], "failed")
+        self.assertEqual(timings["graph"]["status"], "disabled")
+
+
+if __name__ == "__main__":
+    unittest.main()
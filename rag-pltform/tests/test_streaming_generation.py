@@ -0,0 +1,97 @@
+"""
+Unit tests for streaming response generation.
+"""
+import sys
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock
+
+import openai
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.lib.exceptions import LLMError
+from src.lib.fake_provider import FakeCompletions, FakeStreamingServer
+from src.lib.llm_client import QwenClient
+from src.models.query import Query
+from src.models.search_result import SearchResult
+from src.services.generation import GENERATION_ERROR_MESSAGE, GenerationService
+from src.services.orchestration import OrchestrationService
+
+
+class TestStreamingGeneration(unittest.TestCase):
+    """Test streaming from the client through orchestration against a local fake server."""
+
+    def setUp(self):
+        self.server = FakeStreamingServer(
+            FakeCompletions(reply="Streaming answers arrive early.", first_token_delay=0.05, token_delay=0.05)
+        ).start()
+        self.addCleanup(self.server.stop)
+        self.llm_client = QwenClient(
+            embedding_cache=MagicMock(),
+            client=openai.OpenAI(base_url=self.server.base_url, api_key="test", max_retries=0)
+        )
+
+    def test_client_streams_text(self):
+        """Text arrives in several pieces that join to the full reply."""
+        pieces = list(self.llm_client.stream_text("prompt"))
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual("".join(pieces), "Streaming answers arrive early.")
+
+    def test_client_stream_errors_raise_llm_error(self):
+        """Connection failures surface as LLMError."""
+        self.server.stop()
+        with self.assertRaises(LLMError):
+            list(self.llm_client.stream_text("prompt"))
+
+    def test_chat_stream_persists_after_completion(self):
+        """Conversation data is stored once, after the last token, with TTFT recorded."""
+        retrieval = MagicMock()
+        retrieval.search.return_value = [SearchResult(query_id="q", chunk_id="c1", score=0.9, rank=1)]
+        retrieval.hydrate_chunks.return_value = {}
+        post_retrieval = MagicMock()
+        post_retrieval.process_results.side_effect = lambda results, query, rerank: results
+        orchestration = OrchestrationService(
+            MagicMock(), MagicMock(), retrieval, post_retrieval, GenerationService(self.llm_client)
+        )
+        orchestration.pre_retrieval_service.process_query.return_value = Query(original_text="q")
+        orchestration._get_previous_responses = MagicMock(return_value=[])
+        orchestration._store_conversation_data = MagicMock()
+
+        stream, conversation = orchestration.chat_stream("docs", "What arrives early?")
+
+        iterator = iter(stream)
+        first = next(iterator)
+        orchestration._store_conversation_data.assert_not_called()
+        rest = list(iterator)
+
+        self.assertEqual(first + "".join(rest), "Streaming answers arrive early.")
+        self.assertGreater(stream.time_to_first_token, 0)
+        self.assertLess(stream.time_to_first_token, stream.total_time)
+        orchestration._store_conversation_data.assert_called_once()
+        self.assertEqual(orchestration._store_conversation_data.call_args.args[2].content, first + "".join(rest))
+        self.assertEqual(conversation.context["last_question"], "What arrives early?")
+
+    def test_mid_stream_failure_yields_error_message(self):
+        """A failing stream ends with the error message instead of raising."""
+        def broken():
+            yield "Partial"
+            raise LLMError("connection reset")
+
+        llm_client = MagicMock()
+        llm_client.stream_text.return_value = broken()
+        completed = []
+        stream = GenerationService(llm_client).stream_response(
+            Query(original_text="q"), [], [], on_complete=completed.append
+        )
+
+        text = "".join(stream)
+
+        self.assertEqual(text, f"Partial\n{GENERATION_ERROR_MESSAGE}")
+        self.assertEqual(completed[0].model_used, "error-handler")
+        self.assertIs(stream.read(), completed[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+"""
+Unit tests for the in-process vector index.
+"""
+import sys
+import random
+import tempfile
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.lib.vector_index import HNSWIndex, BruteForceIndex, load_vector_index
+from src.lib.vector_store import VectorStore
+from src.models.vector import Vector
+from src.models.query import Query
+from src.services.retrieval import RetrievalService
+
+
+def _random_vectors(count, dim=16, seed=7):
+    rng = random.Random(seed)
+    return [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(count)]
+
+
+class TestHNSWIndex(unittest.TestCase):
+    """Test the HNSW index."""
+
+    def setUp(self):
+        self.vectors = _random_vectors(500)
+        self.index = HNSWIndex(m=8, ef_construction=64, ef_search=32, seed=1)
+        for i, vector in enumerate(self.vectors):
+            self.index.add(f"v{i}", vector, f"chunk{i}")
+
+    def test_finds_exact_match(self):
+        """A stored vector is its own nearest neighbour."""
+        hits = self.index.search(self.vectors[42], k=1)
+        self.assertEqual(hits[0].key, "v42")
+        self.assertEqual(hits[0].payload, "chunk42")
+        self.assertAlmostEqual(hits[0].score, 1.0, places=6)
+
+    def test_recall_against_brute_force(self):
+        """Recall at a generous ef is close to exact search."""
+        queries = _random_vectors(20, seed=99)
+        report = self.index.recall_report(queries, k=10, ef_values=[16, 128])
+        recalls = [result["recall"] for result in report["results"]]
+        self.assertGreaterEqual(recalls[1], 0.9)
+        self.assertGreaterEqual(recalls[1], recalls[0])
+        self.assertEqual(report["size"], 500)
+
+    def test_remove_excludes_vector(self):
+        """Removed vectors are never returned."""
+        self.assertTrue(self.index.remove("v42"))
+        self.assertFalse(self.index.remove("v42"))
+        hits = self.index.search(self.vectors[42], k=5)
+        self.assertNotIn("v42", [hit.key for hit in hits])
+        self.assertEqual(len(self.index), 499)
+
+        self.index.compact()
+        self.assertEqual(len(self.index), 499)
+        self.assertNotIn("v42", self.index)
+
+    def test_dimension_mismatch(self):
+        """Vectors with a different dimension are rejected."""
+        with self.assertRaises(ValueError):
+            self.index.add("bad", [1.0, 2.0])
+
+    def test_save_and_load(self):
+        """A reloaded index returns the same results."""
+        self.index.remove("v1")
+        with tempfile.TemporaryDirectory() as tmp:
+            self.index.save(tmp)
+            restored = load_vector_index(tmp)
+
+        self.assertIsInstance(restored, HNSWIndex)
+        self.assertEqual(len(restored), len(self.index))
+        self.assertNotIn("v1", restored)
+        query = self.vectors[10]
+        self.assertEqual(
+            [hit.key for hit in restored.search(query, k=5)],
+            [hit.key for hit in self.index.search(query, k=5)]
+        )
+
+    def test_brute_force_index(self):
+        """The brute-force index returns exact results and round-trips to disk."""
+        index = BruteForceIndex()
+        for i, vector in enumerate(self.vectors[:50]):
+            index.add(f"v{i}", vector)
+        self.assertEqual(index.search(self.vectors[3], k=1)[0].key, "v3")
+        with tempfile.TemporaryDirectory() as tmp:
+            index.save(tmp)
+            self.assertEqual(len(load_vector_index(tmp)), 50)
+
+    def test_save_writes_a_single_file(self):
+        """Saving replaces one file, leaving no temporary files behind."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.index.save(tmp)
+            self.index.save(tmp)
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["index.bin"])
+
+
+class TestVectorStoreIndexSync(unittest.TestCase):
+    """Test that the vector store keeps its index in sync."""
+
+    def test_store_and_delete_update_index(self):
+        """store_vectors adds to the index and delete_vector removes from it."""
+        db = MagicMock()
+        session = db.get_driver.return_value.session.return_value.__enter__.return_value
+        session.run.return_value.consume.return_value.counters.nodes_deleted = 1
+
+        store = VectorStore(db, index=HNSWIndex(seed=1))
+        vectors = [Vector(chunk_id=f"chunk{i}", embedding=e) for i, e in enumerate(_random_vectors(10))]
+        store.store_vectors(vectors)
+
+        self.assertEqual(len(store.index), 10)
+        self.assertEqual(store.search_index(vectors[4].embedding, k=1)[0].payload, "chunk4")
+
+        self.assertTrue(store.delete_vector(vectors[4].id))
+        self.assertNotIn(vectors[4].id, store.index)
+
+    def _db(self, rows):
+        """Mock a database holding the given vector rows."""
+        def run(query, params=None):
+            result = MagicMock()
+            result.single.return_value = {"count": len(rows)}
+            result.__iter__.return_value = iter(rows)
+            return result
+
+        db = MagicMock()
+        session = db.get_driver.return_value.session.return_value.__enter__.return_value
+        session.run.side_effect = run
+        return db
+
+    def test_index_path_creates_empty_index(self):
+        """An index path without saved files on an empty database starts an empty HNSW index."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = VectorStore(self._db([]), index_path=str(Path(tmp) / "index"))
+            self.assertIsInstance(store.index, HNSWIndex)
+            self.assertEqual(len(store.index), 0)
+
+    def test_index_path_builds_index_for_existing_vectors(self):
+        """A new index on a populated database is built from the stored vectors."""
+        rows = [
+            {"id": f"v{i}", "chunk_id": f"chunk{i}", "embedding": e}
+            for i, e in enumerate(_random_vectors(10))
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            store = VectorStore(self._db(rows), index_path=tmp)
+            self.assertEqual(len(store.index), 10)
+            self.assertEqual(store.search_index(rows[3]["embedding"], k=1)[0].payload, "chunk3")
+
+    def test_stale_saved_index_is_rebuilt(self):
+        """A saved index that no longer matches the database is rebuilt on load."""
+        vectors = _random_vectors(10)
+        stale = HNSWIndex(seed=1)
+        for i, vector in enumerate(vectors[:6]):
+            stale.add(f"v{i}", vector, f"chunk{i}")
+        rows = [{"id": f"v{i}", "chunk_id": f"chunk{i}", "embedding": e} for i, e in enumerate(vectors)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            stale.save(tmp)
+            store = VectorStore(self._db(rows), index_path=tmp)
+        self.assertEqual(len(store.index), 10)
+        self.assertIn("v9", store.index)
+
+
+class TestRetrievalWithIndex(unittest.TestCase):
+    """Test vector retrieval through the in-process index."""
+
+    def test_vector_search_filters_to_collection(self):
+        """Index hits outside the collection's documents are dropped."""
+        vectors = _random_vectors(20)
+        index = HNSWIndex(seed=1)
+        for i, vector in enumerate(vectors):
+            index.add(f"v{i}", vector, f"chunk{i}")
+
+        def run(query, params=None):
+            if "Document {name" in query:
+                return [{"document_id": "doc1"}]
+            # Only even chunks belong to the collection
+            return [{"chunk_id": cid} for cid in params["chunk_ids"] if int(cid[5:]) % 2 == 0]
+
+        db = MagicMock()
+        session = db.get_driver.return_value.session.return_value.__enter__.return_value
+        session.run.side_effect = run
+
+        llm_client = MagicMock()
+        llm_client.generate_embedding.return_value = vectors[4]
+        service = RetrievalService(db, vector_store=VectorStore(db, index=index), llm_client=llm_client)
+        results = service._vector_search(Query(original_text="q"), "docs", limit=3)
+
+        self.assertEqual(results[0].chunk_id, "chunk4")
+        self.assertTrue(all(int(r.chunk_id[5:]) % 2 == 0 for r in results))
+        self.assertLessEqual(len(results), 3)
+        self.assertFalse(any("gds." in call.args[0] for call in session.run.call_args_list))
+
+    def test_empty_index_falls_back_to_database_scan(self):
+        """An empty index does not hide vectors stored in the database."""
+        db = MagicMock()
+        session = db.get_driver.return_value.session.return_value.__enter__.return_value
+        session.run.return_value = [{"chunk_id": "chunk1", "score": 0.9}]
+
+        llm_client = MagicMock()
+        llm_client.generate_embedding.return_value = [0.1, 0.2]
+        store = VectorStore(db, index=HNSWIndex(seed=1))
+        service = RetrievalService(db, vector_store=store, llm_client=llm_client)
+        results = service._vector_search(Query(original_text="q"), "docs", limit=3)
+
+        self.assertEqual([r.chunk_id for r in results], ["chunk1"])
+        self.assertIn("gds.", session.run.call_args.args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()